@@ -36,39 +36,49 @@ _project_root = Path(__file__).parent
 if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
-# Imports principaux du projet (optionnels)
-try:
-    # Importer les modules principaux si disponibles
-    from core.transformation_loader import TransformationLoader
+# Imports principaux charges a la demande : importer le projet ne doit
+# ni sonder l'environnement ni charger les plugins
+_IMPORTS_DIFFERES = {
+    'TransformationLoader': 'core.transformation_loader',
+    'OrchestrateurAST': 'modificateur_interactif',
+}
+
+
+def __getattr__(nom):
+    """Importe TransformationLoader / OrchestrateurAST au premier acces."""
+    module = _IMPORTS_DIFFERES.get(nom)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    import importlib
+    valeur = getattr(importlib.import_module(module), nom)
+    globals()[nom] = valeur
+    return valeur
+
+
+# Fonction utilitaire pour accès rapide
+def get_orchestrator():
+    """Retourne une instance de l'orchestrateur AST."""
     from modificateur_interactif import OrchestrateurAST
-    
-    # Fonction utilitaire pour accès rapide
-    def get_orchestrator():
-        """Retourne une instance de l'orchestrateur AST."""
-        return OrchestrateurAST()
-    
-    def get_loader():
-        """Retourne une instance du chargeur de transformations."""
-        return TransformationLoader()
-    
-    def list_transformations():
-        """Liste toutes les transformations disponibles."""
-        loader = get_loader()
-        return loader.list_transformations()
-    
-    # Exports publics
-    __all__ = [
-        'OrchestrateurAST',
-        'TransformationLoader',
-        'get_orchestrator',
-        'get_loader',
-        'list_transformations'
-    ]
-    
-except ImportError as e:
-    # En cas d'erreur, on continue sans crash
-    print(f"Avertissement __init__: Certains modules ne sont pas disponibles ({e})")
-    __all__ = []
+    return OrchestrateurAST()
+
+def get_loader():
+    """Retourne une instance du chargeur de transformations."""
+    from core.transformation_loader import TransformationLoader
+    return TransformationLoader()
+
+def list_transformations():
+    """Liste toutes les transformations disponibles."""
+    loader = get_loader()
+    return loader.list_transformations()
+
+# Exports publics
+__all__ = [
+    'OrchestrateurAST',
+    'TransformationLoader',
+    'get_orchestrator',
+    'get_loader',
+    'list_transformations'
+]
 
 # Informations pour les développeurs
 def project_info():
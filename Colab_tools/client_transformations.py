@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Client du Serveur de Transformations - Outil AST
+================================================
+
+Client leger pour serveur_transformations.py : n'importe ni les plugins
+ni le chargeur. Le code transforme est ecrit sur la sortie standard
+(ou la reponse complete avec --json).
+
+Usage:
+    python client_transformations.py -p print_to_logging_transform fichier.py
+    python client_transformations.py --op analyze fichier.py --json
+    cat fichier.py | python client_transformations.py -p fix_mutable_defaults_transform -
+    python client_transformations.py --op shutdown
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Ajouter le repertoire du projet au path Python
+_project_root = Path(__file__).parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+
+def construire_parser():
+    """Construit l'analyseur des arguments de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        prog="client_transformations.py",
+        description="Envoie une requete au serveur de transformations."
+    )
+    parser.add_argument("fichier", nargs="?",
+                        help="Fichier a traiter ('-' pour l'entree standard)")
+    parser.add_argument("-p", "--plugin", action="append", default=[], dest="plugins",
+                        help="Plugin a appliquer (repetable, ou liste separee par des virgules)")
+    parser.add_argument("--op", default="transform",
+                        choices=["transform", "preview", "analyze", "list", "ping",
+                                 "reload", "shutdown"],
+                        help="Operation demandee (defaut: transform)")
+    parser.add_argument("--socket", help="Chemin du socket Unix du serveur")
+    parser.add_argument("--http", type=int, metavar="PORT",
+                        help="Utilise le HTTP local sur ce port au lieu du socket")
+    parser.add_argument("--secret", metavar="FICHIER",
+                        help="Fichier du secret de session HTTP (defaut: celui du serveur "
+                             "sur ce port dans le dossier temporaire)")
+    parser.add_argument("--json", action="store_true",
+                        help="Affiche la reponse JSON complete")
+    return parser
+
+
+def main(argv=None):
+    """Point d'entree principal."""
+    from core.server import ClientTransformations, chemin_socket_defaut
+
+    args = construire_parser().parse_args(argv)
+
+    champs = {}
+    plugins = [nom.strip() for valeur in args.plugins for nom in valeur.split(',') if nom.strip()]
+    if plugins:
+        champs['plugins'] = plugins
+    if args.fichier == '-':
+        champs['code'] = sys.stdin.read()
+    elif args.fichier:
+        champs['fichier'] = str(Path(args.fichier).resolve())
+
+    if args.http is not None:
+        client = ClientTransformations(port_http=args.http, chemin_secret=args.secret)
+    else:
+        client = ClientTransformations(chemin_socket=args.socket or chemin_socket_defaut())
+
+    try:
+        with client:
+            reponse = client.requete(args.op, **champs)
+    except (OSError, ValueError) as e:
+        print(f"X Serveur injoignable: {e}", file=sys.stderr)
+        return 2
+
+    if args.json or args.op != 'transform' or not reponse.get('ok'):
+        print(json.dumps(reponse, ensure_ascii=False, indent=None if args.json else 2))
+    else:
+        sys.stdout.write(reponse['code'])
+
+    if not reponse.get('ok'):
+        print(f"X {reponse.get('erreur')}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteur d'Aperçu Rapide pour le Sélecteur de Fichiers
+====================================================
+
+Construit l'aperçu d'un fichier Python sans le charger en entier :
+- Lecture de la tête du fichier uniquement (les N premières lignes)
+- Comptage des lignes par balayage binaire bufferisé
+- Texte d'aperçu construit en une seule chaîne (insertion unique dans le widget)
+- Cache LRU des aperçus récents, invalidé par taille et date de modification
+
+Module indépendant de Tkinter pour pouvoir être utilisé et testé sans GUI.
+"""
+
+import codecs
+import io
+import os
+from functools import lru_cache
+from typing import NamedTuple
+
+# Nombre de lignes affichées par défaut dans l'aperçu
+APERCU_MAX_LIGNES = 100
+
+# Taille des blocs lus pour la tête et pour le comptage des lignes
+_TAILLE_BLOC = 64 * 1024
+_TAILLE_BLOC_COMPTAGE = 1024 * 1024
+
+# Lecture maximale pour la tête (fichiers minifiés sur une seule ligne)
+_TAILLE_TETE_MAX = 1024 * 1024
+
+# Nombre d'aperçus conservés en cache
+_TAILLE_CACHE = 64
+
+
+class ApercuFichier(NamedTuple):
+    """Résultat d'un aperçu de fichier."""
+    texte: str
+    lignes_totales: int
+    lignes_affichees: int
+    tronque: bool
+
+
+def compter_lignes(file_path):
+    """Compte les lignes d'un fichier par balayage binaire bufferisé."""
+    total = 0
+    dernier_octet = b"\n"
+    tampon = bytearray(_TAILLE_BLOC_COMPTAGE)
+    vue = memoryview(tampon)
+
+    with open(file_path, 'rb', buffering=0) as f:
+        while True:
+            lus = f.readinto(tampon)
+            if not lus:
+                break
+            total += tampon.count(b"\n", 0, lus)
+            dernier_octet = bytes(vue[lus - 1:lus])
+
+    # Derniere ligne sans retour a la ligne final (comme readlines())
+    if dernier_octet != b"\n":
+        total += 1
+
+    return total
+
+
+def lire_tete(file_path, max_lignes=APERCU_MAX_LIGNES):
+    """
+    Lit uniquement les premières lignes d'un fichier.
+
+    Returns:
+        tuple: (liste des lignes décodées, True si le fichier a été lu en entier)
+    """
+    morceaux = []
+    nb_retours = 0
+    taille_lue = 0
+    fin_atteinte = False
+
+    with open(file_path, 'rb') as f:
+        while nb_retours < max_lignes and taille_lue < _TAILLE_TETE_MAX:
+            bloc = f.read(_TAILLE_BLOC)
+            if not bloc:
+                fin_atteinte = True
+                break
+            morceaux.append(bloc)
+            nb_retours += bloc.count(b"\n")
+            taille_lue += len(bloc)
+
+        if not fin_atteinte:
+            fin_atteinte = not f.peek(1)
+
+    # Decodage tolerant a un caractere multi-octets coupe en fin de tete
+    decodeur = codecs.getincrementaldecoder('utf-8')()
+    texte = decodeur.decode(b"".join(morceaux), final=fin_atteinte)
+    lignes = io.StringIO(texte, newline=None).readlines()
+
+    return lignes[:max_lignes], fin_atteinte and len(lignes) <= max_lignes
+
+
+@lru_cache(maxsize=_TAILLE_CACHE)
+def _construire_apercu(file_path, taille, mtime_ns, max_lignes):
+    """Construit l'aperçu (mis en cache par chemin, taille et date)."""
+    lignes, complet = lire_tete(file_path, max_lignes)
+    lignes_totales = len(lignes) if complet else compter_lignes(file_path)
+
+    nom = os.path.basename(file_path)
+    parties = [
+        f"# Aperçu : {nom} ({lignes_totales} lignes)\n",
+        f"# {'=' * 50}\n\n",
+    ]
+    parties.extend(f"{i:3d} | {ligne}" for i, ligne in enumerate(lignes, 1))
+
+    tronque = lignes_totales > len(lignes)
+    if tronque:
+        parties.append(f"\n... ({lignes_totales - len(lignes)} lignes supplémentaires)")
+
+    return ApercuFichier(
+        texte="".join(parties),
+        lignes_totales=lignes_totales,
+        lignes_affichees=len(lignes),
+        tronque=tronque
+    )
+
+
+def generer_apercu(file_path, max_lignes=APERCU_MAX_LIGNES):
+    """
+    Retourne l'aperçu d'un fichier, depuis le cache si le fichier n'a pas changé.
+
+    Raises:
+        UnicodeDecodeError: Si la tête du fichier n'est pas en UTF-8
+        OSError: Si le fichier est inaccessible
+    """
+    stat = os.stat(file_path)
+    return _construire_apercu(
+        os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, max_lignes
+    )
+
+
+def vider_cache_apercus():
+    """Vide le cache des aperçus."""
+    _construire_apercu.cache_clear()
@@ -16,6 +16,18 @@ import os
 import sys
 from pathlib import Path
 
+# Ajouter le repertoire parent au path
+current_dir = Path(__file__).parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from core.ignore_rules import creer_decouverte
+
+try:
+    from composants_browser.file_preview import generer_apercu, APERCU_MAX_LIGNES
+except ImportError:
+    from file_preview import generer_apercu, APERCU_MAX_LIGNES
+
 class FileSelectorApp:
     """Interface graphique pour sélectionner des fichiers Python ou dossiers."""
     
@@ -631,23 +643,12 @@ class FileSelectorApp:
         self.preview_text.delete(1.0, tk.END)
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Limiter l'aperçu à 100 lignes
-            preview_lines = lines[:100]
-            
-            # En-tête
-            self.preview_text.insert(tk.END, f"# Aperçu : {os.path.basename(file_path)} ({len(lines)} lignes)\n")
-            self.preview_text.insert(tk.END, f"# {'=' * 50}\n\n")
-            
-            # Contenu avec numérotation
-            for i, line in enumerate(preview_lines, 1):
-                self.preview_text.insert(tk.END, f"{i:3d} | {line}")
-            
-            if len(lines) > 100:
-                self.preview_text.insert(tk.END, f"\n... ({len(lines) - 100} lignes supplémentaires)")
-            
+            # Lecture de la tête uniquement (aperçu mis en cache)
+            apercu = generer_apercu(file_path, APERCU_MAX_LIGNES)
+
+            # Insertion en un seul appel
+            self.preview_text.insert(tk.END, apercu.texte)
+
         except UnicodeDecodeError:
             self.preview_text.insert(tk.END, "Erreur : Impossible de décoder le fichier (encodage non supporté)")
         except Exception as e:
@@ -979,34 +980,38 @@ def _center_window(window):
 # COLLECTEUR DE FICHIERS POUR LE BACKEND
 # ===============================================
 
-def collect_python_files_from_selection(selected_items, selection_type):
-    """Collecte tous les fichiers Python à partir de la sélection GUI."""
-    
-    python_files = []
+def iter_python_files_from_selection(selected_items, selection_type):
+    """Produit les fichiers Python de la sélection GUI au fil du parcours."""
     
     if selection_type == "file":
         # Mode fichier unique
         if selected_items:
             file_path = selected_items[0]
             if os.path.exists(file_path) and file_path.endswith('.py'):
-                python_files.append(file_path)
+                yield file_path
     
     elif selection_type == "folders":
-        # Mode dossiers multiples
+        # Mode dossiers multiples : parcours parallèle, dédoublonné et filtré
+        dossiers = []
         for folder_path in selected_items:
             if not os.path.exists(folder_path) or not os.path.isdir(folder_path):
                 print(f"! Dossier ignoré (non trouvé) : {folder_path}")
                 continue
-            
-            # Parcours récursif pour collecter les fichiers .py
-            for root, dirs, files in os.walk(folder_path):
-                for file in files:
-                    if file.endswith('.py'):
-                        file_path = os.path.join(root, file)
-                        python_files.append(file_path)
-                
-                # Éviter les dossiers système et cachés
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['__pycache__', 'node_modules']]
+            dossiers.append(folder_path)
+        
+        if dossiers:
+            # Regles .gitignore, dossiers d'environnement et taille maximale
+            yield from creer_decouverte(dossiers).iter_files(dossiers)
+
+
+def collect_python_files_from_selection(selected_items, selection_type):
+    """Collecte tous les fichiers Python à partir de la sélection GUI."""
+    
+    python_files = list(iter_python_files_from_selection(selected_items, selection_type))
+    
+    if selection_type == "folders":
+        # Ordre stable pour l'affichage (le parcours parallèle n'est pas ordonné)
+        python_files.sort()
     
     return python_files
 
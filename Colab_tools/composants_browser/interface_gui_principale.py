@@ -10,6 +10,7 @@ import sys
 import os
 from pathlib import Path
 import datetime
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
@@ -27,6 +28,8 @@ class InterfaceAST:
         self.root.geometry("800x600")
         
         self.fichiers_selectionnes = []
+        # Dossier choisi par "Selectionner un dossier" (None : fichiers individuels)
+        self.dossier_selectionne = None
         self.transformations_disponibles = []
         self.loader = None
         
@@ -68,10 +71,15 @@ class InterfaceAST:
         self.transformation_combo = ttk.Combobox(transform_frame, textvariable=self.transformation_var, state="readonly")
         self.transformation_combo.pack(fill='x', padx=10, pady=10)
         
-        # Bouton d'application
-        tk.Button(main_frame, text="Appliquer la Transformation",
+        # Boutons d'estimation et d'application
+        actions_frame = tk.Frame(main_frame)
+        actions_frame.pack(pady=10)
+        tk.Button(actions_frame, text="Estimer le Lot",
+                 command=self.estimate_transformation,
+                 font=('Arial', 12)).pack(side='left', padx=(0, 10))
+        tk.Button(actions_frame, text="Appliquer la Transformation",
                  command=self.apply_transformation,
-                 font=('Arial', 12, 'bold'), bg='#27ae60', fg='white').pack(pady=10)
+                 font=('Arial', 12, 'bold'), bg='#27ae60', fg='white').pack(side='left')
         
         # Console
         console_frame = tk.LabelFrame(main_frame, text="Console", font=('Arial', 12, 'bold'))
@@ -154,6 +162,7 @@ class InterfaceAST:
         
         if fichiers:
             self.fichiers_selectionnes = list(fichiers)
+            self.dossier_selectionne = None
             self.update_files_display()
             self.log_message(f"+ {len(fichiers)} fichier(s) selectionne(s)")
     
@@ -162,14 +171,12 @@ class InterfaceAST:
         dossier = filedialog.askdirectory(title="Selectionner un dossier")
         
         if dossier:
-            fichiers_python = []
-            for root, dirs, files in os.walk(dossier):
-                for file in files:
-                    if file.endswith('.py'):
-                        fichiers_python.append(os.path.join(root, file))
+            from core.ignore_rules import creer_decouverte
+            fichiers_python = creer_decouverte([dossier]).collect([dossier])
             
             if fichiers_python:
                 self.fichiers_selectionnes = fichiers_python
+                self.dossier_selectionne = os.path.abspath(dossier)
                 self.update_files_display()
                 self.log_message(f"+ {len(fichiers_python)} fichier(s) Python trouve(s)")
             else:
@@ -178,6 +185,7 @@ class InterfaceAST:
     def clear_selection(self):
         """Efface la selection."""
         self.fichiers_selectionnes = []
+        self.dossier_selectionne = None
         self.update_files_display()
         self.log_message("+ Selection effacee")
     
@@ -196,6 +204,51 @@ class InterfaceAST:
         for fichier in self.fichiers_selectionnes:
             self.files_listbox.insert(tk.END, os.path.basename(fichier))
     
+    def racine_selection(self):
+        """
+        Racine des chemins relatifs de la sortie : le dossier selectionne,
+        sinon le dossier commun aux fichiers. None (avec un message) si les
+        fichiers sont sur des lecteurs differents.
+        """
+        if self.dossier_selectionne:
+            return self.dossier_selectionne
+        try:
+            return os.path.commonpath([os.path.dirname(os.path.abspath(f))
+                                       for f in self.fichiers_selectionnes])
+        except ValueError:
+            self.log_message("X Fichiers sur des lecteurs differents : "
+                             "selectionner des fichiers d'un meme lecteur")
+            return None
+    
+    def estimate_transformation(self):
+        """Estime la transformation selectionnee sur un echantillon, sans rien ecrire."""
+        if not self.fichiers_selectionnes:
+            self.log_message("X Aucun fichier selectionne")
+            return
+        
+        selection = self.transformation_combo.current()
+        if not self.loader or selection == -1 or not self.transformations_disponibles:
+            self.log_message("X Aucune transformation selectionnee")
+            return
+        
+        transformation = self.transformations_disponibles[selection]
+        self.log_message("=== ESTIMATION ===")
+        self.log_message(f"Transformation: {transformation['display_name']}")
+        
+        try:
+            from core.batch_pipeline import BatchPipeline
+            from core.estimation import estimer, resume_estimation
+            racine = self.racine_selection()
+            if racine is None:
+                return
+            pipeline = BatchPipeline([transformation['name']], loader=self.loader,
+                                     dry_run=True, roots=[racine]).preparer()
+            estimation = estimer(pipeline, self.fichiers_selectionnes, [racine])
+            for ligne in resume_estimation(estimation):
+                self.log_message(ligne)
+        except Exception as e:
+            self.log_message(f"X Erreur estimation: {e}")
+    
     def apply_transformation(self):
         """Applique la transformation selectionnee."""
         if not self.fichiers_selectionnes:
@@ -217,10 +270,25 @@ class InterfaceAST:
         self.log_message("=== DEBUT TRANSFORMATION ===")
         self.log_message(f"Transformation: {transformation['display_name']}")
         
-        # Creer dossier de sortie
+        racine = self.racine_selection()
+        if racine is None:
+            return
+        
+        # Dossier de sortie : miroir de l'arborescence des fichiers selectionnes
+        # (fichiers inchanges clones sans copie, voir SortieMiroir)
+        from core.batch_pipeline import SortieMiroir
+        from core.ignore_rules import IgnoreRules
+        from core.run_report import RapportExecution
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         dossier_sortie = f"transformations_gui_{timestamp}"
-        os.makedirs(dossier_sortie, exist_ok=True)
+        # Miroir complete depuis le seul dossier choisi (memes exclusions que
+        # la decouverte); des fichiers choisis un a un sont seuls reproduits
+        if self.dossier_selectionne:
+            sortie = SortieMiroir(dossier_sortie, roots=[racine],
+                                  regles=IgnoreRules.depuis_parametres([racine]))
+        else:
+            sortie = SortieMiroir(dossier_sortie)
+        rapport = RapportExecution(f"GUI {transformation['display_name']}")
         
         succes = 0
         echecs = 0
@@ -228,6 +296,9 @@ class InterfaceAST:
         for i, fichier_source in enumerate(self.fichiers_selectionnes, 1):
             self.log_message(f"[{i}/{len(self.fichiers_selectionnes)}] {os.path.basename(fichier_source)}")
             
+            relatif = os.path.relpath(os.path.abspath(fichier_source), racine)
+            debut = time.perf_counter()
+            resultat = {'fichier': fichier_source, 'statut': 'inchange', 'erreur': None}
             try:
                 # Lire le fichier source
                 with open(fichier_source, 'r', encoding='utf-8') as f:
@@ -238,26 +309,45 @@ class InterfaceAST:
                 if transformer and transformer.can_transform(code_source):
                     code_transforme = transformer.transform(code_source)
                     
-                    # Sauvegarder
-                    nom_base = os.path.splitext(os.path.basename(fichier_source))[0]
-                    fichier_sortie = os.path.join(dossier_sortie, f"{nom_base}_{transformation_name}.py")
-                    
-                    with open(fichier_sortie, 'w', encoding='utf-8') as f:
-                        f.write(code_transforme)
+                    # Sauvegarder au meme chemin relatif que la source
+                    sortie.ecrire(relatif, code_transforme, fichier_source)
                     
                     succes += 1
+                    resultat['statut'] = 'modifie'
                     self.log_message("  + Reussi")
                 else:
+                    sortie.lier(relatif, fichier_source)
                     echecs += 1
                     self.log_message("  - Non applicable")
                     
             except Exception as e:
                 echecs += 1
+                resultat.update(statut='erreur', erreur=f"{type(e).__name__}: {e}")
                 self.log_message(f"  X Erreur: {e}")
+                try:
+                    sortie.lier(relatif, fichier_source)
+                except OSError:
+                    pass
+            
+            duree_ms = (time.perf_counter() - debut) * 1000
+            resultat['duree_ms'] = duree_ms
+            resultat['plugins'] = [{'nom': transformation_name, 'duree_ms': duree_ms,
+                                    'applique': resultat['statut'] == 'modifie'}]
+            rapport.ajouter(resultat)
+        
+        # Cloner les fichiers non selectionnes : arbre complet
+        sortie.fermer()
         
         self.log_message("=== RESUME ===")
         self.log_message(f"Succes: {succes}, Echecs: {echecs}")
         self.log_message(f"Dossier: {dossier_sortie}")
+        for ligne in rapport.terminer().resume()[:2]:
+            self.log_message(ligne)
+        try:
+            chemins = rapport.ecrire(f"{dossier_sortie}_rapport")
+            self.log_message(f"Rapport: {', '.join(chemins)}")
+        except OSError as e:
+            self.log_message(f"! Rapport non enregistre: {e}")
     
     def log_message(self, message):
         """Ajoute un message a la console."""
@@ -182,6 +182,14 @@ class AnalyseurJSONAI:
         
         print(f"+ {len(instructions)} instructions créées depuis le JSON")
         return instructions
+    
+    def regles_validation(self, data_json):
+        """Règles de validation activées (validation_rules) du JSON AI."""
+        from core.validation import regles_actives
+        regles = regles_actives(data_json.get("validation_rules"))
+        if regles:
+            print(f"+ Validation après transformation : {', '.join(regles)}")
+        return regles
 
 # 3. ORCHESTRATEUR ÉTENDU POUR JSON AI
 
@@ -192,6 +200,10 @@ class OrchestrateurAI(OrchestrateurAST):
         super().__init__(mode_colab)
         self.analyseur_json = AnalyseurJSONAI()
         self.transformations_appliquees = []
+        self.derniere_sortie = None
+        self.regles_validation = []
+        # Fichier invalide après transformation : version d'origine conservée
+        self.annuler_invalides = False
     
     def appliquer_json_ai(self, fichiers_source, chemin_json):
         """Applique les transformations JSON AI à une liste de fichiers."""
@@ -210,6 +222,8 @@ class OrchestrateurAI(OrchestrateurAST):
             print("X Aucune instruction valide trouvée")
             return False
         
+        self.regles_validation = self.analyseur_json.regles_validation(data_json)
+        
         # Afficher le plan de transformation
         self.afficher_plan_transformation(data_json, instructions_ai)
         
@@ -285,6 +299,11 @@ class OrchestrateurAI(OrchestrateurAST):
                 print("X Impossible de générer le code modifié")
                 return False
             
+            problemes = self.valider_code_modifie(fichier_source, code_modifie, code_source)
+            if problemes and self.annuler_invalides:
+                print("X Transformation annulée : code produit invalide")
+                return False
+            
             # Sauvegarder
             nom_base, extension = os.path.splitext(fichier_source)
             fichier_sortie = nom_base + "_ai_transforme" + extension
@@ -302,6 +321,17 @@ class OrchestrateurAI(OrchestrateurAST):
             print(f"X Erreur transformation AI : {e}")
             return False
     
+    def valider_code_modifie(self, fichier_source, code_modifie, code_source=None):
+        """Applique les validation_rules au code produit; retourne les problèmes introduits."""
+        if not self.regles_validation:
+            return []
+        from core.validation import valider_code
+        problemes = valider_code(code_modifie, fichier_source, self.regles_validation,
+                                 source=code_source)
+        for probleme in problemes:
+            print(f"  ! {probleme['regle']} (ligne {probleme['ligne']}) : {probleme['message']}")
+        return problemes
+    
     def appliquer_ai_lot(self, fichiers_source, instructions_ai):
         """Applique l'AI à un lot de fichiers."""
         
@@ -314,6 +344,7 @@ class OrchestrateurAI(OrchestrateurAST):
         )
         if not dossier_sortie:
             return False
+        self.derniere_sortie = dossier_sortie
         
         # Statistiques globales
         stats = {
@@ -324,20 +355,39 @@ class OrchestrateurAI(OrchestrateurAST):
             'erreurs': []
         }
         
+        # Rapport d'exécution : une étape par phase du moteur
+        import time
+        from core.run_report import RapportExecution
+        rapport = RapportExecution("AI lot")
+        
         # Traitement fichier par fichier
         for i, fichier_source in enumerate(fichiers_source, 1):
             fichier_sortie = mapping_fichiers[fichier_source]
             
             print(f"[{i}/{stats['total']}] AI : {os.path.basename(fichier_source)}")
             
+            debut = time.perf_counter()
+            etapes = []
+            resultat = {'fichier': fichier_source, 'statut': 'erreur', 'erreur': None,
+                        'plugins': etapes}
+            
+            def etape(nom, depuis, applique=False):
+                maintenant = time.perf_counter()
+                etapes.append({'nom': nom, 'duree_ms': (maintenant - depuis) * 1000,
+                               'applique': applique})
+                return maintenant
+            
             try:
                 # Charger et traiter
                 with open(fichier_source, 'r', encoding='utf-8') as f:
                     code_source = f.read()
                 
                 # Réinitialiser le moteur pour chaque fichier
-                if not self.moteur.charger_code(code_source):
+                charge = self.moteur.charger_code(code_source)
+                instant = etape('chargement', debut)
+                if not charge:
                     stats['echecs'] += 1
+                    resultat['erreur'] = "Chargement du code impossible"
                     continue
                 
                 # Appliquer les instructions AI
@@ -345,24 +395,38 @@ class OrchestrateurAI(OrchestrateurAST):
                 for instr_data in instructions_ai:
                     if self.moteur.appliquer_instruction(instr_data["instruction"]):
                         transformations_fichier += 1
+                instant = etape('instructions', instant, transformations_fichier > 0)
                 
                 # Générer et sauvegarder
                 code_modifie = self.moteur.generer_code_modifie()
+                if code_modifie and self.valider_code_modifie(
+                        fichier_source, code_modifie, code_source) and self.annuler_invalides:
+                    # Annulation : le fichier d'origine est recopié tel quel
+                    code_modifie = code_source
+                    transformations_fichier = 0
+                    resultat['annule'] = True
                 if code_modifie:
                     with open(fichier_sortie, 'w', encoding='utf-8') as f:
                         f.write(code_modifie)
                     
                     stats['reussis'] += 1
                     stats['transformations_totales'] += transformations_fichier
+                    resultat['statut'] = 'modifie' if transformations_fichier else 'inchange'
                     print(f"  ✅ {transformations_fichier} transformations appliquées")
                 else:
                     stats['echecs'] += 1
+                    resultat['erreur'] = "Échec génération code"
                     print(f"  ❌ Échec génération code")
+                etape('generation', instant)
                 
             except Exception as e:
                 stats['echecs'] += 1
                 stats['erreurs'].append(f"{fichier_source}: {str(e)}")
+                resultat['erreur'] = f"{type(e).__name__}: {e}"
                 print(f"  ❌ Erreur : {str(e)}")
+            finally:
+                resultat['duree_ms'] = (time.perf_counter() - debut) * 1000
+                rapport.ajouter(resultat)
         
         # Rapport final
         print("=" * 50)
@@ -372,6 +436,13 @@ class OrchestrateurAI(OrchestrateurAST):
         print(f"Échecs : {stats['echecs']}")
         print(f"Transformations totales : {stats['transformations_totales']}")
         print(f"Taux de réussite : {(stats['reussis']/stats['total']*100):.1f}%")
+        for ligne in rapport.terminer().resume():
+            print(ligne)
+        try:
+            chemins = rapport.ecrire(os.path.join(dossier_sortie, "rapport_execution"))
+            print(f"Rapport : {', '.join(chemins)}")
+        except OSError as e:
+            print(f"! Rapport non enregistré : {e}")
         
         return stats['reussis'] > 0
 
@@ -466,7 +537,9 @@ def demo_avec_json_ai():
     
     if success:
         print("*** TRAITEMENT AI RÉUSSI ! ***")
-        gerer_sortie_environnement(None, "ai")
+        # Sous Colab : dossier de sortie archivé puis proposé en un seul téléchargement
+        from core.colab_output import gerer_sortie_environnement
+        gerer_sortie_environnement(orchestrateur_ai.derniere_sortie, "ai")
     else:
         print("X Le traitement AI a échoué")
     
@@ -20,18 +20,27 @@ __version__ = "2.4.0"
 __author__ = "Équipe AST"
 __description__ = "Système modulaire de transformations AST pour Python"
 
-# Imports principaux disponibles depuis le module core
-try:
-    from .transformation_loader import TransformationLoader
-    from .base_transformer import BaseTransformer
-    
-    # Exports publics
-    __all__ = [
-        'TransformationLoader',
-        'BaseTransformer'
-    ]
-    
-except ImportError as e:
-    # En cas d'erreur d'import, on continue sans crash
-    print(f"Avertissement core.__init__: {e}")
-    __all__ = []
\ No newline at end of file
+# Imports principaux charges a la demande : "import core" reste leger
+# et ne charge ni le chargeur ni inspect tant qu'ils ne sont pas utilises
+_IMPORTS_DIFFERES = {
+    'TransformationLoader': '.transformation_loader',
+    'BaseTransformer': '.base_transformer',
+}
+
+# Exports publics
+__all__ = list(_IMPORTS_DIFFERES)
+
+
+def __getattr__(nom):
+    """Importe TransformationLoader / BaseTransformer au premier acces."""
+    module = _IMPORTS_DIFFERES.get(nom)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    import importlib
+    valeur = getattr(importlib.import_module(module, __name__), nom)
+    globals()[nom] = valeur
+    return valeur
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Archives en Entree - Lecture sans Extraction
+Une archive zip, wheel, tar ou sdist (.tar.gz...) donnee comme racine est
+parcourue comme un dossier : chaque membre est designe par un chemin
+virtuel '<archive>!/<membre>' et lu en flux depuis l'archive, sans copie
+sur disque. Le chemin relatif d'un membre (sorties dossier, archive,
+patch) est son chemin dans l'archive.
+
+Un tar compresse ne se lit efficacement que dans l'ordre : l'index des
+membres est construit une seule fois, les membres sont lus dans l'ordre
+de la decouverte (par le producteur en mode parallele, voir BatchPipeline)
+et les derniers membres lus restent en memoire pour les relectures
+(patch, miroir, tampons) sans revenir en arriere dans le flux compresse.
+"""
+
+import io
+import os
+import posixpath
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional, Tuple
+
+# Separateur entre le chemin de l'archive et celui du membre
+SEPARATEUR = '!/'
+
+# Extensions reconnues comme archives (sdist : .tar.gz, wheel : .whl)
+EXTENSIONS_ARCHIVE = ('.zip', '.whl', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2',
+                      '.tar.xz', '.txz')
+
+# Archives ouvertes en lecture, par processus : (pid, archive) -> (est_zip, archive, index)
+# (zipfile et tarfile ne sont importes qu'a la premiere archive rencontree)
+_OUVERTES = {}
+_VERROU = threading.Lock()
+
+# Derniers membres tar lus, par processus : (pid, chemin) -> octets
+_LUS = OrderedDict()
+_LUS_MAX_OCTETS = 64 * 1024 * 1024
+_lus_octets = 0
+
+
+def est_archive(chemin: str) -> bool:
+    """Vrai si chemin est un fichier d'archive reconnu a son extension."""
+    return chemin.lower().endswith(EXTENSIONS_ARCHIVE) and os.path.isfile(chemin)
+
+
+def chemin_membre(archive: str, membre: str) -> str:
+    return f"{archive}{SEPARATEUR}{membre}"
+
+
+def decomposer(chemin: str) -> Optional[Tuple[str, str]]:
+    """
+    Separe un chemin virtuel en (archive, membre).
+
+    Returns:
+        tuple: (archive, membre), ou None pour un fichier ordinaire
+    """
+    position = chemin.find(SEPARATEUR)
+    while position != -1:
+        archive = chemin[:position]
+        if est_archive(archive):
+            return archive, chemin[position + len(SEPARATEUR):]
+        position = chemin.find(SEPARATEUR, position + 1)
+    return None
+
+
+def _nom_sur(membre: str) -> bool:
+    """Ecarte les membres qui sortiraient du dossier de sortie (absolus, '..')."""
+    normalise = posixpath.normpath(membre)
+    return not (membre.startswith('/') or normalise == '..' or normalise.startswith('../')
+                or ':' in membre.split('/')[0])
+
+
+class _EntreeMembre:
+    """Equivalent minimal d'un os.DirEntry pour les filtres de decouverte."""
+
+    def __init__(self, taille: int):
+        self._stat = os.stat_result((0o100644, 0, 0, 1, 0, 0, taille, 0, 0, 0))
+
+    def stat(self, follow_symlinks: bool = True):
+        return self._stat
+
+
+def iter_membres(archive: str, est_candidat: Callable[[str], bool],
+                 exclure_dossier: Optional[Callable[[str, str], bool]] = None,
+                 exclure_fichier: Optional[Callable] = None) -> Iterator[str]:
+    """
+    Chemins virtuels des membres retenus, dans l'ordre de l'archive.
+
+    Les filtres sont ceux de FileDiscovery; un membre est ecarte si l'un
+    de ses dossiers l'est.
+    """
+    archive = os.path.abspath(archive)
+    dossiers_exclus = {}
+
+    def dossier_exclu(membre: str) -> bool:
+        if exclure_dossier is None:
+            return False
+        dossier = ''
+        for nom in membre.split('/')[:-1]:
+            dossier = f"{dossier}/{nom}" if dossier else nom
+            exclu = dossiers_exclus.get(dossier)
+            if exclu is None:
+                exclu = dossiers_exclus[dossier] = exclure_dossier(
+                    nom, chemin_membre(archive, dossier))
+            if exclu:
+                return True
+        return False
+
+    for membre, taille in _lister(archive):
+        nom = membre.rsplit('/', 1)[-1]
+        if not est_candidat(nom) or not _nom_sur(membre) or dossier_exclu(membre):
+            continue
+        chemin = chemin_membre(archive, membre)
+        if exclure_fichier is not None and exclure_fichier(nom, chemin, _EntreeMembre(taille)):
+            continue
+        yield chemin
+
+
+def _lister(archive: str) -> Iterator[Tuple[str, int]]:
+    """(membre, taille) des fichiers ordinaires, en flux (tar lu une seule fois)."""
+    import tarfile
+    import zipfile
+
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as f:
+            for info in f.infolist():
+                if not info.is_dir():
+                    yield info.filename, info.file_size
+        return
+    with tarfile.open(archive, 'r:*') as f:
+        for info in f:
+            if info.isfile():
+                yield info.name, info.size
+
+
+def _ouvrir_archive(archive: str):
+    """
+    Archive ouverte pour ce processus (jamais partagee apres un fork).
+
+    Returns:
+        tuple: (est_zip, archive ouverte, index nom -> TarInfo ou None pour un zip)
+    """
+    cle = (os.getpid(), archive)
+    with _VERROU:
+        ouverte = _OUVERTES.get(cle)
+        if ouverte is None:
+            import tarfile
+            import zipfile
+
+            if zipfile.is_zipfile(archive):
+                ouverte = (True, zipfile.ZipFile(archive), None)
+            else:
+                tar = tarfile.open(archive, 'r:*')
+                # Une seule lecture de l'archive, puis acces direct par nom
+                ouverte = (False, tar, {info.name: info for info in tar.getmembers()
+                                        if info.isfile()})
+            _OUVERTES[cle] = ouverte
+        return ouverte
+
+
+def _lire_membre_tar(chemin: str, tar, info) -> bytes:
+    """Contenu d'un membre tar, garde en memoire pour les relectures (sous _VERROU)."""
+    global _lus_octets
+    cle = (os.getpid(), chemin)
+    donnees = _LUS.get(cle)
+    if donnees is not None:
+        _LUS.move_to_end(cle)
+        return donnees
+    donnees = tar.extractfile(info).read()
+    _LUS[cle] = donnees
+    _lus_octets += len(donnees)
+    while _lus_octets > _LUS_MAX_OCTETS and len(_LUS) > 1:
+        _lus_octets -= len(_LUS.popitem(last=False)[1])
+    return donnees
+
+
+def ouvrir_binaire(chemin: str):
+    """Ouvre un fichier ou un membre d'archive en lecture binaire."""
+    parties = decomposer(chemin) if SEPARATEUR in chemin else None
+    if parties is None:
+        return open(chemin, 'rb')
+    archive, membre = parties
+    est_zip, ouverte, index = _ouvrir_archive(archive)
+    try:
+        with _VERROU:
+            if est_zip:
+                return ouverte.open(membre)
+            # Lecture immediate : le flux tar partage la position de l'archive
+            return io.BytesIO(_lire_membre_tar(chemin, ouverte, index[membre]))
+    except KeyError:
+        raise FileNotFoundError(f"Membre absent de l'archive: {chemin}") from None
+
+
+def ouvrir_texte(chemin: str):
+    """Ouvre un fichier ou un membre d'archive en texte UTF-8 (comme open)."""
+    if SEPARATEUR not in chemin:
+        return open(chemin, 'r', encoding='utf-8')
+    return io.TextIOWrapper(ouvrir_binaire(chemin), encoding='utf-8')
+
+
+def existe(chemin: str) -> bool:
+    """Vrai pour un fichier existant ou un membre d'une archive existante."""
+    return os.path.exists(chemin) or (SEPARATEUR in chemin and decomposer(chemin) is not None)
+
+
+def taille(chemin: str) -> int:
+    """Taille d'un fichier ou d'un membre d'archive (0 si inconnue)."""
+    parties = decomposer(chemin) if SEPARATEUR in chemin else None
+    try:
+        if parties is None:
+            return os.path.getsize(chemin)
+        est_zip, ouverte, index = _ouvrir_archive(parties[0])
+        if est_zip:
+            with _VERROU:
+                return ouverte.getinfo(parties[1]).file_size
+        return index[parties[1]].size
+    except (OSError, KeyError):
+        return 0
+
+
+def fermer_archives():
+    """Ferme les archives ouvertes par ce processus et oublie les membres lus."""
+    global _lus_octets
+    pid = os.getpid()
+    with _VERROU:
+        for cle in [cle for cle in _OUVERTES if cle[0] == pid]:
+            _OUVERTES.pop(cle)[1].close()
+        for cle in [cle for cle in _LUS if cle[0] == pid]:
+            _lus_octets -= len(_LUS.pop(cle))
@@ -7,8 +7,10 @@ Utilise ABC pour garantir l'implementation des methodes essentielles
 """
 
 import ast
+import hashlib
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 class BaseTransformer(ABC):
     """
@@ -109,3 +111,43 @@ class BaseTransformer(ABC):
             'description': self.get_metadata()['description'],
             'estimated_changes': 0
         }
+
+    def empreinte_cache(self) -> str:
+        """
+        Identifie le comportement du plugin pour le cache des analyses
+        (core/parse_cache.py) : classe, version et contenu du fichier
+        du plugin. A surcharger si le resultat depend aussi d'un etat
+        de l'instance (options, instructions chargees).
+
+        Returns:
+            str: Empreinte, modifiee des que le plugin change
+        """
+        classe = type(self)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{classe.__module__}.{classe.__qualname__}:{self.get_metadata().get('version')}".encode('utf-8'))
+        chemin = _fichier_classe(classe)
+        if chemin:
+            try:
+                with open(chemin, 'rb') as f:
+                    h.update(f.read())
+            except OSError:
+                pass
+        return h.hexdigest()
+
+
+def _fichier_classe(classe) -> Optional[str]:
+    """
+    Fichier qui definit classe. Les plugins sont executes par le chargeur
+    sans etre inscrits dans sys.modules : le fichier est d'abord lu dans le
+    code des methodes propres a la classe.
+    """
+    for valeur in vars(classe).values():
+        valeur = getattr(valeur, '__func__', valeur)
+        code = getattr(valeur, '__code__', None)
+        if code is not None and getattr(valeur, '__module__', None) == classe.__module__ \
+                and not code.co_filename.startswith('<'):
+            return code.co_filename
+    module = sys.modules.get(classe.__module__)
+    if getattr(module, classe.__name__, None) is classe:
+        return getattr(module, '__file__', None)
+    return None
@@ -0,0 +1,728 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pipeline de Traitement par Lot - Sans Interaction
+Applique une chaine de plugins a un flux de fichiers, en parallele si
+demande, et produit un resultat structure pour chaque fichier
+"""
+
+import contextlib
+import os
+import shutil
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .archive_input import SEPARATEUR, decomposer, existe, ouvrir_binaire, ouvrir_texte
+from .stamps import (empreinte_config, empreinte_corps, est_a_jour, lire_tampons_code,
+                     tamponner)
+
+# Nombre de fichiers en attente par processus de travail
+_FENETRE_PAR_JOB = 4
+
+# ioctl Linux de clonage d'un fichier (reflink sur btrfs, XFS...)
+_FICLONE = 0x40049409
+
+
+def ajouter_imports(code: str, imports_requis: List[str]) -> str:
+    """Ajoute les imports requis apres les imports existants."""
+    lignes = code.split('\n')
+    position_insertion = 0
+
+    # Trouver la fin des imports existants
+    for i, ligne in enumerate(lignes):
+        if ligne.strip().startswith(('import ', 'from ')):
+            position_insertion = i + 1
+        elif ligne.strip() and not ligne.strip().startswith('#'):
+            break
+
+    for import_module in imports_requis:
+        import_line = f"import {import_module}"
+        if not any(import_line in ligne for ligne in lignes[:position_insertion]):
+            lignes.insert(position_insertion, import_line)
+            position_insertion += 1
+
+    return '\n'.join(lignes)
+
+
+def inserer_config(code: str, config_code: str) -> str:
+    """Insere le code de configuration apres les imports (une seule fois)."""
+    if not config_code or not config_code.strip() or config_code.strip() in code:
+        return code
+
+    lignes = code.split('\n')
+    position_insertion = 0
+
+    for i, ligne in enumerate(lignes):
+        if ligne.strip().startswith(('import ', 'from ')):
+            position_insertion = i + 1
+        elif ligne.strip() and not ligne.strip().startswith('#'):
+            break
+
+    for ligne in reversed(config_code.strip().split('\n')):
+        lignes.insert(position_insertion, ligne)
+
+    return '\n'.join(lignes)
+
+
+def chemin_relatif(chemin: str, roots: Iterable[str]) -> str:
+    """
+    Chemin relatif a la racine la plus profonde qui contient le fichier
+    (chemin dans l'archive pour un membre '<archive>!/<membre>').
+    """
+    chemin = os.path.abspath(chemin)
+    meilleure = None
+    for root in roots:
+        root = os.path.abspath(root)
+        if SEPARATEUR in chemin and chemin.startswith(root + SEPARATEUR):
+            return chemin[len(root) + len(SEPARATEUR):]
+        if os.path.isfile(root):
+            if root == chemin:
+                return os.path.basename(chemin)
+            continue
+        if chemin.startswith(root.rstrip(os.sep) + os.sep):
+            if meilleure is None or len(root) > len(meilleure):
+                meilleure = root
+    if meilleure is None:
+        return os.path.basename(chemin)
+    return os.path.relpath(chemin, meilleure)
+
+
+class SortieDossier:
+    """Ecrit les fichiers transformes dans un dossier en reproduisant l'arborescence."""
+
+    def __init__(self, dossier: str):
+        self.dossier = os.path.abspath(dossier)
+
+    def ecrire(self, relatif: str, code: str, chemin_source: Optional[str] = None) -> str:
+        """Ecrit un fichier transforme et retourne son chemin."""
+        destination = os.path.join(self.dossier, relatif)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        with open(destination, 'w', encoding='utf-8') as f:
+            f.write(code)
+        return destination
+
+    def fermer(self):
+        """Aucune ressource a liberer pour un dossier."""
+        pass
+
+    def abandonner(self):
+        """Lot interrompu : les fichiers deja ecrits restent, rien n'est complete."""
+        pass
+
+
+def cloner_fichier(source: str, destination: str, liens_durs: bool = True) -> str:
+    """
+    Reproduit source a destination sans copier les donnees si possible.
+
+    Essaie un reflink (copie sur ecriture), puis un lien dur, puis une
+    copie ordinaire. Un lien dur partage le fichier avec la source :
+    il ne doit pas etre modifie sur place (SortieMiroir remplace au lieu
+    de reecrire).
+
+    Returns:
+        str: 'reflink', 'lien' ou 'copie'
+    """
+    try:
+        import fcntl
+        with open(source, 'rb') as f_source, open(destination, 'wb') as f_destination:
+            fcntl.ioctl(f_destination.fileno(), _FICLONE, f_source.fileno())
+        shutil.copystat(source, destination)
+        return 'reflink'
+    except (ImportError, OSError):
+        with contextlib.suppress(OSError):
+            os.unlink(destination)
+
+    if liens_durs:
+        try:
+            os.link(source, destination)
+            return 'lien'
+        except OSError:
+            pass
+
+    shutil.copy2(source, destination)
+    return 'copie'
+
+
+class SortieMiroir(SortieDossier):
+    """
+    Reproduit l'arborescence des racines dans un dossier de sortie.
+
+    Les fichiers modifies sont ecrits; les autres sont clones sans copie
+    (reflink ou lien dur, voir cloner_fichier). A la fermeture, les
+    fichiers des racines qui n'ont pas ete traites (autres extensions)
+    sont clones a leur tour (memes exclusions que la decouverte si regles
+    est fourni) : chaque execution produit un arbre complet. Avec shard
+    (i, N), seuls les fichiers du shard i sont completes, afin que les
+    shards d'un meme lot se partagent le miroir sans se recouvrir.
+    """
+
+    def __init__(self, dossier: str, roots: Iterable[str] = (), regles=None,
+                 liens_durs: bool = True, shard: Optional[Tuple[int, int]] = None):
+        super().__init__(dossier)
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.regles = regles
+        self.liens_durs = liens_durs
+        self.shard = shard
+        self.compteurs = {'ecrit': 0, 'reflink': 0, 'lien': 0, 'copie': 0}
+        self._traites = set()
+
+    def _preparer(self, relatif: str) -> str:
+        destination = os.path.join(self.dossier, relatif)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        # Remplacer sans ouvrir : la destination peut etre un lien dur vers la source
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(destination)
+        self._traites.add(os.path.normpath(relatif))
+        return destination
+
+    def ecrire(self, relatif: str, code: str, chemin_source: Optional[str] = None) -> str:
+        destination = self._preparer(relatif)
+        with open(destination, 'w', encoding='utf-8') as f:
+            f.write(code)
+        self.compteurs['ecrit'] += 1
+        return destination
+
+    def lier(self, relatif: str, chemin_source: str) -> str:
+        """Clone un fichier inchange et retourne son chemin dans le miroir."""
+        destination = self._preparer(relatif)
+        if SEPARATEUR in chemin_source and not os.path.exists(chemin_source):
+            # Membre d'archive : copie en flux, rien a cloner
+            with ouvrir_binaire(chemin_source) as source, open(destination, 'wb') as f:
+                shutil.copyfileobj(source, f)
+            self.compteurs['copie'] += 1
+            return destination
+        self.compteurs[cloner_fichier(chemin_source, destination, self.liens_durs)] += 1
+        return destination
+
+    def fermer(self):
+        """Complete le miroir avant de terminer."""
+        self.completer()
+
+    def completer(self):
+        """Clone les fichiers des racines qui n'ont pas encore ete traites."""
+        if not self.roots:
+            return
+        from .discovery import FileDiscovery
+        from .sharding import numero_shard
+
+        # Toutes les extensions, avec les memes exclusions que la decouverte
+        decouverte = (self.regles.creer_decouverte(extensions=('',)) if self.regles
+                      else FileDiscovery(extensions=('',)))
+        dossier_sortie = self.dossier.rstrip(os.sep) + os.sep
+        for chemin in decouverte.iter_files(self.roots):
+            chemin = os.path.abspath(chemin)
+            if chemin.startswith(dossier_sortie):
+                continue
+            relatif = os.path.normpath(chemin_relatif(chemin, self.roots))
+            if self.shard is not None and numero_shard(relatif, self.shard[1]) != self.shard[0]:
+                continue
+            if relatif not in self._traites:
+                try:
+                    self.lier(relatif, chemin)
+                except OSError as e:
+                    print(f"! Miroir incomplet ({relatif}): {e}")
+
+
+class SortiePatch:
+    """
+    Ecrit des diffs unifies au lieu des fichiers transformes.
+
+    Avec combine=True, destination est un fichier unique qui recoit le
+    patch de chaque fichier modifie au fil du lot; sinon destination est
+    un dossier qui recoit un '<chemin relatif>.patch' par fichier. Les
+    chemins 'a/' et 'b/' sont relatifs aux racines (patch -p1, git apply).
+    """
+
+    def __init__(self, destination: str, combine: bool = True, contexte: int = 3):
+        self.destination = os.path.abspath(destination)
+        self.combine = combine
+        self.contexte = contexte
+        # Dossier affiche dans le resume du lanceur
+        self.dossier = self.destination
+        self._flux = None
+
+    def ecrire(self, relatif: str, code: str, chemin_source: Optional[str] = None) -> str:
+        """Ecrit le diff entre la source et le code transforme; retourne le patch."""
+        from .diff_engine import diff_unifie
+
+        with ouvrir_texte(chemin_source) as f:
+            ancien = f.read()
+        relatif_posix = relatif.replace(os.sep, '/')
+        patch = diff_unifie(ancien, code, f"a/{relatif_posix}", f"b/{relatif_posix}",
+                            self.contexte)
+
+        if self.combine:
+            if self._flux is None:
+                os.makedirs(os.path.dirname(self.destination), exist_ok=True)
+                self._flux = open(self.destination, 'w', encoding='utf-8')
+            self._flux.write(patch)
+            self._flux.flush()
+            return self.destination
+
+        destination = os.path.join(self.destination, relatif + '.patch')
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        with open(destination, 'w', encoding='utf-8') as f:
+            f.write(patch)
+        return destination
+
+    def fermer(self):
+        """Ferme le patch combine."""
+        if self._flux is not None:
+            self._flux.close()
+            self._flux = None
+
+    def abandonner(self):
+        """Lot interrompu : le patch garde les fichiers deja traites."""
+        self.fermer()
+
+
+# Formats d'archive reconnus a l'extension de la destination
+FORMATS_ARCHIVE = ('zip', 'tar', 'tar.gz')
+
+
+def format_archive(destination: str) -> Optional[str]:
+    """Format d'archive deduit de l'extension (None si non reconnue)."""
+    nom = destination.lower()
+    if nom.endswith(('.tar.gz', '.tgz')):
+        return 'tar.gz'
+    for format_ in ('zip', 'tar'):
+        if nom.endswith('.' + format_):
+            return format_
+    return None
+
+
+class SortieArchive:
+    """
+    Ecrit les fichiers transformes directement dans une archive zip ou tar,
+    sans dossier intermediaire : un seul fichier a telecharger ou a copier
+    (sur un stockage type Drive, ecrire des milliers de petits fichiers
+    coute bien plus cher qu'un seul flux).
+
+    L'archive est construite dans '<destination>.partiel' et ne prend son
+    nom qu'a la fermeture : une archive presente est toujours complete.
+    """
+
+    def __init__(self, destination: str, type_archive: Optional[str] = None,
+                 niveau_compression: int = 6):
+        self.destination = os.path.abspath(destination)
+        self.format = type_archive or format_archive(destination) or 'zip'
+        if self.format not in FORMATS_ARCHIVE:
+            raise ValueError(f"Format d'archive inconnu: {self.format}")
+        self.niveau_compression = niveau_compression
+        # Dossier affiche dans le resume du lanceur
+        self.dossier = self.destination
+        self.membres = 0
+        self._partiel = self.destination + '.partiel'
+        self._archive = None
+        self._terminee = False
+
+    def _ouvrir(self):
+        os.makedirs(os.path.dirname(self.destination), exist_ok=True)
+        if self.format == 'zip':
+            import zipfile
+            self._archive = zipfile.ZipFile(self._partiel, 'w', zipfile.ZIP_DEFLATED,
+                                            compresslevel=self.niveau_compression)
+        else:
+            import tarfile
+            mode = 'w:gz' if self.format == 'tar.gz' else 'w'
+            options = {'compresslevel': self.niveau_compression} if self.format == 'tar.gz' else {}
+            self._archive = tarfile.open(self._partiel, mode, **options)
+
+    def ecrire(self, relatif: str, code: str, chemin_source: Optional[str] = None) -> str:
+        """Ajoute un fichier transforme a l'archive et retourne son chemin dans l'archive."""
+        if self._archive is None:
+            self._ouvrir()
+        nom = relatif.replace(os.sep, '/')
+        donnees = code.encode('utf-8')
+        instant = time.time()
+        if self.format == 'zip':
+            import zipfile
+            info = zipfile.ZipInfo(nom, time.localtime(instant)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            self._archive.writestr(info, donnees)
+        else:
+            import io
+            import tarfile
+            info = tarfile.TarInfo(nom)
+            info.size = len(donnees)
+            info.mtime = int(instant)
+            info.mode = 0o644
+            self._archive.addfile(info, io.BytesIO(donnees))
+        self.membres += 1
+        return f"{self.destination}/{nom}"
+
+    def ajouter_fichier(self, relatif: str, chemin: str) -> str:
+        """Ajoute un fichier existant a l'archive, lu en flux depuis le disque."""
+        if self._archive is None:
+            self._ouvrir()
+        nom = relatif.replace(os.sep, '/')
+        if self.format == 'zip':
+            self._archive.write(chemin, nom)
+        else:
+            self._archive.add(chemin, nom, recursive=False)
+        self.membres += 1
+        return f"{self.destination}/{nom}"
+
+    def fermer(self):
+        """Termine l'archive et lui donne son nom definitif."""
+        if self._terminee:
+            return
+        if self._archive is None:
+            # Aucun fichier modifie : archive vide, pour un resultat toujours present
+            self._ouvrir()
+        self._archive.close()
+        self._archive = None
+        os.replace(self._partiel, self.destination)
+        self._terminee = True
+
+    def abandonner(self):
+        """Lot interrompu : supprime l'archive partielle sans la renommer."""
+        if self._terminee:
+            return
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._partiel)
+        self._terminee = True
+
+
+class BatchPipeline:
+    """
+    Applique une chaine ordonnee de plugins a une liste de fichiers.
+
+    Les plugins s'appliquent l'un apres l'autre sur le resultat du precedent.
+    Avec jobs > 1, les fichiers sont repartis sur des processus de travail
+    qui chargent chacun leurs plugins; l'ecriture reste dans le processus
+    principal. Avec isoler=True, chaque fichier passe par un processus
+    supervise (limites timeout et max_rss_mb, voir core/isolation.py).
+    Avec un profileur (core/memory_profile.py), les allocations de chaque
+    fichier et de chaque etape des plugins sont mesurees; le traitement
+    reste alors sequentiel, dans le processus principal.
+    Avec un cache (core/parse_cache.py), le resultat d'un plugin sur un
+    code deja analyse est repris sans executer le plugin.
+    Avec tampons=True (core/stamps.py), chaque plugin applique laisse un
+    tampon en tete du fichier; un plugin deja applique avec la meme
+    configuration est saute tant que le corps du fichier n'a pas change
+    (le fichier est alors lu et hache, mais pas analyse).
+    Avec des regles de validation (validation, ou validation_rules des
+    instructions JSON), le code produit est valide avant ecriture
+    (core/validation.py); avec annuler_invalides=True, un fichier
+    invalide est rapporte en erreur et garde sa version d'origine.
+    """
+
+    def __init__(self, plugins: List[str], loader=None, json_instructions: Optional[str] = None,
+                 jobs: int = 1, dry_run: bool = False, sortie=None, roots: Iterable[str] = (),
+                 isoler: bool = False, timeout: Optional[float] = None,
+                 max_rss_mb: Optional[float] = None, profileur=None, cache=None,
+                 tampons: bool = False, validation: Optional[Iterable] = None,
+                 annuler_invalides: bool = False):
+        self.plugins = list(plugins)
+        self.loader = loader
+        self.json_instructions = json_instructions
+        self.jobs = max(1, int(jobs or 1))
+        self.dry_run = dry_run
+        self.sortie = sortie
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.isoler = isoler
+        self.timeout = timeout
+        self.max_rss_mb = max_rss_mb
+        self.profileur = profileur
+        self.cache = cache
+        self.tampons = tampons
+        self.validation = validation
+        self.annuler_invalides = annuler_invalides
+        self.validateur = None
+        self._transformers: List[Tuple[str, object]] = []
+        self._empreintes: Dict[str, str] = {}
+        self._versions: Dict[str, str] = {}
+        self._configs: Dict[str, str] = {}
+
+    def preparer(self):
+        """
+        Charge les plugins demandes.
+
+        Raises:
+            ValueError: Si un plugin est inconnu ou si les instructions JSON sont invalides
+        """
+        if self.loader is None:
+            from core.transformation_loader import TransformationLoader
+            # Chargement paresseux : seuls les plugins demandes sont executes
+            self.loader = TransformationLoader(lazy=True)
+
+        inconnus = [nom for nom in self.plugins if not self.loader.get_transformation(nom)]
+        if inconnus:
+            disponibles = ', '.join(self.loader.list_transformations())
+            raise ValueError(f"Plugin(s) inconnu(s): {', '.join(inconnus)} "
+                             f"(disponibles: {disponibles})")
+
+        self._transformers = [(nom, self.loader.get_transformation(nom)) for nom in self.plugins]
+
+        if self.json_instructions:
+            cibles = [t for _, t in self._transformers if hasattr(t, 'load_json_instructions')]
+            if not cibles:
+                raise ValueError("--json-instructions demande un plugin JSON-AI dans la chaine")
+            for transformer in cibles:
+                if not transformer.load_json_instructions(self.json_instructions):
+                    raise ValueError(f"Instructions JSON invalides: {self.json_instructions}")
+
+        regles = self.validation
+        if regles is None:
+            # validation_rules declarees par les instructions JSON chargees
+            regles = [regle for _, t in self._transformers
+                      if isinstance(getattr(t, 'json_instructions', None), dict)
+                      for regle in t.json_instructions.get('validation_rules') or ()]
+        if regles:
+            from .validation import Validateur, regles_actives
+            actives = regles_actives(regles)
+            self.validateur = Validateur(actives, self.roots, self.jobs, self.annuler_invalides,
+                                         self.cache) if actives else None
+
+        self._versions = {nom: str(transformer.get_metadata().get('version', ''))
+                          for nom, transformer in self._transformers}
+        if self.cache is not None or self.tampons:
+            # Apres le chargement des instructions, dont depend le plugin JSON-AI
+            self._empreintes = {nom: transformer.empreinte_cache()
+                                for nom, transformer in self._transformers}
+            self._configs = {nom: empreinte_config(empreinte)
+                             for nom, empreinte in self._empreintes.items()}
+        return self
+
+    def traiter_fichier(self, chemin: str) -> Tuple[Dict, Optional[str]]:
+        """
+        Applique la chaine de plugins a un fichier.
+
+        Returns:
+            tuple: (resultat structure, code transforme ou None si inchange)
+        """
+        debut = time.perf_counter()
+        try:
+            with ouvrir_texte(chemin) as f:
+                code_source = f.read()
+        except Exception as e:
+            resultat, _ = self._resultat_vide(chemin)
+            resultat['statut'] = 'erreur'
+            resultat['erreur'] = f"{type(e).__name__}: {e}"
+            resultat['duree_ms'] = round((time.perf_counter() - debut) * 1000, 3)
+            return resultat, None
+
+        return self.traiter_source(chemin, code_source, debut)
+
+    def _resultat_vide(self, chemin: str):
+        return {
+            'fichier': chemin,
+            'statut': 'inchange',
+            'plugins': [],
+            'sortie': None,
+            'duree_ms': 0.0,
+            'erreur': None,
+        }, None
+
+    def traiter_source(self, chemin: str, code_source: str,
+                       debut: Optional[float] = None) -> Tuple[Dict, Optional[str]]:
+        """Applique la chaine de plugins a un code source deja lu."""
+        debut = debut if debut is not None else time.perf_counter()
+        resultat, code_final = self._resultat_vide(chemin)
+
+        try:
+            code = code_source
+            tampons = lire_tampons_code(code) if self.tampons else {}
+            # Corps du code courant (sans tampons), recalcule apres chaque modification
+            corps = None
+            # Plugins a tamponner avec le corps final : appliques ou confirmes
+            a_tamponner = {}
+            with self._mesure('fichier', chemin):
+                for nom, transformer in self._transformers:
+                    debut_plugin = time.perf_counter()
+                    if tampons and corps is None:
+                        corps = empreinte_corps(code)
+                    if tampons and est_a_jour(tampons, nom, self._configs[nom], corps):
+                        a_tamponner[nom] = (self._versions[nom], self._configs[nom])
+                        resultat['plugins'].append({'nom': nom, 'applique': False,
+                                                    'duree_ms': 0.0, 'tampon': True})
+                        continue
+                    applique = False
+                    with self._mesure('plugin', nom):
+                        nouveau, repris = self._analyser(nom, transformer, code)
+                        if nouveau != code:
+                            with self._mesure('etape', 'entete'):
+                                imports_requis = transformer.get_imports_required()
+                                if imports_requis:
+                                    nouveau = ajouter_imports(nouveau, imports_requis)
+                                nouveau = inserer_config(nouveau, transformer.get_config_code())
+                            if self.tampons:
+                                a_tamponner[nom] = (self._versions[nom], self._configs[nom])
+                                corps = None
+                            applique = True
+                        code = nouveau
+                    etape = {
+                        'nom': nom,
+                        'applique': applique,
+                        'duree_ms': round((time.perf_counter() - debut_plugin) * 1000, 3),
+                    }
+                    if repris:
+                        etape['cache'] = True
+                    resultat['plugins'].append(etape)
+
+            if code != code_source:
+                if self.tampons:
+                    with self._mesure('etape', 'entete'):
+                        code = tamponner(code, tampons, a_tamponner)
+                resultat['statut'] = 'modifie'
+                code_final = code
+
+        except Exception as e:
+            resultat['statut'] = 'erreur'
+            resultat['erreur'] = f"{type(e).__name__}: {e}"
+
+        resultat['duree_ms'] = round((time.perf_counter() - debut) * 1000, 3)
+        return resultat, code_final
+
+    def _analyser(self, nom: str, transformer, code: str) -> Tuple[str, bool]:
+        """
+        Code produit par un plugin, repris du cache des analyses si possible.
+
+        Returns:
+            tuple: (code transforme ou code inchange, True si repris du cache)
+        """
+        cle = None
+        if self.cache is not None:
+            from .parse_cache import MANQUANT
+            cle = self.cache.cle(code, self._empreintes[nom])
+            memorise = self.cache.lire(cle)
+            if memorise is not MANQUANT:
+                return (code if memorise is None else memorise), True
+
+        nouveau = transformer.transform(code) if transformer.can_transform(code) else code
+        if cle is not None:
+            self.cache.ecrire(cle, nouveau if nouveau != code else None)
+        return nouveau, False
+
+    def _mesure(self, nature: str, nom: str):
+        """Bloc mesure par le profileur memoire (sans effet sans profileur)."""
+        if self.profileur is None:
+            return contextlib.nullcontext()
+        return getattr(self.profileur, nature)(nom)
+
+    def executer(self, fichiers: Iterable[str]) -> Iterator[Dict]:
+        """
+        Traite un flux de fichiers et produit un resultat par fichier
+        des qu'il est disponible (ordre d'achevement en mode parallele).
+        """
+        if not self._transformers:
+            self.preparer()
+
+        if self.profileur is not None and (self.isoler or self.jobs > 1):
+            print("! Profil memoire : traitement sequentiel dans le processus principal")
+
+        if self.isoler and self.profileur is None:
+            from .isolation import ExecuteurIsole
+            resultats = ExecuteurIsole(self.plugins, self.json_instructions, self.jobs,
+                                       self.timeout, self.max_rss_mb, self.cache,
+                                       self.tampons).executer(fichiers)
+        elif self.jobs == 1 or self.profileur is not None:
+            resultats = (self.traiter_fichier(chemin) for chemin in fichiers)
+        else:
+            resultats = self._executer_parallele(fichiers)
+
+        if self.validateur is not None:
+            resultats = self.validateur.valider_flux(resultats)
+        for resultat, code_final in resultats:
+            yield self.finaliser(resultat, code_final)
+
+    def valider(self, resultat: Dict, code_final: Optional[str]) -> Tuple[Dict, Optional[str]]:
+        """Valide un seul resultat avant finaliser (sans effet sans regles)."""
+        if self.validateur is None:
+            return resultat, code_final
+        return self.validateur.valider(resultat, code_final)
+
+    def finaliser(self, resultat: Dict, code_final: Optional[str]) -> Dict:
+        """Ajoute le chemin relatif et ecrit la sortie si necessaire."""
+        relatif = chemin_relatif(resultat['fichier'], self.roots)
+        resultat['relatif'] = relatif.replace(os.sep, '/')
+
+        if self.dry_run or self.sortie is None:
+            return resultat
+        if code_final is not None:
+            try:
+                resultat['sortie'] = self.sortie.ecrire(relatif, code_final, resultat['fichier'])
+            except OSError as e:
+                resultat['statut'] = 'erreur'
+                resultat['erreur'] = f"Ecriture impossible: {e}"
+        elif hasattr(self.sortie, 'lier') and existe(resultat['fichier']):
+            # Sortie miroir : le fichier inchange (ou en erreur) garde sa version d'origine
+            try:
+                self.sortie.lier(relatif, resultat['fichier'])
+            except OSError as e:
+                print(f"! Miroir incomplet ({relatif}): {e}")
+        return resultat
+
+    def _executer_parallele(self, fichiers: Iterable[str]):
+        """
+        Repartit les fichiers sur des processus avec une fenetre bornee.
+
+        Les membres d'archive sont lus ici, dans l'ordre de la decouverte,
+        et leur texte est transmis aux processus : un tar compresse est lu
+        une seule fois en flux au lieu d'etre rembobine par chaque processus.
+        """
+        # Import differe : multiprocessing n'est charge qu'avec jobs > 1
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        from .isolation import contexte_processus
+
+        fenetre = self.jobs * _FENETRE_PAR_JOB
+        with ProcessPoolExecutor(max_workers=self.jobs, mp_context=contexte_processus(),
+                                 initializer=_initialiser_travailleur,
+                                 initargs=(self.plugins, self.json_instructions, self.cache,
+                                           self.tampons)) as executor:
+            en_attente = set()
+            for chemin in fichiers:
+                code_source = _lire_membre(chemin)
+                if code_source is None:
+                    en_attente.add(executor.submit(_traiter_dans_travailleur, chemin))
+                else:
+                    en_attente.add(executor.submit(_traiter_source_dans_travailleur,
+                                                   chemin, code_source))
+                if len(en_attente) >= fenetre:
+                    termines, en_attente = wait(en_attente, return_when=FIRST_COMPLETED)
+                    for future in termines:
+                        yield future.result()
+            while en_attente:
+                termines, en_attente = wait(en_attente, return_when=FIRST_COMPLETED)
+                for future in termines:
+                    yield future.result()
+
+
+# Pipeline propre a chaque processus de travail
+_PIPELINE_TRAVAILLEUR: Optional[BatchPipeline] = None
+
+
+def _initialiser_travailleur(plugins, json_instructions, cache=None, tampons=False):
+    """Charge les plugins une fois par processus; les messages vont sur stderr."""
+    global _PIPELINE_TRAVAILLEUR
+    sys.stdout = sys.stderr
+    _PIPELINE_TRAVAILLEUR = BatchPipeline(plugins, json_instructions=json_instructions,
+                                          cache=cache, tampons=tampons).preparer()
+
+
+def _traiter_dans_travailleur(chemin):
+    return _PIPELINE_TRAVAILLEUR.traiter_fichier(chemin)
+
+
+def _traiter_source_dans_travailleur(chemin, code_source):
+    return _PIPELINE_TRAVAILLEUR.traiter_source(chemin, code_source)
+
+
+def _lire_membre(chemin: str) -> Optional[str]:
+    """Texte d'un membre d'archive, ou None (fichier ordinaire ou lecture a refaire)."""
+    if SEPARATEUR not in chemin or decomposer(chemin) is None:
+        return None
+    try:
+        with ouvrir_texte(chemin) as f:
+            return f.read()
+    except Exception:
+        # Le processus de travail relira le membre et rapportera l'erreur
+        return None
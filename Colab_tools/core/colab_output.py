@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Recuperation des Resultats selon l'Environnement
+Sous Google Colab, les resultats sont recuperes en un seul telechargement :
+une archive produite directement par le lot (SortieArchive) est proposee
+telle quelle, un dossier de sortie est d'abord rassemble en une archive.
+Hors Colab, le chemin des resultats est simplement affiche.
+"""
+
+import importlib.util
+import os
+from typing import Optional
+
+
+def est_colab() -> bool:
+    """Vrai si le code s'execute dans un noyau Google Colab."""
+    try:
+        return importlib.util.find_spec("google.colab") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def archiver_dossier(dossier: str, destination: Optional[str] = None) -> str:
+    """
+    Rassemble un dossier de sortie en une archive zip (fichiers lus en flux).
+
+    Returns:
+        str: Chemin de l'archive ('<dossier>.zip' par defaut)
+    """
+    from .batch_pipeline import SortieArchive
+
+    dossier = os.path.abspath(dossier)
+    archive = SortieArchive(destination or dossier.rstrip(os.sep) + '.zip')
+    for racine, sous_dossiers, fichiers in os.walk(dossier):
+        sous_dossiers.sort()
+        for nom in sorted(fichiers):
+            chemin = os.path.join(racine, nom)
+            archive.ajouter_fichier(os.path.relpath(chemin, dossier), chemin)
+    archive.fermer()
+    return archive.destination
+
+
+def telecharger(chemin: str) -> bool:
+    """Propose le fichier au telechargement du navigateur (Colab seulement)."""
+    if not est_colab():
+        return False
+    try:
+        from google.colab import files
+        files.download(chemin)
+        return True
+    except Exception as e:
+        # Appel hors du noyau (sous-processus) ou navigateur deconnecte
+        print(f"! Telechargement impossible ({os.path.basename(chemin)}): {e}")
+        return False
+
+
+def gerer_sortie_environnement(chemin: Optional[str], nature: str = "lot") -> Optional[str]:
+    """
+    Rend les resultats d'un traitement recuperables.
+
+    Args:
+        chemin: Archive ou dossier de sortie du traitement
+        nature: Type de traitement, pour les messages ('lot', 'ai'...)
+
+    Returns:
+        str: Chemin du fichier propose (archive), ou None si rien a recuperer
+    """
+    if not chemin or not os.path.exists(chemin):
+        print(f"! Aucune sortie {nature} a recuperer")
+        return None
+
+    if not est_colab():
+        print(f"+ Resultats {nature}: {os.path.abspath(chemin)}")
+        return os.path.abspath(chemin)
+
+    if os.path.isdir(chemin):
+        print(f"+ Archivage de la sortie {nature}: {chemin}")
+        chemin = archiver_dossier(chemin)
+    if telecharger(chemin):
+        print(f"+ Telechargement {nature}: {os.path.basename(chemin)}")
+    return chemin
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Moteur de Differences - Algorithme de Myers
+Calcule le plus court script d'edition entre deux textes en O((N+M)D)
+(D = nombre de lignes changees) et le formate en diff unifie applicable
+par `patch -p1` ou `git apply`
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Au-dela de ce nombre d'editions, le milieu du fichier est remplace en bloc
+# (diff valide mais non minimal) pour borner le temps de calcul
+D_MAX_DEFAUT = 1000
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def lignes(texte: str) -> List[str]:
+    """Decoupe sur '\\n' uniquement, fins de ligne conservees."""
+    morceaux = texte.split('\n')
+    resultat = [morceau + '\n' for morceau in morceaux[:-1]]
+    if morceaux[-1]:
+        resultat.append(morceaux[-1])
+    return resultat
+
+
+def _numeroter(a: List[str], b: List[str]) -> Tuple[List[int], List[int]]:
+    """Remplace chaque ligne par un entier (comparaisons en temps constant)."""
+    index: Dict[str, int] = {}
+    return ([index.setdefault(ligne, len(index)) for ligne in a],
+            [index.setdefault(ligne, len(index)) for ligne in b])
+
+
+def _myers(a: List[int], b: List[int], d_max: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Chemin d'edition minimal de Myers (variante gloutonne).
+
+    Returns:
+        list: Points (x, y) du chemin, de (0, 0) a (len(a), len(b)), ou None
+        si plus de d_max editions sont necessaires
+    """
+    n, m = len(a), len(b)
+    decalage = n + m + 1
+    v = [0] * (2 * decalage + 1)
+    traces = []
+
+    for d in range(min(n + m, d_max) + 1):
+        # Seules les diagonales [-d, d] sont utiles au retour arriere de l'etape d
+        traces.append(v[decalage - d:decalage + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[decalage + k - 1] < v[decalage + k + 1]):
+                x = v[decalage + k + 1]
+            else:
+                x = v[decalage + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[decalage + k] = x
+            if x >= n and y >= m:
+                return _retour_arriere(traces, n, m)
+    return None
+
+
+def _retour_arriere(traces, n: int, m: int) -> List[Tuple[int, int]]:
+    """Reconstruit le chemin depuis les diagonales memorisees a chaque etape."""
+    x, y = n, m
+    chemin = [(x, y)]
+    for d in range(len(traces) - 1, -1, -1):
+        v = traces[d]
+
+        def lire(k, v=v, d=d):
+            return v[k + d]
+
+        k = x - y
+        if k == -d or (k != d and lire(k - 1) < lire(k + 1)):
+            k_precedent = k + 1
+        else:
+            k_precedent = k - 1
+        x_precedent = lire(k_precedent) if d > 0 else 0
+        y_precedent = x_precedent - k_precedent if d > 0 else 0
+
+        while x > x_precedent and y > y_precedent:
+            x -= 1
+            y -= 1
+            chemin.append((x, y))
+        if d > 0:
+            x, y = x_precedent, y_precedent
+            chemin.append((x, y))
+    chemin.reverse()
+    return chemin
+
+
+def differences(a: List[str], b: List[str], d_max: int = D_MAX_DEFAUT) -> List[Opcode]:
+    """
+    Operations transformant a en b, au format de difflib.SequenceMatcher.get_opcodes :
+    (tag, i1, i2, j1, j2) avec tag dans 'equal', 'delete', 'insert', 'replace'.
+    """
+    # Prefixe et suffixe communs : hors de l'algorithme
+    debut = 0
+    limite = min(len(a), len(b))
+    while debut < limite and a[debut] == b[debut]:
+        debut += 1
+    fin = 0
+    while fin < limite - debut and a[-1 - fin] == b[-1 - fin]:
+        fin += 1
+
+    milieu_a, milieu_b = _numeroter(a[debut:len(a) - fin], b[debut:len(b) - fin])
+    chemin = _myers(milieu_a, milieu_b, d_max)
+    if chemin is None:
+        chemin = [(0, 0), (len(milieu_a), 0), (len(milieu_a), len(milieu_b))]
+
+    opcodes: List[Opcode] = []
+
+    def ajouter(tag, i1, i2, j1, j2):
+        i1, i2, j1, j2 = i1 + debut, i2 + debut, j1 + debut, j2 + debut
+        if opcodes and opcodes[-1][0] == tag:
+            opcodes[-1] = (tag, opcodes[-1][1], i2, opcodes[-1][3], j2)
+        elif opcodes and {opcodes[-1][0], tag} <= {'delete', 'insert', 'replace'}:
+            precedent = opcodes[-1]
+            opcodes[-1] = ('replace', precedent[1], i2, precedent[3], j2)
+        else:
+            opcodes.append((tag, i1, i2, j1, j2))
+
+    if debut:
+        opcodes.append(('equal', 0, debut, 0, debut))
+    for (x1, y1), (x2, y2) in zip(chemin, chemin[1:]):
+        if x2 - x1 == y2 - y1:
+            ajouter('equal', x1, x2, y1, y2)
+        elif y2 == y1:
+            ajouter('delete', x1, x2, y1, y2)
+        else:
+            ajouter('insert', x1, x2, y1, y2)
+    if fin:
+        ajouter('equal', len(a) - fin - debut, len(a) - debut,
+                len(b) - fin - debut, len(b) - debut)
+    return [op for op in opcodes if op[1] != op[2] or op[3] != op[4]]
+
+
+def _plage(debut: int, longueur: int) -> str:
+    """Plage d'un en-tete de bloc, comme difflib.unified_diff."""
+    if longueur == 1:
+        return f"{debut + 1}"
+    if longueur == 0:
+        return f"{debut},0"
+    return f"{debut + 1},{longueur}"
+
+
+def _groupes(opcodes: List[Opcode], contexte: int) -> Iterator[List[Opcode]]:
+    """Regroupe les operations en blocs entoures de 'contexte' lignes."""
+    if not opcodes:
+        return
+    opcodes = list(opcodes)
+    if opcodes[0][0] == 'equal':
+        _, i1, i2, j1, j2 = opcodes[0]
+        opcodes[0] = ('equal', max(i1, i2 - contexte), i2, max(j1, j2 - contexte), j2)
+    if opcodes[-1][0] == 'equal':
+        _, i1, i2, j1, j2 = opcodes[-1]
+        opcodes[-1] = ('equal', i1, min(i2, i1 + contexte), j1, min(j2, j1 + contexte))
+
+    groupe: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal' and i2 - i1 > 2 * contexte:
+            groupe.append((tag, i1, i1 + contexte, j1, j1 + contexte))
+            yield groupe
+            groupe = []
+            i1, j1 = i2 - contexte, j2 - contexte
+        groupe.append((tag, i1, i2, j1, j2))
+    if groupe and not (len(groupe) == 1 and groupe[0][0] == 'equal'):
+        yield groupe
+
+
+def _ligne_diff(prefixe: str, ligne: str) -> str:
+    if ligne.endswith('\n'):
+        return prefixe + ligne
+    return prefixe + ligne + "\n\\ No newline at end of file\n"
+
+
+def diff_unifie(ancien: str, nouveau: str, chemin_ancien: str = "a", chemin_nouveau: str = "b",
+                contexte: int = 3, d_max: int = D_MAX_DEFAUT) -> str:
+    """
+    Diff unifie entre deux textes ('' s'ils sont identiques).
+
+    Args:
+        ancien, nouveau: Textes compares
+        chemin_ancien, chemin_nouveau: Noms des lignes '---' et '+++'
+        contexte: Lignes inchangees autour de chaque bloc
+    """
+    a, b = lignes(ancien), lignes(nouveau)
+    opcodes = differences(a, b, d_max)
+    if all(op[0] == 'equal' for op in opcodes):
+        return ""
+
+    sortie = [f"--- {chemin_ancien}\n", f"+++ {chemin_nouveau}\n"]
+    for groupe in _groupes(opcodes, contexte):
+        i1, i2 = groupe[0][1], groupe[-1][2]
+        j1, j2 = groupe[0][3], groupe[-1][4]
+        sortie.append(f"@@ -{_plage(i1, i2 - i1)} +{_plage(j1, j2 - j1)} @@\n")
+        for tag, a1, a2, b1, b2 in groupe:
+            if tag == 'equal':
+                sortie.extend(_ligne_diff(' ', ligne) for ligne in a[a1:a2])
+                continue
+            sortie.extend(_ligne_diff('-', ligne) for ligne in a[a1:a2])
+            sortie.extend(_ligne_diff('+', ligne) for ligne in b[b1:b2])
+    return "".join(sortie)
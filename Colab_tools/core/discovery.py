@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Service de Decouverte de Fichiers - Parcours Parallele et Dedoublonne
+Parcourt plusieurs dossiers en parallele avec os.scandir et produit
+les fichiers Python trouves sous forme de flux. Une archive donnee comme
+racine (zip, wheel, tar, sdist) produit ses membres (core/archive_input.py)
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+from .archive_input import est_archive, iter_membres
+
+# Dossiers ignores par defaut (systeme, caches, dependances)
+DOSSIERS_EXCLUS_DEFAUT = frozenset(['__pycache__', 'node_modules'])
+
+# Marqueur de fin de parcours dans la file de sortie
+_FIN = object()
+
+
+def _dossier_exclu_defaut(nom: str, chemin: str) -> bool:
+    """Regle historique : dossiers caches et dossiers systeme ignores."""
+    return nom.startswith('.') or nom in DOSSIERS_EXCLUS_DEFAUT
+
+
+class FileDiscovery:
+    """
+    Decouvre les fichiers Python de plusieurs racines en parallele.
+
+    Chaque dossier est identifie par (device, inode) : un dossier deja
+    visite (racines qui se chevauchent, liens symboliques, boucles) n'est
+    jamais parcouru deux fois, et un fichier n'est produit qu'une seule fois.
+    """
+
+    def __init__(self, extensions=('.py',), max_workers: Optional[int] = None,
+                 exclure_dossier: Optional[Callable[[str, str], bool]] = None,
+                 exclure_fichier: Optional[Callable[[str, str, os.DirEntry], bool]] = None,
+                 suivre_liens: bool = True):
+        self.extensions = tuple(extensions)
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 1) * 2)
+        self.exclure_dossier = exclure_dossier or _dossier_exclu_defaut
+        self.exclure_fichier = exclure_fichier
+        self.suivre_liens = suivre_liens
+
+        self._verrou = threading.Lock()
+        self._dossiers_vus = set()
+        self._fichiers_vus = set()
+
+    def iter_files(self, roots: Iterable[str]) -> Iterator[str]:
+        """
+        Produit les chemins des fichiers trouves au fur et a mesure du parcours.
+
+        Args:
+            roots: Dossiers, fichiers ou archives a parcourir
+
+        Yields:
+            str: Chemin de chaque fichier, dans l'ordre de decouverte
+        """
+        sortie = queue.Queue()
+        arret = threading.Event()
+        # Compteur de taches, initialise a 1 pendant la soumission des racines
+        en_cours = [1]
+
+        with self._verrou:
+            self._dossiers_vus.clear()
+            self._fichiers_vus.clear()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                      thread_name_prefix="discovery")
+
+        def soumettre(chemin, device):
+            if arret.is_set():
+                return
+            with self._verrou:
+                en_cours[0] += 1
+            executor.submit(tache, chemin, device)
+
+        def terminer_tache():
+            with self._verrou:
+                en_cours[0] -= 1
+                termine = en_cours[0] == 0
+            if termine:
+                sortie.put(_FIN)
+
+        def tache(chemin, device):
+            try:
+                if not arret.is_set():
+                    self._scanner_dossier(chemin, device, sortie, soumettre)
+            finally:
+                terminer_tache()
+
+        try:
+            for root in roots:
+                root = os.path.abspath(root)
+                if est_archive(root):
+                    # Archive : membres lus depuis l'index, sans extraction
+                    for chemin in iter_membres(root, self._est_candidat, self.exclure_dossier,
+                                               self.exclure_fichier):
+                        if self._marquer_fichier(chemin):
+                            yield chemin
+                    continue
+                if os.path.isfile(root):
+                    if self._est_candidat(os.path.basename(root)):
+                        try:
+                            stat = os.stat(root)
+                        except OSError:
+                            continue
+                        if self._marquer_fichier((stat.st_dev, stat.st_ino)):
+                            yield root
+                    continue
+
+                try:
+                    stat = os.stat(root)
+                except OSError:
+                    print(f"! Dossier ignore (non trouve) : {root}")
+                    continue
+                if not self._marquer_dossier((stat.st_dev, stat.st_ino)):
+                    continue
+
+                soumettre(root, stat.st_dev)
+
+            terminer_tache()
+
+            while True:
+                element = sortie.get()
+                if element is _FIN:
+                    break
+                yield element
+
+        finally:
+            # Arret anticipe si le consommateur abandonne le flux
+            arret.set()
+            executor.shutdown(wait=True)
+
+    def collect(self, roots: Iterable[str]) -> list:
+        """Retourne la liste triee de tous les fichiers decouverts."""
+        return sorted(self.iter_files(roots))
+
+    def _scanner_dossier(self, chemin, device, sortie, soumettre):
+        """Scanne un dossier : fichiers vers la sortie, sous-dossiers en taches."""
+        try:
+            with os.scandir(chemin) as entries:
+                for entry in entries:
+                    try:
+                        est_lien = entry.is_symlink()
+                        if entry.is_dir(follow_symlinks=self.suivre_liens):
+                            if self.exclure_dossier(entry.name, entry.path):
+                                continue
+                            stat = entry.stat(follow_symlinks=True)
+                            if self._marquer_dossier((stat.st_dev, stat.st_ino)):
+                                soumettre(entry.path, stat.st_dev)
+
+                        elif self._est_candidat(entry.name) and entry.is_file():
+                            if (self.exclure_fichier is not None and
+                                    self.exclure_fichier(entry.name, entry.path, entry)):
+                                continue
+                            if est_lien:
+                                stat = entry.stat(follow_symlinks=True)
+                                cle = (stat.st_dev, stat.st_ino)
+                            else:
+                                # Meme device que le dossier parent : pas de stat
+                                cle = (device, entry.inode())
+                            if self._marquer_fichier(cle):
+                                sortie.put(entry.path)
+                    except OSError:
+                        continue
+        except (PermissionError, OSError):
+            pass
+
+    def _est_candidat(self, nom: str) -> bool:
+        return nom.endswith(self.extensions)
+
+    def _marquer_dossier(self, cle) -> bool:
+        """Enregistre un dossier; retourne False s'il a deja ete visite."""
+        with self._verrou:
+            if cle in self._dossiers_vus:
+                return False
+            self._dossiers_vus.add(cle)
+            return True
+
+    def _marquer_fichier(self, cle) -> bool:
+        """Enregistre un fichier; retourne False s'il a deja ete produit."""
+        with self._verrou:
+            if cle in self._fichiers_vus:
+                return False
+            self._fichiers_vus.add(cle)
+            return True
+
+
+def iter_python_files(roots: Iterable[str], **options) -> Iterator[str]:
+    """Raccourci : flux des fichiers Python de plusieurs racines."""
+    return FileDiscovery(**options).iter_files(roots)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Estimation d'un Lot par Echantillonnage Stratifie
+Transforme un echantillon aleatoire des fichiers selectionnes, stratifie
+par dossier de premier niveau et par quartile de taille, puis extrapole
+au lot complet la duree, la taille de sortie, le nombre de fichiers
+modifies et le nombre de modifications (comptees par preview_changes),
+avec des intervalles de confiance.
+
+Estimateur du total stratifie : somme sur les strates de N_h * moyenne_h,
+variance somme de N_h^2 * (1 - n_h/N_h) * s_h^2 / n_h.
+"""
+
+import math
+import os
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .archive_input import ouvrir_texte, taille as taille_fichier
+
+# Taille d'echantillon par defaut
+ECHANTILLON_DEFAUT = 100
+
+# Fichiers tires au minimum par strate (variance estimable)
+_MINIMUM_PAR_STRATE = 2
+
+# Au-dela, les plus petits dossiers sont regroupes dans une strate commune
+_DOSSIERS_MAX = 8
+
+# Quantile de la loi normale pour un niveau de confiance donne
+_QUANTILES = {0.80: 1.2816, 0.90: 1.6449, 0.95: 1.9600, 0.99: 2.5758}
+
+# Grandeurs extrapolees
+MESURES = ('duree_ms', 'taille_sortie', 'fichiers_modifies', 'modifications')
+
+
+def _dossier(chemin: str, roots: Sequence[str]) -> str:
+    from .batch_pipeline import chemin_relatif
+    relatif = chemin_relatif(chemin, roots)
+    parties = relatif.replace(os.sep, '/').split('/')
+    return parties[0] if len(parties) > 1 else '.'
+
+
+def stratifier(fichiers: Iterable[str], roots: Sequence[str] = ()) -> Dict[Tuple[str, int], List[str]]:
+    """
+    Repartit les fichiers par (dossier de premier niveau, quartile de taille).
+
+    Returns:
+        dict: (dossier, quartile 0-3) -> chemins
+    """
+    roots = [os.path.abspath(r) for r in roots]
+    tailles = {chemin: taille_fichier(chemin) for chemin in fichiers}
+    if not tailles:
+        return {}
+
+    triees = sorted(tailles.values())
+    bornes = [triees[min(len(triees) - 1, len(triees) * q // 4)] for q in (1, 2, 3)]
+
+    dossiers = {chemin: _dossier(chemin, roots) for chemin in tailles}
+    effectifs: Dict[str, int] = {}
+    for dossier in dossiers.values():
+        effectifs[dossier] = effectifs.get(dossier, 0) + 1
+    gardes = set(sorted(effectifs, key=lambda d: (-effectifs[d], d))[:_DOSSIERS_MAX - 1])
+    if len(effectifs) <= _DOSSIERS_MAX:
+        gardes = set(effectifs)
+
+    strates: Dict[Tuple[str, int], List[str]] = {}
+    for chemin, taille in tailles.items():
+        dossier = dossiers[chemin] if dossiers[chemin] in gardes else '(autres)'
+        quartile = sum(1 for borne in bornes if taille > borne)
+        strates.setdefault((dossier, quartile), []).append(chemin)
+    return strates
+
+
+def repartir(effectifs: Dict, taille: int) -> Dict:
+    """
+    Allocation proportionnelle de l'echantillon entre strates, avec au
+    moins deux fichiers par strate (ou toute la strate si elle est petite).
+    """
+    total = sum(effectifs.values())
+    if taille >= total:
+        return dict(effectifs)
+    allocation = {strate: min(n, max(_MINIMUM_PAR_STRATE, round(taille * n / total)))
+                  for strate, n in effectifs.items()}
+    # Ajustement a la taille demandee (sans descendre sous le minimum)
+    excedent = sum(allocation.values()) - taille
+    for strate in sorted(allocation, key=lambda s: (-allocation[s], s)):
+        if excedent <= 0:
+            break
+        retrait = min(excedent, allocation[strate] - min(effectifs[strate], _MINIMUM_PAR_STRATE))
+        allocation[strate] -= retrait
+        excedent -= retrait
+    return allocation
+
+
+def echantillonner(strates: Dict, taille: int, graine: Optional[int] = None) -> Dict:
+    """Tirage aleatoire simple sans remise dans chaque strate."""
+    generateur = random.Random(graine)
+    allocation = repartir({strate: len(chemins) for strate, chemins in strates.items()}, taille)
+    # Ordre fixe des strates : meme graine, meme echantillon
+    return {strate: generateur.sample(sorted(strates[strate]), allocation[strate])
+            for strate in sorted(allocation) if allocation[strate]}
+
+
+def mesurer_fichier(pipeline, chemin: str) -> Dict[str, float]:
+    """
+    Transforme un fichier (sans ecrire) et compte les modifications
+    annoncees par preview_changes pour chaque plugin de la chaine.
+    """
+    try:
+        with ouvrir_texte(chemin) as f:
+            code = f.read()
+    except (OSError, UnicodeDecodeError):
+        return {'duree_ms': 0.0, 'taille_sortie': 0, 'fichiers_modifies': 0,
+                'modifications': 0, 'erreur': 1}
+
+    debut = time.perf_counter()
+    resultat, code_final = pipeline.traiter_source(chemin, code, debut)
+    duree_ms = (time.perf_counter() - debut) * 1000
+
+    modifications = 0
+    courant = code
+    for nom, transformer in pipeline._transformers:
+        try:
+            apercu = transformer.preview_changes(courant)
+            modifications += int(apercu.get('estimated_changes') or 0)
+            if transformer.can_transform(courant):
+                courant = transformer.transform(courant)
+        except Exception:
+            break
+
+    sortie = code_final if code_final is not None else code
+    return {
+        'duree_ms': duree_ms,
+        'taille_sortie': len(sortie.encode('utf-8', 'surrogatepass')),
+        'fichiers_modifies': 1 if resultat['statut'] == 'modifie' else 0,
+        'modifications': modifications,
+        'erreur': 1 if resultat['statut'] == 'erreur' else 0,
+    }
+
+
+def extrapoler(effectifs: Dict, mesures: Dict[object, List[Dict]], niveau: float = 0.95) -> Dict:
+    """
+    Total estime et intervalle de confiance de chaque grandeur.
+
+    Args:
+        effectifs: Nombre de fichiers par strate (N_h)
+        mesures: Mesures des fichiers tires, par strate
+
+    Returns:
+        dict: grandeur -> {'estimation', 'bas', 'haut', 'erreur_type'}
+    """
+    z = _QUANTILES.get(niveau, 1.96)
+    estimations = {}
+    for grandeur in MESURES:
+        total = variance = 0.0
+        for strate, valeurs in mesures.items():
+            valeurs = [m[grandeur] for m in valeurs]
+            n, population = len(valeurs), effectifs[strate]
+            if not n:
+                continue
+            moyenne = sum(valeurs) / n
+            total += population * moyenne
+            if n > 1 and n < population:
+                s2 = sum((v - moyenne) ** 2 for v in valeurs) / (n - 1)
+                variance += population ** 2 * (1 - n / population) * s2 / n
+        erreur_type = math.sqrt(variance)
+        estimations[grandeur] = {
+            'estimation': total,
+            'bas': max(0.0, total - z * erreur_type),
+            'haut': total + z * erreur_type,
+            'erreur_type': erreur_type,
+        }
+    return estimations
+
+
+def estimer(pipeline, fichiers: Iterable[str], roots: Sequence[str] = (),
+            taille: int = ECHANTILLON_DEFAUT, graine: Optional[int] = None,
+            niveau: float = 0.95) -> Dict:
+    """
+    Estime un lot complet a partir d'un echantillon stratifie.
+
+    Args:
+        pipeline: BatchPipeline (plugins de la chaine; rien n'est ecrit)
+        fichiers: Fichiers selectionnes
+        taille: Nombre de fichiers a transformer
+        graine: Graine du tirage (reproductible)
+
+    Returns:
+        dict: Population, echantillon, duree de l'estimation et estimations
+    """
+    if not pipeline._transformers:
+        pipeline.preparer()
+    debut = time.perf_counter()
+    strates = stratifier(fichiers, roots)
+    effectifs = {strate: len(chemins) for strate, chemins in strates.items()}
+    tirage = echantillonner(strates, taille, graine)
+
+    mesures = {strate: [mesurer_fichier(pipeline, chemin) for chemin in chemins]
+               for strate, chemins in tirage.items()}
+    estimations = extrapoler(effectifs, mesures, niveau)
+
+    return {
+        'fichiers': sum(effectifs.values()),
+        'echantillon': sum(len(chemins) for chemins in tirage.values()),
+        'strates': len(strates),
+        'erreurs_echantillon': sum(m['erreur'] for valeurs in mesures.values() for m in valeurs),
+        'niveau_confiance': niveau,
+        'duree_estimation_s': round(time.perf_counter() - debut, 3),
+        'estimations': {grandeur: {cle: round(valeur, 3) for cle, valeur in e.items()}
+                        for grandeur, e in estimations.items()},
+    }
+
+
+def _duree(secondes: float) -> str:
+    if secondes < 10:
+        return f"{secondes:.2f} s"
+    if secondes < 120:
+        return f"{secondes:.0f} s"
+    if secondes < 7200:
+        return f"{secondes / 60:.0f} min"
+    return f"{secondes / 3600:.1f} h"
+
+
+def resume_estimation(estimation: Dict, jobs: Sequence[int] = (1, 2, 4, 8)) -> List[str]:
+    """Lignes lisibles, avec la duree selon le nombre de processus."""
+    e = estimation['estimations']
+    niveau = int(estimation['niveau_confiance'] * 100)
+    duree = e['duree_ms']
+    lignes = [
+        f"Estimation sur {estimation['echantillon']}/{estimation['fichiers']} fichier(s) "
+        f"({estimation['strates']} strate(s), intervalles a {niveau}%)",
+        f"Fichiers modifies : {e['fichiers_modifies']['estimation']:.0f} "
+        f"[{e['fichiers_modifies']['bas']:.0f} - {e['fichiers_modifies']['haut']:.0f}]",
+        f"Modifications : {e['modifications']['estimation']:.0f} "
+        f"[{e['modifications']['bas']:.0f} - {e['modifications']['haut']:.0f}]",
+        f"Taille de sortie : {e['taille_sortie']['estimation'] / 1e6:.1f} Mo "
+        f"[{e['taille_sortie']['bas'] / 1e6:.1f} - {e['taille_sortie']['haut'] / 1e6:.1f}]",
+    ]
+    # Duree ideale : temps de calcul reparti sans surcout entre les processus
+    for nombre in jobs:
+        lignes.append(f"Duree avec {nombre} processus : {_duree(duree['estimation'] / 1000 / nombre)} "
+                      f"[{_duree(duree['bas'] / 1000 / nombre)} - {_duree(duree['haut'] / 1000 / nombre)}]")
+    return lignes
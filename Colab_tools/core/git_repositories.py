@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Depots Git Locaux
+Retrouve le depot git qui contient un chemin et regroupe des chemins par
+depot, sans lancer git ni importer GitPython. Partage par la selection
+incrementale (core/git_selection.py) et par github-sync.py, a la racine
+du depot, qui ajoute Colab_tools au path pour l'importer.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional
+
+
+def find_repository_root(path: str) -> Optional[str]:
+    """Racine de l'arbre de travail git qui contient path, ou None."""
+    current = os.path.abspath(os.path.expanduser(path))
+    if not os.path.isdir(current):
+        current = os.path.dirname(current)
+    while True:
+        if os.path.exists(os.path.join(current, '.git')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def group_paths_by_repository(paths: Iterable[str], relative: bool = True,
+                              skipped: Optional[List[str]] = None) -> Dict[str, List[str]]:
+    """
+    Regroupe des chemins par racine de depot, dans l'ordre, sans doublon.
+
+    Args:
+        paths: Fichiers ou dossiers
+        relative: Chemins relatifs a la racine du depot (sinon absolus)
+        skipped: Liste qui recoit les chemins hors de tout depot
+
+    Returns:
+        dict: Racine du depot -> chemins qu'il contient
+    """
+    groups = {}
+    for path in paths:
+        absolute = os.path.abspath(os.path.expanduser(path))
+        root = find_repository_root(absolute)
+        if root is None:
+            if skipped is not None:
+                skipped.append(path)
+            continue
+        entry = os.path.relpath(absolute, root) if relative else absolute
+        members = groups.setdefault(root, [])
+        if entry not in members:
+            members.append(entry)
+    return groups
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Selection Incrementale par Git
+Au lieu de parcourir les racines, demande au depot git local quels
+fichiers Python different d'une reference (git diff --name-only -M,
+renommages compris) : le cout suit la taille du changement et non celle
+du depot. Les depots sont ouverts avec GitPython, comme dans github-sync.py,
+et les fichiers retenus passent par les memes regles d'exclusion que la
+decouverte.
+"""
+
+import os
+from typing import Iterable, Iterator, List
+
+from .git_repositories import group_paths_by_repository
+
+
+def _motifs(depot: str, racines: List[str], extensions) -> List[str]:
+    """Pathspecs git limitant le diff aux racines et aux extensions."""
+    motifs = []
+    for racine in racines:
+        relatif = os.path.relpath(racine, depot).replace(os.sep, '/')
+        if os.path.isfile(racine):
+            motifs.append(relatif)
+            continue
+        prefixe = '' if relatif == '.' else f"{relatif}/"
+        # Sans magie de pathspec, '*' traverse aussi les dossiers
+        motifs.extend(f"{prefixe}*{extension}" for extension in extensions)
+    return motifs
+
+
+def fichiers_modifies(depot: str, ref: str, racines: Iterable[str] = (),
+                      extensions=('.py',)) -> List[str]:
+    """
+    Fichiers du depot qui different de ref (arbre de travail compris).
+
+    Un fichier renomme est donne sous son nouveau nom; les fichiers
+    supprimes sont ignores.
+
+    Args:
+        depot: Racine du depot git
+        ref: Commit, branche ou tag de comparaison (ex: 'origin/main')
+        racines: Dossiers ou fichiers du depot auxquels limiter le diff
+
+    Returns:
+        list: Chemins absolus, dans l'ordre de git
+
+    Raises:
+        ValueError: GitPython absent, depot invalide ou reference inconnue
+    """
+    try:
+        from git import GitCommandError, InvalidGitRepositoryError, Repo
+    except ImportError:
+        raise ValueError("GitPython est requis pour la selection par git "
+                         "(pip install GitPython)") from None
+
+    depot = os.path.abspath(depot)
+    racines = [os.path.abspath(r) for r in racines] or [depot]
+    try:
+        repo = Repo(depot)
+        sortie = repo.git.diff('--name-only', '-z', '-M', '--diff-filter=d', '--no-ext-diff',
+                               ref, '--', *_motifs(depot, racines, extensions))
+    except InvalidGitRepositoryError:
+        raise ValueError(f"Depot git invalide: {depot}") from None
+    except GitCommandError as e:
+        detail = (e.stderr or '').strip().splitlines()
+        raise ValueError(f"git diff {ref} impossible dans {depot}: "
+                         f"{detail[-1] if detail else e}") from None
+    return [os.path.join(depot, *nom.split('/')) for nom in sortie.split('\0') if nom]
+
+
+def _retenu(chemin: str, racine: str, regles) -> bool:
+    """Applique les regles de decouverte aux dossiers puis au fichier."""
+    if os.path.isfile(racine):
+        return chemin == racine
+    if os.path.commonpath([chemin, racine]) != racine or not os.path.isfile(chemin):
+        return False
+    if regles is None:
+        return True
+    dossier = racine
+    for nom in os.path.relpath(os.path.dirname(chemin), racine).split(os.sep):
+        if nom == '.':
+            continue
+        dossier = os.path.join(dossier, nom)
+        if regles.exclure_dossier(nom, dossier):
+            return False
+    return not regles.exclure_fichier(os.path.basename(chemin), chemin)
+
+
+def selectionner(racines: Iterable[str], ref: str, regles=None,
+                 extensions=('.py',)) -> Iterator[str]:
+    """
+    Produit les fichiers des racines qui different de ref, sans parcours.
+
+    Les racines sont regroupees par depot (un seul git diff par depot);
+    une racine hors de tout depot est signalee et ignoree.
+
+    Args:
+        racines: Dossiers ou fichiers, comme pour la decouverte
+        ref: Reference git de comparaison
+        regles: IgnoreRules a appliquer (None : aucune exclusion)
+
+    Yields:
+        str: Chemin absolu de chaque fichier retenu, une seule fois
+    """
+    ignorees = []
+    par_depot = group_paths_by_repository(racines, relative=False, skipped=ignorees)
+    for racine in ignorees:
+        print(f"! Racine ignoree (hors depot git) : {os.path.abspath(racine)}")
+
+    vus = set()
+    for depot, racines_depot in par_depot.items():
+        for chemin in fichiers_modifies(depot, ref, racines_depot, extensions):
+            if chemin in vus:
+                continue
+            if any(_retenu(chemin, racine, regles) for racine in racines_depot):
+                vus.add(chemin)
+                yield chemin
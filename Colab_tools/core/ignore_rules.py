@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Moteur de Regles d'Exclusion pour la Decouverte de Fichiers
+Compile .gitignore, exclusions utilisateur et limite de taille en un
+seul filtre qui elague les sous-arbres avant leur parcours
+"""
+
+import os
+import re
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from .discovery import FileDiscovery
+from .settings import charger_parametres
+
+# Dossiers ignores par defaut (caches, dependances installees). Les builds
+# relevent du .gitignore; remplacable par le parametre ignored_dirs
+DOSSIERS_IGNORES = frozenset(['__pycache__', 'node_modules', '.eggs'])
+
+# Fichier marqueur d'un environnement virtuel, quel que soit son nom
+_MARQUEUR_VENV = 'pyvenv.cfg'
+
+
+def motif_vers_regex(motif: str) -> str:
+    """
+    Traduit un motif glob au format .gitignore en expression reguliere.
+
+    Gere '*', '?', '**', les classes '[...]' et les echappements '\\'.
+    """
+    morceaux = []
+    i, n = 0, len(motif)
+    while i < n:
+        c = motif[i]
+        if c == '*':
+            if motif.startswith('**', i):
+                if i + 2 < n and motif[i + 2] == '/':
+                    # '**/' : zero ou plusieurs dossiers
+                    morceaux.append('(?:.*/)?')
+                    i += 3
+                else:
+                    morceaux.append('.*')
+                    i += 2
+                continue
+            morceaux.append('[^/]*')
+        elif c == '?':
+            morceaux.append('[^/]')
+        elif c == '[':
+            fin = motif.find(']', i + 2)
+            if fin == -1:
+                morceaux.append(re.escape(c))
+            else:
+                classe = motif[i + 1:fin].replace('\\', '\\\\')
+                if classe.startswith('!'):
+                    classe = '^' + classe[1:]
+                morceaux.append(f'[{classe}]')
+                i = fin + 1
+                continue
+        elif c == '\\' and i + 1 < n:
+            morceaux.append(re.escape(motif[i + 1]))
+            i += 2
+            continue
+        else:
+            morceaux.append(re.escape(c))
+        i += 1
+    return ''.join(morceaux)
+
+
+def analyser_regle(ligne: str, ancrage: bool = True) -> Optional[Tuple[str, bool, bool]]:
+    """
+    Analyse une ligne .gitignore.
+
+    Args:
+        ligne: Ligne du fichier
+        ancrage: Si False, le motif s'applique a toutes les profondeurs
+
+    Returns:
+        tuple: (regex relative au dossier du .gitignore, negation, dossier seulement)
+        ou None pour une ligne vide ou un commentaire
+    """
+    ligne = ligne.rstrip('\n\r')
+    if not ligne.endswith('\\ '):
+        ligne = ligne.rstrip()
+    if not ligne or ligne.startswith('#'):
+        return None
+
+    negation = ligne.startswith('!')
+    if negation:
+        ligne = ligne[1:]
+    elif ligne.startswith('\\'):
+        ligne = ligne[1:]
+
+    dossier_seulement = ligne.endswith('/')
+    ligne = ligne.rstrip('/')
+    if not ligne:
+        return None
+
+    # Un '/' avant la fin ancre le motif au dossier du .gitignore
+    ancre = ancrage and '/' in ligne
+    ligne = ligne.lstrip('/')
+    corps = motif_vers_regex(ligne)
+    regex = corps if ancre else f'(?:.*/)?{corps}'
+
+    return regex, negation, dossier_seulement
+
+
+class _PorteeRegles:
+    """Regles d'un fichier .gitignore, compilees en deux expressions uniques."""
+
+    def __init__(self, regles: List[Tuple[str, bool, bool]]):
+        self.negations = any(negation for _, negation, _ in regles)
+        self._dossiers = self._compiler(regles)
+        self._fichiers = self._compiler([r for r in regles if not r[2]])
+
+    def _compiler(self, regles):
+        if not regles:
+            return None
+        # Ordre inverse : la premiere alternative qui correspond est la derniere regle
+        regles = list(reversed(regles))
+        motif = '|'.join(f'(?P<r{i}>{regex})' for i, (regex, _, _) in enumerate(regles))
+        return re.compile(motif, re.DOTALL), [negation for _, negation, _ in regles]
+
+    def decider(self, relatif: str, est_dossier: bool) -> Optional[bool]:
+        """Retourne True (ignore), False (reinclus) ou None (aucune regle)."""
+        compile_ = self._dossiers if est_dossier else self._fichiers
+        if compile_ is None:
+            return None
+        regex, negations = compile_
+        correspondance = regex.fullmatch(relatif)
+        if correspondance is None:
+            return None
+        if not self.negations:
+            return True
+        return not negations[correspondance.lastindex - 1]
+
+
+class IgnoreRules:
+    """
+    Filtre de decouverte combinant :
+    - les dossiers ignores par nom (DOSSIERS_IGNORES par defaut) et les
+      environnements virtuels, reconnus a leur pyvenv.cfg
+    - les fichiers .gitignore rencontres (et ceux du depot englobant)
+    - les motifs d'exclusion de l'utilisateur
+    - la limite de taille max_file_size_mb des parametres
+    """
+
+    def __init__(self, roots: Iterable[str] = (), exclusions: Iterable[str] = (),
+                 max_file_size_mb: Optional[float] = None, utiliser_gitignore: bool = True,
+                 dossiers_ignores: Optional[Iterable[str]] = None):
+        self.utiliser_gitignore = utiliser_gitignore
+        self.dossiers_ignores = (DOSSIERS_IGNORES if dossiers_ignores is None
+                                 else frozenset(dossiers_ignores))
+        self.max_octets = int(max_file_size_mb * 1024 * 1024) if max_file_size_mb else None
+
+        # Exclusions utilisateur : non ancrees, valables sous toutes les racines
+        regles = [r for r in (analyser_regle(m, ancrage=False) for m in exclusions) if r]
+        self._exclusions = _PorteeRegles(regles) if regles else None
+
+        self._verrou = threading.Lock()
+        self._portees = {}
+        self._chaines = {}
+        self._limites = set()
+        for root in roots:
+            self._limites.add(self._limite_pour(os.path.abspath(root)))
+
+    @classmethod
+    def depuis_parametres(cls, roots: Iterable[str] = (), exclusions: Iterable[str] = (),
+                          parametres: Optional[dict] = None, **options):
+        """
+        Construit le filtre avec la limite de taille et les dossiers ignores
+        (ignored_dirs, DOSSIERS_IGNORES si absent) des parametres du projet.
+        """
+        parametres = parametres if parametres is not None else charger_parametres()
+        options.setdefault('dossiers_ignores', parametres.get('ignored_dirs'))
+        return cls(roots, exclusions,
+                   max_file_size_mb=parametres.get('max_file_size_mb'), **options)
+
+    def exclure_dossier(self, nom: str, chemin: str) -> bool:
+        """Filtre de dossiers pour FileDiscovery (elague le sous-arbre)."""
+        if nom.startswith('.') or nom in self.dossiers_ignores or nom.endswith('.egg-info'):
+            return True
+        if os.path.exists(os.path.join(chemin, _MARQUEUR_VENV)):
+            return True
+        return self._decider(chemin, True)
+
+    def exclure_fichier(self, nom: str, chemin: str, entry=None) -> bool:
+        """Filtre de fichiers pour FileDiscovery (taille et regles)."""
+        if self.max_octets is not None:
+            try:
+                taille = entry.stat().st_size if entry is not None else os.path.getsize(chemin)
+            except OSError:
+                return True
+            if taille > self.max_octets:
+                return True
+        return self._decider(chemin, False)
+
+    def creer_decouverte(self, **options) -> FileDiscovery:
+        """Retourne un FileDiscovery qui applique ces regles."""
+        return FileDiscovery(exclure_dossier=self.exclure_dossier,
+                             exclure_fichier=self.exclure_fichier, **options)
+
+    def _decider(self, chemin: str, est_dossier: bool) -> bool:
+        chemin_posix = chemin.replace(os.sep, '/')
+
+        if self._exclusions is not None:
+            decision = self._exclusions.decider(chemin_posix, est_dossier)
+            if decision is not None:
+                return decision
+
+        if not self.utiliser_gitignore:
+            return False
+
+        # Portee la plus profonde en premier
+        for dossier, portee in self._chaine(os.path.dirname(chemin)):
+            relatif = chemin_posix[len(dossier) + 1:]
+            decision = portee.decider(relatif, est_dossier)
+            if decision is not None:
+                return decision
+        return False
+
+    def _chaine(self, dossier: str) -> list:
+        """Liste (dossier, regles) des .gitignore applicables, du plus profond au plus haut."""
+        with self._verrou:
+            chaine = self._chaines.get(dossier)
+        if chaine is not None:
+            return chaine
+
+        portee = self._portee(dossier)
+        chaine = [(dossier.replace(os.sep, '/'), portee)] if portee else []
+
+        parent = os.path.dirname(dossier)
+        limite = dossier in self._limites or os.path.exists(os.path.join(dossier, '.git'))
+        if not limite and parent != dossier:
+            chaine = chaine + self._chaine(parent)
+
+        with self._verrou:
+            self._chaines[dossier] = chaine
+        return chaine
+
+    def _portee(self, dossier: str) -> Optional[_PorteeRegles]:
+        """Charge et compile le .gitignore d'un dossier (une seule fois)."""
+        with self._verrou:
+            if dossier in self._portees:
+                return self._portees[dossier]
+
+        portee = None
+        try:
+            with open(os.path.join(dossier, '.gitignore'), 'r', encoding='utf-8',
+                      errors='replace') as f:
+                regles = [r for r in (analyser_regle(ligne) for ligne in f) if r]
+            if regles:
+                portee = _PorteeRegles(regles)
+        except OSError:
+            pass
+
+        with self._verrou:
+            self._portees[dossier] = portee
+        return portee
+
+    @staticmethod
+    def _limite_pour(root: str) -> str:
+        """Racine du depot git englobant, sinon la racine elle-meme."""
+        dossier = root
+        while True:
+            if os.path.exists(os.path.join(dossier, '.git')):
+                return dossier
+            parent = os.path.dirname(dossier)
+            if parent == dossier:
+                return root
+            dossier = parent
+
+
+def creer_decouverte(roots: Iterable[str], exclusions: Iterable[str] = (),
+                     parametres: Optional[dict] = None, **options) -> FileDiscovery:
+    """Raccourci : decouverte configuree avec les regles d'exclusion du projet."""
+    regles = IgnoreRules.depuis_parametres(list(roots), exclusions, parametres)
+    return regles.creer_decouverte(**options)
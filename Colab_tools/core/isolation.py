@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Execution Isolee des Plugins
+Chaque fichier est traite dans un processus de travail supervise, avec
+une limite de duree et de memoire; un processus qui depasse est tue,
+remplace, et l'echec est enregistre sans interrompre le lot
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Intervalle de surveillance des processus (secondes)
+_INTERVALLE_SURVEILLANCE = 0.02
+# Taille d'une page memoire pour /proc/<pid>/statm
+_TAILLE_PAGE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def memoire_residente(pid: int) -> Optional[int]:
+    """RSS d'un processus en octets (Linux), None si indisponible."""
+    try:
+        with open(f"/proc/{pid}/statm", 'rb') as f:
+            return int(f.read().split()[1]) * _TAILLE_PAGE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def contexte_processus():
+    """
+    Contexte multiprocessing des processus de travail : forkserver, sinon
+    spawn, jamais fork. Un fork pendant que les fils de decouverte tournent
+    peut copier un verrou tenu (archive_input._VERROU) et bloquer l'enfant.
+    """
+    methodes = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methodes else 'spawn')
+
+
+def _limiter_memoire(max_octets: int):
+    """Borne le segment de donnees du processus (allocation massive -> MemoryError)."""
+    try:
+        import resource
+    except ImportError:
+        return
+    base = 0
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for ligne in f:
+                if ligne.startswith("VmData:"):
+                    base = int(ligne.split()[1]) * 1024
+                    break
+    except (OSError, ValueError):
+        pass
+    try:
+        _, dur = resource.getrlimit(resource.RLIMIT_DATA)
+        limite = base + max_octets
+        if dur != resource.RLIM_INFINITY:
+            limite = min(limite, dur)
+        resource.setrlimit(resource.RLIMIT_DATA, (limite, dur))
+    except (ValueError, OSError):
+        pass
+
+
+def _boucle_travailleur(connexion, plugins, json_instructions, max_octets, cache=None,
+                        tampons=False):
+    """Charge les plugins puis traite les chemins recus jusqu'a None."""
+    from .batch_pipeline import BatchPipeline
+
+    sys.stdout = sys.stderr
+    pipeline = BatchPipeline(plugins, json_instructions=json_instructions, cache=cache,
+                             tampons=tampons).preparer()
+    if max_octets:
+        _limiter_memoire(max_octets)
+    connexion.send('pret')
+
+    while True:
+        try:
+            chemin = connexion.recv()
+        except EOFError:
+            break
+        if chemin is None:
+            break
+        try:
+            reponse = pipeline.traiter_fichier(chemin)
+        except MemoryError:
+            resultat, _ = pipeline._resultat_vide(chemin)
+            resultat.update(statut='erreur', erreur="MemoryError: limite memoire atteinte",
+                            incident='memoire')
+            reponse = (resultat, None)
+        connexion.send(reponse)
+
+
+class _Travailleur:
+    """Processus de travail et sa tache en cours."""
+
+    def __init__(self, contexte, plugins, json_instructions, max_octets, cache=None,
+                 tampons=False):
+        self.connexion, connexion_enfant = contexte.Pipe()
+        self.processus = contexte.Process(
+            target=_boucle_travailleur,
+            args=(connexion_enfant, plugins, json_instructions, max_octets, cache, tampons),
+            daemon=True)
+        self.processus.start()
+        connexion_enfant.close()
+        self.pret = False
+        self.termine = False
+        self.chemin: Optional[str] = None
+        self.debut = 0.0
+
+    def soumettre(self, chemin: str):
+        self.chemin = chemin
+        self.debut = time.perf_counter()
+        self.connexion.send(chemin)
+
+    def tuer(self):
+        if self.termine:
+            return
+        self.termine = True
+        if self.processus.is_alive():
+            self.processus.kill()
+        self.processus.join(5)
+        self.connexion.close()
+
+    def arreter(self):
+        if self.termine:
+            return
+        self.termine = True
+        try:
+            self.connexion.send(None)
+        except OSError:
+            pass
+        self.processus.join(5)
+        if self.processus.is_alive():
+            self.processus.kill()
+            self.processus.join(5)
+        self.connexion.close()
+
+
+class ExecuteurIsole:
+    """
+    Repartit les fichiers sur des processus supervises.
+
+    Un processus qui depasse timeout secondes sur un fichier ou dont la
+    memoire residente depasse max_rss_mb est tue puis remplace; le fichier
+    est rapporte en erreur avec un champ 'incident' ('delai', 'memoire'
+    ou 'arret') et le lot continue.
+    """
+
+    def __init__(self, plugins: List[str], json_instructions: Optional[str] = None,
+                 jobs: int = 1, timeout: Optional[float] = None,
+                 max_rss_mb: Optional[float] = None, cache=None, tampons: bool = False):
+        self.plugins = list(plugins)
+        self.json_instructions = json_instructions
+        self.cache = cache
+        self.tampons = tampons
+        self.jobs = max(1, int(jobs or 1))
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.max_octets = int(max_rss_mb * 1024 * 1024) if max_rss_mb else None
+        self._contexte = contexte_processus()
+        self.recyclages = 0
+
+    def _nouveau_travailleur(self) -> _Travailleur:
+        return _Travailleur(self._contexte, self.plugins, self.json_instructions, self.max_octets,
+                            self.cache, self.tampons)
+
+    def executer(self, fichiers: Iterable[str]) -> Iterator[Tuple[Dict, Optional[str]]]:
+        """Produit (resultat, code final) par fichier, dans l'ordre d'achevement."""
+        fichiers = iter(fichiers)
+        travailleurs = [self._nouveau_travailleur() for _ in range(self.jobs)]
+        epuise = False
+
+        try:
+            while True:
+                # Distribuer aux travailleurs prets et libres
+                for travailleur in travailleurs:
+                    if travailleur.pret and travailleur.chemin is None and not epuise:
+                        chemin = next(fichiers, None)
+                        if chemin is None:
+                            epuise = True
+                        else:
+                            travailleur.soumettre(chemin)
+
+                actifs = [t for t in travailleurs if not t.pret or t.chemin is not None]
+                if epuise and not any(t.chemin is not None for t in travailleurs):
+                    break
+                if not actifs:
+                    continue
+
+                prets = wait([t.connexion for t in actifs] + [t.processus.sentinel for t in actifs],
+                             timeout=_INTERVALLE_SURVEILLANCE)
+
+                for index, travailleur in enumerate(travailleurs):
+                    resultat = self._examiner(travailleur, prets)
+                    if resultat is None:
+                        continue
+                    if resultat is _A_REMPLACER:
+                        travailleurs[index] = self._nouveau_travailleur()
+                        continue
+                    yield resultat
+                    if resultat[0].get('incident'):
+                        travailleur.tuer()
+                        travailleurs[index] = self._nouveau_travailleur()
+                        self.recyclages += 1
+        finally:
+            for travailleur in travailleurs:
+                if travailleur.chemin is None and travailleur.pret:
+                    travailleur.arreter()
+                else:
+                    travailleur.tuer()
+
+    def _examiner(self, travailleur: _Travailleur, prets):
+        """Lit la reponse d'un travailleur ou applique les limites."""
+        if travailleur.connexion in prets:
+            try:
+                message = travailleur.connexion.recv()
+            except (EOFError, OSError):
+                message = None
+            if message == 'pret':
+                travailleur.pret = True
+                return None
+            if message is not None:
+                travailleur.chemin = None
+                return message
+
+        if travailleur.chemin is None:
+            if not travailleur.processus.is_alive():
+                # Mort au chargement des plugins : inutile de boucler
+                if not travailleur.pret:
+                    raise RuntimeError("Le processus de travail n'a pas pu charger les plugins "
+                                       f"(code {travailleur.processus.exitcode})")
+                travailleur.tuer()
+                return _A_REMPLACER
+            return None
+
+        duree = time.perf_counter() - travailleur.debut
+        if not travailleur.processus.is_alive():
+            return self._echec(travailleur, 'arret',
+                               f"Processus de travail arrete (code {travailleur.processus.exitcode})",
+                               duree)
+        if self.timeout is not None and duree > self.timeout:
+            return self._echec(travailleur, 'delai',
+                               f"Delai depasse ({self.timeout:g} s)", duree)
+        if self.max_octets is not None:
+            rss = memoire_residente(travailleur.processus.pid)
+            if rss is not None and rss > self.max_octets:
+                return self._echec(travailleur, 'memoire',
+                                   f"Memoire depassee ({rss // (1024 * 1024)} Mo > "
+                                   f"{self.max_octets // (1024 * 1024)} Mo)", duree)
+        return None
+
+    def _echec(self, travailleur: _Travailleur, incident: str, message: str, duree: float):
+        """Tue le travailleur et construit le resultat d'erreur du fichier en cours."""
+        chemin = travailleur.chemin
+        travailleur.chemin = None
+        travailleur.tuer()
+        print(f"! {os.path.basename(chemin)}: {message}, processus de travail remplace")
+        resultat = {
+            'fichier': chemin,
+            'statut': 'erreur',
+            'plugins': [],
+            'sortie': None,
+            'duree_ms': round(duree * 1000, 3),
+            'erreur': message,
+            'incident': incident,
+        }
+        return resultat, None
+
+
+# Marqueur : le travailleur est mort entre deux fichiers
+_A_REMPLACER = object()
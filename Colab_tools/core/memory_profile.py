@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Profilage Memoire par Fichier et par Etape de Plugin
+Mesure avec tracemalloc le pic et la memoire retenue de chaque etape
+(parse, visit, unparse, entete) pour chaque fichier et chaque plugin,
+et produit un classement des plus gros consommateurs
+"""
+
+import ast
+import contextlib
+import os
+import tracemalloc
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Nombre de lignes d'allocation retenues conservees par fichier
+_SITES_PAR_FICHIER = 3
+
+
+class _Cadre:
+    """Etape en cours : memoire au debut et pic absolu observe."""
+
+    __slots__ = ('cle', 'debut', 'pic')
+
+    def __init__(self, cle, debut):
+        self.cle = cle
+        self.debut = debut
+        self.pic = debut
+
+
+class ProfileurMemoire:
+    """
+    Attribue les allocations aux fichiers, plugins et etapes.
+
+    Les etapes peuvent s'imbriquer (parse dans un plugin) : le pic d'une
+    etape interne est repercute sur l'etape englobante, car
+    tracemalloc.reset_peak() est appele a chaque changement d'etape; ces
+    compteurs ne coutent presque rien par fichier. Avec sites=True, deux
+    instantanes (tracemalloc.take_snapshot) par fichier donnent en plus les
+    lignes qui retiennent le plus de memoire : chaque instantane copie
+    toutes les traces, a reserver aux lots de diagnostic.
+    """
+
+    def __init__(self, profondeur: int = 1, sites: bool = False):
+        self.profondeur = profondeur
+        self.sites = sites
+        # (fichier, plugin, etape) -> {'appels', 'pic', 'retenu'}
+        self.etapes: Dict[Tuple[str, str, str], Dict[str, int]] = {}
+        # fichier -> {'pic', 'retenu', 'sites'}
+        self.fichiers: Dict[str, Dict] = {}
+        self._pile: List[_Cadre] = []
+        self._fichier: Optional[str] = None
+        self._plugin: Optional[str] = None
+        self._demarre_ici = False
+        self._originaux = None
+
+    # --- Cycle de vie ---
+
+    def demarrer(self):
+        """Active tracemalloc et instrumente ast.parse, ast.unparse et NodeVisitor.visit."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.profondeur)
+            self._demarre_ici = True
+        self._instrumenter()
+        return self
+
+    def arreter(self):
+        """Retire l'instrumentation (tracemalloc est arrete s'il a ete demarre ici)."""
+        self._desinstrumenter()
+        if self._demarre_ici:
+            tracemalloc.stop()
+            self._demarre_ici = False
+
+    def __enter__(self):
+        return self.demarrer()
+
+    def __exit__(self, *exc):
+        self.arreter()
+
+    def _instrumenter(self):
+        if self._originaux is not None:
+            return
+        profileur = self
+        parse, unparse, visit = ast.parse, ast.unparse, ast.NodeVisitor.visit
+        self._originaux = (parse, unparse, visit)
+
+        def parse_mesure(*args, **kwargs):
+            with profileur.etape('parse'):
+                return parse(*args, **kwargs)
+
+        def unparse_mesure(*args, **kwargs):
+            with profileur.etape('unparse'):
+                return unparse(*args, **kwargs)
+
+        def visit_mesure(visiteur, noeud):
+            # Les visites recursives restent dans l'etape englobante
+            if profileur._pile and profileur._pile[-1].cle == 'visit':
+                return visit(visiteur, noeud)
+            with profileur.etape('visit'):
+                return visit(visiteur, noeud)
+
+        ast.parse, ast.unparse, ast.NodeVisitor.visit = parse_mesure, unparse_mesure, visit_mesure
+
+    def _desinstrumenter(self):
+        if self._originaux is None:
+            return
+        ast.parse, ast.unparse, ast.NodeVisitor.visit = self._originaux
+        self._originaux = None
+
+    # --- Mesure ---
+
+    @contextlib.contextmanager
+    def fichier(self, chemin: str) -> Iterator[None]:
+        """Toutes les etapes executees dans ce bloc sont attribuees a chemin."""
+        avant = tracemalloc.take_snapshot() if self.sites else None
+        self._fichier = chemin
+        try:
+            with self.etape('fichier'):
+                yield
+        finally:
+            self._fichier = None
+            entree = self.fichiers.setdefault(chemin, {'pic': 0, 'retenu': 0, 'sites': []})
+            mesure = self.etapes.pop((chemin, '', 'fichier'), None)
+            if mesure:
+                entree['pic'] = max(entree['pic'], mesure['pic'])
+                entree['retenu'] += mesure['retenu']
+            if avant is not None:
+                # Les allocations du profileur lui-meme ne sont pas rapportees
+                filtres = [tracemalloc.Filter(False, __file__)]
+                apres = tracemalloc.take_snapshot().filter_traces(filtres)
+                statistiques = apres.compare_to(avant.filter_traces(filtres), 'lineno')
+                entree['sites'] = [
+                    (str(stat.traceback[0]), stat.size_diff)
+                    for stat in statistiques[:_SITES_PAR_FICHIER]
+                    if stat.size_diff > 0
+                ]
+
+    @contextlib.contextmanager
+    def plugin(self, nom: str) -> Iterator[None]:
+        """Les etapes de ce bloc sont attribuees au plugin nom."""
+        precedent = self._plugin
+        self._plugin = nom
+        try:
+            with self.etape('plugin'):
+                yield
+        finally:
+            self._plugin = precedent
+
+    @contextlib.contextmanager
+    def etape(self, etape: str) -> Iterator[None]:
+        """Mesure le pic et la memoire retenue du bloc."""
+        courant, pic = tracemalloc.get_traced_memory()
+        if self._pile:
+            parent = self._pile[-1]
+            parent.pic = max(parent.pic, pic)
+        tracemalloc.reset_peak()
+        cadre = _Cadre(etape, courant)
+        self._pile.append(cadre)
+        try:
+            yield
+        finally:
+            courant, pic = tracemalloc.get_traced_memory()
+            cadre.pic = max(cadre.pic, pic)
+            self._pile.pop()
+            if self._pile:
+                self._pile[-1].pic = max(self._pile[-1].pic, cadre.pic)
+            tracemalloc.reset_peak()
+            self._enregistrer(etape, cadre.pic - cadre.debut, courant - cadre.debut)
+
+    def _enregistrer(self, etape: str, pic: int, retenu: int):
+        if self._fichier is None:
+            return
+        plugin = '' if etape == 'fichier' else (self._plugin or '')
+        mesure = self.etapes.setdefault((self._fichier, plugin, etape),
+                                        {'appels': 0, 'pic': 0, 'retenu': 0})
+        mesure['appels'] += 1
+        mesure['pic'] = max(mesure['pic'], pic)
+        mesure['retenu'] += retenu
+
+    # --- Rapport ---
+
+    def classement(self, critere: str = 'pic', limite: int = 20) -> List[Dict]:
+        """Etapes triees par pic (ou memoire retenue) decroissant."""
+        lignes = [
+            {'fichier': fichier, 'plugin': plugin, 'etape': etape, **mesure}
+            for (fichier, plugin, etape), mesure in self.etapes.items()
+        ]
+        lignes.sort(key=lambda ligne: ligne[critere], reverse=True)
+        return lignes[:limite]
+
+    def rapport(self, limite: int = 20) -> str:
+        """Rapport texte : pires etapes, pires fichiers et lignes responsables."""
+        lignes = ["PROFIL MEMOIRE - PIRES ETAPES (pic)",
+                  f"{'Pic':>10} {'Retenu':>10} {'Appels':>6}  {'Etape':<8} {'Plugin':<32} Fichier"]
+        for ligne in self.classement('pic', limite):
+            lignes.append(f"{_taille(ligne['pic']):>10} {_taille(ligne['retenu']):>10} "
+                          f"{ligne['appels']:>6}  {ligne['etape']:<8} {ligne['plugin']:<32} "
+                          f"{os.path.basename(ligne['fichier'])}")
+
+        lignes += ["", "PROFIL MEMOIRE - PIRES FICHIERS",
+                   f"{'Pic':>10} {'Retenu':>10}  Fichier"]
+        pires = sorted(self.fichiers.items(), key=lambda item: item[1]['pic'], reverse=True)
+        for chemin, mesure in pires[:limite]:
+            lignes.append(f"{_taille(mesure['pic']):>10} {_taille(mesure['retenu']):>10}  {chemin}")
+            for site, taille in mesure['sites']:
+                lignes.append(f"{'':>23}+{_taille(taille)} {site}")
+        return "\n".join(lignes)
+
+
+def _taille(octets: int) -> str:
+    """Taille lisible (o, Ko, Mo)."""
+    signe = '-' if octets < 0 else ''
+    octets = abs(octets)
+    if octets < 1024:
+        return f"{signe}{octets} o"
+    if octets < 1024 * 1024:
+        return f"{signe}{octets / 1024:.1f} Ko"
+    return f"{signe}{octets / (1024 * 1024):.1f} Mo"
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache Disque des Analyses de Plugins
+Memorise, pour chaque couple (code source, plugin), le resultat de
+l'analyse : aucun changement, ou le code transforme. Un plugin applique
+a un fichier inchange ne reparse donc plus le fichier d'une execution a
+l'autre.
+
+Les arbres syntaxiques eux-memes ne sont pas conserves : avec CPython,
+recreer les noeuds depuis le disque (pickle, ou marshal puis
+reconstruction) coute plus cher que ast.parse. Le cache garde donc ce
+que l'arbre a permis de calculer.
+
+Cle : empreinte du code, du plugin (BaseTransformer.empreinte_cache) et
+de la version de Python. Les entrees sont compressees (zlib) et les moins
+recemment utilisees sont supprimees au-dela de la taille maximale.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import zlib
+from typing import Optional, Tuple
+
+# Taille maximale par defaut du cache (Mo)
+TAILLE_MAX_DEFAUT_MO = 256
+
+# Apres eviction, le cache redescend a cette fraction de la taille maximale
+_TAUX_APRES_EVICTION = 0.8
+
+# Version du format des entrees
+_VERSION_FORMAT = 1
+
+# Les analyses dependent de la grammaire (et de ast.unparse) de l'interpreteur
+_VERSION_PYTHON = f"{sys.implementation.cache_tag}-{sys.version_info[0]}.{sys.version_info[1]}.{sys.version_info[2]}"
+
+# Resultat absent du cache (None signifie "aucun changement")
+MANQUANT = object()
+
+
+def dossier_cache_defaut() -> str:
+    """Dossier utilisateur du cache (XDG_CACHE_HOME si defini)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'colab_tools', 'analyses')
+
+
+class CacheAnalyse:
+    """
+    Resultats d'analyse des plugins, sur disque.
+
+    Une entree par fichier (dossier/ab/abcdef...), ecrite de facon
+    atomique : plusieurs processus de travail peuvent partager le cache.
+    La date de modification d'une entree est mise a jour a chaque lecture
+    et sert a l'eviction (moins recemment utilisee en premier).
+    """
+
+    def __init__(self, dossier: Optional[str] = None, taille_max_mo: float = TAILLE_MAX_DEFAUT_MO):
+        self.dossier = os.path.abspath(dossier or dossier_cache_defaut())
+        self.taille_max = int(taille_max_mo * 1024 * 1024)
+        self.succes = 0
+        self.echecs = 0
+        # Taille totale, calculee au premier ajout
+        self._taille: Optional[int] = None
+
+    def __getstate__(self):
+        # Transmis aux processus de travail sans les compteurs ni la taille
+        return {'dossier': self.dossier, 'taille_max': self.taille_max}
+
+    def __setstate__(self, etat):
+        self.__init__(etat['dossier'])
+        self.taille_max = etat['taille_max']
+
+    @staticmethod
+    def cle(code: str, empreinte_plugin: str) -> str:
+        """Cle d'une entree : code, plugin et version de Python."""
+        h = hashlib.blake2b(digest_size=20)
+        for morceau in (_VERSION_PYTHON, empreinte_plugin):
+            h.update(morceau.encode('utf-8'))
+            h.update(b'\0')
+        h.update(code.encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def _chemin(self, cle: str) -> str:
+        return os.path.join(self.dossier, cle[:2], cle)
+
+    def lire(self, cle: str):
+        """
+        Resultat memorise.
+
+        Returns:
+            None si le plugin ne change rien, le code transforme, ou MANQUANT
+        """
+        chemin = self._chemin(cle)
+        try:
+            with open(chemin, 'rb') as f:
+                version, resultat = marshal.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            # Entree absente, tronquee ou d'un autre format : recalculee
+            self.echecs += 1
+            return MANQUANT
+        if version != _VERSION_FORMAT:
+            self.echecs += 1
+            return MANQUANT
+        try:
+            os.utime(chemin)
+        except OSError:
+            pass
+        self.succes += 1
+        return resultat
+
+    def ecrire(self, cle: str, resultat: Optional[str]):
+        """Memorise un resultat (None : aucun changement)."""
+        donnees = zlib.compress(marshal.dumps((_VERSION_FORMAT, resultat)))
+        chemin = self._chemin(cle)
+        try:
+            os.makedirs(os.path.dirname(chemin), exist_ok=True)
+            descripteur, temporaire = tempfile.mkstemp(dir=os.path.dirname(chemin), suffix='.tmp')
+            with os.fdopen(descripteur, 'wb') as f:
+                f.write(donnees)
+            os.replace(temporaire, chemin)
+        except OSError as e:
+            print(f"! Cache des analyses non ecrit: {e}")
+            return
+
+        if self._taille is None:
+            self._taille = self._mesurer()[0]
+        else:
+            self._taille += len(donnees)
+        if self._taille > self.taille_max:
+            self.evincer()
+
+    def _mesurer(self) -> Tuple[int, list]:
+        """Taille totale et entrees (date, taille, chemin)."""
+        total, entrees = 0, []
+        try:
+            sous_dossiers = list(os.scandir(self.dossier))
+        except OSError:
+            return 0, []
+        for sous_dossier in sous_dossiers:
+            if not sous_dossier.is_dir():
+                continue
+            try:
+                for entree in os.scandir(sous_dossier.path):
+                    etat = entree.stat()
+                    total += etat.st_size
+                    entrees.append((etat.st_mtime, etat.st_size, entree.path))
+            except OSError:
+                continue
+        return total, entrees
+
+    def evincer(self) -> int:
+        """
+        Supprime les entrees les moins recemment utilisees jusqu'a
+        redescendre sous la taille maximale (avec une marge).
+
+        Returns:
+            int: Nombre d'entrees supprimees
+        """
+        total, entrees = self._mesurer()
+        cible = int(self.taille_max * _TAUX_APRES_EVICTION)
+        supprimees = 0
+        if total > self.taille_max:
+            entrees.sort()
+            for _, taille, chemin in entrees:
+                if total <= cible:
+                    break
+                try:
+                    os.unlink(chemin)
+                except OSError:
+                    # Deja supprimee par un autre processus
+                    pass
+                total -= taille
+                supprimees += 1
+        self._taille = total
+        return supprimees
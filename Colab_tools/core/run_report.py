@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Rapport d'Execution d'un Lot
+Agrege les resultats par fichier (format de BatchPipeline) en un rapport
+structure : duree totale, debit, temps par plugin, latences p50/p95/p99,
+fichiers les plus lents avec le detail de leurs etapes et erreurs.
+Ecrit en JSON (exploitable par des scripts) et en HTML (lecture directe).
+"""
+
+import datetime
+import heapq
+import html
+import json
+import math
+import os
+import time
+from typing import Dict, List, Optional
+
+# Nombre de fichiers les plus lents conserves
+NOMBRE_LENTS_DEFAUT = 50
+
+# Messages d'erreur conserves dans le rapport (les compteurs restent exacts)
+_ERREURS_CONSERVEES = 100
+
+# Centiles de latence rapportes
+CENTILES = (50, 95, 99)
+
+
+def centile(valeurs_triees: List[float], rang: float) -> float:
+    """Centile par rang le plus proche (0 si aucune valeur)."""
+    if not valeurs_triees:
+        return 0.0
+    indice = math.ceil(rang * len(valeurs_triees) / 100) - 1
+    indice = max(0, min(len(valeurs_triees) - 1, indice))
+    return valeurs_triees[indice]
+
+
+class RapportExecution:
+    """
+    Collecte les resultats d'un lot au fil de l'eau.
+
+    Chaque resultat est un dict {'fichier', 'statut', 'duree_ms',
+    'plugins': [{'nom', 'duree_ms', 'applique'}...], 'erreur'} comme ceux
+    de BatchPipeline; les autres champs sont ignores. Seuls les N
+    fichiers les plus lents sont gardes en memoire (tas borne).
+    """
+
+    def __init__(self, titre: str = "Lot", nombre_lents: int = NOMBRE_LENTS_DEFAUT):
+        self.titre = titre
+        self.nombre_lents = nombre_lents
+        self.debut_date = datetime.datetime.now()
+        self._debut = time.perf_counter()
+        self._fin: Optional[float] = None
+        self.latences: List[float] = []
+        self.statuts: Dict[str, int] = {}
+        self.plugins: Dict[str, Dict[str, float]] = {}
+        self.erreurs: List[Dict[str, str]] = []
+        self.nombre_erreurs = 0
+        self.incidents: Dict[str, int] = {}
+        self._lents: List = []
+        self._ordre = 0
+
+    def ajouter(self, resultat: Dict):
+        """Prend en compte le resultat d'un fichier."""
+        duree = float(resultat.get('duree_ms') or 0.0)
+        statut = resultat.get('statut', 'inconnu')
+        self.latences.append(duree)
+        self.statuts[statut] = self.statuts.get(statut, 0) + 1
+
+        etapes = {}
+        for etape in resultat.get('plugins', []):
+            nom = etape['nom']
+            cumul = self.plugins.setdefault(nom, {'duree_ms': 0.0, 'fichiers': 0, 'appliques': 0})
+            cumul['duree_ms'] += etape.get('duree_ms') or 0.0
+            cumul['fichiers'] += 1
+            cumul['appliques'] += 1 if etape.get('applique') else 0
+            etapes[nom] = etapes.get(nom, 0.0) + (etape.get('duree_ms') or 0.0)
+
+        if statut == 'erreur':
+            self.nombre_erreurs += 1
+            incident = resultat.get('incident')
+            if incident:
+                self.incidents[incident] = self.incidents.get(incident, 0) + 1
+            if len(self.erreurs) < _ERREURS_CONSERVEES:
+                self.erreurs.append({'fichier': resultat.get('fichier', ''),
+                                     'erreur': resultat.get('erreur') or ''})
+
+        entree = (duree, self._ordre, {
+            'fichier': resultat.get('fichier', ''),
+            'statut': statut,
+            'duree_ms': round(duree, 3),
+            'etapes': {nom: round(ms, 3) for nom, ms in etapes.items()},
+        })
+        self._ordre += 1
+        if len(self._lents) < self.nombre_lents:
+            heapq.heappush(self._lents, entree)
+        elif self.nombre_lents and entree[:2] > self._lents[0][:2]:
+            heapq.heapreplace(self._lents, entree)
+
+    def terminer(self, duree_s: Optional[float] = None):
+        """
+        Fige la duree totale (sinon mesuree au moment du rapport), ou
+        l'impose (rapport reconstitue, par exemple fusion de shards).
+        """
+        self._fin = time.perf_counter() if duree_s is None else self._debut + duree_s
+        return self
+
+    # --- Rapport ---
+
+    def donnees(self) -> Dict:
+        """Rapport complet, serialisable en JSON."""
+        duree_totale = (self._fin or time.perf_counter()) - self._debut
+        nombre = len(self.latences)
+        triees = sorted(self.latences)
+        return {
+            'titre': self.titre,
+            'debut': self.debut_date.isoformat(timespec='seconds'),
+            'duree_totale_s': round(duree_totale, 3),
+            'fichiers': nombre,
+            'fichiers_par_s': round(nombre / duree_totale, 2) if duree_totale > 0 else 0.0,
+            'statuts': dict(self.statuts),
+            'latence_ms': dict(
+                {f"p{rang}": round(centile(triees, rang), 3) for rang in CENTILES},
+                moyenne=round(sum(triees) / nombre, 3) if nombre else 0.0,
+                max=round(triees[-1], 3) if triees else 0.0),
+            'plugins': {
+                nom: {'duree_ms': round(cumul['duree_ms'], 3), 'fichiers': cumul['fichiers'],
+                      'appliques': cumul['appliques'],
+                      'moyenne_ms': round(cumul['duree_ms'] / cumul['fichiers'], 3)}
+                for nom, cumul in sorted(self.plugins.items(),
+                                         key=lambda item: item[1]['duree_ms'], reverse=True)
+            },
+            'erreurs': {'nombre': self.nombre_erreurs, 'incidents': dict(self.incidents),
+                        'details': list(self.erreurs)},
+            'plus_lents': [entree for _, _, entree in sorted(self._lents, reverse=True)],
+        }
+
+    def resume(self) -> List[str]:
+        """Lignes de resume pour la console."""
+        d = self.donnees()
+        latence = d['latence_ms']
+        lignes = [
+            f"{d['fichiers']} fichier(s) en {d['duree_totale_s']:.2f} s "
+            f"({d['fichiers_par_s']:.1f} fichiers/s), {d['erreurs']['nombre']} erreur(s)",
+            f"Latence par fichier : p50 {latence['p50']:.1f} ms, p95 {latence['p95']:.1f} ms, "
+            f"p99 {latence['p99']:.1f} ms, max {latence['max']:.1f} ms",
+        ]
+        for nom, cumul in list(d['plugins'].items())[:5]:
+            lignes.append(f"  {nom}: {cumul['duree_ms'] / 1000:.2f} s "
+                          f"({cumul['appliques']}/{cumul['fichiers']} applique(s))")
+        return lignes
+
+    def ecrire(self, prefixe: str) -> List[str]:
+        """
+        Ecrit <prefixe>.json et <prefixe>.html.
+
+        Returns:
+            list: Chemins ecrits
+        """
+        donnees = self.donnees()
+        dossier = os.path.dirname(os.path.abspath(prefixe))
+        os.makedirs(dossier, exist_ok=True)
+        chemins = [prefixe + '.json', prefixe + '.html']
+        with open(chemins[0], 'w', encoding='utf-8') as f:
+            json.dump(donnees, f, ensure_ascii=False, indent=2)
+        with open(chemins[1], 'w', encoding='utf-8') as f:
+            f.write(rapport_html(donnees))
+        return chemins
+
+
+def _ligne(cellules, entete: bool = False, suffixe: str = '') -> str:
+    """Ligne de tableau (cellules echappees, suffixe HTML brut)."""
+    balise = 'th' if entete else 'td'
+    return ("<tr>" + "".join(f"<{balise}>{html.escape(str(c))}</{balise}>" for c in cellules)
+            + suffixe + "</tr>")
+
+
+def rapport_html(donnees: Dict) -> str:
+    """Page HTML autonome a partir de RapportExecution.donnees()."""
+    latence = donnees['latence_ms']
+    morceaux = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>{html.escape(donnees['titre'])}</title>",
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin:1em 0}"
+        "td,th{border:1px solid #ccc;padding:3px 8px;text-align:left}th{background:#eee}"
+        ".barre{background:#4a90d9;height:10px}</style></head><body>",
+        f"<h1>{html.escape(donnees['titre'])}</h1>",
+        f"<p>Debut : {html.escape(donnees['debut'])} - duree totale : {donnees['duree_totale_s']:.2f} s"
+        f" - {donnees['fichiers']} fichier(s), {donnees['fichiers_par_s']:.1f} fichiers/s</p>",
+        "<h2>Statuts et erreurs</h2><table>",
+        _ligne(["Statut", "Fichiers"], entete=True),
+    ]
+    morceaux += [_ligne([statut, nombre]) for statut, nombre in sorted(donnees['statuts'].items())]
+    morceaux += [_ligne([f"incident: {nom}", nombre])
+                 for nom, nombre in sorted(donnees['erreurs']['incidents'].items())]
+    morceaux.append("</table>")
+
+    morceaux += ["<h2>Latence par fichier (ms)</h2><table>",
+                 _ligne(list(latence), entete=True),
+                 _ligne([f"{valeur:.1f}" for valeur in latence.values()]), "</table>"]
+
+    morceaux += ["<h2>Temps par plugin</h2><table>",
+                 _ligne(["Plugin", "Total (s)", "Fichiers", "Appliques", "Moyenne (ms)", ""], entete=True)]
+    total_max = max([c['duree_ms'] for c in donnees['plugins'].values()] or [0]) or 1
+    for nom, cumul in donnees['plugins'].items():
+        largeur = int(200 * cumul['duree_ms'] / total_max)
+        morceaux.append(_ligne([nom, f"{cumul['duree_ms'] / 1000:.2f}", cumul['fichiers'],
+                                cumul['appliques'], f"{cumul['moyenne_ms']:.1f}"],
+                               suffixe=f"<td><div class='barre' style='width:{largeur}px'></div></td>"))
+    morceaux.append("</table>")
+
+    morceaux += [f"<h2>{len(donnees['plus_lents'])} fichiers les plus lents</h2><table>",
+                 _ligne(["Duree (ms)", "Statut", "Fichier", "Etapes (ms)"], entete=True)]
+    for entree in donnees['plus_lents']:
+        etapes = ", ".join(f"{nom} {ms:.1f}" for nom, ms in entree['etapes'].items())
+        morceaux.append(_ligne([f"{entree['duree_ms']:.1f}", entree['statut'],
+                                entree['fichier'], etapes]))
+    morceaux.append("</table>")
+
+    if donnees['erreurs']['details']:
+        morceaux += ["<h2>Erreurs</h2><table>", _ligne(["Fichier", "Erreur"], entete=True)]
+        morceaux += [_ligne([e['fichier'], e['erreur']]) for e in donnees['erreurs']['details']]
+        morceaux.append("</table>")
+    morceaux.append("</body></html>\n")
+    return "\n".join(morceaux)
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Serveur de Transformations Persistant
+Garde le TransformationLoader et ses plugins charges et repond aux
+requetes transform / preview / analyze sur un socket Unix (lignes JSON)
+ou en HTTP sur localhost. Le socket Unix n'est accessible qu'a son
+proprietaire (0600); en HTTP, chaque requete doit presenter le secret de
+la session (ecrit dans un fichier 0600 lu par le client), un en-tete Host
+local et un corps application/json, afin qu'une page web ou un autre
+utilisateur de la machine ne puisse pas piloter le serveur.
+"""
+
+import ast
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from .batch_pipeline import BatchPipeline
+
+# Operations acceptees par le service
+OPERATIONS = ('transform', 'preview', 'analyze', 'list', 'ping', 'reload', 'shutdown')
+
+# Taille maximale d'un corps de requete HTTP (octets)
+TAILLE_REQUETE_MAX = 64 * 1024 * 1024
+
+
+def chemin_socket_defaut() -> str:
+    """Socket propre a l'utilisateur dans le dossier temporaire."""
+    uid = os.getuid() if hasattr(os, 'getuid') else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"ast_transformations_{uid}.sock")
+
+
+def chemin_secret_defaut(port: int) -> str:
+    """Fichier du secret de session HTTP, propre a l'utilisateur et au port."""
+    uid = os.getuid() if hasattr(os, 'getuid') else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"ast_transformations_{uid}_{port}.secret")
+
+
+def ecrire_secret(chemin: str) -> str:
+    """Genere un secret de session et l'ecrit dans un fichier lisible par son seul proprietaire."""
+    secret = secrets.token_urlsafe(32)
+    if os.path.lexists(chemin):
+        os.unlink(chemin)
+    # O_EXCL : jamais ecrit a travers un lien ou un fichier prepare par un tiers
+    descripteur = os.open(chemin, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(descripteur, 'w', encoding='utf-8') as f:
+        f.write(secret)
+    return secret
+
+
+def lire_secret(chemin: str) -> str:
+    """Secret de session ecrit par le serveur."""
+    with open(chemin, 'r', encoding='utf-8') as f:
+        return f.read().strip()
+
+
+class ErreurRequete(ValueError):
+    """Requete mal formee ou plugin inconnu."""
+
+
+class ServiceTransformations:
+    """
+    Traite les requetes avec des plugins deja charges.
+
+    Une requete est un dict {'op': ..., 'plugins': [...], 'code': ...}
+    (ou 'fichier' a la place de 'code'); la reponse reprend son 'id'.
+    Les plugins n'etant pas garantis reentrants, leur execution est
+    serialisee par un verrou.
+    """
+
+    def __init__(self, loader=None):
+        if loader is None:
+            from .transformation_loader import TransformationLoader
+            loader = TransformationLoader()
+        self.loader = loader
+        self._verrou = threading.Lock()
+        self._pipelines: Dict[tuple, BatchPipeline] = {}
+        self.arret = threading.Event()
+
+    def traiter_requete(self, requete: Dict) -> Dict:
+        """Execute une requete et retourne la reponse (jamais d'exception)."""
+        debut = time.perf_counter()
+        reponse = {'id': requete.get('id') if isinstance(requete, dict) else None}
+        try:
+            if not isinstance(requete, dict):
+                raise ErreurRequete("La requete doit etre un objet JSON")
+            op = requete.get('op', 'transform')
+            if op not in OPERATIONS:
+                raise ErreurRequete(f"Operation inconnue: {op} (attendues: {', '.join(OPERATIONS)})")
+            reponse.update(getattr(self, f"_op_{op}")(requete))
+            reponse['ok'] = True
+        except ErreurRequete as e:
+            reponse.update(ok=False, erreur=str(e))
+        except Exception as e:
+            reponse.update(ok=False, erreur=f"{type(e).__name__}: {e}")
+        reponse['duree_ms'] = round((time.perf_counter() - debut) * 1000, 3)
+        return reponse
+
+    # --- Operations ---
+
+    def _op_ping(self, requete):
+        return {'plugins': len(self.loader.list_transformations())}
+
+    def _op_list(self, requete):
+        return {'plugins': [
+            {'plugin': nom, 'nom': m.get('name'), 'version': m.get('version'),
+             'description': m.get('description')}
+            for nom, m in self.loader.get_transformation_metadata().items()
+        ]}
+
+    def _op_reload(self, requete):
+        with self._verrou:
+            self._pipelines.clear()
+            return {'plugins': self.loader.reload_plugins()}
+
+    def _op_shutdown(self, requete):
+        self.arret.set()
+        return {}
+
+    def _op_transform(self, requete):
+        code = self._code(requete)
+        plugins = self._plugins(requete)
+        with self._verrou:
+            pipeline = self._pipeline(plugins)
+            resultat, code_final = pipeline.traiter_source(requete.get('fichier') or '<requete>', code)
+        return {
+            'statut': resultat['statut'],
+            'plugins': resultat['plugins'],
+            'erreur': resultat['erreur'],
+            'code': code_final if code_final is not None else code,
+        }
+
+    def _op_preview(self, requete):
+        code = self._code(requete)
+        apercus = {}
+        with self._verrou:
+            for nom in self._plugins(requete):
+                apercus[nom] = self.loader.get_transformation(nom).preview_changes(code)
+        return {'apercus': apercus}
+
+    def _op_analyze(self, requete):
+        code = self._code(requete)
+        analyse = {'lignes': code.count('\n') + (1 if code and not code.endswith('\n') else 0)}
+        try:
+            arbre = ast.parse(code)
+        except SyntaxError as e:
+            analyse.update(syntaxe_valide=False, erreur_syntaxe=f"ligne {e.lineno}: {e.msg}")
+            return analyse
+
+        analyse['syntaxe_valide'] = True
+        analyse['fonctions'] = sum(isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
+                                   for n in ast.walk(arbre))
+        analyse['classes'] = sum(isinstance(n, ast.ClassDef) for n in ast.walk(arbre))
+        noms = requete.get('plugins') or self.loader.list_transformations()
+        with self._verrou:
+            analyse['applicables'] = [nom for nom in self._plugins({'plugins': noms})
+                                      if self.loader.get_transformation(nom).can_transform(code)]
+        return analyse
+
+    # --- Utilitaires ---
+
+    def _code(self, requete) -> str:
+        if isinstance(requete.get('code'), str):
+            return requete['code']
+        fichier = requete.get('fichier')
+        if not fichier:
+            raise ErreurRequete("Champ 'code' ou 'fichier' requis")
+        try:
+            with open(fichier, 'r', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise ErreurRequete(f"Lecture impossible: {e}")
+
+    def _plugins(self, requete) -> List[str]:
+        plugins = requete.get('plugins')
+        if isinstance(plugins, str):
+            plugins = [p.strip() for p in plugins.split(',') if p.strip()]
+        if not plugins:
+            raise ErreurRequete("Champ 'plugins' requis")
+        inconnus = [p for p in plugins if not self.loader.get_transformation(p)]
+        if inconnus:
+            raise ErreurRequete(f"Plugin(s) inconnu(s): {', '.join(inconnus)}")
+        return list(plugins)
+
+    def _pipeline(self, plugins: List[str]) -> BatchPipeline:
+        cle = tuple(plugins)
+        pipeline = self._pipelines.get(cle)
+        if pipeline is None:
+            pipeline = BatchPipeline(plugins, loader=self.loader, dry_run=True).preparer()
+            self._pipelines[cle] = pipeline
+        return pipeline
+
+
+class _GestionnaireLignes(socketserver.StreamRequestHandler):
+    """Une requete JSON par ligne, une reponse JSON par ligne."""
+
+    def handle(self):
+        service = self.server.service
+        for ligne in self.rfile:
+            if not ligne.strip():
+                continue
+            try:
+                requete = json.loads(ligne)
+            except ValueError as e:
+                reponse = {'id': None, 'ok': False, 'erreur': f"JSON invalide: {e}"}
+            else:
+                reponse = service.traiter_requete(requete)
+            self.wfile.write(json.dumps(reponse, ensure_ascii=False).encode('utf-8') + b"\n")
+            self.wfile.flush()
+            if service.arret.is_set():
+                break
+
+
+class _GestionnaireHTTP(BaseHTTPRequestHandler):
+    """
+    POST /<op> avec un corps JSON; GET /ping et /list.
+
+    Toute requete doit porter 'Authorization: Bearer <secret>' et un Host
+    local (contre le DNS rebinding); un POST doit etre en application/json
+    (un formulaire HTML ne peut pas envoyer ce type sans preflight CORS).
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    # Noms d'hote acceptes dans l'en-tete Host
+    HOTES_LOCAUX = ('127.0.0.1', 'localhost')
+
+    def do_GET(self):
+        if self._autorise():
+            self._repondre({'op': self.path.strip('/') or 'ping'})
+
+    def do_POST(self):
+        if not self._autorise():
+            return
+        type_contenu = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if type_contenu != 'application/json':
+            self._envoyer(415, {'ok': False, 'erreur': "Content-Type application/json requis"})
+            return
+        try:
+            longueur = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            longueur = -1
+        if not 0 <= longueur <= TAILLE_REQUETE_MAX:
+            # Corps non lu : la connexion ne peut pas etre reutilisee
+            self.close_connection = True
+            if longueur < 0:
+                self._envoyer(400, {'ok': False, 'erreur': "Content-Length invalide"})
+            else:
+                self._envoyer(413, {'ok': False, 'erreur': "Requete trop volumineuse "
+                                    f"(maximum {TAILLE_REQUETE_MAX} octets)"})
+            return
+        try:
+            requete = json.loads(self.rfile.read(longueur) or b'{}')
+        except ValueError as e:
+            self._envoyer(400, {'ok': False, 'erreur': f"JSON invalide: {e}"})
+            return
+        if isinstance(requete, dict) and self.path.strip('/'):
+            requete.setdefault('op', self.path.strip('/'))
+        self._repondre(requete)
+
+    def _autorise(self) -> bool:
+        """Verifie l'hote et le secret; repond 403 ou 401 sinon."""
+        hote = (self.headers.get('Host') or '').rsplit(':', 1)[0].lower()
+        if hote not in self.HOTES_LOCAUX:
+            self._envoyer(403, {'ok': False, 'erreur': f"Hote refuse: {hote or '(absent)'}"})
+            return False
+        attendu = f"Bearer {self.server.secret}".encode('utf-8')
+        recu = (self.headers.get('Authorization') or '').encode('utf-8')
+        if not hmac.compare_digest(recu, attendu):
+            self._envoyer(401, {'ok': False, 'erreur': "Secret de session absent ou invalide"})
+            return False
+        return True
+
+    def _repondre(self, requete):
+        reponse = self.server.service.traiter_requete(requete)
+        self._envoyer(200 if reponse['ok'] else 400, reponse)
+
+    def _envoyer(self, code, reponse):
+        corps = json.dumps(reponse, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corps)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ServeurUnix(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ServeurTransformations:
+    """
+    Expose un ServiceTransformations sur un socket Unix et/ou en HTTP local.
+
+    Sans socket Unix disponible (Windows), seul le HTTP local est ouvert.
+    Le secret de la session HTTP est ecrit dans chemin_secret (par defaut
+    chemin_secret_defaut(port)) et supprime a l'arret.
+    """
+
+    def __init__(self, service: Optional[ServiceTransformations] = None,
+                 chemin_socket: Optional[str] = None, port_http: Optional[int] = None,
+                 hote: str = '127.0.0.1', chemin_secret: Optional[str] = None):
+        self.service = service or ServiceTransformations()
+        self.chemin_socket = chemin_socket
+        self.port_http = port_http
+        self.hote = hote
+        self.chemin_secret = chemin_secret
+        self._serveurs = []
+
+    def demarrer(self):
+        """Ouvre les points d'ecoute et lance un thread par serveur."""
+        if self.chemin_socket:
+            if not hasattr(socket, 'AF_UNIX'):
+                raise OSError("Sockets Unix indisponibles, utiliser le HTTP local")
+            if os.path.exists(self.chemin_socket):
+                self._verifier_socket_libre()
+                os.unlink(self.chemin_socket)
+            # Socket cree directement en 0600 : pas de fenetre avant un chmod
+            masque = os.umask(0o177)
+            try:
+                serveur = _ServeurUnix(self.chemin_socket, _GestionnaireLignes)
+            finally:
+                os.umask(masque)
+            serveur.service = self.service
+            self._serveurs.append(serveur)
+
+        if self.port_http is not None:
+            serveur = ThreadingHTTPServer((self.hote, self.port_http), _GestionnaireHTTP)
+            serveur.daemon_threads = True
+            serveur.service = self.service
+            self.port_http = serveur.server_address[1]
+            chemin_secret = self.chemin_secret or chemin_secret_defaut(self.port_http)
+            try:
+                serveur.secret = ecrire_secret(chemin_secret)
+            except OSError:
+                serveur.server_close()
+                raise
+            self.chemin_secret = chemin_secret
+            self._serveurs.append(serveur)
+
+        if not self._serveurs:
+            raise ValueError("Aucun point d'ecoute (socket Unix ou port HTTP)")
+
+        for serveur in self._serveurs:
+            threading.Thread(target=serveur.serve_forever, kwargs={'poll_interval': 0.1},
+                             daemon=True).start()
+        return self
+
+    def _verifier_socket_libre(self):
+        """Refuse de remplacer le socket d'un serveur encore actif."""
+        sonde = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sonde.connect(self.chemin_socket)
+        except OSError:
+            return
+        finally:
+            sonde.close()
+        raise OSError(f"Un serveur ecoute deja sur {self.chemin_socket}")
+
+    def attendre(self):
+        """Bloque jusqu'a une requete 'shutdown' ou Ctrl+C."""
+        try:
+            while not self.service.arret.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.arreter()
+
+    def arreter(self):
+        for serveur in self._serveurs:
+            serveur.shutdown()
+            serveur.server_close()
+        self._serveurs = []
+        if self.chemin_socket and os.path.exists(self.chemin_socket):
+            os.unlink(self.chemin_socket)
+        if self.chemin_secret and os.path.exists(self.chemin_secret):
+            os.unlink(self.chemin_secret)
+
+
+class ClientTransformations:
+    """
+    Client leger : garde une connexion ouverte vers le serveur.
+
+    Utilise le socket Unix si chemin_socket est donne, sinon le HTTP local
+    avec le secret de session lu dans chemin_secret (par defaut
+    chemin_secret_defaut(port_http)).
+    """
+
+    def __init__(self, chemin_socket: Optional[str] = None, port_http: Optional[int] = None,
+                 hote: str = '127.0.0.1', timeout: float = 30.0,
+                 chemin_secret: Optional[str] = None):
+        self.chemin_socket = chemin_socket
+        self.port_http = port_http
+        self.hote = hote
+        self.timeout = timeout
+        self.chemin_secret = chemin_secret
+        self._secret = None
+        self._connexion = None
+        self._flux = None
+        self._compteur = 0
+
+    def requete(self, op: str, **champs) -> Dict:
+        """Envoie une requete et retourne la reponse decodee."""
+        self._compteur += 1
+        requete = dict(champs, op=op, id=self._compteur)
+        if self.chemin_socket:
+            return self._requete_socket(requete)
+        return self._requete_http(requete)
+
+    def transform(self, code: str, plugins: List[str]) -> Dict:
+        return self.requete('transform', code=code, plugins=plugins)
+
+    def preview(self, code: str, plugins: List[str]) -> Dict:
+        return self.requete('preview', code=code, plugins=plugins)
+
+    def analyze(self, code: str, plugins: Optional[List[str]] = None) -> Dict:
+        return self.requete('analyze', code=code, plugins=plugins)
+
+    def _requete_socket(self, requete):
+        if self._connexion is None:
+            self._connexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._connexion.settimeout(self.timeout)
+            self._connexion.connect(self.chemin_socket)
+            self._flux = self._connexion.makefile('rb')
+        self._connexion.sendall(json.dumps(requete, ensure_ascii=False).encode('utf-8') + b"\n")
+        ligne = self._flux.readline()
+        if not ligne:
+            self.fermer()
+            raise ConnectionError("Connexion fermee par le serveur")
+        return json.loads(ligne)
+
+    def _requete_http(self, requete):
+        import http.client
+
+        if self._connexion is None:
+            self._secret = lire_secret(self.chemin_secret or
+                                       chemin_secret_defaut(self.port_http))
+            self._connexion = http.client.HTTPConnection(self.hote, self.port_http,
+                                                         timeout=self.timeout)
+        corps = json.dumps(requete, ensure_ascii=False).encode('utf-8')
+        self._connexion.request('POST', f"/{requete['op']}", body=corps,
+                                headers={'Content-Type': 'application/json',
+                                         'Authorization': f"Bearer {self._secret}"})
+        return json.loads(self._connexion.getresponse().read())
+
+    def fermer(self):
+        if self._flux is not None:
+            self._flux.close()
+            self._flux = None
+        if self._connexion is not None:
+            self._connexion.close()
+            self._connexion = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
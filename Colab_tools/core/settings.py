@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parametres Partages du Systeme de Transformations
+Lit tests/config/test_settings.json et complete avec les valeurs par defaut
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Fichier de parametres du projet
+CHEMIN_PARAMETRES_DEFAUT = Path(__file__).parent.parent / "tests" / "config" / "test_settings.json"
+
+# Valeurs utilisees si le fichier est absent ou incomplet
+PARAMETRES_DEFAUT: Dict[str, Any] = {
+    'timeout_seconds': 30,
+    'max_file_size_mb': 10,
+    'enable_cache': True,
+    'log_level': 'INFO',
+    'output_format': 'json',
+    'parallel_tests': True,
+    'max_workers': 4,
+    'max_rss_mb': 1024,
+}
+
+
+def charger_parametres(chemin: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Charge les parametres depuis le fichier JSON du projet.
+
+    Args:
+        chemin: Fichier de parametres (par defaut tests/config/test_settings.json)
+
+    Returns:
+        dict: Parametres fusionnes avec les valeurs par defaut
+    """
+    parametres = dict(PARAMETRES_DEFAUT)
+    fichier = Path(chemin) if chemin else CHEMIN_PARAMETRES_DEFAUT
+
+    try:
+        with open(fichier, 'r', encoding='utf-8') as f:
+            donnees = json.load(f)
+        if isinstance(donnees, dict):
+            parametres.update(donnees)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"! Parametres illisibles ({fichier}): {e}")
+
+    return parametres
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Partage d'un Lot en Shards
+Repartit les fichiers d'un lot entre N shards d'apres une empreinte
+stable de leur chemin relatif aux racines : chaque machine (ou processus)
+qui voit le meme arbre, partage ou synchronise, calcule la meme partition
+sans coordination.
+
+Chaque shard ecrit un manifeste JSON lines : une ligne d'en-tete, une
+ligne par fichier traite (format de BatchPipeline), une ligne de fin. La
+fusion verifie que tous les shards sont presents et complets, puis
+recombine les resultats en un seul lot et un seul rapport.
+"""
+
+import datetime
+import glob
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .batch_pipeline import chemin_relatif
+
+# Version du format des manifestes
+VERSION_MANIFESTE = 1
+
+
+def analyser_shard(texte: str) -> Tuple[int, int]:
+    """
+    Lit une designation 'i/N' (shard i parmi N, de 0 a N-1).
+
+    Raises:
+        ValueError: Si la designation est invalide
+    """
+    try:
+        indice, total = (int(partie) for partie in texte.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard invalide: {texte!r} (attendu i/N, par exemple 0/4)") from None
+    if total < 1 or not 0 <= indice < total:
+        raise ValueError(f"Shard invalide: {texte!r} (0 <= i < N)")
+    return indice, total
+
+
+def numero_shard(relatif: str, total: int) -> int:
+    """Shard d'un chemin relatif, identique sur toutes les machines."""
+    relatif = relatif.replace(os.sep, '/')
+    empreinte = hashlib.blake2b(relatif.encode('utf-8', 'surrogateescape'), digest_size=8)
+    return int.from_bytes(empreinte.digest(), 'big') % total
+
+
+def filtrer(fichiers: Iterable[str], roots: Iterable[str], indice: int, total: int) -> Iterator[str]:
+    """Ne garde que les fichiers du shard demande."""
+    roots = [os.path.abspath(r) for r in roots]
+    for chemin in fichiers:
+        if numero_shard(chemin_relatif(chemin, roots), total) == indice:
+            yield chemin
+
+
+def nom_manifeste(indice: int, total: int) -> str:
+    return f"shard-{indice:04d}-de-{total:04d}.jsonl"
+
+
+class ManifesteShard:
+    """
+    Manifeste d'un shard, ecrit au fil du lot.
+
+    Sans ligne de fin (shard interrompu), la fusion le considere incomplet.
+    """
+
+    def __init__(self, dossier: str, indice: int, total: int, plugins: List[str],
+                 racines: Iterable[str] = ()):
+        os.makedirs(dossier, exist_ok=True)
+        self.chemin = os.path.join(dossier, nom_manifeste(indice, total))
+        self.compteurs: Dict[str, int] = {}
+        self._debut = time.perf_counter()
+        self._fichier = open(self.chemin, 'w', encoding='utf-8')
+        self._ecrire({
+            'manifeste': VERSION_MANIFESTE,
+            'shard': indice,
+            'shards': total,
+            'plugins': list(plugins),
+            'racines': [str(r) for r in racines],
+            'machine': os.uname().nodename if hasattr(os, 'uname') else '',
+            'debut': datetime.datetime.now().isoformat(timespec='seconds'),
+        })
+
+    def _ecrire(self, donnees: Dict):
+        self._fichier.write(json.dumps(donnees, ensure_ascii=False) + "\n")
+
+    def ajouter(self, resultat: Dict):
+        """Enregistre le resultat d'un fichier."""
+        statut = resultat.get('statut', 'inconnu')
+        self.compteurs[statut] = self.compteurs.get(statut, 0) + 1
+        self._ecrire({'resultat': resultat})
+
+    def fermer(self, complet: bool = True):
+        """Ferme le manifeste, avec la ligne de fin si le shard est complet."""
+        if complet:
+            self._ecrire({'fin': True, 'duree_s': round(time.perf_counter() - self._debut, 3),
+                          'compteurs': self.compteurs})
+        self._fichier.close()
+
+
+def lire_manifeste(chemin: str) -> Tuple[Dict, List[Dict], Optional[Dict]]:
+    """
+    Relit un manifeste.
+
+    Returns:
+        tuple: (en-tete, resultats, ligne de fin ou None si incomplet)
+
+    Raises:
+        ValueError: Si le fichier n'est pas un manifeste de shard
+    """
+    entete, resultats, fin = None, [], None
+    with open(chemin, 'r', encoding='utf-8') as f:
+        for numero, ligne in enumerate(f):
+            try:
+                donnees = json.loads(ligne)
+            except json.JSONDecodeError:
+                # Derniere ligne tronquee par une interruption
+                break
+            if numero == 0:
+                if donnees.get('manifeste') != VERSION_MANIFESTE:
+                    raise ValueError(f"Manifeste de shard invalide: {chemin}")
+                entete = donnees
+            elif 'resultat' in donnees:
+                resultats.append(donnees['resultat'])
+            elif donnees.get('fin'):
+                fin = donnees
+    if entete is None:
+        raise ValueError(f"Manifeste de shard vide: {chemin}")
+    return entete, resultats, fin
+
+
+def fusionner(dossier: str) -> Dict:
+    """
+    Rassemble les manifestes d'un dossier.
+
+    Returns:
+        dict: 'shards' (N), 'plugins', 'entetes' (par shard, avec 'duree_s'),
+        'resultats' (tries par chemin relatif), 'manquants', 'incomplets',
+        'doublons' (chemins traites par plusieurs shards)
+
+    Raises:
+        ValueError: Aucun manifeste, ou manifestes de lots differents
+    """
+    chemins = sorted(glob.glob(os.path.join(dossier, "shard-*-de-*.jsonl")))
+    if not chemins:
+        raise ValueError(f"Aucun manifeste de shard dans {dossier}")
+
+    entetes: Dict[int, Dict] = {}
+    incomplets = []
+    par_relatif: Dict[str, Dict] = {}
+    doublons = []
+    total = plugins = None
+    for chemin in chemins:
+        entete, resultats, fin = lire_manifeste(chemin)
+        if total is None:
+            total, plugins = entete['shards'], entete['plugins']
+        elif (entete['shards'], entete['plugins']) != (total, plugins):
+            raise ValueError(f"{os.path.basename(chemin)} provient d'un autre lot "
+                             f"({entete['shards']} shards, plugins {entete['plugins']})")
+        indice = entete['shard']
+        if fin is None:
+            incomplets.append(indice)
+        entetes[indice] = dict(entete, duree_s=(fin or {}).get('duree_s'),
+                               fichiers=len(resultats), manifeste=chemin)
+        for resultat in resultats:
+            relatif = resultat.get('relatif') or resultat.get('fichier', '')
+            if relatif in par_relatif:
+                doublons.append(relatif)
+            par_relatif[relatif] = resultat
+
+    return {
+        'shards': total,
+        'plugins': plugins,
+        'entetes': [entetes[i] for i in sorted(entetes)],
+        'resultats': [par_relatif[relatif] for relatif in sorted(par_relatif)],
+        'manquants': [i for i in range(total) if i not in entetes],
+        'incomplets': sorted(incomplets),
+        'doublons': doublons,
+    }
+
+
+def rapport_fusion(fusion: Dict, titre: Optional[str] = None):
+    """
+    Rapport d'execution du lot complet : la duree est celle du shard
+    le plus long (les shards s'executent en parallele).
+    """
+    from .run_report import RapportExecution
+
+    rapport = RapportExecution(titre or f"Lot {', '.join(fusion['plugins'])} "
+                                        f"({fusion['shards']} shards)")
+    for resultat in fusion['resultats']:
+        rapport.ajouter(resultat)
+    debuts = [e['debut'] for e in fusion['entetes'] if e.get('debut')]
+    if debuts:
+        rapport.debut_date = datetime.datetime.fromisoformat(min(debuts))
+    durees = [e['duree_s'] for e in fusion['entetes'] if e.get('duree_s') is not None]
+    return rapport.terminer(max(durees) if durees else None)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tampons d'Idempotence
+Chaque plugin applique laisse en tete du fichier une ligne de commentaire
+avec son nom, sa version, l'empreinte de sa configuration
+(BaseTransformer.empreinte_cache : code du plugin, instructions chargees)
+et celle du corps produit, tampons exclus :
+
+    # colab-tools: print_to_logging_transform 2.1 config=9b1e04c2d7aa5f30 corps=3f2a9c0d51e4b7a8
+
+Les tampons se relisent sans analyse. Un plugin n'est saute que si sa
+configuration est la meme et si le corps du fichier n'a pas change
+depuis le tampon : un fichier modifie a la main est retransforme.
+"""
+
+import hashlib
+import re
+from typing import Dict, Tuple
+
+from .archive_input import ouvrir_binaire
+
+# Prefixe des lignes de tampon
+MARQUEUR = "# colab-tools:"
+
+# Octets lus en tete de fichier pour retrouver les tampons
+TAILLE_LECTURE = 4096
+
+_LIGNE_TAMPON = re.compile(r"# colab-tools: (\S+) (\S+) config=([0-9a-f]+) corps=([0-9a-f]+)\s*$")
+
+# Toute ligne de tampon, y compris d'un ancien format (retiree a la reecriture)
+_LIGNE_MARQUEE = re.compile(r"# colab-tools: \S+")
+
+# Declaration d'encodage (PEP 263) : doit rester sur l'une des deux premieres lignes
+_ENCODAGE = re.compile(r"^[ \t\f]*#.*?coding[:=]")
+
+Tampons = Dict[str, Tuple[str, str, str]]
+
+
+def empreinte_source(code: str) -> str:
+    """Empreinte courte d'un code."""
+    return hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+
+
+def empreinte_config(empreinte_plugin: str) -> str:
+    """
+    Empreinte courte de BaseTransformer.empreinte_cache() : classe, version,
+    fichier source du plugin et etat propre (instructions, moteur).
+    """
+    return empreinte_source(empreinte_plugin)
+
+
+def empreinte_corps(code: str) -> str:
+    """Empreinte du code sans ses lignes de tampon."""
+    return empreinte_source(retirer_tampons(code))
+
+
+def _version(version) -> str:
+    """Version telle qu'ecrite dans un tampon (sans espaces)."""
+    return str(version).strip().replace(' ', '_') or '?'
+
+
+def ligne_tampon(plugin: str, version: str, config: str, corps: str) -> str:
+    return f"{MARQUEUR} {plugin} {_version(version)} config={config} corps={corps}"
+
+
+def lire_tampons_code(code: str) -> Tampons:
+    """
+    Tampons du bloc de commentaires en tete du code.
+
+    Returns:
+        dict: plugin -> (version, empreinte de la configuration, empreinte du corps)
+    """
+    tampons: Tampons = {}
+    for ligne in code[:TAILLE_LECTURE].splitlines():
+        ligne = ligne.strip()
+        if not ligne:
+            continue
+        if not ligne.startswith('#'):
+            break
+        correspondance = _LIGNE_TAMPON.match(ligne)
+        if correspondance:
+            plugin, version, config, corps = correspondance.groups()
+            tampons[plugin] = (version, config, corps)
+    return tampons
+
+
+def lire_tampons(chemin: str, taille: int = TAILLE_LECTURE) -> Tampons:
+    """Tampons d'un fichier, d'apres ses premiers octets seulement."""
+    try:
+        with ouvrir_binaire(chemin) as f:
+            tete = f.read(taille)
+    except OSError:
+        return {}
+    return lire_tampons_code(tete.decode('utf-8', errors='replace'))
+
+
+def est_a_jour(tampons: Tampons, plugin: str, config: str, corps: str) -> bool:
+    """
+    Vrai si le plugin a deja ete applique avec cette configuration et
+    que le corps du fichier (empreinte_corps) n'a pas change depuis.
+    """
+    tampon = tampons.get(plugin)
+    return tampon is not None and tampon[1:] == (config, corps)
+
+
+def retirer_tampons(code: str) -> str:
+    """Supprime les lignes de tampon du bloc de commentaires en tete."""
+    lignes = code.split('\n')
+    conservees = []
+    for i, ligne in enumerate(lignes):
+        texte = ligne.strip()
+        if texte and not texte.startswith('#'):
+            conservees.extend(lignes[i:])
+            break
+        if not _LIGNE_MARQUEE.match(texte):
+            conservees.append(ligne)
+    return '\n'.join(conservees)
+
+
+def apposer(code: str, tampons: Tampons) -> str:
+    """
+    Remplace les tampons en tete du code par ceux donnes, places apres
+    la ligne shebang et la declaration d'encodage eventuelles.
+    """
+    lignes = retirer_tampons(code).split('\n')
+    position = 0
+    if lignes and lignes[0].startswith('#!'):
+        position = 1
+    while position < min(2, len(lignes)) and _ENCODAGE.match(lignes[position]):
+        position += 1
+    nouvelles = [ligne_tampon(plugin, *tampon) for plugin, tampon in tampons.items()]
+    return '\n'.join(lignes[:position] + nouvelles + lignes[position:])
+
+
+def tamponner(code: str, tampons: Tampons, plugins: Dict[str, Tuple[str, str]]) -> str:
+    """
+    Tamponne les plugins donnes (nom -> (version, config)) avec le corps
+    final du code, en gardant les autres tampons.
+    """
+    corps = empreinte_corps(code)
+    tampons = dict(tampons)
+    for plugin, (version, config) in plugins.items():
+        tampons[plugin] = (_version(version), config, corps)
+    return apposer(code, tampons)
@@ -7,27 +7,35 @@ Decouvre et charge dynamiquement les plugins de transformation
 """
 
 import os
+import re
 import sys
 import importlib
 import importlib.util
-import inspect
 from pathlib import Path
 from typing import Dict, Optional, List
 from .base_transformer import BaseTransformer
 
+# Detection statique d'un plugin pour le mode paresseux
+_MOTIF_PLUGIN = re.compile(r'^class\s+\w+\s*\([^)]*\bBaseTransformer\b', re.MULTILINE)
+
 class TransformationLoader:
     """
     Decouvre et charge dynamiquement les plugins de transformation
     depuis le dossier 'transformations'.
+
+    En mode paresseux (lazy=True), les fichiers sont seulement reperes
+    au demarrage; un plugin n'est execute qu'au premier get_transformation.
     """
     
-    def __init__(self, transformations_dir=None):
+    def __init__(self, transformations_dir=None, lazy=False):
         if transformations_dir:
             self.transformations_dir = Path(transformations_dir)
         else:
             # Chemin absolu robuste
             self.transformations_dir = Path(__file__).parent / "transformations"
+        self.lazy = lazy
         self.plugins: Dict[str, BaseTransformer] = {}
+        self._disponibles: Dict[str, Path] = {}
         self.discover_plugins()
     
     def discover_plugins(self):
@@ -41,64 +49,91 @@ class TransformationLoader:
         if parent_dir not in sys.path:
             sys.path.insert(0, parent_dir)
         
+        if self.lazy:
+            self._reperer_plugins()
+            return
+        
         plugins_loaded = 0
         
         for file_path in self.transformations_dir.glob("*.py"):
             if file_path.name.startswith("__"):
                 continue
-                
-            module_name = file_path.stem
-            try:
-                # Importation dynamique du module avec spec
-                spec = importlib.util.spec_from_file_location(
-                    f"core.transformations.{module_name}", 
-                    file_path
-                )
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    
-                    # Chercher la classe qui herite de BaseTransformer
-                    for name, obj in inspect.getmembers(module):
-                        if (inspect.isclass(obj) and 
-                            issubclass(obj, BaseTransformer) and 
-                            obj is not BaseTransformer):
-                            
-                            # Instancier le plugin
-                            try:
-                                instance = obj()
-                                metadata = instance.get_metadata()
-                                self.plugins[module_name] = instance
-                                print(f"+ Plugin charge : {metadata['name']} v{metadata['version']}")
-                                plugins_loaded += 1
-                                break
-                            except Exception as e:
-                                print(f"! Erreur instanciation {name}: {e}")
-                
-            except Exception as e:
-                print(f"! Erreur chargement plugin {module_name}: {e}")
+            if self._charger_plugin(file_path.stem, file_path):
+                plugins_loaded += 1
         
         if plugins_loaded == 0:
             print(f"! Aucune transformation trouvee dans {self.transformations_dir}")
         else:
             print(f"+ {plugins_loaded} plugin(s) charge(s) avec succes")
     
+    def _reperer_plugins(self):
+        """Repere les fichiers qui declarent une classe BaseTransformer, sans les executer."""
+        for file_path in sorted(self.transformations_dir.glob("*.py")):
+            if file_path.name.startswith("__"):
+                continue
+            try:
+                contenu = file_path.read_text(encoding='utf-8', errors='replace')
+            except OSError as e:
+                print(f"! Erreur lecture plugin {file_path.stem}: {e}")
+                continue
+            if _MOTIF_PLUGIN.search(contenu):
+                self._disponibles[file_path.stem] = file_path
+    
+    def _charger_plugin(self, module_name: str, file_path: Path) -> bool:
+        """Execute un fichier de plugin et instancie sa classe BaseTransformer."""
+        try:
+            # Importation dynamique du module avec spec
+            spec = importlib.util.spec_from_file_location(
+                f"core.transformations.{module_name}", 
+                file_path
+            )
+            if spec and spec.loader:
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                
+                # Chercher la classe qui herite de BaseTransformer
+                for name, obj in sorted(vars(module).items()):
+                    if (isinstance(obj, type) and 
+                        issubclass(obj, BaseTransformer) and 
+                        obj is not BaseTransformer):
+                        
+                        # Instancier le plugin
+                        try:
+                            instance = obj()
+                            metadata = instance.get_metadata()
+                            self.plugins[module_name] = instance
+                            print(f"+ Plugin charge : {metadata['name']} v{metadata['version']}")
+                            return True
+                        except Exception as e:
+                            print(f"! Erreur instanciation {name}: {e}")
+            
+        except Exception as e:
+            print(f"! Erreur chargement plugin {module_name}: {e}")
+        return False
+    
     def get_transformation(self, name: str) -> Optional[BaseTransformer]:
-        """Retourne une instance du plugin demande."""
-        return self.plugins.get(name)
+        """Retourne une instance du plugin demande (chargee au besoin)."""
+        plugin = self.plugins.get(name)
+        if plugin is None and name in self._disponibles:
+            self._charger_plugin(name, self._disponibles.pop(name))
+            plugin = self.plugins.get(name)
+        return plugin
     
     def list_transformations(self) -> List[str]:
-        """Liste tous les noms de plugins charges."""
-        return list(self.plugins.keys())
+        """Liste tous les noms de plugins charges ou reperes."""
+        return list(self.plugins.keys()) + [n for n in self._disponibles if n not in self.plugins]
     
     def get_transformation_metadata(self) -> Dict[str, Dict]:
-        """Retourne les metadonnees de tous les plugins charges."""
+        """Retourne les metadonnees de tous les plugins (les charge tous)."""
+        for name in list(self._disponibles):
+            self.get_transformation(name)
         return {name: plugin.get_metadata() for name, plugin in self.plugins.items()}
     
     def reload_plugins(self):
         """Recharge tous les plugins (utile pour le developpement)."""
         print("Rechargement des plugins...")
         self.plugins.clear()
+        self._disponibles.clear()
         
         # Nettoyer les modules caches
         modules_to_remove = [
@@ -110,7 +145,7 @@ class TransformationLoader:
         
         # Recharger
         self.discover_plugins()
-        return len(self.plugins)
+        return len(self.list_transformations())
     
     def test_transformation(self, name: str, code_source: str) -> tuple[bool, str]:
         """Teste une transformation sur du code."""
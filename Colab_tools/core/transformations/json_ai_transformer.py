@@ -7,6 +7,7 @@ Applique des transformations basées sur des instructions JSON générées par I
 """
 
 import ast
+import hashlib
 import json
 import sys
 import os
@@ -65,6 +66,12 @@ class JsonAITransformer(BaseTransformer):
         """
         return True  # Toujours applicable, les instructions seront vérifiées plus tard
     
+    def empreinte_cache(self):
+        """Le résultat dépend aussi des instructions chargées."""
+        instructions = json.dumps(self.json_instructions, sort_keys=True, ensure_ascii=False)
+        empreinte = hashlib.blake2b(instructions.encode('utf-8'), digest_size=16).hexdigest()
+        return f"{super().empreinte_cache()}:{empreinte}"
+    
     def load_json_instructions(self, json_file_path):
         """
         Charge les instructions depuis un fichier JSON.
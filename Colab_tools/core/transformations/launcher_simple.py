@@ -25,35 +25,28 @@ __version__ = "2.4.0"
 __author__ = "Équipe AST"
 __description__ = "Collection de plugins de transformation AST"
 
-# Imports des transformations disponibles (optionnel)
-try:
-    # Tentative d'import des plugins principaux
-    from core.print_to_logging_transform import PrintToLoggingTransform
-    from core.add_docstrings_transform import AddDocstringsTransform
-    from core.json_ai_transformer import JsonAITransformer
-    
-    # Liste des transformations disponibles
-    AVAILABLE_TRANSFORMATIONS = [
-        'print_to_logging_transform',
-        'add_docstrings_transform', 
-        'json_ai_transformer'
-    ]
-    
-    # Exports publics
-    __all__ = [
-        'PrintToLoggingTransform',
-        'AddDocstringsTransform',
-        'JsonAITransformer',
-        'AVAILABLE_TRANSFORMATIONS'
-    ]
-    
-    print(f"Module transformations: {len(AVAILABLE_TRANSFORMATIONS)} plugin(s) disponible(s)")
-    
-except ImportError as e:
-    # En cas d'erreur d'import, on continue sans crash
-    print(f"Avertissement transformations.__init__: {e}")
-    AVAILABLE_TRANSFORMATIONS = []
-    __all__ = []
+# Transformations disponibles : les classes sont importees a la demande
+# (un import ici executerait tous les plugins a chaque chargement)
+_CLASSES_TRANSFORMATIONS = {
+    'PrintToLoggingTransform': 'print_to_logging_transform',
+    'AddDocstringsTransform': 'add_docstrings_transform',
+    'JsonAITransformer': 'json_ai_transformer',
+}
+
+# Liste des transformations disponibles
+AVAILABLE_TRANSFORMATIONS = list(_CLASSES_TRANSFORMATIONS.values())
+
+# Exports publics
+__all__ = list(_CLASSES_TRANSFORMATIONS) + ['AVAILABLE_TRANSFORMATIONS']
+
+
+def __getattr__(name):
+    """Importe une classe de transformation au premier acces."""
+    module = _CLASSES_TRANSFORMATIONS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    return getattr(importlib.import_module(f"core.transformations.{module}"), name)
 
 # Fonction utilitaire pour lister les transformations
 def list_available_transformations():
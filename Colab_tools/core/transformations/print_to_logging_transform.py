@@ -4,19 +4,56 @@
 """
 Transformation: Print vers Logging
 Convertit les appels print() en logging.info() et ajoute l'import necessaire
+
+Moteur par defaut ('jetons') : les noms print appeles sont reperes par un
+balayage lexical (chaines et commentaires sautes) et renommes sur place,
+ce qui conserve la mise en forme et les commentaires. Les cas ambigus
+(print redefini ou utilise autrement qu'en appel, argument file=, print
+dans une f-string) passent par le moteur AST historique. Le code n'est
+pas analyse : un fichier syntaxiquement invalide voit aussi ses print
+renommes, alors que le moteur AST le laisse intact.
 """
 
 import ast
-from typing import Dict, Any, List
-from base_transformer import BaseTransformer
+import re
+from typing import Dict, Any, List, Optional
 from core.base_transformer import BaseTransformer
 
+# Chaines Python, reconnues a partir du guillemet (le prefixe eventuel est
+# examine a part). Les motifs commencent tous par un caractere fixe, ce qui
+# permet au moteur d'expressions regulieres de sauter le reste du code.
+_CHAINE = (r'"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""'
+           r"|'''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''"
+           r'|"[^"\\\r\n]*(?:\\.[^"\\\r\n]*)*"'
+           r"|'[^'\\\r\n]*(?:\\.[^'\\\r\n]*)*'")
+
+# Jetons utiles au reperage : commentaires, chaines et noms print
+_MOTIF_JETONS = re.compile(r"#[^\r\n]*|" + _CHAINE + r"|print\b", re.DOTALL)
+
+# Jetons utiles dans les arguments d'un appel : imbrication et mot-cle file=
+_MOTIF_ARGUMENTS = re.compile(r"#[^\r\n]*|" + _CHAINE + r"|[(\[{)\]}]|file\s*=(?!=)", re.DOTALL)
+
+# Prefixe d'une f-string, lu a rebours devant le guillemet
+_PREFIXE_F = frozenset(['f', 'rf', 'fr'])
+
 class PrintToLoggingTransform(BaseTransformer):
     """
     Transformer pour convertir les appels print() en logging.info().
     Plugin respectant le contrat BaseTransformer avec ABC.
+
+    moteur: 'jetons' (renommage sur place, repli AST si ambigu) ou 'ast'.
     """
 
+    def __init__(self, moteur: str = 'jetons'):
+        super().__init__()
+        self.moteur = moteur
+        # Dernier balayage (can_transform puis transform sur le meme code)
+        self._dernier_balayage = (None, None)
+
+    def empreinte_cache(self) -> str:
+        """Les deux moteurs ne produisent pas la meme mise en forme."""
+        return f"{super().empreinte_cache()}:{self.moteur}"
+
     def get_metadata(self) -> Dict[str, Any]:
         """Retourne les metadonnees de cette transformation."""
         return {
@@ -28,6 +65,12 @@ class PrintToLoggingTransform(BaseTransformer):
 
     def can_transform(self, code_source: str) -> bool:
         """Verifie s'il y a des print() dans le code."""
+        if self.moteur == 'jetons':
+            if 'print' not in code_source:
+                return False
+            positions = self._positions(code_source)
+            if positions is not None:
+                return bool(positions)
         try:
             tree = ast.parse(code_source)
             for node in ast.walk(tree):
@@ -54,6 +97,35 @@ logging.basicConfig(
 """
 
     def transform(self, code_source: str) -> str:
+        """Applique la transformation (balayage lexical, ou AST si ambigu)."""
+        if self.moteur == 'jetons':
+            if 'print' not in code_source:
+                return code_source
+            positions = self._positions(code_source)
+            if positions is not None:
+                return self._renommer(code_source, positions)
+        return self._transform_ast(code_source)
+
+    def _positions(self, code_source: str) -> Optional[List[int]]:
+        """Balayage lexical, memorise pour le dernier code examine."""
+        code, positions = self._dernier_balayage
+        if code is not code_source and code != code_source:
+            positions = _reperer_appels_print(code_source)
+            self._dernier_balayage = (code_source, positions)
+        return positions
+
+    def _renommer(self, code_source: str, positions: List[int]) -> str:
+        """Remplace chaque nom print repere par logging.info."""
+        morceaux = []
+        precedente = 0
+        for position in positions:
+            morceaux.append(code_source[precedente:position])
+            morceaux.append('logging.info')
+            precedente = position + len('print')
+        morceaux.append(code_source[precedente:])
+        return ''.join(morceaux)
+
+    def _transform_ast(self, code_source: str) -> str:
         """Applique la transformation en utilisant l'AST."""
         try:
             tree = ast.parse(code_source)
@@ -75,14 +147,19 @@ logging.basicConfig(
     def preview_changes(self, code_source: str) -> Dict[str, Any]:
         """Previsualise les changements."""
         try:
-            tree = ast.parse(code_source)
-            print_count = 0
-            for node in ast.walk(tree):
-                if (isinstance(node, ast.Call) and 
-                    isinstance(node.func, ast.Name) and 
-                    node.func.id == 'print'):
-                    print_count += 1
-            
+            positions = (self._positions(code_source)
+                         if self.moteur == 'jetons' else None)
+            if positions is not None:
+                print_count = len(positions)
+            else:
+                tree = ast.parse(code_source)
+                print_count = 0
+                for node in ast.walk(tree):
+                    if (isinstance(node, ast.Call) and
+                        isinstance(node.func, ast.Name) and
+                        node.func.id == 'print'):
+                        print_count += 1
+
             return {
                 'applicable': print_count > 0,
                 'description': f"Conversion de {print_count} appel(s) print() en logging.info()",
@@ -100,6 +177,95 @@ logging.basicConfig(
                 'estimated_changes': 0
             }
 
+def _caractere_de_nom(caractere: str) -> bool:
+    return caractere.isalnum() or caractere == '_'
+
+
+def _est_f_string(code: str, guillemet: int) -> bool:
+    """Vrai si la chaine commencant a cette position porte un prefixe f."""
+    debut = guillemet
+    while debut > 0 and guillemet - debut < 2 and code[debut - 1] in 'rRbBuUfF':
+        debut -= 1
+    if debut > 0 and _caractere_de_nom(code[debut - 1]):
+        return False
+    return code[debut:guillemet].lower() in _PREFIXE_F
+
+
+def _reperer_appels_print(code: str) -> Optional[List[int]]:
+    """
+    Positions des noms print appeles (print(...)) hors chaines et commentaires.
+
+    Returns:
+        list: Positions a renommer (vide si aucun appel), ou None si un cas
+        ambigu impose le moteur AST : print redefini ou utilise sans etre
+        appele, appel avec file=, print dans une f-string
+    """
+    positions = []
+    # Dernier caractere de chaque commentaire -> debut du commentaire
+    commentaires = {}
+    for jeton in _MOTIF_JETONS.finditer(code):
+        debut = jeton.start()
+        initiale = code[debut]
+        if initiale == '#':
+            commentaires[jeton.end() - 1] = debut
+            continue
+        if initiale != 'p':
+            if 'print' in jeton.group() and _est_f_string(code, debut):
+                return None
+            continue
+        if debut > 0 and _caractere_de_nom(code[debut - 1]):
+            # Fin d'un autre nom (myprint)
+            continue
+
+        # Jeton precedent (commentaires sautes) : attribut (x.print) ou
+        # definition (def print)
+        avant = debut - 1
+        while True:
+            while avant >= 0 and code[avant] in ' \t\f\r\n\\':
+                avant -= 1
+            if avant not in commentaires:
+                break
+            avant = commentaires[avant] - 1
+        if avant >= 0 and code[avant] == '.':
+            continue
+        debut_mot = avant
+        while debut_mot >= 0 and _caractere_de_nom(code[debut_mot]):
+            debut_mot -= 1
+        if code[debut_mot + 1:avant + 1] in ('def', 'class'):
+            return None
+
+        # Jeton suivant : seul un appel est renomme
+        apres = jeton.end()
+        while apres < len(code) and code[apres] in ' \t\f\\':
+            apres += 1
+            if code[apres - 1] == '\\' and code.startswith(('\r\n', '\n'), apres):
+                apres += 2 if code.startswith('\r\n', apres) else 1
+        if apres >= len(code) or code[apres] != '(':
+            return None
+        if _argument_file(code, apres):
+            return None
+        positions.append(debut)
+    return positions
+
+
+def _argument_file(code: str, ouvrante: int) -> bool:
+    """Vrai si l'appel ouvert a cette position passe file= a son propre niveau."""
+    profondeur = 0
+    for jeton in _MOTIF_ARGUMENTS.finditer(code, ouvrante):
+        initiale = code[jeton.start()]
+        if initiale in '([{':
+            profondeur += 1
+        elif initiale in ')]}':
+            profondeur -= 1
+            if profondeur == 0:
+                return False
+        elif initiale == 'f' and profondeur == 1:
+            precedent = code[jeton.start() - 1]
+            if not (_caractere_de_nom(precedent) or precedent == '.'):
+                return True
+    return False
+
+
 # Classe visiteur AST privee pour cette transformation
 class _PrintVisitor(ast.NodeTransformer):
     """Visiteur AST pour transformer print() en logging.info()."""
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Validation des Fichiers Transformes
+Applique les validation_rules du format JSON AI (syntax_check,
+import_check) au code produit par la chaine de plugins, avant ecriture.
+Chaque sortie n'est analysee qu'une fois : le meme arbre sert a la
+verification de syntaxe et a celle des imports. Les resultats sont
+memorises par empreinte du code produit (et dans le cache des analyses
+s'il est actif), et les fichiers a valider sont repartis sur des
+processus avec jobs > 1. Seuls les problemes introduits par la
+transformation sont rapportes : ceux deja presents dans la source (module
+absent de l'environnement, syntaxe deja invalide) sont ecartes. Un fichier
+invalide est signale et, si demande, annule (le fichier d'origine est
+conserve) sans arreter le lot.
+"""
+
+import ast
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .archive_input import SEPARATEUR, ouvrir_texte
+from .stamps import empreinte_source
+
+# Regles reconnues, dans leur ordre d'application
+REGLES_VALIDATION = ('syntax_check', 'import_check')
+
+# Nombre de fichiers en attente de validation par processus
+_FENETRE_PAR_JOB = 4
+
+# Exceptions qui rendent un import optionnel (try/except autour de l'import)
+_EXCEPTIONS_IMPORT = frozenset(['ImportError', 'ModuleNotFoundError', 'Exception',
+                                'BaseException'])
+
+# Modules de premier niveau deja resolus dans ce processus
+_RESOLUS: Dict[Tuple[str, Tuple[str, ...]], bool] = {}
+
+
+def regles_actives(regles: Optional[Iterable]) -> List[str]:
+    """
+    Regles activees d'une liste validation_rules.
+
+    Accepte les entrees du format JSON AI ({"rule": ..., "enabled": ...})
+    ou de simples noms; une regle inconnue est signalee et ignoree.
+    """
+    actives = []
+    for regle in regles or ():
+        if isinstance(regle, dict):
+            if not regle.get('enabled', True):
+                continue
+            regle = regle.get('rule')
+        if regle not in REGLES_VALIDATION:
+            print(f"! Regle de validation inconnue ignoree: {regle}")
+            continue
+        if regle not in actives:
+            actives.append(regle)
+    return [r for r in REGLES_VALIDATION if r in actives]
+
+
+def _probleme(regle: str, ligne: Optional[int], message: str) -> Dict:
+    return {'regle': regle, 'ligne': ligne, 'message': message}
+
+
+def _imports_obligatoires(arbre: ast.AST) -> Iterator[ast.AST]:
+    """Imports du module, hors blocs try/except ImportError et if TYPE_CHECKING."""
+    def optionnel(noeud):
+        if isinstance(noeud, ast.Try):
+            for handler in noeud.handlers:
+                types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+                if handler.type is None or any(
+                        isinstance(t, ast.Name) and t.id in _EXCEPTIONS_IMPORT for t in types):
+                    return True
+        if isinstance(noeud, ast.If):
+            test = noeud.test
+            nom = test.id if isinstance(test, ast.Name) else getattr(test, 'attr', None)
+            return nom == 'TYPE_CHECKING'
+        return False
+
+    a_visiter = [arbre]
+    while a_visiter:
+        noeud = a_visiter.pop()
+        if isinstance(noeud, (ast.Import, ast.ImportFrom)):
+            yield noeud
+            continue
+        if isinstance(noeud, ast.Try) and optionnel(noeud):
+            # Le corps est optionnel, pas les handlers ni le else
+            enfants = noeud.handlers + noeud.orelse + noeud.finalbody
+        elif isinstance(noeud, ast.If) and optionnel(noeud):
+            enfants = noeud.orelse
+        else:
+            enfants = list(ast.iter_child_nodes(noeud))
+        a_visiter.extend(reversed(enfants))
+
+
+def _module_resolu(nom: str, dossiers: Tuple[str, ...]) -> bool:
+    """Vrai si le module de premier niveau nom est trouvable, sans l'importer."""
+    cle = (nom, dossiers)
+    resolu = _RESOLUS.get(cle)
+    if resolu is not None:
+        return resolu
+
+    resolu = nom in sys.builtin_module_names or nom in getattr(sys, 'stdlib_module_names', ())
+    if not resolu:
+        resolu = any(os.path.isfile(os.path.join(d, f"{nom}.py")) or
+                     os.path.isdir(os.path.join(d, nom)) for d in dossiers)
+    if not resolu:
+        import importlib.util
+        try:
+            # Premier niveau : aucun paquet parent n'est execute
+            resolu = importlib.util.find_spec(nom) is not None
+        except (ImportError, ValueError):
+            resolu = False
+    _RESOLUS[cle] = resolu
+    return resolu
+
+
+def _relatif_resolu(dossier: str, niveau: int, module: Optional[str]) -> Optional[bool]:
+    """Resout un import relatif depuis le dossier du fichier (None : non verifiable)."""
+    for _ in range(niveau - 1):
+        dossier = os.path.dirname(dossier)
+    if not os.path.isdir(dossier):
+        return None
+    if not module:
+        return True
+    chemin = os.path.join(dossier, *module.split('.'))
+    return os.path.isfile(chemin + '.py') or os.path.isdir(chemin)
+
+
+def verifier_imports(arbre: ast.AST, chemin: str, dossiers: Iterable[str] = ()) -> List[Dict]:
+    """
+    Imports obligatoires qui ne se resolvent pas.
+
+    Les modules absolus sont cherches dans le dossier du fichier, les
+    dossiers donnes (racines du lot et leurs parents) puis sys.path; les
+    imports relatifs d'un membre d'archive ne sont pas verifies.
+    """
+    dossier = os.path.dirname(os.path.abspath(chemin)) if SEPARATEUR not in chemin else None
+    recherche = tuple(d for d in ([dossier] if dossier else []) + list(dossiers))
+    problemes = []
+    for noeud in _imports_obligatoires(arbre):
+        if isinstance(noeud, ast.ImportFrom) and noeud.level:
+            if dossier is None:
+                continue
+            if _relatif_resolu(dossier, noeud.level, noeud.module) is False:
+                cible = '.' * noeud.level + (noeud.module or '')
+                problemes.append(_probleme('import_check', noeud.lineno,
+                                           f"Import relatif introuvable: {cible}"))
+            continue
+        noms = [noeud.module] if isinstance(noeud, ast.ImportFrom) else \
+            [alias.name for alias in noeud.names]
+        for nom in noms:
+            if nom and not _module_resolu(nom.split('.')[0], recherche):
+                problemes.append(_probleme('import_check', noeud.lineno,
+                                           f"Module introuvable: {nom}"))
+    return problemes
+
+
+def _problemes(code: str, chemin: str, regles: List[str],
+               dossiers: Iterable[str]) -> List[Dict]:
+    """Problemes d'un code, analyse une seule fois pour toutes les regles."""
+    try:
+        arbre = ast.parse(code, filename=chemin)
+    except SyntaxError as e:
+        # Sans arbre, les imports ne peuvent pas etre verifies
+        return [_probleme('syntax_check', e.lineno, f"Syntaxe invalide: {e.msg}")] \
+            if 'syntax_check' in regles else []
+    if 'import_check' in regles:
+        return verifier_imports(arbre, chemin, dossiers)
+    return []
+
+
+def valider_code(code: str, chemin: str, regles: Iterable[str],
+                 dossiers: Iterable[str] = (), source: Optional[str] = None) -> List[Dict]:
+    """
+    Valide un code produit.
+
+    Args:
+        code: Code transforme
+        chemin: Fichier d'origine (resolution des imports locaux)
+        regles: Regles actives (REGLES_VALIDATION)
+        dossiers: Dossiers supplementaires ou chercher les modules locaux
+        source: Code d'origine; ses propres problemes ne sont pas rapportes
+
+    Returns:
+        list: Problemes {'regle', 'ligne', 'message'} (vide si valide)
+    """
+    regles = list(regles)
+    dossiers = list(dossiers)
+    problemes = _problemes(code, chemin, regles, dossiers)
+    if not problemes or source is None:
+        return problemes
+    # Difference par regle et message : les numeros de ligne ont pu bouger
+    existants = Counter((p['regle'], p['message'])
+                        for p in _problemes(source, chemin, regles, dossiers))
+    if any(p['regle'] == 'syntax_check' for p in problemes) and \
+            any(regle == 'syntax_check' for regle, _ in existants):
+        # Source deja invalide : la transformation n'a rien casse de nouveau
+        return []
+    introduits = []
+    for probleme in problemes:
+        signature = (probleme['regle'], probleme['message'])
+        if existants[signature]:
+            existants[signature] -= 1
+        else:
+            introduits.append(probleme)
+    return introduits
+
+
+def _lire_source(chemin: str) -> Optional[str]:
+    """Code d'origine d'un fichier, ou None s'il n'est plus lisible."""
+    try:
+        with ouvrir_texte(chemin) as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _dossiers_recherche(roots: Iterable[str]) -> Tuple[str, ...]:
+    """Racines du lot (et leurs parents) ou chercher les modules du projet."""
+    dossiers = []
+    for root in roots:
+        if SEPARATEUR in root or not os.path.exists(root):
+            continue
+        root = root if os.path.isdir(root) else os.path.dirname(root)
+        for dossier in (root, os.path.dirname(root)):
+            if dossier not in dossiers:
+                dossiers.append(dossier)
+    return tuple(dossiers)
+
+
+class Validateur:
+    """
+    Etape de validation entre la transformation et l'ecriture.
+
+    Seuls les fichiers modifies sont valides, par difference avec leur
+    source. Un resultat valide recoit
+    'validation': {'valide', 'problemes', 'duree_ms'}; avec annuler=True,
+    un fichier invalide passe en erreur et son code transforme est
+    abandonne.
+    """
+
+    def __init__(self, regles: Iterable[str], roots: Iterable[str] = (), jobs: int = 1,
+                 annuler: bool = False, cache=None):
+        self.regles = list(regles)
+        self.dossiers = _dossiers_recherche(roots)
+        self.jobs = max(1, int(jobs or 1))
+        self.annuler = annuler
+        self.cache = cache
+        self._memoire: Dict[str, List[Dict]] = {}
+
+    def _cle(self, code: str, chemin: str, source: Optional[str]) -> str:
+        from .parse_cache import CacheAnalyse
+
+        # La source compte pour la difference, l'emplacement pour les imports locaux
+        empreinte = f"validation:{','.join(self.regles)}:" \
+                    f"{empreinte_source(source) if source is not None else ''}"
+        if 'import_check' in self.regles:
+            empreinte += f":{os.path.dirname(chemin)}:{'|'.join(self.dossiers)}"
+        return CacheAnalyse.cle(code, empreinte)
+
+    def _memorise(self, cle: str) -> Optional[List[Dict]]:
+        problemes = self._memoire.get(cle)
+        if problemes is None and self.cache is not None:
+            from .parse_cache import MANQUANT
+            memorise = self.cache.lire(cle)
+            if memorise is not MANQUANT and memorise is not None:
+                problemes = self._memoire[cle] = json.loads(memorise)
+        return problemes
+
+    def _memoriser(self, cle: str, problemes: List[Dict]):
+        self._memoire[cle] = problemes
+        if self.cache is not None:
+            self.cache.ecrire(cle, json.dumps(problemes))
+
+    def appliquer(self, resultat: Dict, code_final: Optional[str], problemes: List[Dict],
+                  duree_ms: float = 0.0, repris: bool = False) -> Tuple[Dict, Optional[str]]:
+        """Reporte la validation dans le resultat; annule le fichier si demande."""
+        resultat['validation'] = {'valide': not problemes, 'problemes': problemes,
+                                  'duree_ms': round(duree_ms, 3)}
+        if repris:
+            resultat['validation']['cache'] = True
+        if problemes and self.annuler:
+            premier = problemes[0]
+            resultat['statut'] = 'erreur'
+            resultat['erreur'] = (f"Validation ({premier['regle']}, ligne {premier['ligne']}): "
+                                  f"{premier['message']}")
+            resultat['annule'] = True
+            code_final = None
+        return resultat, code_final
+
+    def valider(self, resultat: Dict, code_final: Optional[str]) -> Tuple[Dict, Optional[str]]:
+        """Valide un seul resultat dans ce processus."""
+        if code_final is None:
+            return resultat, code_final
+        debut = time.perf_counter()
+        source = _lire_source(resultat['fichier'])
+        cle = self._cle(code_final, resultat['fichier'], source)
+        problemes = self._memorise(cle)
+        repris = problemes is not None
+        if not repris:
+            problemes = valider_code(code_final, resultat['fichier'], self.regles, self.dossiers,
+                                     source)
+            self._memoriser(cle, problemes)
+        return self.appliquer(resultat, code_final, problemes,
+                              (time.perf_counter() - debut) * 1000, repris)
+
+    def valider_flux(self, resultats: Iterable[Tuple[Dict, Optional[str]]]
+                     ) -> Iterator[Tuple[Dict, Optional[str]]]:
+        """
+        Valide un flux (resultat, code final) et le reproduit, dans l'ordre
+        d'achevement avec jobs > 1.
+        """
+        if self.jobs == 1:
+            for resultat, code_final in resultats:
+                yield self.valider(resultat, code_final)
+            return
+
+        # Import differe : multiprocessing n'est charge qu'avec jobs > 1
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        from .isolation import contexte_processus
+
+        executor = None
+        en_attente = {}
+        fenetre = self.jobs * _FENETRE_PAR_JOB
+
+        def terminer(futures):
+            for future in futures:
+                resultat, code_final, cle = en_attente.pop(future)
+                problemes, duree_ms = future.result()
+                self._memoriser(cle, problemes)
+                yield self.appliquer(resultat, code_final, problemes, duree_ms)
+
+        try:
+            for resultat, code_final in resultats:
+                if code_final is None:
+                    yield resultat, code_final
+                    continue
+                source = _lire_source(resultat['fichier'])
+                cle = self._cle(code_final, resultat['fichier'], source)
+                problemes = self._memorise(cle)
+                if problemes is not None:
+                    yield self.appliquer(resultat, code_final, problemes, repris=True)
+                    continue
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=self.jobs,
+                                                   mp_context=contexte_processus())
+                future = executor.submit(_valider_mesure, code_final, resultat['fichier'],
+                                         self.regles, self.dossiers, source)
+                en_attente[future] = (resultat, code_final, cle)
+                termines = [f for f in en_attente if f.done()]
+                if len(en_attente) >= fenetre and not termines:
+                    termines, _ = wait(list(en_attente), return_when=FIRST_COMPLETED)
+                yield from terminer(termines)
+            while en_attente:
+                termines, _ = wait(list(en_attente), return_when=FIRST_COMPLETED)
+                yield from terminer(termines)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _valider_mesure(code: str, chemin: str, regles: List[str], dossiers: Tuple[str, ...],
+                    source: Optional[str] = None) -> Tuple[List[Dict], float]:
+    """valider_code dans un processus de travail, avec sa duree (ms)."""
+    debut = time.perf_counter()
+    problemes = valider_code(code, chemin, regles, dossiers, source)
+    return problemes, (time.perf_counter() - debut) * 1000
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mode Surveillance - Retransformation Incrementale
+Surveille les racines (inotify, sinon scrutation des mtime) et ne
+retransforme que les fichiers modifies, avec les plugins deja charges
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from .batch_pipeline import BatchPipeline
+
+# Constantes inotify (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_MASQUE = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_CREATE | _IN_DELETE_SELF
+_EVENEMENT = struct.Struct('iIII')
+
+# Delai de regroupement des sauvegardes successives (secondes)
+DEBOUNCE_DEFAUT = 0.005
+# Intervalle de scrutation du mode de repli (secondes)
+INTERVALLE_POLLING_DEFAUT = 0.5
+# Nombre de resultats recents gardes en memoire
+TAILLE_CACHE_DEFAUT = 256
+
+
+class _Filtre:
+    """Applique extensions et regles d'exclusion aux chemins signales."""
+
+    def __init__(self, regles=None, extensions=('.py',)):
+        self.regles = regles
+        self.extensions = tuple(extensions)
+
+    def dossier_exclu(self, chemin: str) -> bool:
+        if self.regles is None:
+            return False
+        return self.regles.exclure_dossier(os.path.basename(chemin), chemin)
+
+    def fichier_accepte(self, chemin: str) -> bool:
+        if not chemin.endswith(self.extensions):
+            return False
+        if self.regles is None:
+            return True
+        return not self.regles.exclure_fichier(os.path.basename(chemin), chemin)
+
+
+class SourceInotify:
+    """Evenements du noyau via inotify (Linux), charge par ctypes."""
+
+    nom = 'inotify'
+
+    def __init__(self, roots: Iterable[str], filtre: _Filtre):
+        libc_nom = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_nom, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError("inotify indisponible")
+
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a echoue")
+
+        self.filtre = filtre
+        self._dossiers: Dict[int, str] = {}
+        # Dossiers surveilles en entier (les autres ne servent qu'a des fichiers isoles)
+        self._arbres: Set[int] = set()
+        self._fichiers_racines: Set[str] = set()
+        for root in roots:
+            root = os.path.abspath(root)
+            if os.path.isfile(root):
+                self._fichiers_racines.add(root)
+                self._surveiller(os.path.dirname(root), arbre=False)
+            else:
+                self._surveiller_arbre(root)
+
+    def _surveiller(self, dossier: str, arbre: bool = True) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dossier), _MASQUE)
+        if wd < 0:
+            return False
+        self._dossiers[wd] = dossier
+        if arbre:
+            self._arbres.add(wd)
+        return True
+
+    def _surveiller_arbre(self, racine: str, nouveaux: Optional[Set[str]] = None):
+        """Ajoute une surveillance par dossier; collecte les fichiers si demande."""
+        pile = [racine]
+        while pile:
+            dossier = pile.pop()
+            if not self._surveiller(dossier):
+                continue
+            try:
+                with os.scandir(dossier) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.filtre.dossier_exclu(entry.path):
+                                pile.append(entry.path)
+                        elif nouveaux is not None and self.filtre.fichier_accepte(entry.path):
+                            nouveaux.add(entry.path)
+            except OSError:
+                continue
+
+    def attendre(self, timeout: float) -> Set[str]:
+        """Bloque au plus timeout secondes et retourne les fichiers modifies."""
+        try:
+            prets, _, _ = select.select([self._fd], [], [], timeout)
+        except InterruptedError:
+            return set()
+        if not prets:
+            return set()
+
+        modifies: Set[str] = set()
+        while True:
+            try:
+                donnees = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not donnees:
+                break
+            self._decoder(donnees, modifies)
+        return modifies
+
+    def _decoder(self, donnees: bytes, modifies: Set[str]):
+        position = 0
+        while position + _EVENEMENT.size <= len(donnees):
+            wd, masque, _, longueur = _EVENEMENT.unpack_from(donnees, position)
+            position += _EVENEMENT.size
+            nom = donnees[position:position + longueur].rstrip(b'\0')
+            position += longueur
+
+            if masque & _IN_Q_OVERFLOW:
+                print("! File inotify saturee, evenements perdus")
+                continue
+            if masque & _IN_IGNORED:
+                self._dossiers.pop(wd, None)
+                self._arbres.discard(wd)
+                continue
+
+            dossier = self._dossiers.get(wd)
+            if dossier is None or not nom:
+                continue
+            chemin = os.path.join(dossier, os.fsdecode(nom))
+
+            if wd not in self._arbres:
+                if masque & (_IN_CLOSE_WRITE | _IN_MOVED_TO) and chemin in self._fichiers_racines:
+                    modifies.add(chemin)
+                continue
+
+            if masque & _IN_ISDIR:
+                # Nouveau dossier (cree ou deplace) : le surveiller et prendre ses fichiers
+                if masque & (_IN_CREATE | _IN_MOVED_TO) and not self.filtre.dossier_exclu(chemin):
+                    self._surveiller_arbre(chemin, modifies)
+                continue
+
+            if masque & (_IN_CLOSE_WRITE | _IN_MOVED_TO) and self.filtre.fichier_accepte(chemin):
+                modifies.add(chemin)
+
+    def fermer(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class SourcePolling:
+    """Repli portable : compare (mtime, taille) des fichiers a chaque passage."""
+
+    nom = 'polling'
+
+    def __init__(self, roots: Iterable[str], filtre: _Filtre, intervalle: float = INTERVALLE_POLLING_DEFAUT):
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.filtre = filtre
+        self.intervalle = intervalle
+        self._etat = self._instantane()
+        self._prochain = time.monotonic() + intervalle
+
+    def _instantane(self) -> Dict[str, tuple]:
+        from .discovery import FileDiscovery
+
+        regles = self.filtre.regles
+        decouverte = FileDiscovery(
+            extensions=self.filtre.extensions,
+            exclure_dossier=regles.exclure_dossier if regles else None,
+            exclure_fichier=regles.exclure_fichier if regles else None,
+        )
+        etat = {}
+        for chemin in decouverte.iter_files(self.roots):
+            try:
+                st = os.stat(chemin)
+            except OSError:
+                continue
+            etat[chemin] = (st.st_mtime_ns, st.st_size)
+        return etat
+
+    def attendre(self, timeout: float) -> Set[str]:
+        """Attend le prochain passage (borne par timeout) et retourne les fichiers modifies."""
+        attente = self._prochain - time.monotonic()
+        if attente > timeout:
+            time.sleep(timeout)
+            return set()
+        if attente > 0:
+            time.sleep(attente)
+
+        etat = self._instantane()
+        modifies = {chemin for chemin, signature in etat.items()
+                    if self._etat.get(chemin) != signature}
+        self._etat = etat
+        self._prochain = time.monotonic() + self.intervalle
+        return modifies
+
+    def fermer(self):
+        pass
+
+
+def creer_source(roots: Iterable[str], regles=None, forcer_polling: bool = False,
+                 intervalle: float = INTERVALLE_POLLING_DEFAUT):
+    """Retourne une source inotify si possible, sinon la scrutation des mtime."""
+    roots = list(roots)
+    filtre = _Filtre(regles)
+    if not forcer_polling:
+        try:
+            return SourceInotify(roots, filtre)
+        except (OSError, AttributeError) as e:
+            print(f"! inotify indisponible ({e}), scrutation des fichiers")
+    return SourcePolling(roots, filtre, intervalle)
+
+
+class Surveillant:
+    """
+    Retransforme les fichiers modifies sous les racines surveillees.
+
+    Les plugins sont charges une seule fois; les resultats recents sont
+    gardes par empreinte du contenu, si bien qu'une sauvegarde sans
+    changement (ou un retour a une version deja vue) ne relance pas les
+    plugins. Les rafales de sauvegardes sont regroupees par un court delai.
+    """
+
+    def __init__(self, pipeline: BatchPipeline, roots: Iterable[str], regles=None,
+                 debounce: float = DEBOUNCE_DEFAUT, forcer_polling: bool = False,
+                 intervalle_polling: float = INTERVALLE_POLLING_DEFAUT,
+                 taille_cache: int = TAILLE_CACHE_DEFAUT):
+        self.pipeline = pipeline
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.regles = regles
+        self.debounce = debounce
+        self.forcer_polling = forcer_polling
+        self.intervalle_polling = intervalle_polling
+        self.taille_cache = taille_cache
+        self.arret = threading.Event()
+        self.pret = threading.Event()
+        self.source = None
+        # empreinte du contenu -> (resultat, code final)
+        self._recents: "OrderedDict[str, tuple]" = OrderedDict()
+        # fichier -> empreinte de la derniere version traitee
+        self._empreintes: Dict[str, str] = {}
+
+    def traiter(self, chemin: str) -> Optional[Dict]:
+        """Retransforme un fichier; None si son contenu n'a pas change."""
+        debut = time.perf_counter()
+        try:
+            with open(chemin, 'rb') as f:
+                brut = f.read()
+        except OSError:
+            # Supprime ou deplace entre l'evenement et la lecture
+            self._empreintes.pop(chemin, None)
+            return None
+
+        empreinte = hashlib.blake2b(brut, digest_size=16).hexdigest()
+        if self._empreintes.get(chemin) == empreinte:
+            return None
+        self._empreintes[chemin] = empreinte
+
+        connu = self._recents.get(empreinte)
+        if connu is not None:
+            self._recents.move_to_end(empreinte)
+            modele, code_final = connu
+            resultat = dict(modele, fichier=chemin, sortie=None, cache=True)
+            resultat['duree_ms'] = round((time.perf_counter() - debut) * 1000, 3)
+        else:
+            try:
+                code_source = brut.decode('utf-8')
+            except UnicodeDecodeError:
+                resultat, code_final = self.pipeline.traiter_fichier(chemin)
+            else:
+                resultat, code_final = self.pipeline.traiter_source(chemin, code_source, debut)
+            if resultat['statut'] != 'erreur':
+                self._recents[empreinte] = (dict(resultat), code_final)
+                if len(self._recents) > self.taille_cache:
+                    self._recents.popitem(last=False)
+
+        return self.pipeline.finaliser(*self.pipeline.valider(resultat, code_final))
+
+    def surveiller(self, rappel: Callable[[Dict], None], duree_max: Optional[float] = None):
+        """
+        Boucle de surveillance jusqu'a arret (Event, Ctrl+C ou duree_max).
+
+        Args:
+            rappel: Appele avec le resultat de chaque fichier retransforme
+            duree_max: Duree maximale de surveillance en secondes
+        """
+        if not self.pipeline._transformers:
+            self.pipeline.preparer()
+
+        self.source = creer_source(self.roots, self.regles, self.forcer_polling,
+                                   self.intervalle_polling)
+        fin = time.monotonic() + duree_max if duree_max else None
+        en_attente: Set[str] = set()
+        dernier_evenement = 0.0
+        self.pret.set()
+
+        try:
+            while not self.arret.is_set():
+                maintenant = time.monotonic()
+                if fin is not None and maintenant >= fin:
+                    break
+
+                if en_attente:
+                    timeout = max(0.0, dernier_evenement + self.debounce - maintenant)
+                else:
+                    timeout = 0.2
+                if fin is not None:
+                    timeout = min(timeout, max(0.0, fin - maintenant))
+
+                modifies = self.source.attendre(timeout)
+                if modifies:
+                    en_attente |= modifies
+                    dernier_evenement = time.monotonic()
+                    continue
+
+                if en_attente and time.monotonic() - dernier_evenement >= self.debounce:
+                    lot, en_attente = sorted(en_attente), set()
+                    for chemin in lot:
+                        resultat = self.traiter(chemin)
+                        if resultat is not None:
+                            rappel(resultat)
+        finally:
+            self.source.fermer()
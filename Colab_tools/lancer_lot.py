@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lanceur en Lot Sans Interaction - Outil AST
+===========================================
+
+Point d'entree en ligne de commande pour les executions non surveillees
+(CI, scripts). Aucun appel a input() : tout passe par les arguments.
+
+Chaque fichier traite produit une ligne JSON sur la sortie standard des
+qu'il est termine; les messages des plugins et le resume vont sur stderr.
+
+Usage:
+    python lancer_lot.py -p print_to_logging_transform src/ -o sortie/
+    python lancer_lot.py -p fix_mutable_defaults_transform,add_docstrings_transform src/ --jobs 4
+    python lancer_lot.py -p json_ai_transformer --json-instructions regles.json src/ --dry-run
+    python lancer_lot.py -p print_to_logging_transform src/ -o sortie/ --valider --annuler-invalides
+    python lancer_lot.py -p print_to_logging_transform src/ -o sortie/ --watch
+    python lancer_lot.py -p print_to_logging_transform src/ -o miroir/ --format-sortie miroir
+    python lancer_lot.py -p print_to_logging_transform src/ -o changements.patch --format-sortie patch
+    python lancer_lot.py -p print_to_logging_transform src/ -o resultats.zip --format-sortie zip
+    python lancer_lot.py -p print_to_logging_transform paquet-1.0.tar.gz -o sortie/
+    python lancer_lot.py -p print_to_logging_transform src/ --dry-run --profil-memoire memoire.txt
+    python lancer_lot.py -p print_to_logging_transform src/ --estimer 200
+    python lancer_lot.py -p print_to_logging_transform src/ -o sortie/ --depuis-ref origin/main
+    python lancer_lot.py -p print_to_logging_transform src/ -o sortie/ --shard 0/4 --manifestes shards/
+    python lancer_lot.py --fusionner shards/ --rapport rapport
+    python lancer_lot.py --lister
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import sys
+from pathlib import Path
+
+# Ajouter le repertoire du projet au path Python
+_project_root = Path(__file__).parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+# Formats ecrits par SortieArchive (module leger, sans dependance)
+from core.batch_pipeline import FORMATS_ARCHIVE
+
+# Formats de sortie disponibles (--format-sortie)
+FORMATS_SORTIE = ('dossier', 'miroir', 'patch', 'patch-par-fichier') + FORMATS_ARCHIVE
+
+
+def construire_parser():
+    """Construit l'analyseur des arguments de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        prog="lancer_lot.py",
+        description="Applique des transformations AST en lot, sans interaction."
+    )
+    parser.add_argument("racines", nargs="*",
+                        help="Fichiers, dossiers ou archives (zip, wheel, tar, sdist) a traiter; "
+                             "les archives sont lues sans extraction")
+    parser.add_argument("-p", "--plugin", action="append", default=[], dest="plugins",
+                        help="Plugin a appliquer (repetable, ou liste separee par des virgules); "
+                             "les plugins s'appliquent dans l'ordre donne")
+    parser.add_argument("-o", "--sortie",
+                        help="Dossier de sortie (defaut: transformations_lot_<horodatage>)")
+    parser.add_argument("--format-sortie", choices=FORMATS_SORTIE, default='dossier',
+                        help="dossier: fichiers modifies seulement; miroir: arbre complet, "
+                             "fichiers inchanges clones sans copie (reflink ou lien dur); "
+                             "patch: un diff unifie combine (-o = fichier); "
+                             "patch-par-fichier: un .patch par fichier modifie; "
+                             "zip, tar, tar.gz: fichiers modifies ecrits directement dans "
+                             "une archive (-o = fichier), sans dossier intermediaire")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Nombre de processus de travail (defaut: 1)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Transforme sans ecrire aucun fichier")
+    parser.add_argument("--isoler", action="store_true",
+                        help="Traite chaque fichier dans un processus supervise "
+                             "(limites de duree et de memoire)")
+    parser.add_argument("--timeout", type=float,
+                        help="Duree maximale par fichier en secondes, implique --isoler "
+                             "(defaut: timeout_seconds des parametres)")
+    parser.add_argument("--max-rss-mb", type=float,
+                        help="Memoire residente maximale d'un processus de travail, "
+                             "implique --isoler (defaut: max_rss_mb des parametres)")
+    parser.add_argument("--cache-analyses", nargs="?", const="", metavar="DOSSIER",
+                        help="Reprend le resultat d'un plugin sur un code deja analyse "
+                             "(defaut: ~/.cache/colab_tools/analyses)")
+    parser.add_argument("--cache-taille-mo", type=float, default=256,
+                        help="Taille maximale du cache des analyses (defaut: 256 Mo)")
+    parser.add_argument("--tampons", action="store_true",
+                        help="Tamponne les fichiers transformes (plugin, version) et saute "
+                             "ceux deja transformes par la meme version")
+    parser.add_argument("--telecharger", action="store_true",
+                        help="Sous Colab (lanceur appele dans le noyau), propose la sortie "
+                             "en un seul telechargement (un dossier est d'abord archive)")
+    parser.add_argument("--json-instructions",
+                        help="Fichier d'instructions JSON pour le plugin JSON-AI")
+    parser.add_argument("--valider", nargs="?", const="syntax_check,import_check",
+                        metavar="REGLES",
+                        help="Valide le code produit avant ecriture (regles separees par des "
+                             "virgules, defaut: syntax_check,import_check); sans cette option, "
+                             "les validation_rules des instructions JSON s'appliquent")
+    parser.add_argument("--annuler-invalides", action="store_true",
+                        help="Un fichier transforme invalide garde sa version d'origine "
+                             "et est rapporte en erreur")
+    parser.add_argument("-x", "--exclure", action="append", default=[],
+                        help="Motif d'exclusion au format .gitignore (repetable)")
+    parser.add_argument("--sans-gitignore", action="store_true",
+                        help="Ne pas appliquer les fichiers .gitignore")
+    parser.add_argument("--depuis-ref", metavar="REF",
+                        help="Ne traite que les fichiers des racines qui different de REF "
+                             "dans leur depot git (git diff --name-only -M), sans parcourir "
+                             "les racines")
+    parser.add_argument("--watch", action="store_true",
+                        help="Apres le lot, surveille les racines et retransforme "
+                             "les fichiers modifies (Ctrl+C pour arreter)")
+    parser.add_argument("--polling", action="store_true",
+                        help="Avec --watch, scrute les dates de modification au lieu d'inotify")
+    parser.add_argument("--debounce-ms", type=float, default=5,
+                        help="Avec --watch, delai de regroupement des sauvegardes (defaut: 5 ms)")
+    parser.add_argument("--profil",
+                        help="Enregistre un profil cProfile de l'execution dans ce fichier")
+    parser.add_argument("--profil-memoire",
+                        help="Mesure avec tracemalloc la memoire de chaque fichier et etape "
+                             "des plugins et ecrit le classement dans ce fichier "
+                             "(traitement sequentiel)")
+    parser.add_argument("--sites-memoire", action="store_true",
+                        help="Avec --profil-memoire, ajoute pour chaque fichier les lignes qui "
+                             "retiennent le plus de memoire (deux instantanes tracemalloc "
+                             "par fichier, beaucoup plus lent)")
+    parser.add_argument("--rapport", metavar="PREFIXE",
+                        help="Ecrit le rapport d'execution (debit, latences p50/p95/p99, "
+                             "temps par plugin, fichiers les plus lents) dans PREFIXE.json "
+                             "et PREFIXE.html")
+    parser.add_argument("--estimer", nargs="?", type=int, const=100, metavar="N",
+                        help="Transforme un echantillon stratifie de N fichiers (defaut: 100) "
+                             "sans rien ecrire et extrapole duree, taille de sortie et "
+                             "modifications du lot complet")
+    parser.add_argument("--graine", type=int,
+                        help="Avec --estimer, graine du tirage (echantillon reproductible)")
+    parser.add_argument("--shard", metavar="I/N",
+                        help="Ne traite que le shard I parmi N (0 <= I < N), d'apres une "
+                             "empreinte stable du chemin relatif : chaque shard peut tourner "
+                             "sur une autre machine qui voit le meme arbre")
+    parser.add_argument("--manifestes", default="manifestes_shards", metavar="DOSSIER",
+                        help="Avec --shard, dossier des manifestes de shard "
+                             "(defaut: manifestes_shards)")
+    parser.add_argument("--fusionner", metavar="DOSSIER",
+                        help="Fusionne les manifestes des shards de DOSSIER en un seul lot "
+                             "(lignes JSON, resume et --rapport)")
+    parser.add_argument("--lister", action="store_true",
+                        help="Liste les plugins disponibles (une ligne JSON par plugin)")
+    return parser
+
+
+def _plugins_demandes(valeurs):
+    """Aplatit les options -p (repetees ou separees par des virgules)."""
+    plugins = []
+    for valeur in valeurs:
+        plugins.extend(nom.strip() for nom in valeur.split(',') if nom.strip())
+    return plugins
+
+
+def ecrire_ligne(flux, donnees):
+    """Ecrit une ligne JSON et la rend immediatement disponible."""
+    flux.write(json.dumps(donnees, ensure_ascii=False) + "\n")
+    flux.flush()
+
+
+def lister_plugins(flux_json):
+    """Ecrit les plugins disponibles, une ligne JSON par plugin."""
+    from core.transformation_loader import TransformationLoader
+
+    loader = TransformationLoader()
+    for nom, metadata in loader.get_transformation_metadata().items():
+        ecrire_ligne(flux_json, {
+            'plugin': nom,
+            'nom': metadata.get('name'),
+            'version': metadata.get('version'),
+            'description': metadata.get('description'),
+        })
+    return 0
+
+
+def _suffixe_shard(destination, shard):
+    """Un fichier de sortie par shard : les shards n'ecrivent pas dans le meme fichier."""
+    if shard is None:
+        return destination
+    base, extension = os.path.splitext(destination)
+    if base.lower().endswith('.tar'):
+        base, extension = base[:-4], base[-4:] + extension
+    return f"{base}.shard-{shard[0]}-de-{shard[1]}{extension}"
+
+
+def creer_sortie(args, regles, shard=None):
+    """Construit la sortie du format demande (partagee entre shards si shard est donne)."""
+    from core.batch_pipeline import SortieArchive, SortieDossier, SortieMiroir, SortiePatch
+
+    dossier_sortie = args.sortie or (
+        f"transformations_lot_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+    if args.format_sortie == 'miroir':
+        return SortieMiroir(dossier_sortie, args.racines, regles, shard=shard)
+    if args.format_sortie == 'patch':
+        destination = args.sortie or dossier_sortie + ".patch"
+        return SortiePatch(_suffixe_shard(destination, shard), combine=True)
+    if args.format_sortie == 'patch-par-fichier':
+        return SortiePatch(dossier_sortie, combine=False)
+    if args.format_sortie in FORMATS_ARCHIVE:
+        destination = args.sortie or f"{dossier_sortie}.{args.format_sortie}"
+        return SortieArchive(_suffixe_shard(destination, shard), args.format_sortie)
+    return SortieDossier(dossier_sortie)
+
+
+def executer_lot(args, flux_json):
+    """Execute le lot et retourne le code de sortie du processus."""
+    from core.batch_pipeline import BatchPipeline
+    from core.ignore_rules import IgnoreRules
+
+    plugins = _plugins_demandes(args.plugins)
+    if not plugins:
+        print("X Aucun plugin demande (option -p)")
+        return 2
+    if not args.racines:
+        print("X Aucune racine a traiter")
+        return 2
+
+    shard = None
+    if args.shard:
+        from core.sharding import analyser_shard
+        try:
+            shard = analyser_shard(args.shard)
+        except ValueError as e:
+            print(f"X {e}")
+            return 2
+        if args.watch:
+            print("X --watch ne s'utilise pas avec --shard")
+            return 2
+    if args.watch and args.format_sortie in FORMATS_ARCHIVE:
+        print("X --watch ne s'utilise pas avec une sortie archive (ecrite une seule fois)")
+        return 2
+    estimation = args.estimer is not None
+    if estimation and args.estimer < 1:
+        print(f"X --estimer attend une taille d'echantillon >= 1 (recu: {args.estimer})")
+        return 2
+
+    regles = IgnoreRules.depuis_parametres(args.racines, args.exclure,
+                                           utiliser_gitignore=not args.sans_gitignore)
+    sortie = None if args.dry_run or estimation else creer_sortie(args, regles, shard)
+
+    isoler = args.isoler or args.timeout is not None or args.max_rss_mb is not None
+    timeout = max_rss_mb = None
+    if isoler:
+        from core.settings import charger_parametres
+        parametres = charger_parametres()
+        timeout = args.timeout if args.timeout is not None else parametres.get('timeout_seconds')
+        max_rss_mb = args.max_rss_mb if args.max_rss_mb is not None else parametres.get('max_rss_mb')
+
+    cache = None
+    if args.cache_analyses is not None:
+        from core.parse_cache import CacheAnalyse
+        cache = CacheAnalyse(args.cache_analyses or None, args.cache_taille_mo)
+
+    profileur = None
+    if args.profil_memoire:
+        from core.memory_profile import ProfileurMemoire
+        profileur = ProfileurMemoire(sites=args.sites_memoire)
+
+    pipeline = BatchPipeline(plugins, json_instructions=args.json_instructions,
+                             jobs=args.jobs, dry_run=args.dry_run or estimation,
+                             sortie=sortie, roots=args.racines,
+                             isoler=isoler, timeout=timeout, max_rss_mb=max_rss_mb,
+                             profileur=profileur, cache=cache, tampons=args.tampons,
+                             validation=args.valider.split(',') if args.valider else None,
+                             annuler_invalides=args.annuler_invalides)
+    try:
+        pipeline.preparer()
+    except ValueError as e:
+        print(f"X {e}")
+        return 2
+
+    if args.depuis_ref:
+        from core.git_selection import selectionner
+        try:
+            fichiers = list(selectionner(args.racines, args.depuis_ref, regles))
+        except ValueError as e:
+            print(f"X {e}")
+            return 2
+        print(f"+ {len(fichiers)} fichier(s) modifie(s) depuis {args.depuis_ref}")
+    else:
+        fichiers = regles.creer_decouverte().iter_files(args.racines)
+    manifeste = None
+    prefixe_rapport = args.rapport
+    if shard is not None:
+        from core.sharding import ManifesteShard, filtrer
+        fichiers = filtrer(fichiers, args.racines, *shard)
+        if args.rapport:
+            prefixe_rapport = f"{args.rapport}.shard-{shard[0]}-de-{shard[1]}"
+    if estimation:
+        return estimer_lot(args, pipeline, fichiers, flux_json)
+    if shard is not None:
+        manifeste = ManifesteShard(args.manifestes, *shard, plugins, args.racines)
+
+    rapport = None
+    if args.rapport:
+        from core.run_report import RapportExecution
+        titre = f"Lot {', '.join(plugins)}"
+        rapport = RapportExecution(titre if shard is None else f"{titre} (shard {args.shard})")
+
+    compteurs = {'modifie': 0, 'inchange': 0, 'erreur': 0}
+    analyses = repris = invalides = 0
+    termine = False
+    if profileur is not None:
+        profileur.demarrer()
+    try:
+        for resultat in pipeline.executer(fichiers):
+            compteurs[resultat['statut']] = compteurs.get(resultat['statut'], 0) + 1
+            analyses += len(resultat['plugins'])
+            repris += sum(1 for etape in resultat['plugins'] if etape.get('cache'))
+            if not resultat.get('validation', {}).get('valide', True):
+                invalides += 1
+                print(f"! Validation echouee ({resultat['relatif']}): "
+                      f"{resultat['validation']['problemes'][0]['message']}")
+            if rapport is not None:
+                rapport.ajouter(resultat)
+            if manifeste is not None:
+                manifeste.ajouter(resultat)
+            ecrire_ligne(flux_json, resultat)
+        termine = True
+    finally:
+        if manifeste is not None:
+            # Sans ligne de fin, la fusion signale le shard comme incomplet
+            manifeste.fermer(complet=termine)
+        if profileur is not None:
+            profileur.arreter()
+            pipeline.profileur = None
+            ecrire_profil_memoire(profileur, args.profil_memoire)
+        if sortie is not None and not termine:
+            # Lot interrompu : ni archive renommee ni miroir complete
+            sortie.abandonner()
+        elif sortie is not None and not args.watch:
+            sortie.fermer()
+        elif hasattr(sortie, 'completer'):
+            # En surveillance, la sortie reste ouverte jusqu'a l'arret
+            sortie.completer()
+
+    total = sum(compteurs.values())
+    print(f"+ {total} fichier(s) traite(s): {compteurs['modifie']} modifie(s), "
+          f"{compteurs['inchange']} inchange(s), {compteurs['erreur']} erreur(s)")
+    # Miroir et archive sont produits meme sans fichier modifie
+    toujours_produite = args.format_sortie == 'miroir' or args.format_sortie in FORMATS_ARCHIVE
+    if sortie is not None and (compteurs['modifie'] or toujours_produite):
+        print(f"+ Sortie: {sortie.dossier}")
+    if invalides:
+        etat = "annule(s)" if args.annuler_invalides else "ecrit(s) malgre tout"
+        print(f"! {invalides} fichier(s) invalide(s), {etat}")
+    if cache is not None:
+        print(f"+ Cache des analyses: {repris}/{analyses} resultat(s) repris ({cache.dossier})")
+    if args.telecharger and sortie is not None:
+        from core.colab_output import gerer_sortie_environnement
+        gerer_sortie_environnement(sortie.dossier, "lot")
+    if manifeste is not None:
+        print(f"+ Manifeste du shard {args.shard}: {manifeste.chemin}")
+    if rapport is not None:
+        ecrire_rapport(rapport.terminer(), prefixe_rapport)
+
+    if args.watch:
+        return surveiller(args, pipeline, regles, flux_json)
+
+    return 1 if compteurs['erreur'] or invalides else 0
+
+
+def fusionner_lot(args, flux_json):
+    """Fusionne les manifestes des shards en un seul lot et un seul rapport."""
+    from core.sharding import fusionner, rapport_fusion
+
+    try:
+        fusion = fusionner(args.fusionner)
+    except (OSError, ValueError) as e:
+        print(f"X {e}")
+        return 2
+
+    compteurs = {'modifie': 0, 'inchange': 0, 'erreur': 0}
+    for resultat in fusion['resultats']:
+        compteurs[resultat['statut']] = compteurs.get(resultat['statut'], 0) + 1
+        ecrire_ligne(flux_json, resultat)
+
+    print(f"+ {len(fusion['entetes'])}/{fusion['shards']} shard(s) fusionne(s): "
+          f"{len(fusion['resultats'])} fichier(s), {compteurs['modifie']} modifie(s), "
+          f"{compteurs['inchange']} inchange(s), {compteurs['erreur']} erreur(s)")
+    for entete in fusion['entetes']:
+        duree = f"{entete['duree_s']:.2f} s" if entete['duree_s'] is not None else "incomplet"
+        print(f"  shard {entete['shard']}: {entete['fichiers']} fichier(s), {duree}"
+              + (f" ({entete['machine']})" if entete.get('machine') else ""))
+    if fusion['manquants']:
+        print(f"! Shard(s) manquant(s): {', '.join(map(str, fusion['manquants']))}")
+    if fusion['incomplets']:
+        print(f"! Shard(s) incomplet(s): {', '.join(map(str, fusion['incomplets']))}")
+    if fusion['doublons']:
+        print(f"! {len(fusion['doublons'])} fichier(s) traite(s) par plusieurs shards "
+              f"(racines differentes ?), par exemple {fusion['doublons'][0]}")
+    if args.rapport:
+        ecrire_rapport(rapport_fusion(fusion), args.rapport)
+
+    partiel = fusion['manquants'] or fusion['incomplets']
+    return 1 if compteurs['erreur'] or partiel else 0
+
+
+def estimer_lot(args, pipeline, fichiers, flux_json):
+    """Estime le lot sur un echantillon et ecrit l'estimation en une ligne JSON."""
+    from core.estimation import estimer, resume_estimation
+
+    estimation = estimer(pipeline, list(fichiers), args.racines,
+                         taille=args.estimer, graine=args.graine)
+    ecrire_ligne(flux_json, estimation)
+    if not estimation['fichiers']:
+        print("! Aucun fichier a estimer")
+        return 0
+    print(f"+ Estimation terminee en {estimation['duree_estimation_s']:.1f} s")
+    jobs = sorted({1, 2, 4, 8, max(1, args.jobs)})
+    for ligne in resume_estimation(estimation, jobs):
+        print(f"  {ligne}")
+    return 0
+
+
+def ecrire_rapport(rapport, prefixe):
+    """Ecrit le rapport d'execution (JSON et HTML) et affiche son resume."""
+    try:
+        chemins = rapport.ecrire(prefixe)
+        print(f"+ Rapport d'execution: {', '.join(chemins)}")
+    except OSError as e:
+        print(f"! Rapport d'execution non enregistre ({prefixe}): {e}")
+    for ligne in rapport.resume():
+        print(f"  {ligne}")
+
+
+def ecrire_profil_memoire(profileur, chemin):
+    """Ecrit le classement memoire et affiche les pires etapes."""
+    rapport = profileur.rapport()
+    try:
+        with open(chemin, 'w', encoding='utf-8') as f:
+            f.write(rapport + "\n")
+        print(f"+ Profil memoire enregistre: {chemin}")
+    except OSError as e:
+        print(f"! Profil memoire non enregistre ({chemin}): {e}")
+    for ligne in rapport.split("\n")[:7]:
+        print(ligne)
+
+
+def surveiller(args, pipeline, regles, flux_json):
+    """Retransforme les fichiers modifies jusqu'a Ctrl+C (plugins deja charges)."""
+    from core.watch import Surveillant
+
+    surveillant = Surveillant(pipeline, args.racines, regles, debounce=args.debounce_ms / 1000,
+                              forcer_polling=args.polling)
+    print(f"+ Surveillance de {len(args.racines)} racine(s) (Ctrl+C pour arreter)")
+    try:
+        surveillant.surveiller(lambda resultat: ecrire_ligne(flux_json, resultat))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if pipeline.sortie is not None:
+            pipeline.sortie.fermer()
+    print("+ Surveillance arretee")
+    return 0
+
+
+def main(argv=None):
+    """Point d'entree principal."""
+    args = construire_parser().parse_args(argv)
+    flux_json = sys.stdout
+
+    # Tous les messages (chargement, plugins) vont sur stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.lister:
+            action, arguments = lister_plugins, (flux_json,)
+        elif args.fusionner:
+            action, arguments = fusionner_lot, (args, flux_json)
+        else:
+            action, arguments = executer_lot, (args, flux_json)
+
+        if not args.profil:
+            return action(*arguments)
+
+        import cProfile
+        profil = cProfile.Profile()
+        try:
+            return profil.runcall(action, *arguments)
+        finally:
+            profil.dump_stats(args.profil)
+            print(f"+ Profil enregistre: {args.profil}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,27 +13,38 @@ import datetime
 import json
 from typing import List, Dict, Any, Optional
 
-# Detection d'environnement
+# Detection d'environnement (differee : faite au lancement, pas a l'import)
 COLAB_ENV = False
 VSCODE_ENV = False
 
-try:
-    import google.colab
-    from google.colab import files
-    COLAB_ENV = True
-    print("*** Environnement Google Colab detecte ***")
-except ImportError:
-    pass
 
-try:
-    if 'VSCODE_PID' in os.environ or 'JUPYTER_SERVER_ROOT' in os.environ:
-        VSCODE_ENV = True
-        print("*** Environnement VSCode/Jupyter detecte ***")
-except:
-    pass
+def detecter_environnement(afficher=False):
+    """
+    Detecte Google Colab et VSCode/Jupyter et met a jour COLAB_ENV / VSCODE_ENV.
 
-if not COLAB_ENV and not VSCODE_ENV:
-    print("*** Environnement Terminal detecte ***")
+    Args:
+        afficher: Affiche la banniere de l'environnement detecte
+
+    Returns:
+        tuple: (COLAB_ENV, VSCODE_ENV)
+    """
+    global COLAB_ENV, VSCODE_ENV
+    import importlib.util
+
+    try:
+        COLAB_ENV = importlib.util.find_spec("google.colab") is not None
+    except (ImportError, ValueError):
+        COLAB_ENV = False
+    VSCODE_ENV = 'VSCODE_PID' in os.environ or 'JUPYTER_SERVER_ROOT' in os.environ
+
+    if afficher:
+        if COLAB_ENV:
+            print("*** Environnement Google Colab detecte ***")
+        if VSCODE_ENV:
+            print("*** Environnement VSCode/Jupyter detecte ***")
+        if not COLAB_ENV and not VSCODE_ENV:
+            print("*** Environnement Terminal detecte ***")
+    return COLAB_ENV, VSCODE_ENV
 
 # ==============================================================================
 # UTILITAIRES GENERAUX
@@ -210,109 +221,6 @@ class OrchestrateurAST:
             })
         return transformations
 
-# ==============================================================================
-# BROWSER DE FICHIERS SIMPLIFIE
-# ==============================================================================
-
-def browser_fichier_simple():
-    """Browser simple pour selectionner un fichier Python."""
-    repertoire_actuel = os.getcwd()
-    fichiers_python = [f for f in os.listdir(repertoire_actuel) if f.endswith('.py')]
-    
-    if not fichiers_python:
-        print("Aucun fichier Python trouve dans le repertoire actuel")
-        return None
-    
-    print("Fichiers Python disponibles:")
-    for i, fichier in enumerate(fichiers_python, 1):
-        print(f"{i}. {fichier}")
-    
-    try:
-        choix = int(input(f"Choisissez un fichier (1-{len(fichiers_python)}): ")) - 1
-        if 0 <= choix < len(fichiers_python):
-            return os.path.join(repertoire_actuel, fichiers_python[choix])
-    except:
-        pass
-    
-    return None
-
-# ==============================================================================
-# FONCTIONS PRINCIPALES
-# ==============================================================================
-
-def demo_simple():
-    """Demonstration simple."""
-    print("*** DEMONSTRATION SIMPLE - Outil AST ***")
-    print("=" * 40)
-    
-    fichier = browser_fichier_simple()
-    if not fichier:
-        print("Aucun fichier selectionne")
-        return
-    
-    print(f"Fichier selectionne: {os.path.basename(fichier)}")
-    
-    # Generer nom de sortie
-    base, ext = os.path.splitext(fichier)
-    fichier_sortie = base + "_transforme" + ext
-    
-    # Transformer
-    orchestrateur = OrchestrateurAST()
-    if orchestrateur.transformation_simple(fichier, fichier_sortie):
-        print(f"+ Fichier transforme: {fichier_sortie}")
-    else:
-        print("X Transformation echouee")
-
-def menu_principal():
-    """Menu principal simplifie."""
-    print("*** OUTIL AST - VERSION MINIMALE ***")
-    print("=" * 40)
-    print("1. Demonstration simple")
-    print("2. Tester systeme modulaire")
-    print("3. Quitter")
-    
-    choix = input("Votre choix (1-3): ").strip()
-    return choix
-
-def main():
-    """Point d'entree principal."""
-    try:
-        # Essayer l'interface GUI
-        from composants_browser.interface_gui_principale import InterfaceAST
-        print(">> Lancement interface GUI...")
-        app = InterfaceAST()
-        app.run()
-    except ImportError:
-        print("Interface GUI non disponible, mode texte...")
-        
-        while True:
-            choix = menu_principal()
-            
-            if choix == "1":
-                demo_simple()
-            elif choix == "2":
-                orchestrateur = OrchestrateurAST()
-                transformations = orchestrateur.lister_transformations_modulaires()
-                if transformations:
-                    print("Transformations modulaires disponibles:")
-                    for t in transformations:
-                        print(f"  - {t['display_name']}: {t['description']}")
-                else:
-                    print("Aucune transformation modulaire disponible")
-                input("Appuyez sur Entree...")
-            elif choix == "3":
-                print("*** DEMO TRANSFORMATION MODULAIRE ***")
-                orchestrateur = OrchestrateurAST()
-                orchestrateur.demo_modulaire()
-                input("\nAppuyez sur Entree pour continuer...")
-            elif choix == "4":
-                break
-            else:
-                print("Choix invalide (1-4)")
-
-if __name__ == "__main__":
-    main()
-
     def appliquer_transformation_modulaire(self, fichier_source, fichier_sortie, transformation_name):
         """
         Applique une transformation modulaire du systeme core/.
@@ -348,6 +256,15 @@ if __name__ == "__main__":
             with open(fichier_source, 'r', encoding='utf-8') as f:
                 code_source = f.read()
             
+            # Tampons en tete du fichier : meme configuration et corps inchange, sans analyse
+            from core.stamps import empreinte_config, empreinte_corps, est_a_jour, lire_tampons_code
+            tampons = lire_tampons_code(code_source)
+            config = empreinte_config(transformer.empreinte_cache())
+            if tampons and est_a_jour(tampons, transformation_name, config,
+                                      empreinte_corps(code_source)):
+                print(f"! Fichier deja transforme par '{metadata['name']}' v{metadata['version']} (tampon), ignore")
+                return False
+            
             # Verifier si la transformation est applicable
             if not transformer.can_transform(code_source):
                 print(f"! Transformation '{metadata['name']}' non applicable a ce code")
@@ -387,8 +304,10 @@ if __name__ == "__main__":
                 code_transforme = self._inserer_config_modulaire(code_transforme, config_code)
                 print(f"+ Configuration ajoutee")
             
-            # Ajouter l'en-tete specialise
-            code_final = self._ajouter_entete_modulaire(code_transforme, fichier_source, transformer)
+            # Ajouter l'en-tete specialise, avec les tampons des plugins deja appliques
+            code_final = self._ajouter_entete_modulaire(
+                code_transforme, fichier_source, transformer, tampons,
+                {transformation_name: (str(metadata['version']), config)})
             
             # Sauvegarder le fichier transforme
             with open(fichier_sortie, 'w', encoding='utf-8') as f:
@@ -457,8 +376,14 @@ if __name__ == "__main__":
         
         return '\n'.join(lignes)
     
-    def _ajouter_entete_modulaire(self, code, fichier_source, transformer):
-        """Ajoute un en-tete specialise pour transformation modulaire."""
+    def _ajouter_entete_modulaire(self, code, fichier_source, transformer, tampons=None,
+                                  plugins=None):
+        """
+        Ajoute un en-tete specialise pour transformation modulaire.
+        Les tampons (core/stamps.py) sont places sous la ligne d'encodage
+        et retires du code transforme pour ne pas s'empiler; les plugins
+        donnes (nom -> (version, config)) sont tamponnes avec le corps final.
+        """
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         metadata = transformer.get_metadata()
         
@@ -488,6 +413,9 @@ Plugin module : {transformer.__class__.__module__}
 """
 
 '''
+        if tampons or plugins:
+            from core.stamps import retirer_tampons, tamponner
+            return tamponner(entete + retirer_tampons(code), tampons or {}, plugins or {})
         return entete + code
     
     def demo_modulaire(self):
@@ -560,3 +488,108 @@ Plugin module : {transformer.__class__.__module__}
             print("Choix invalide")
         except Exception as e:
             print(f"Erreur: {e}")
+
+# ==============================================================================
+# BROWSER DE FICHIERS SIMPLIFIE
+# ==============================================================================
+
+def browser_fichier_simple():
+    """Browser simple pour selectionner un fichier Python."""
+    repertoire_actuel = os.getcwd()
+    fichiers_python = [f for f in os.listdir(repertoire_actuel) if f.endswith('.py')]
+    
+    if not fichiers_python:
+        print("Aucun fichier Python trouve dans le repertoire actuel")
+        return None
+    
+    print("Fichiers Python disponibles:")
+    for i, fichier in enumerate(fichiers_python, 1):
+        print(f"{i}. {fichier}")
+    
+    try:
+        choix = int(input(f"Choisissez un fichier (1-{len(fichiers_python)}): ")) - 1
+        if 0 <= choix < len(fichiers_python):
+            return os.path.join(repertoire_actuel, fichiers_python[choix])
+    except:
+        pass
+    
+    return None
+
+# ==============================================================================
+# FONCTIONS PRINCIPALES
+# ==============================================================================
+
+def demo_simple():
+    """Demonstration simple."""
+    print("*** DEMONSTRATION SIMPLE - Outil AST ***")
+    print("=" * 40)
+    
+    fichier = browser_fichier_simple()
+    if not fichier:
+        print("Aucun fichier selectionne")
+        return
+    
+    print(f"Fichier selectionne: {os.path.basename(fichier)}")
+    
+    # Generer nom de sortie
+    base, ext = os.path.splitext(fichier)
+    fichier_sortie = base + "_transforme" + ext
+    
+    # Transformer
+    orchestrateur = OrchestrateurAST()
+    if orchestrateur.transformation_simple(fichier, fichier_sortie):
+        print(f"+ Fichier transforme: {fichier_sortie}")
+    else:
+        print("X Transformation echouee")
+
+def menu_principal():
+    """Menu principal simplifie."""
+    print("*** OUTIL AST - VERSION MINIMALE ***")
+    print("=" * 40)
+    print("1. Demonstration simple")
+    print("2. Tester systeme modulaire")
+    print("3. Demonstration modulaire")
+    print("4. Quitter")
+    
+    choix = input("Votre choix (1-4): ").strip()
+    return choix
+
+def main():
+    """Point d'entree principal."""
+    detecter_environnement(afficher=True)
+    try:
+        # Essayer l'interface GUI
+        from composants_browser.interface_gui_principale import InterfaceAST
+        print(">> Lancement interface GUI...")
+        app = InterfaceAST()
+        app.run()
+    except ImportError:
+        print("Interface GUI non disponible, mode texte...")
+        
+        while True:
+            choix = menu_principal()
+            
+            if choix == "1":
+                demo_simple()
+            elif choix == "2":
+                orchestrateur = OrchestrateurAST()
+                transformations = orchestrateur.lister_transformations_modulaires()
+                if transformations:
+                    print("Transformations modulaires disponibles:")
+                    for t in transformations:
+                        print(f"  - {t['display_name']}: {t['description']}")
+                else:
+                    print("Aucune transformation modulaire disponible")
+                input("Appuyez sur Entree...")
+            elif choix == "3":
+                print("*** DEMO TRANSFORMATION MODULAIRE ***")
+                orchestrateur = OrchestrateurAST()
+                orchestrateur.demo_modulaire()
+                input("\nAppuyez sur Entree pour continuer...")
+            elif choix == "4":
+                break
+            else:
+                print("Choix invalide (1-4)")
+
+if __name__ == "__main__":
+    main()
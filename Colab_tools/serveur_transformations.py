@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serveur de Transformations - Outil AST
+======================================
+
+Demarre un processus persistant qui garde les plugins charges et repond
+aux requetes transform / preview / analyze. Les editeurs et la CI evitent
+ainsi le demarrage de l'interpreteur et le chargement des plugins a
+chaque fichier.
+
+Protocole socket Unix : une requete JSON par ligne, une reponse par ligne
+    {"op": "transform", "plugins": ["print_to_logging_transform"], "code": "..."}
+
+Protocole HTTP local : POST /transform (meme corps JSON), GET /ping, avec
+l'en-tete 'Authorization: Bearer <secret>'. Le secret de la session est
+ecrit dans un fichier lisible par le seul utilisateur (affiche au
+demarrage), que client_transformations.py lit de lui-meme.
+
+Usage:
+    python serveur_transformations.py                  # socket Unix par defaut
+    python serveur_transformations.py --http 8765      # HTTP sur 127.0.0.1
+    python serveur_transformations.py --socket /tmp/ast.sock --http 0
+"""
+
+import argparse
+import contextlib
+import sys
+from pathlib import Path
+
+# Ajouter le repertoire du projet au path Python
+_project_root = Path(__file__).parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+
+def construire_parser():
+    """Construit l'analyseur des arguments de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        prog="serveur_transformations.py",
+        description="Serveur persistant de transformations AST."
+    )
+    parser.add_argument("--socket",
+                        help="Chemin du socket Unix (defaut: dossier temporaire)")
+    parser.add_argument("--http", type=int, metavar="PORT",
+                        help="Ecoute aussi en HTTP sur 127.0.0.1:PORT (0 = port libre)")
+    parser.add_argument("--sans-socket", action="store_true",
+                        help="N'ouvre pas de socket Unix (HTTP seulement)")
+    parser.add_argument("--secret", metavar="FICHIER",
+                        help="Fichier du secret de session HTTP (defaut: dossier temporaire)")
+    return parser
+
+
+def main(argv=None):
+    """Point d'entree principal."""
+    import socket
+
+    from core.server import ServeurTransformations, ServiceTransformations, chemin_socket_defaut
+
+    args = construire_parser().parse_args(argv)
+
+    chemin_socket = None
+    if not args.sans_socket and hasattr(socket, 'AF_UNIX'):
+        chemin_socket = args.socket or chemin_socket_defaut()
+    port_http = args.http
+    if chemin_socket is None and port_http is None:
+        port_http = 8765
+
+    # Les messages de chargement des plugins restent sur stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        service = ServiceTransformations()
+
+    serveur = ServeurTransformations(service, chemin_socket, port_http,
+                                     chemin_secret=args.secret)
+    try:
+        serveur.demarrer()
+    except (OSError, ValueError) as e:
+        print(f"X {e}", file=sys.stderr)
+        return 1
+
+    if chemin_socket:
+        print(f"+ Serveur pret sur {chemin_socket}", file=sys.stderr)
+    if serveur.port_http is not None:
+        print(f"+ Serveur pret sur http://127.0.0.1:{serveur.port_http}", file=sys.stderr)
+        print(f"+ Secret de session: {serveur.chemin_secret}", file=sys.stderr)
+    sys.stderr.flush()
+
+    serveur.attendre()
+    print("+ Serveur arrete", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,13 +11,29 @@ Ce test vérifie la santé globale du système de transformations :
 - Fonctionnement des transformations
 - Compatibilité entre plugins
 
+Le mode performance (--perf) chronomètre la découverte, le
+rechargement et chaque plugin sur le corpus de référence
+(tests/data/input), ajoute la mesure à une série temporelle JSONL et
+signale les régressions par rapport à la médiane des exécutions
+précédentes, avec un rapport de tendance texte et HTML.
+
 Usage:
     python tests/test_periodic_transformers.py
+    python tests/periodic_transformer_test.py --perf
+    python tests/periodic_transformer_test.py --perf --html rapport.html
     
 Ou via pytest:
     pytest tests/test_periodic_transformers.py -v
 """
 
+import argparse
+import contextlib
+import html
+import io
+import json
+import platform
+import statistics
+import time
 import unittest
 import sys
 import os
@@ -30,6 +46,18 @@ sys.path.insert(0, str(project_root))
 from core.transformation_loader import TransformationLoader
 from core.base_transformer import BaseTransformer
 
+# Corpus de référence et fichiers du mode performance
+CORPUS_REFERENCE = project_root / "tests" / "data" / "input"
+HISTORIQUE_DEFAUT = project_root / "tests" / "temp" / "performances.jsonl"
+RAPPORT_HTML_DEFAUT = project_root / "tests" / "temp" / "performances.html"
+
+# Détection des régressions : médiane des N dernières mesures, écart relatif
+# et écart absolu minimal (les mesures de quelques microsecondes sont bruitées)
+FENETRE_DEFAUT = 10
+SEUIL_RELATIF_DEFAUT = 0.25
+SEUIL_ABSOLU_MS = 0.5
+MESURES_MINIMALES = 3
+
 
 class TestPeriodicTransformers(unittest.TestCase):
     """Tests périodiques pour le système de transformateurs."""
@@ -212,6 +240,197 @@ def another_function(data):
         print(f"+ Systeme sain: {len(non_init_files)} fichiers de transformation disponibles")
 
 
+# ---------------------------------------------------------------------------
+# Mode performance
+# ---------------------------------------------------------------------------
+
+def _chronometrer(fonction, repetitions):
+    """Médiane de la durée d'exécution de fonction() en millisecondes."""
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        durees.append((time.perf_counter() - debut) * 1000)
+    return round(statistics.median(durees), 4)
+
+
+def mesurer_performances(corpus=CORPUS_REFERENCE, repetitions=5):
+    """
+    Chronomètre le système sur le corpus de référence.
+
+    Returns:
+        dict: {'date', 'python', 'fichiers', 'mesures': {nom: ms}}; les
+        mesures sont 'decouverte', 'rechargement' et 'plugin:<nom>'
+        (durée de can_transform + transform sur tout le corpus)
+    """
+    sources = [f.read_text(encoding='utf-8') for f in sorted(Path(corpus).glob("*.py"))]
+    mesures = {}
+
+    # Les messages du chargeur ne font pas partie de la mesure
+    with contextlib.redirect_stdout(io.StringIO()):
+        mesures['decouverte'] = _chronometrer(TransformationLoader, repetitions)
+        loader = TransformationLoader()
+        mesures['rechargement'] = _chronometrer(loader.reload_plugins, repetitions)
+
+        for nom in sorted(loader.list_transformations()):
+            transformer = loader.get_transformation(nom)
+            if transformer is None:
+                continue
+
+            def appliquer(transformer=transformer):
+                for code in sources:
+                    if transformer.can_transform(code):
+                        transformer.transform(code)
+
+            try:
+                mesures[f"plugin:{nom}"] = _chronometrer(appliquer, repetitions)
+            except Exception as e:
+                print(f"! {nom}: {e}", file=sys.stderr)
+
+    return {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'fichiers': len(sources),
+        'mesures': mesures,
+    }
+
+
+def lire_historique(chemin=HISTORIQUE_DEFAUT):
+    """Mesures précédentes de la série temporelle (lignes illisibles ignorées)."""
+    historique = []
+    try:
+        with open(chemin, 'r', encoding='utf-8') as f:
+            for ligne in f:
+                try:
+                    historique.append(json.loads(ligne))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return historique
+
+
+def ajouter_mesure(mesure, chemin=HISTORIQUE_DEFAUT):
+    """Ajoute une mesure en fin de série temporelle."""
+    chemin = Path(chemin)
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    with open(chemin, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(mesure, ensure_ascii=False) + "\n")
+
+
+def detecter_regressions(mesure, historique, fenetre=FENETRE_DEFAUT,
+                         seuil=SEUIL_RELATIF_DEFAUT):
+    """
+    Compare chaque durée à la médiane des 'fenetre' mesures précédentes.
+
+    Returns:
+        list: [{'nom', 'duree_ms', 'reference_ms', 'ecart'}] des mesures qui
+        dépassent la référence de plus de 'seuil' (et de SEUIL_ABSOLU_MS)
+    """
+    regressions = []
+    for nom, duree in sorted(mesure['mesures'].items()):
+        precedentes = [m['mesures'][nom] for m in historique[-fenetre:]
+                       if nom in m.get('mesures', {})]
+        if len(precedentes) < MESURES_MINIMALES:
+            continue
+        reference = statistics.median(precedentes)
+        if duree > reference * (1 + seuil) and duree - reference > SEUIL_ABSOLU_MS:
+            regressions.append({
+                'nom': nom,
+                'duree_ms': duree,
+                'reference_ms': round(reference, 4),
+                'ecart': round(duree / reference - 1 if reference else float('inf'), 3),
+            })
+    return regressions
+
+
+def rapport_tendance_texte(historique, regressions=(), fenetre=FENETRE_DEFAUT):
+    """Tableau texte : dernière durée, médiane de référence et tendance."""
+    if not historique:
+        return "Aucune mesure enregistree"
+    derniere = historique[-1]
+    signalees = {r['nom'] for r in regressions}
+    lignes = [f"{'Mesure':<40} {'Derniere':>10} {'Mediane':>10} {'Tendance':>9}"]
+    for nom, duree in sorted(derniere['mesures'].items()):
+        precedentes = [m['mesures'][nom] for m in historique[-fenetre - 1:-1]
+                       if nom in m.get('mesures', {})]
+        if precedentes:
+            reference = statistics.median(precedentes)
+            tendance = f"{(duree / reference - 1) * 100:+.0f}%" if reference else "-"
+            reference = f"{reference:.3f}"
+        else:
+            reference, tendance = "-", "-"
+        marque = "  X" if nom in signalees else ""
+        lignes.append(f"{nom:<40} {duree:>10.3f} {reference:>10} {tendance:>9}{marque}")
+    lignes.append(f"({len(historique)} mesure(s), durees en ms, X = regression)")
+    return "\n".join(lignes)
+
+
+def rapport_tendance_html(historique, regressions=(), fenetre=FENETRE_DEFAUT):
+    """Page HTML autonome : tableau et courbe SVG de chaque mesure."""
+    signalees = {r['nom'] for r in regressions}
+    noms = sorted({nom for m in historique for nom in m.get('mesures', {})})
+    recentes = historique[-50:]
+    lignes = []
+    for nom in noms:
+        valeurs = [m['mesures'].get(nom) for m in recentes]
+        points = [(i, v) for i, v in enumerate(valeurs) if v is not None]
+        courbe = ""
+        if len(points) > 1:
+            maximum = max(v for _, v in points) or 1
+            largeur = max(len(recentes) - 1, 1)
+            coords = " ".join(f"{i * 200 / largeur:.1f},{30 - v * 28 / maximum:.1f}"
+                              for i, v in points)
+            courbe = (f'<svg width="200" height="32"><polyline points="{coords}" '
+                      f'fill="none" stroke="#36c" stroke-width="1.5"/></svg>')
+        derniere = f"{points[-1][1]:.3f}" if points else "-"
+        classe = ' class="regression"' if nom in signalees else ""
+        lignes.append(f"<tr{classe}><td>{html.escape(nom)}</td><td>{derniere}</td>"
+                      f"<td>{courbe}</td></tr>")
+    date = html.escape(historique[-1]['date']) if historique else "-"
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        "<title>Performances des transformateurs</title>"
+        "<style>body{font-family:sans-serif}td{padding:2px 8px}"
+        "tr.regression td{background:#fdd}</style></head><body>"
+        f"<h1>Performances des transformateurs</h1>"
+        f"<p>{len(historique)} mesure(s), derniere le {date}; "
+        f"{len(regressions)} regression(s).</p>"
+        "<table><tr><th>Mesure</th><th>Derniere (ms)</th><th>Tendance</th></tr>"
+        + "".join(lignes) + "</table></body></html>\n"
+    )
+
+
+def run_performance_test(historique=HISTORIQUE_DEFAUT, rapport_html=RAPPORT_HTML_DEFAUT,
+                         repetitions=5, fenetre=FENETRE_DEFAUT, seuil=SEUIL_RELATIF_DEFAUT,
+                         corpus=CORPUS_REFERENCE):
+    """Mesure, compare à l'historique, enregistre et affiche la tendance."""
+    print("=" * 60)
+    print("TEST PERIODIQUE - PERFORMANCES DES TRANSFORMATEURS")
+    print("=" * 60)
+
+    precedentes = lire_historique(historique)
+    mesure = mesurer_performances(corpus, repetitions)
+    regressions = detecter_regressions(mesure, precedentes, fenetre, seuil)
+    ajouter_mesure(mesure, historique)
+    series = precedentes + [mesure]
+
+    print(rapport_tendance_texte(series, regressions, fenetre))
+    if rapport_html:
+        Path(rapport_html).parent.mkdir(parents=True, exist_ok=True)
+        Path(rapport_html).write_text(rapport_tendance_html(series, regressions, fenetre),
+                                      encoding='utf-8')
+        print(f"+ Rapport HTML : {rapport_html}")
+
+    for regression in regressions:
+        print(f"X Regression {regression['nom']}: {regression['duree_ms']:.3f} ms "
+              f"(reference {regression['reference_ms']:.3f} ms, "
+              f"{regression['ecart'] * 100:+.0f}%)")
+    if not regressions:
+        print("+ Aucune regression de performance")
+    return not regressions
+
+
 def run_periodic_test():
     """Fonction utilitaire pour exécuter le test périodique."""
     print("=" * 60)
@@ -248,5 +467,24 @@ def run_periodic_test():
 
 if __name__ == "__main__":
     # Exécution directe du script
-    success = run_periodic_test()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Test periodique des transformateurs")
+    parser.add_argument('--perf', action='store_true',
+                        help="Mode performance : chronometrer et comparer a l'historique")
+    parser.add_argument('--historique', default=str(HISTORIQUE_DEFAUT),
+                        help="Serie temporelle JSONL des mesures")
+    parser.add_argument('--html', default=str(RAPPORT_HTML_DEFAUT),
+                        help="Rapport de tendance HTML ('' pour aucun)")
+    parser.add_argument('--repetitions', type=int, default=5,
+                        help="Repetitions par mesure (mediane)")
+    parser.add_argument('--fenetre', type=int, default=FENETRE_DEFAUT,
+                        help="Nombre de mesures precedentes pour la reference")
+    parser.add_argument('--seuil', type=float, default=SEUIL_RELATIF_DEFAUT,
+                        help="Ecart relatif signale comme regression (0.25 = +25%%)")
+    args = parser.parse_args()
+
+    if args.perf:
+        success = run_performance_test(args.historique, args.html, args.repetitions,
+                                       args.fenetre, args.seuil)
+    else:
+        success = run_periodic_test()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du temps d'import des points d'entree
+================================================
+
+Mesure le temps d'import cumule de chaque point d'entree avec
+`python -X importtime` (mediane de plusieurs executions) et le compare
+au budget fixe. Verifie aussi qu'une execution sans interface
+n'importe ni tkinter ni json_ai_processor.
+
+Usage:
+    python tests/scripts/benchmark_imports.py
+    python tests/scripts/benchmark_imports.py --repetitions 9 --facteur 2
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Racine du projet
+root_dir = Path(__file__).parent.parent.parent
+
+# Budget d'import cumule par point d'entree (millisecondes)
+BUDGETS_MS = {
+    'core': 10,
+    'core.batch_pipeline': 40,
+    'lancer_lot': 60,
+    'client_transformations': 50,
+    'modificateur_interactif': 60,
+}
+
+# Modules interdits lors d'une execution sans interface
+MODULES_INTERDITS = ('tkinter', 'json_ai_processor', 'composants_browser', 'modificateur_interactif')
+
+
+def temps_import(module, repetitions=5):
+    """Temps d'import cumule du module (mediane, en millisecondes)."""
+    mesures = []
+    for _ in range(repetitions):
+        resultat = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=root_dir, capture_output=True, text=True)
+        for ligne in resultat.stderr.splitlines():
+            colonnes = ligne.split('|')
+            if len(colonnes) == 3 and colonnes[2].strip() == module:
+                mesures.append(int(colonnes[1]) / 1000)
+    return statistics.median(mesures) if mesures else None
+
+
+def modules_execution_sans_interface():
+    """
+    Lance lancer_lot.py sur un fichier et retourne (modules importes,
+    nombre de plugins executes).
+    """
+    with tempfile.TemporaryDirectory() as dossier:
+        fichier = os.path.join(dossier, "exemple.py")
+        with open(fichier, 'w', encoding='utf-8') as f:
+            f.write('print("x")\n')
+        resultat = subprocess.run(
+            [sys.executable, "-X", "importtime", str(root_dir / "lancer_lot.py"),
+             "-p", "print_to_logging_transform", "--dry-run", fichier],
+            cwd=root_dir, capture_output=True, text=True)
+
+    modules = set()
+    plugins = 0
+    for ligne in resultat.stderr.splitlines():
+        colonnes = ligne.split('|')
+        if ligne.startswith("import time:") and len(colonnes) == 3:
+            modules.add(colonnes[2].strip())
+        elif ligne.startswith("+ Plugin charge"):
+            plugins += 1
+    return modules, plugins
+
+
+def main(argv=None):
+    """Point d'entree principal."""
+    parser = argparse.ArgumentParser(description="Benchmark du temps d'import")
+    parser.add_argument("--repetitions", type=int, default=5,
+                        help="Executions par module (defaut: 5)")
+    parser.add_argument("--facteur", type=float, default=1.0,
+                        help="Multiplie les budgets (machines lentes)")
+    args = parser.parse_args(argv)
+
+    depassements = 0
+    print("=== TEMPS D'IMPORT DES POINTS D'ENTREE ===")
+    for module, budget in BUDGETS_MS.items():
+        budget *= args.facteur
+        duree = temps_import(module, args.repetitions)
+        if duree is None:
+            print(f"X {module}: import impossible")
+            depassements += 1
+            continue
+        ok = duree <= budget
+        depassements += not ok
+        print(f"{'+' if ok else 'X'} {module}: {duree:.1f} ms (budget {budget:.0f} ms)")
+
+    print("\n=== EXECUTION SANS INTERFACE ===")
+    modules, plugins = modules_execution_sans_interface()
+    for interdit in MODULES_INTERDITS:
+        importes = sorted(m for m in modules if m == interdit or m.startswith(interdit + '.')
+                          or m.endswith('.' + interdit))
+        if importes:
+            print(f"X {interdit} importe: {', '.join(importes)}")
+            depassements += 1
+        else:
+            print(f"+ {interdit} non importe")
+    if plugins != 1:
+        print(f"X {plugins} plugin(s) executes pour un seul plugin demande")
+        depassements += 1
+    else:
+        print("+ Seul le plugin demande est execute")
+
+    return 1 if depassements else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests pour le Moteur d'Apercu Rapide
+====================================
+
+Tests unitaires pour composants_browser/file_preview.py
+(lecture de tete, comptage des lignes, cache LRU).
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from composants_browser.file_preview import (
+    compter_lignes, generer_apercu, lire_tete, vider_cache_apercus
+)
+
+
+class TestFilePreview(unittest.TestCase):
+    """Tests du moteur d'apercu."""
+
+    def setUp(self):
+        """Cree un dossier temporaire et vide le cache."""
+        self.temp_dir = tempfile.mkdtemp()
+        vider_cache_apercus()
+
+    def tearDown(self):
+        """Supprime le dossier temporaire."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _ecrire(self, nom, contenu):
+        chemin = os.path.join(self.temp_dir, nom)
+        with open(chemin, 'w', encoding='utf-8') as f:
+            f.write(contenu)
+        return chemin
+
+    def test_comptage_identique_a_readlines(self):
+        """Le comptage doit correspondre a readlines()."""
+        for contenu in ["", "a", "a\n", "a\nb", "a\nb\n\n", "x = 1\n" * 5000]:
+            with self.subTest(contenu=contenu[:10]):
+                chemin = self._ecrire("f.py", contenu)
+                with open(chemin, 'r', encoding='utf-8') as f:
+                    attendu = len(f.readlines())
+                self.assertEqual(compter_lignes(chemin), attendu)
+
+    def test_grand_fichier_tronque(self):
+        """Un grand fichier n'affiche que la tete et le total exact."""
+        chemin = self._ecrire("gros.py", "".join(f"x_{i} = {i}\n" for i in range(200000)))
+
+        apercu = generer_apercu(chemin, 100)
+
+        self.assertEqual(apercu.lignes_totales, 200000)
+        self.assertEqual(apercu.lignes_affichees, 100)
+        self.assertTrue(apercu.tronque)
+        self.assertIn("(200000 lignes)", apercu.texte)
+        self.assertIn("100 | x_99 = 99", apercu.texte)
+        self.assertNotIn("x_100 = 100", apercu.texte)
+        self.assertIn("199900 lignes supplémentaires", apercu.texte)
+
+    def test_petit_fichier_complet(self):
+        """Un petit fichier est affiche en entier sans mention de troncature."""
+        chemin = self._ecrire("petit.py", "print('é')\nx = 1\n")
+
+        apercu = generer_apercu(chemin)
+
+        self.assertEqual(apercu.lignes_totales, 2)
+        self.assertFalse(apercu.tronque)
+        self.assertIn("  1 | print('é')\n", apercu.texte)
+        self.assertNotIn("supplémentaires", apercu.texte)
+
+    def test_cache_invalide_apres_modification(self):
+        """Le cache retourne le meme apercu, sauf si le fichier change."""
+        chemin = self._ecrire("c.py", "a = 1\n")
+        premier = generer_apercu(chemin)
+        self.assertIs(generer_apercu(chemin), premier)
+
+        self._ecrire("c.py", "a = 1\nb = 2\n")
+        stat = os.stat(chemin)
+        os.utime(chemin, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertEqual(generer_apercu(chemin).lignes_totales, 2)
+
+    def test_tete_multi_octets_coupee(self):
+        """Un caractere multi-octets coupe en fin de bloc ne leve pas d'erreur."""
+        chemin = self._ecrire("u.py", "a" + "é" * 1000000 + "\n")
+
+        lignes, complet = lire_tete(chemin, 10)
+
+        self.assertFalse(complet)
+        self.assertTrue(lignes[0].startswith("aéé"))
+
+    def test_fichier_non_utf8(self):
+        """Un fichier non UTF-8 leve UnicodeDecodeError comme avant."""
+        chemin = os.path.join(self.temp_dir, "latin.py")
+        with open(chemin, 'wb') as f:
+            f.write(b"x = '\xe9\xff'\n")
+
+        with self.assertRaises(UnicodeDecodeError):
+            generer_apercu(chemin)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,8 @@ Lanceur de Tous les Tests Unitaires - Version Amelioree
 Ce script decouvre et lance automatiquement tous les tests unitaires
 dans le dossier tests/unittests/ et ses sous-dossiers.
 NOUVEAU: Copie automatique des resultats vers le presse-papiers pour analyse IA.
+Les modules de test sont repartis sur des processus de travail selon
+parallel_tests / max_workers de tests/config/test_settings.json.
 
 Usage:
     python tests/unittests/run_all_tests.py
@@ -16,12 +18,212 @@ Usage:
 import unittest
 import sys
 import os
+import io
+import time
 import subprocess
+import contextlib
 from pathlib import Path
 
 # Ajouter le chemin du projet au sys.path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
+# Modules utilitaires des tests (selection_tests), apres le projet : le
+# dossier tests/unittests/core ne doit pas masquer le paquet core
+if str(Path(__file__).parent) not in sys.path:
+    sys.path.append(str(Path(__file__).parent))
+
+# Sous-dossiers de tests lances par run_all_unittests
+SOUS_DOSSIERS_TESTS = ['gui', 'system', 'transformations', 'utils']
+
+# Nombre de tests les plus lents affiches dans le rapport
+NB_TESTS_LENTS = 10
+
+
+class ResultatChronometre(unittest.TextTestResult):
+    """Resultat unittest qui mesure la duree de chaque test."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.durees = []
+        self._debut_test = None
+
+    def startTest(self, test):
+        self._debut_test = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        if self._debut_test is not None:
+            self.durees.append((test.id(), time.perf_counter() - self._debut_test))
+            self._debut_test = None
+
+
+class ResultatFusionne:
+    """Resultats de plusieurs modules, avec les attributs de unittest.TestResult."""
+
+    def __init__(self):
+        self.testsRun = 0
+        self.failures = []
+        self.errors = []
+        self.skipped = []
+        self.durees = []
+        self.sorties = []
+        self.modules_en_cache = 0
+
+    def ajouter(self, resultat_module):
+        self.testsRun += resultat_module['tests']
+        self.failures.extend(resultat_module['failures'])
+        self.errors.extend(resultat_module['errors'])
+        self.skipped.extend(resultat_module['skipped'])
+        if resultat_module.get('cache'):
+            # Repris du cache : ni sortie ni duree de cette execution
+            self.modules_en_cache += 1
+            return
+        self.durees.extend(resultat_module['durees'])
+        self.sorties.append(resultat_module['sortie'])
+
+
+def lister_modules_de_test(test_dir=None):
+    """Fichiers test_*.py des sous-dossiers lances par run_all_unittests."""
+    test_dir = Path(test_dir) if test_dir else Path(__file__).parent
+    modules = []
+    for subdir in SOUS_DOSSIERS_TESTS:
+        subdir_path = test_dir / subdir
+        if subdir_path.exists():
+            modules.extend(sorted(subdir_path.glob('test_*.py')))
+    return modules
+
+
+def executer_module_de_test(test_file):
+    """
+    Lance un module de test et retourne un resume transmissible entre processus.
+
+    Les tests sont convertis en texte : les objets TestCase ne traversent
+    pas les processus de travail.
+    """
+    test_file = Path(test_file)
+    debut = time.perf_counter()
+    output_buffer = io.StringIO()
+    resume = {'module': str(test_file), 'tests': 0, 'failures': [], 'errors': [],
+              'skipped': [], 'durees': [], 'sortie': '', 'duree': 0.0}
+
+    with contextlib.redirect_stdout(output_buffer), contextlib.redirect_stderr(output_buffer):
+        try:
+            loader = unittest.TestLoader()
+            suite = loader.discover(str(test_file.parent), pattern=test_file.name)
+            runner = unittest.TextTestRunner(stream=output_buffer, verbosity=2,
+                                             resultclass=ResultatChronometre)
+            result = runner.run(suite)
+            resume.update(
+                tests=result.testsRun,
+                failures=[(str(test), tb) for test, tb in result.failures],
+                errors=[(str(test), tb) for test, tb in result.errors],
+                skipped=[(str(test), raison) for test, raison in result.skipped],
+                durees=result.durees,
+            )
+        except Exception as e:
+            resume['errors'].append((str(test_file.name), f"Erreur chargement module\n{e}\n"))
+
+    resume['sortie'] = output_buffer.getvalue()
+    resume['duree'] = time.perf_counter() - debut
+    return resume
+
+
+def _parametres_execution():
+    """
+    Lit parallel_tests / max_workers / enable_cache des parametres.
+
+    Returns:
+        tuple: (nombre de processus borne par le nombre de CPU, cache actif)
+    """
+    from core.settings import charger_parametres
+
+    parametres = charger_parametres()
+    processus = 1
+    if parametres.get('parallel_tests'):
+        processus = max(1, min(int(parametres.get('max_workers') or 1), os.cpu_count() or 1))
+    return processus, bool(parametres.get('enable_cache'))
+
+
+def _executer_en_parallele(modules, processus):
+    """
+    Execute chaque module dans un processus neuf; produit (module, future)
+    dans l'ordre d'achevement.
+
+    max_tasks_per_child n'existe qu'a partir de Python 3.11 : avant, chaque
+    module recoit son propre executeur a un seul processus, au plus
+    processus a la fois.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+    if sys.version_info >= (3, 11):
+        with ProcessPoolExecutor(max_workers=processus, max_tasks_per_child=1) as executor:
+            futures = {executor.submit(executer_module_de_test, str(m)): m for m in modules}
+            for future in as_completed(futures):
+                yield futures[future], future
+        return
+
+    restants = list(modules)
+    en_cours = {}
+    try:
+        while restants or en_cours:
+            while restants and len(en_cours) < processus:
+                module = restants.pop(0)
+                executor = ProcessPoolExecutor(max_workers=1)
+                en_cours[executor.submit(executer_module_de_test, str(module))] = (module, executor)
+            termines, _ = wait(list(en_cours), return_when=FIRST_COMPLETED)
+            for future in termines:
+                module, executor = en_cours.pop(future)
+                executor.shutdown(wait=True)
+                yield module, future
+    finally:
+        for _, executor in en_cours.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def executer_modules(modules, processus=1, utiliser_cache=False, chemin_cache=None):
+    """
+    Lance les modules de test, en parallele si processus > 1.
+
+    Chaque module tourne dans son propre processus (un seul module par
+    processus) : aucun etat global ni sys.modules partage entre modules.
+    Avec utiliser_cache, un module dont le code et les dependances n'ont
+    pas change depuis sa derniere reussite n'est pas relance.
+    """
+    resultats = {}
+    a_executer = list(modules)
+    if utiliser_cache:
+        from selection_tests import CacheResultats, GrapheImports, selectionner
+
+        graphe = GrapheImports()
+        cache = CacheResultats(chemin_cache)
+        a_executer, resultats, empreintes = selectionner(modules, graphe, cache)
+
+    if processus > 1 and len(a_executer) > 1:
+        for module, future in _executer_en_parallele(a_executer, processus):
+            try:
+                resultats[module] = future.result()
+            except Exception as e:
+                resultats[module] = {
+                    'module': str(module), 'tests': 0, 'failures': [],
+                    'errors': [(module.name, f"Processus de test interrompu\n{e}\n")],
+                    'skipped': [], 'durees': [], 'sortie': '', 'duree': 0.0,
+                }
+    else:
+        for module in a_executer:
+            resultats[module] = executer_module_de_test(str(module))
+
+    if utiliser_cache:
+        for module in a_executer:
+            cache.enregistrer(graphe._relatif(Path(module).resolve()), empreintes[module],
+                              resultats[module])
+        cache.sauver()
+
+    # Fusion dans l'ordre des modules pour un rapport stable
+    fusion = ResultatFusionne()
+    for module in modules:
+        fusion.ajouter(resultats[module])
+    return fusion
 
 def copy_to_clipboard(text):
     """Copie le texte vers le presse-papiers."""
@@ -49,55 +251,33 @@ def copy_to_clipboard(text):
         print(f"Erreur copie presse-papiers: {e}")
         return False
 
-def run_all_unittests():
-    """Lance tous les tests unitaires."""
+def run_all_unittests(utiliser_cache=True):
+    """Lance tous les tests unitaires (cache selon enable_cache si utiliser_cache)."""
     
     print("=" * 60)
     print("EXECUTION DE TOUS LES TESTS UNITAIRES")
     print("=" * 60)
     
-    # Dossier de base des tests unitaires
-    test_dir = Path(__file__).parent
-    
-    # Decouvrir tous les tests (en excluant les modules problematiques)
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
+    # Un processus par module de test, selon tests/config/test_settings.json
+    modules = lister_modules_de_test()
+    processus, cache_actif = _parametres_execution()
+    cache_actif = cache_actif and utiliser_cache
+    print(f"Modules de test: {len(modules)} ({processus} processus"
+          f"{', cache actif' if cache_actif else ''})")
     
-    # Parcourir chaque sous-dossier et charger les tests manuellement
-    for subdir in ['gui', 'system', 'transformations', 'utils']:
-        subdir_path = test_dir / subdir
-        if subdir_path.exists():
-            try:
-                # Charger les tests de ce sous-dossier
-                sub_suite = loader.discover(str(subdir_path), pattern='test_*.py')
-                suite.addTest(sub_suite)
-            except Exception as e:
-                print(f"Erreur chargement {subdir}: {e}")
+    debut = time.perf_counter()
+    result = executer_modules(modules, processus, utiliser_cache=cache_actif)
+    duree_totale = time.perf_counter() - debut
+    test_output = "".join(result.sorties)
     
-    # Compter le nombre de tests
-    test_count = suite.countTestCases()
-    print(f"Tests decouverts: {test_count}")
+    print(f"Tests decouverts: {result.testsRun}")
     
-    if test_count == 0:
+    if result.testsRun == 0:
         report = "ERREUR: Aucun test trouve !"
         print(report)
         copy_to_clipboard(report)
         return False
     
-    # Capture de la sortie pour le rapport
-    from io import StringIO
-    import contextlib
-    
-    output_buffer = StringIO()
-    
-    # Lancer tous les tests avec capture de sortie
-    with contextlib.redirect_stdout(output_buffer), contextlib.redirect_stderr(output_buffer):
-        runner = unittest.TextTestRunner(stream=output_buffer, verbosity=2)
-        result = runner.run(suite)
-    
-    # Recuperer la sortie
-    test_output = output_buffer.getvalue()
-    
     # Creer le rapport detaille
     report_lines = []
     report_lines.append("=" * 60)
@@ -114,6 +294,17 @@ def run_all_unittests():
         success_rate = ((result.testsRun - len(result.failures) - len(result.errors)) / result.testsRun) * 100
         report_lines.append(f"Taux de reussite: {success_rate:.1f}%")
     
+    report_lines.append(f"Duree totale: {duree_totale:.2f} s ({processus} processus)")
+    if result.modules_en_cache:
+        report_lines.append(f"Modules repris du cache (inchanges): "
+                            f"{result.modules_en_cache}/{len(modules)}")
+    
+    # Tests les plus lents
+    if result.durees:
+        report_lines.append(f"\nTESTS LES PLUS LENTS ({min(NB_TESTS_LENTS, len(result.durees))}):")
+        for test_id, duree in sorted(result.durees, key=lambda d: d[1], reverse=True)[:NB_TESTS_LENTS]:
+            report_lines.append(f"  {duree * 1000:8.1f} ms  {test_id}")
+    
     # Problemes detectes
     problems_detected = []
     
@@ -294,11 +485,14 @@ def main():
                 run_specific_test_file(sys.argv[2])
             else:
                 run_all_unittests()
+        elif sys.argv[1] == "--sans-cache":
+            run_all_unittests(utiliser_cache=False)
         else:
             print("Usage:")
             print("  python run_all_tests.py         # Lance tous les tests")
             print("  python run_all_tests.py --list  # Liste les tests")
             print("  python run_all_tests.py --run test_file.py  # Lance un test specifique")
+            print("  python run_all_tests.py --sans-cache  # Relance tout, sans cache")
     else:
         # Mode interactif
         while True:
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Selection des Tests Selon les Modifications
+===========================================
+
+Construit le graphe des imports de core/, composants_browser/, des
+scripts du projet et des tests, puis calcule pour chaque module de test
+une empreinte de son contenu et de toutes ses dependances transitives.
+Un module dont l'empreinte n'a pas change depuis sa derniere reussite
+est repris du cache au lieu d'etre relance (enable_cache).
+
+Les plugins etant charges dynamiquement par TransformationLoader, un
+test depend aussi des plugins dont il cite le nom en chaine
+("print_to_logging_transform"), et des scripts dont il cite le fichier
+("lancer_lot.py"). Le chargeur lui-meme depend de tous les plugins : un
+test qui l'atteint (chargement complet, analyze sans liste de plugins)
+est relance des qu'un plugin change.
+
+Les fichiers cites par leur nom (donnees et configuration des tests,
+scripts hors de la racine atteints par Path(__file__).parent...) font
+aussi partie de l'empreinte. Un test qui remonte au-dessus de la racine
+sans qu'aucun fichier cite n'y soit trouve n'est jamais repris du cache.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Racine du projet (Colab_tools/)
+project_root = Path(__file__).parent.parent.parent
+
+# Dossiers analyses pour le graphe (en plus des scripts a la racine et des tests)
+PAQUETS_ANALYSES = ['core', 'composants_browser']
+
+# Fichier du cache des resultats
+CHEMIN_CACHE_DEFAUT = project_root / "tests" / "temp" / "cache_resultats_tests.json"
+
+# Version du format du cache
+_VERSION_CACHE = 2
+
+# Module qui execute tous les fichiers de core/transformations/
+MODULE_CHARGEUR = 'core.transformation_loader'
+
+# Dossiers de tests jamais pris comme ressources (sorties des tests, caches)
+_DOSSIERS_NON_RESSOURCES = frozenset(['__pycache__', 'temp'])
+
+
+def empreinte_fichier(chemin: Path) -> str:
+    """Empreinte du contenu d'un fichier."""
+    with open(chemin, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+class GrapheImports:
+    """
+    Graphe des dependances entre fichiers Python du projet.
+
+    Les imports sont resolus comme au lancement : nom complet depuis la
+    racine du projet, puis module voisin, puis module du dossier parent
+    (chemins ajoutes a sys.path par les plugins et l'interface).
+    """
+
+    def __init__(self, racine: Optional[Path] = None, dossier_tests: Optional[Path] = None):
+        self.racine = Path(racine or project_root).resolve()
+        self.dossier_tests = Path(dossier_tests or self.racine / "tests" / "unittests").resolve()
+        self.modules: Dict[str, Path] = {}
+        self.dependances: Dict[Path, Set[Path]] = {}
+        self._fermetures: Dict[Path, Set[Path]] = {}
+        # Modules dont une dependance hors de la racine n'a pu etre resolue
+        self.non_resolus: Set[Path] = set()
+        self._indexer()
+        self._plugins = {chemin.stem: chemin for nom, chemin in self.modules.items()
+                         if nom.startswith('core.transformations.')}
+        self._scripts = {chemin.name: chemin for nom, chemin in self.modules.items()
+                         if '.' not in nom}
+
+    def _indexer(self):
+        for chemin in sorted(self.racine.glob('*.py')):
+            self.modules[chemin.stem] = chemin.resolve()
+        for paquet in PAQUETS_ANALYSES:
+            for chemin in sorted((self.racine / paquet).rglob('*.py')):
+                if '__pycache__' in chemin.parts:
+                    continue
+                relatif = chemin.relative_to(self.racine).with_suffix('')
+                parties = list(relatif.parts)
+                if parties[-1] == '__init__':
+                    parties.pop()
+                self.modules['.'.join(parties)] = chemin.resolve()
+
+        # Fichiers de donnees des tests, par nom (ex: test_settings.json)
+        self._ressources: Dict[str, Set[Path]] = {}
+        for chemin in self._fichiers_ressources(self.racine / 'tests'):
+            self._ressources.setdefault(chemin.name, set()).add(chemin)
+
+    @staticmethod
+    def _fichiers_ressources(dossier: Path) -> List[Path]:
+        fichiers = []
+        for racine, sous_dossiers, noms in os.walk(dossier):
+            sous_dossiers[:] = sorted(d for d in sous_dossiers if d not in _DOSSIERS_NON_RESSOURCES)
+            fichiers.extend(Path(racine, nom).resolve() for nom in sorted(noms)
+                            if not nom.endswith('.pyc'))
+        return fichiers
+
+    def fichiers_de_test(self) -> List[Path]:
+        return sorted(p.resolve() for p in self.dossier_tests.rglob('test_*.py')
+                      if '__pycache__' not in p.parts)
+
+    # --- Dependances directes ---
+
+    def dependances_directes(self, fichier: Path) -> Set[Path]:
+        fichier = Path(fichier).resolve()
+        if fichier in self.dependances:
+            return self.dependances[fichier]
+
+        deps: Set[Path] = set()
+        self.dependances[fichier] = deps
+        if fichier.suffix != '.py':
+            return deps
+        try:
+            arbre = ast.parse(fichier.read_text(encoding='utf-8', errors='replace'))
+        except (OSError, SyntaxError, ValueError):
+            return deps
+
+        bases = self._bases_ressources(fichier, arbre)
+        # Dossiers hors de la racine atteints depuis __file__ (pas celui du module)
+        exterieurs = [b for b in bases[3:] if not self._dans_racine(b)]
+        resolus_dehors = False
+        for noeud in ast.walk(arbre):
+            if isinstance(noeud, ast.Import):
+                for alias in noeud.names:
+                    self._ajouter(deps, fichier, alias.name)
+            elif isinstance(noeud, ast.ImportFrom):
+                base = self._base_relative(fichier, noeud.level, noeud.module)
+                if base is None:
+                    continue
+                if base:
+                    self._ajouter(deps, fichier, base)
+                for alias in noeud.names:
+                    self._ajouter(deps, fichier, f"{base}.{alias.name}" if base else alias.name,
+                                  strict=True)
+            elif isinstance(noeud, ast.Constant) and isinstance(noeud.value, str):
+                self._ajouter_reference(deps, noeud.value)
+                resolus_dehors |= self._ajouter_ressource(deps, fichier, noeud.value, bases)
+
+        if exterieurs and not resolus_dehors:
+            self.non_resolus.add(fichier)
+        if fichier == self.modules.get(MODULE_CHARGEUR):
+            deps.update(self._plugins.values())
+        deps.discard(fichier)
+        return deps
+
+    def _dans_racine(self, chemin: Path) -> bool:
+        return chemin == self.racine or self.racine in chemin.parents
+
+    def _bases_ressources(self, fichier: Path, arbre: ast.AST) -> List[Path]:
+        """Dossiers ou chercher les fichiers cites : voisins, racine, tests et
+        dossiers atteints par Path(__file__).parent.parent..."""
+        bases = [fichier.parent, self.racine, self.racine / 'tests']
+        for noeud in ast.walk(arbre):
+            niveaux, courant = 0, noeud
+            while isinstance(courant, ast.Attribute) and courant.attr == 'parent':
+                niveaux += 1
+                courant = courant.value
+            if niveaux and any(isinstance(n, ast.Name) and n.id == '__file__'
+                               for n in ast.walk(courant)):
+                base = fichier
+                for _ in range(niveaux):
+                    base = base.parent
+                if base not in bases:
+                    bases.append(base)
+        return bases
+
+    def _ajouter_ressource(self, deps: Set[Path], fichier: Path, texte: str,
+                           bases: List[Path]) -> bool:
+        """
+        Fichiers designes par une chaine (nom ou chemin relatif).
+
+        Returns:
+            bool: True si un fichier hors de la racine a ete trouve
+        """
+        if not texte or len(texte) > 200 or '\n' in texte or os.path.isabs(texte) \
+                or not texte.strip('./'):
+            return False
+        dehors = False
+        dossier_tests = self.racine / 'tests'
+        for base in bases:
+            try:
+                candidat = (base / texte).resolve()
+                if self._dans_racine(candidat) and _DOSSIERS_NON_RESSOURCES.intersection(
+                        candidat.relative_to(self.racine).parts):
+                    continue
+                if candidat.is_file():
+                    deps.add(candidat)
+                    dehors |= not self._dans_racine(candidat)
+                elif (candidat.is_dir() and dossier_tests in candidat.parents
+                      and dossier_tests in fichier.parents):
+                    # Dossier de donnees cite par un test : tout son contenu
+                    deps.update(self._fichiers_ressources(candidat))
+            except (OSError, ValueError):
+                continue
+        deps.update(self._ressources.get(texte, ()))
+        return dehors
+
+    def _base_relative(self, fichier: Path, niveau: int, module: Optional[str]) -> Optional[str]:
+        if not niveau:
+            return module or ''
+        try:
+            paquet = fichier.parent.relative_to(self.racine).parts
+        except ValueError:
+            return None
+        if niveau - 1 > len(paquet):
+            return None
+        parties = list(paquet[:len(paquet) - (niveau - 1)])
+        if module:
+            parties.append(module)
+        return '.'.join(parties)
+
+    def _ajouter(self, deps: Set[Path], fichier: Path, nom: str, strict: bool = False):
+        """Ajoute le module 'nom' et les paquets qui le contiennent."""
+        cible = self.modules.get(nom)
+        if cible is None and not strict:
+            # Module voisin ou du dossier parent (sys.path ajuste a l'execution)
+            for dossier in (fichier.parent, fichier.parent.parent):
+                candidat = dossier / (nom.replace('.', os.sep) + '.py')
+                if candidat.exists():
+                    cible = candidat.resolve()
+                    break
+        if cible is None:
+            return
+        deps.add(cible)
+        parties = nom.split('.')
+        for i in range(1, len(parties)):
+            paquet = self.modules.get('.'.join(parties[:i]))
+            if paquet is not None:
+                deps.add(paquet)
+
+    def _ajouter_reference(self, deps: Set[Path], texte: str):
+        """Chaines qui designent un plugin, un module ou un script du projet."""
+        if len(texte) > 200:
+            return
+        if texte in self._plugins:
+            deps.add(self._plugins[texte])
+        elif texte in self.modules and '.' in texte:
+            deps.add(self.modules[texte])
+        elif texte.endswith('.py') and texte in self._scripts:
+            deps.add(self._scripts[texte])
+
+    # --- Fermeture transitive ---
+
+    def dependances_transitives(self, fichier: Path) -> Set[Path]:
+        fichier = Path(fichier).resolve()
+        if fichier in self._fermetures:
+            return self._fermetures[fichier]
+        vus: Set[Path] = set()
+        pile = [fichier]
+        while pile:
+            courant = pile.pop()
+            for dep in self.dependances_directes(courant):
+                if dep not in vus and dep != fichier:
+                    vus.add(dep)
+                    pile.append(dep)
+        self._fermetures[fichier] = vus
+        return vus
+
+    def empreinte_test(self, fichier: Path,
+                       empreintes: Optional[Dict[Path, str]] = None) -> Optional[str]:
+        """
+        Empreinte d'un module de test et de toutes ses dependances.
+
+        Returns:
+            str: Empreinte, ou None si une dependance n'a pu etre resolue
+            (le module est alors toujours relance)
+        """
+        empreintes = empreintes if empreintes is not None else {}
+        fichier = Path(fichier).resolve()
+        fermeture = {fichier} | self.dependances_transitives(fichier)
+        if fermeture & self.non_resolus:
+            return None
+        morceaux = []
+        for chemin in sorted(fermeture):
+            if chemin not in empreintes:
+                try:
+                    empreintes[chemin] = empreinte_fichier(chemin)
+                except OSError:
+                    return None
+            morceaux.append(f"{self._relatif(chemin)}:{empreintes[chemin]}")
+        return hashlib.blake2b("\n".join(morceaux).encode('utf-8'), digest_size=16).hexdigest()
+
+    def tests_affectes(self, modifies: Iterable[Path], tests: Iterable[Path]) -> List[Path]:
+        """Modules de test qui dependent (transitivement) d'un fichier modifie."""
+        modifies = {Path(m).resolve() for m in modifies}
+        return [t for t in tests
+                if Path(t).resolve() in modifies or self.dependances_transitives(t) & modifies]
+
+    def _relatif(self, chemin: Path) -> str:
+        try:
+            return chemin.relative_to(self.racine).as_posix()
+        except ValueError:
+            return str(chemin)
+
+
+class CacheResultats:
+    """Resultats des modules de test reussis, indexes par empreinte."""
+
+    def __init__(self, chemin: Optional[Path] = None):
+        self.chemin = Path(chemin or CHEMIN_CACHE_DEFAUT)
+        self.entrees: Dict[str, Dict] = {}
+        try:
+            with open(self.chemin, 'r', encoding='utf-8') as f:
+                donnees = json.load(f)
+            if donnees.get('version') == _VERSION_CACHE:
+                self.entrees = donnees.get('modules', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def resultat(self, module: str, empreinte: str) -> Optional[Dict]:
+        """Resultat en cache si l'empreinte correspond, sinon None."""
+        entree = self.entrees.get(module)
+        if empreinte is not None and entree and entree.get('empreinte') == empreinte:
+            return entree['resultat']
+        return None
+
+    def enregistrer(self, module: str, empreinte: str, resultat: Dict):
+        """Garde un resultat reussi; un echec retire l'entree (il sera relance)."""
+        if resultat['failures'] or resultat['errors'] or empreinte is None:
+            self.entrees.pop(module, None)
+            return
+        self.entrees[module] = {'empreinte': empreinte, 'date': time.time(),
+                                'resultat': dict(resultat, sortie='')}
+
+    def sauver(self):
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        temporaire = self.chemin.with_suffix('.tmp')
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump({'version': _VERSION_CACHE, 'modules': self.entrees}, f)
+        os.replace(temporaire, self.chemin)
+
+
+def selectionner(modules: Iterable[Path], graphe: GrapheImports,
+                 cache: CacheResultats) -> Tuple[List[Path], Dict[Path, Dict], Dict[Path, str]]:
+    """
+    Separe les modules a relancer de ceux repris du cache.
+
+    Returns:
+        tuple: (modules a executer, resultats en cache par module, empreinte par module)
+    """
+    empreintes_fichiers: Dict[Path, str] = {}
+    a_executer, en_cache, empreintes = [], {}, {}
+    for module in modules:
+        empreinte = graphe.empreinte_test(module, empreintes_fichiers)
+        empreintes[module] = empreinte
+        resultat = cache.resultat(graphe._relatif(Path(module).resolve()), empreinte)
+        if resultat is not None:
+            en_cache[module] = dict(resultat, cache=True)
+        else:
+            a_executer.append(module)
+    return a_executer, en_cache, empreintes
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du Cache des Analyses
+===========================
+
+Tests de core/parse_cache.py : cle (code, plugin, version de Python),
+eviction des entrees les moins recemment utilisees et reprise des
+resultats par BatchPipeline sans executer le plugin.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.base_transformer import BaseTransformer
+from core.batch_pipeline import BatchPipeline
+from core.parse_cache import MANQUANT, CacheAnalyse
+from core.transformation_loader import TransformationLoader
+
+
+class _PluginCompteur(BaseTransformer):
+    """Plugin factice qui compte ses analyses."""
+
+    def __init__(self):
+        super().__init__()
+        self.analyses = 0
+
+    def get_metadata(self):
+        return {'name': 'Compteur', 'description': '', 'version': '1.0', 'author': ''}
+
+    def can_transform(self, code_source):
+        self.analyses += 1
+        return 'x' in code_source
+
+    def transform(self, code_source):
+        return code_source.replace('x', 'y')
+
+
+class _Chargeur:
+    def __init__(self, plugin):
+        self.plugin = plugin
+
+    def get_transformation(self, nom):
+        return self.plugin
+
+
+class TestCacheAnalyses(unittest.TestCase):
+    """Tests du cache sur disque."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = CacheAnalyse(os.path.join(self.temp_dir, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_lecture_ecriture(self):
+        """Resultat absent, inchange (None) ou code transforme."""
+        cle = self.cache.cle("x = 1\n", "plugin")
+        self.assertIs(self.cache.lire(cle), MANQUANT)
+        self.cache.ecrire(cle, None)
+        self.assertIsNone(self.cache.lire(cle))
+        self.cache.ecrire(cle, "y = 1\n")
+        self.assertEqual(CacheAnalyse(self.cache.dossier).lire(cle), "y = 1\n")
+        self.assertEqual((self.cache.succes, self.cache.echecs), (1, 1))
+
+    def test_cle_depend_du_code_et_du_plugin(self):
+        cle = CacheAnalyse.cle("x = 1\n", "a")
+        self.assertNotEqual(cle, CacheAnalyse.cle("x = 2\n", "a"))
+        self.assertNotEqual(cle, CacheAnalyse.cle("x = 1\n", "b"))
+        self.assertEqual(cle, CacheAnalyse.cle("x = 1\n", "a"))
+
+    def test_entree_corrompue_ignoree(self):
+        cle = self.cache.cle("x", "p")
+        self.cache.ecrire(cle, "y")
+        with open(self.cache._chemin(cle), 'wb') as f:
+            f.write(b"pas du zlib")
+        self.assertIs(self.cache.lire(cle), MANQUANT)
+
+    def test_eviction_des_moins_recemment_utilisees(self):
+        """Au-dela de la taille maximale, les entrees anciennes partent d'abord."""
+        cles = [self.cache.cle(str(i), "p") for i in range(6)]
+        for i, cle in enumerate(cles):
+            self.cache.ecrire(cle, os.urandom(200).hex())
+            os.utime(self.cache._chemin(cle), (time.time() - 100 + i,) * 2)
+        # La plus ancienne est relue : elle devient la plus recente
+        self.assertIsNot(self.cache.lire(cles[0]), MANQUANT)
+
+        taille = os.path.getsize(self.cache._chemin(cles[1]))
+        self.cache.taille_max = taille * 4
+        self.assertGreater(self.cache.evincer(), 0)
+        restantes = [cle for cle in cles if os.path.exists(self.cache._chemin(cle))]
+        self.assertIn(cles[0], restantes)
+        self.assertIn(cles[5], restantes)
+        self.assertNotIn(cles[1], restantes)
+        self.assertLessEqual(sum(os.path.getsize(self.cache._chemin(c)) for c in restantes),
+                             self.cache.taille_max)
+
+    def test_pipeline_reprend_les_resultats(self):
+        """Second passage : resultats identiques, plugin non execute."""
+        fichiers = []
+        for nom, contenu in (("a.py", "x = 1\n"), ("b.py", "z = 1\n")):
+            chemin = os.path.join(self.temp_dir, nom)
+            with open(chemin, 'w', encoding='utf-8') as f:
+                f.write(contenu)
+            fichiers.append(chemin)
+
+        def executer():
+            plugin = _PluginCompteur()
+            pipeline = BatchPipeline(["compteur"], loader=_Chargeur(plugin), dry_run=True,
+                                     cache=CacheAnalyse(self.cache.dossier)).preparer()
+            resultats = [pipeline.traiter_fichier(chemin) for chemin in fichiers]
+            return plugin, resultats
+
+        plugin, premiers = executer()
+        self.assertEqual(plugin.analyses, 2)
+        plugin, seconds = executer()
+        self.assertEqual(plugin.analyses, 0)
+        self.assertEqual([code for _, code in seconds], ["y = 1\n", None])
+        self.assertEqual([code for _, code in seconds], [code for _, code in premiers])
+        self.assertTrue(all(r['plugins'][0].get('cache') for r, _ in seconds))
+
+    def test_empreinte_suit_le_fichier_du_plugin(self):
+        """Un plugin charge par le chargeur et modifie sans changer de version."""
+        dossier = Path(self.temp_dir) / "plugins"
+        dossier.mkdir()
+        source = project_root / "core" / "transformations" / "print_to_logging_transform.py"
+        copie = dossier / source.name
+        shutil.copy(source, copie)
+
+        def empreinte():
+            chargeur = TransformationLoader(transformations_dir=str(dossier))
+            return chargeur.get_transformation("print_to_logging_transform").empreinte_cache()
+
+        avant = empreinte()
+        self.assertEqual(avant, empreinte())
+        with open(copie, 'a', encoding='utf-8') as f:
+            f.write("\n# logique modifiee, meme version\n")
+        self.assertNotEqual(avant, empreinte())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests des Imports Differes
+==========================
+
+Verifie dans des sous-processus que les points d'entree restent legers :
+pas de banniere a l'import, pas de tkinter ni de plugins superflus
+pour une execution sans interface.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.transformation_loader import TransformationLoader
+
+
+def _executer(code):
+    """Execute du code Python dans un interpreteur neuf depuis la racine du projet."""
+    return subprocess.run([sys.executable, "-c", code], cwd=project_root,
+                          capture_output=True, text=True, timeout=60)
+
+
+class TestImportsDifferes(unittest.TestCase):
+    """Tests des imports des points d'entree."""
+
+    def test_import_core_leger(self):
+        """'import core' ne charge pas le chargeur de transformations."""
+        resultat = _executer(
+            "import sys, core; print('core.transformation_loader' in sys.modules); "
+            "core.TransformationLoader; print('core.transformation_loader' in sys.modules)")
+        self.assertEqual(resultat.stdout.split(), ["False", "True"], resultat.stderr)
+
+    def test_import_modificateur_silencieux(self):
+        """Importer modificateur_interactif n'affiche aucune banniere."""
+        resultat = _executer("import modificateur_interactif")
+        self.assertEqual(resultat.returncode, 0, resultat.stderr)
+        self.assertEqual(resultat.stdout, "")
+
+    def test_execution_sans_interface(self):
+        """Un lot sans interface n'importe ni tkinter ni json_ai_processor."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            fichier = os.path.join(temp_dir, "a.py")
+            with open(fichier, 'w', encoding='utf-8') as f:
+                f.write('print("x")\n')
+            resultat = _executer(
+                "import contextlib, io, json, sys, lancer_lot\n"
+                "with contextlib.redirect_stdout(io.StringIO()):\n"
+                f"    lancer_lot.main(['-p', 'print_to_logging_transform', '--dry-run', {fichier!r}])\n"
+                "print(json.dumps(sorted(sys.modules)))")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        self.assertEqual(resultat.returncode, 0, resultat.stderr)
+        modules = json.loads(resultat.stdout.strip().splitlines()[-1])
+        self.assertNotIn("tkinter", modules)
+        self.assertFalse([m for m in modules if "json_ai_processor" in m])
+        self.assertEqual(resultat.stderr.count("+ Plugin charge"), 1)
+
+
+class TestChargeurParesseux(unittest.TestCase):
+    """Tests du mode lazy du TransformationLoader."""
+
+    def test_plugins_reperes_sans_execution(self):
+        """Les plugins sont listes sans etre executes, puis charges a la demande."""
+        loader = TransformationLoader(lazy=True)
+        self.assertIn("print_to_logging_transform", loader.list_transformations())
+        self.assertNotIn("launcher_simple", loader.list_transformations())
+        self.assertEqual(loader.plugins, {})
+
+        plugin = loader.get_transformation("print_to_logging_transform")
+        self.assertIsNotNone(plugin)
+        self.assertEqual(list(loader.plugins), ["print_to_logging_transform"])
+        self.assertIsNone(loader.get_transformation("inexistant"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests pour l'Execution Isolee
+=============================
+
+Tests de core/isolation.py : un fichier pathologique depasse la limite
+de duree ou de memoire, son processus est remplace et le lot continue.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.batch_pipeline import BatchPipeline
+from core.isolation import ExecuteurIsole, contexte_processus, memoire_residente
+
+
+class TestExecutionIsolee(unittest.TestCase):
+    """Tests des limites par fichier."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Les processus de travail reimportent core d'apres sys.path, ou
+        # pytest place tests/unittests (dont le dossier core masque le paquet)
+        sys.path.insert(0, str(project_root))
+
+    def setUp(self):
+        """Un gros litteral (lent et gourmand a analyser) et un fichier normal."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.gros = os.path.join(self.temp_dir, "gros.py")
+        with open(self.gros, 'w', encoding='utf-8') as f:
+            # print non appele : impose le moteur AST (le balayage lexical est rapide)
+            f.write("x = [" + "1," * 300000 + "]\nafficher = print\nprint(x)\n")
+        self.normal = os.path.join(self.temp_dir, "normal.py")
+        with open(self.normal, 'w', encoding='utf-8') as f:
+            f.write('print("x")\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_processus_sans_fork(self):
+        """Les processus de travail ne sont pas crees par fork."""
+        self.assertIn(contexte_processus().get_start_method(), ('forkserver', 'spawn'))
+
+    def _executer(self, **limites):
+        executeur = ExecuteurIsole(["print_to_logging_transform"], **limites)
+        resultats = {os.path.basename(r['fichier']): r
+                     for r, _ in executeur.executer([self.gros, self.normal])}
+        return executeur, resultats
+
+    def test_delai_depasse(self):
+        """Le fichier trop lent est rapporte et le suivant est traite."""
+        executeur, resultats = self._executer(timeout=0.2)
+        self.assertEqual(resultats["gros.py"]['incident'], 'delai')
+        self.assertEqual(resultats["normal.py"]['statut'], 'modifie')
+        self.assertEqual(executeur.recyclages, 1)
+
+    def test_memoire_depassee(self):
+        """Le fichier trop gourmand est rapporte et le suivant est traite."""
+        if memoire_residente(os.getpid()) is None:
+            self.skipTest("/proc indisponible")
+        _, resultats = self._executer(max_rss_mb=64)
+        self.assertEqual(resultats["gros.py"]['statut'], 'erreur')
+        self.assertEqual(resultats["gros.py"]['incident'], 'memoire')
+        self.assertEqual(resultats["normal.py"]['statut'], 'modifie')
+
+    def test_pipeline_isole_sans_incident(self):
+        """Sans depassement, le mode isole donne les memes resultats."""
+        pipeline = BatchPipeline(["print_to_logging_transform"], dry_run=True,
+                                 roots=[self.temp_dir], isoler=True, jobs=2, timeout=60)
+        resultats = list(pipeline.executer([self.normal, self.normal]))
+        self.assertEqual([r['statut'] for r in resultats], ['modifie', 'modifie'])
+        self.assertNotIn('incident', resultats[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
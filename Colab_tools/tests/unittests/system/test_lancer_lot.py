@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests pour le Lanceur en Lot Sans Interaction
+=============================================
+
+Tests du pipeline par lot (core/batch_pipeline.py) et de la ligne
+de commande lancer_lot.py executee dans un sous-processus.
+"""
+
+import json
+import os
+import sys
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.batch_pipeline import ajouter_imports, chemin_relatif, inserer_config
+
+CODE_AVEC_PRINT = 'def f(items=[]):\n    print("x")\n    return items\n'
+CODE_SANS_PRINT = 'def g():\n    return 1\n'
+
+
+class TestBatchPipeline(unittest.TestCase):
+    """Tests des fonctions du pipeline."""
+
+    def test_ajouter_imports_sans_doublon(self):
+        """Un import deja present n'est pas ajoute une seconde fois."""
+        code = ajouter_imports("import os\nx = 1", ["logging", "os"])
+        self.assertEqual(code.count("import logging"), 1)
+        self.assertEqual(code.count("import os"), 1)
+
+    def test_inserer_config_une_seule_fois(self):
+        """La configuration n'est inseree qu'une fois."""
+        config = "logging.basicConfig(level=logging.INFO)"
+        code = inserer_config("import logging\nx = 1", config)
+        self.assertEqual(inserer_config(code, config), code)
+
+    def test_chemin_relatif_racine_la_plus_profonde(self):
+        """Le chemin relatif utilise la racine la plus profonde."""
+        racines = [os.path.join(os.sep, "a"), os.path.join(os.sep, "a", "b")]
+        chemin = os.path.join(os.sep, "a", "b", "c", "d.py")
+        self.assertEqual(chemin_relatif(chemin, racines), os.path.join("c", "d.py"))
+
+
+class TestLancerLot(unittest.TestCase):
+    """Tests de la ligne de commande en sous-processus."""
+
+    def setUp(self):
+        """Cree un projet temporaire."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.src = Path(self.temp_dir) / "src"
+        (self.src / "pkg").mkdir(parents=True)
+        (self.src / "pkg" / "a.py").write_text(CODE_AVEC_PRINT, encoding='utf-8')
+        (self.src / "b.py").write_text(CODE_SANS_PRINT, encoding='utf-8')
+        self.sortie = Path(self.temp_dir) / "out"
+
+    def tearDown(self):
+        """Supprime le projet temporaire."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _lancer(self, *arguments):
+        processus = subprocess.run(
+            [sys.executable, str(project_root / "lancer_lot.py"), *arguments],
+            capture_output=True, text=True, timeout=120
+        )
+        lignes = [json.loads(l) for l in processus.stdout.splitlines() if l.strip()]
+        return processus.returncode, lignes
+
+    def test_lot_plusieurs_plugins_dans_l_ordre(self):
+        """Chaque fichier produit une ligne JSON; les plugins suivent l'ordre donne."""
+        code, lignes = self._lancer(
+            "-p", "print_to_logging_transform", "-p", "fix_mutable_defaults_transform",
+            str(self.src), "-o", str(self.sortie), "--jobs", "2"
+        )
+
+        self.assertEqual(code, 0)
+        par_fichier = {l['relatif']: l for l in lignes}
+        self.assertEqual(set(par_fichier), {"pkg/a.py", "b.py"})
+        self.assertEqual([p['nom'] for p in par_fichier["pkg/a.py"]['plugins']],
+                         ["print_to_logging_transform", "fix_mutable_defaults_transform"])
+        self.assertEqual(par_fichier["pkg/a.py"]['statut'], "modifie")
+        self.assertEqual(par_fichier["b.py"]['statut'], "inchange")
+
+        resultat = (self.sortie / "pkg" / "a.py").read_text(encoding='utf-8')
+        self.assertIn("logging.info", resultat)
+        self.assertIn("import logging", resultat)
+        self.assertIn("items=None", resultat.replace(" ", ""))
+        self.assertFalse((self.sortie / "b.py").exists())
+
+    def test_dry_run_n_ecrit_rien(self):
+        """--dry-run rapporte les modifications sans ecrire."""
+        code, lignes = self._lancer("-p", "print_to_logging_transform", str(self.src),
+                                    "-o", str(self.sortie), "--dry-run")
+
+        self.assertEqual(code, 0)
+        self.assertIn("modifie", [l['statut'] for l in lignes])
+        self.assertTrue(all(l['sortie'] is None for l in lignes))
+        self.assertFalse(self.sortie.exists())
+
+    def test_rapport_execution(self):
+        """--rapport ecrit le rapport JSON et HTML du lot."""
+        prefixe = Path(self.temp_dir) / "rapports" / "nuit"
+        code, lignes = self._lancer("-p", "print_to_logging_transform", str(self.src),
+                                    "--dry-run", "--rapport", str(prefixe))
+        self.assertEqual(code, 0)
+        rapport = json.loads(prefixe.with_suffix(".json").read_text(encoding='utf-8'))
+        self.assertEqual(rapport['fichiers'], 2)
+        self.assertEqual(rapport['statuts'], {'modifie': 1, 'inchange': 1})
+        self.assertEqual(rapport['plugins']['print_to_logging_transform']['appliques'], 1)
+        self.assertEqual(len(rapport['plus_lents']), 2)
+        self.assertIn("print_to_logging_transform",
+                      prefixe.with_suffix(".html").read_text(encoding='utf-8'))
+
+    def test_plugin_inconnu(self):
+        """Un plugin inconnu termine avec le code 2 sans sortie JSON."""
+        code, lignes = self._lancer("-p", "plugin_inexistant", str(self.src), "--dry-run")
+        self.assertEqual(code, 2)
+        self.assertEqual(lignes, [])
+
+    def test_json_instructions(self):
+        """Les instructions JSON sont chargees dans le plugin JSON-AI."""
+        instructions = Path(self.temp_dir) / "regles.json"
+        instructions.write_text(json.dumps({"transformations": [
+            {"action": "rename_variable", "old_name": "items", "new_name": "elements"}
+        ]}), encoding='utf-8')
+
+        code, lignes = self._lancer("-p", "json_ai_transformer", "--json-instructions",
+                                    str(instructions), str(self.src), "-o", str(self.sortie))
+
+        self.assertEqual(code, 0)
+        self.assertIn("elements", (self.sortie / "pkg" / "a.py").read_text(encoding='utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
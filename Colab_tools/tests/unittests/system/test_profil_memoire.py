@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du Profil Memoire
+=======================
+
+Tests de core/memory_profile.py : attribution des allocations aux
+fichiers, plugins et etapes, et classement des pires consommateurs.
+"""
+
+import ast
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.batch_pipeline import BatchPipeline
+from core.memory_profile import ProfileurMemoire
+
+
+class TestProfilMemoire(unittest.TestCase):
+    """Tests de l'attribution par etape."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.gros = os.path.join(self.temp_dir, "gros.py")
+        with open(self.gros, 'w', encoding='utf-8') as f:
+            # print non appele : impose le moteur AST et ses etapes parse/visit/unparse
+            f.write("x = [" + "1," * 20000 + "]\nafficher = print\nprint(x)\n")
+        self.petit = os.path.join(self.temp_dir, "petit.py")
+        with open(self.petit, 'w', encoding='utf-8') as f:
+            f.write('print("x")\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_attribution_et_classement(self):
+        """Le gros fichier arrive en tete, avec ses etapes parse/visit/unparse/entete."""
+        profileur = ProfileurMemoire()
+        pipeline = BatchPipeline(["print_to_logging_transform"], dry_run=True,
+                                 roots=[self.temp_dir], profileur=profileur)
+        with profileur:
+            resultats = list(pipeline.executer([self.petit, self.gros]))
+        self.assertEqual([r['statut'] for r in resultats], ['modifie', 'modifie'])
+
+        etapes = {etape for (fichier, _, etape) in profileur.etapes if fichier == self.gros}
+        self.assertTrue({'plugin', 'parse', 'visit', 'unparse', 'entete'} <= etapes)
+
+        pire = profileur.classement('pic', 1)[0]
+        self.assertEqual(pire['fichier'], self.gros)
+        self.assertEqual(pire['plugin'], "print_to_logging_transform")
+        self.assertGreater(profileur.fichiers[self.gros]['pic'],
+                           profileur.fichiers[self.petit]['pic'])
+        self.assertIn("gros.py", profileur.rapport())
+        # Sans sites, aucun instantane n'est pris
+        self.assertEqual(profileur.fichiers[self.gros]['sites'], [])
+
+    def test_sites_sur_demande(self):
+        """Avec sites=True, les lignes qui retiennent de la memoire sont rapportees."""
+        profileur = ProfileurMemoire(sites=True)
+        with profileur:
+            with profileur.fichier("f"):
+                self.conserve = bytearray(2 * 1024 * 1024)
+        sites = profileur.fichiers["f"]['sites']
+        self.assertTrue(sites)
+        self.assertIn("test_profil_memoire.py", sites[0][0])
+        self.assertGreaterEqual(sites[0][1], 2 * 1024 * 1024)
+
+    def test_instrumentation_retiree(self):
+        """ast et tracemalloc sont restaures a l'arret."""
+        parse = ast.parse
+        with ProfileurMemoire():
+            self.assertIsNot(ast.parse, parse)
+        self.assertIs(ast.parse, parse)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_pic_interne_repercute(self):
+        """Le pic d'une etape interne est inclus dans celui de l'etape englobante."""
+        profileur = ProfileurMemoire(sites=False)
+        with profileur:
+            with profileur.fichier("f"):
+                with profileur.plugin("p"):
+                    with profileur.etape('parse'):
+                        tampon = bytearray(2 * 1024 * 1024)
+                        del tampon
+        parse = profileur.etapes[("f", "p", 'parse')]
+        plugin = profileur.etapes[("f", "p", 'plugin')]
+        self.assertGreaterEqual(parse['pic'], 2 * 1024 * 1024)
+        self.assertGreaterEqual(plugin['pic'], parse['pic'])
+        self.assertLess(plugin['retenu'], 1024 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du Lanceur de Tests Unitaires
+===================================
+
+Tests de tests/unittests/run_all_unittests.py : execution des modules
+dans des processus de travail et fusion des resultats.
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "tests" / "unittests"))
+
+import run_all_unittests
+from run_all_unittests import executer_modules, lister_modules_de_test
+
+MODULE_OK = '''import unittest
+
+class TestOk(unittest.TestCase):
+    def test_un(self):
+        self.assertTrue(True)
+
+    @unittest.skip("raison")
+    def test_ignore(self):
+        pass
+'''
+
+MODULE_ECHEC = '''import unittest
+
+class TestEchec(unittest.TestCase):
+    def test_echec(self):
+        self.assertEqual(1, 2)
+
+    def test_erreur(self):
+        raise RuntimeError("boom")
+'''
+
+
+class TestLanceurParallele(unittest.TestCase):
+    """Tests de la repartition et de la fusion."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        dossier = Path(self.temp_dir) / "utils"
+        dossier.mkdir()
+        (dossier / "test_ok.py").write_text(MODULE_OK, encoding='utf-8')
+        (dossier / "test_echec.py").write_text(MODULE_ECHEC, encoding='utf-8')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _verifier(self, resultat):
+        self.assertEqual(resultat.testsRun, 4)
+        self.assertEqual(len(resultat.failures), 1)
+        self.assertEqual(len(resultat.errors), 1)
+        self.assertEqual(len(resultat.skipped), 1)
+        self.assertEqual(len(resultat.durees), 4)
+        self.assertIn("test_echec", resultat.failures[0][0])
+
+    def test_fusion_sequentielle(self):
+        """Les resultats de plusieurs modules sont cumules."""
+        modules = lister_modules_de_test(self.temp_dir)
+        self.assertEqual([m.name for m in modules], ["test_echec.py", "test_ok.py"])
+        self._verifier(executer_modules(modules, processus=1))
+
+    def test_fusion_parallele(self):
+        """Le mode parallele donne les memes totaux."""
+        self._verifier(executer_modules(lister_modules_de_test(self.temp_dir), processus=2))
+
+    def test_fusion_parallele_avant_python_311(self):
+        """Sans max_tasks_per_child, un executeur neuf par module."""
+        with mock.patch.object(run_all_unittests.sys, 'version_info', (3, 10, 0)):
+            self._verifier(executer_modules(lister_modules_de_test(self.temp_dir), processus=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
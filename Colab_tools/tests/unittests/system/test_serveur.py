@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests pour le Serveur de Transformations
+========================================
+
+Tests de core/server.py (service, socket Unix, HTTP local) et du
+client leger client_transformations.py execute dans un sous-processus.
+"""
+
+import http.client
+import json
+import os
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.server import (ClientTransformations, ServeurTransformations, ServiceTransformations,
+                         TAILLE_REQUETE_MAX, lire_secret)
+
+CODE_AVEC_PRINT = 'def f():\n    print("x")\n'
+
+
+class TestServeurTransformations(unittest.TestCase):
+    """Un seul serveur pour toute la classe : les plugins restent charges."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.chemin_socket = None
+        if hasattr(socket, 'AF_UNIX'):
+            cls.chemin_socket = os.path.join(cls.temp_dir, "ast.sock")
+        cls.chemin_secret = os.path.join(cls.temp_dir, "session.secret")
+        cls.serveur = ServeurTransformations(ServiceTransformations(), cls.chemin_socket,
+                                             port_http=0, chemin_secret=cls.chemin_secret
+                                             ).demarrer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.serveur.arreter()
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def _client(self):
+        if self.chemin_socket is None:
+            self.skipTest("Sockets Unix indisponibles")
+        return ClientTransformations(chemin_socket=self.chemin_socket)
+
+    def test_transform_socket(self):
+        """Le code transforme est renvoye sur le socket Unix."""
+        with self._client() as client:
+            reponse = client.transform(CODE_AVEC_PRINT, ["print_to_logging_transform"])
+            self.assertTrue(reponse['ok'])
+            self.assertEqual(reponse['statut'], 'modifie')
+            self.assertIn("logging.info", reponse['code'])
+            # Connexion reutilisee pour la requete suivante
+            self.assertTrue(client.requete('ping')['ok'])
+
+    def test_transform_http(self):
+        """Le meme service repond en HTTP local."""
+        with ClientTransformations(port_http=self.serveur.port_http,
+                                   chemin_secret=self.chemin_secret) as client:
+            reponse = client.transform(CODE_AVEC_PRINT, ["print_to_logging_transform"])
+        self.assertTrue(reponse['ok'])
+        self.assertIn("logging.info", reponse['code'])
+
+    def _post(self, entetes, corps=b'{}'):
+        connexion = http.client.HTTPConnection('127.0.0.1', self.serveur.port_http, timeout=30)
+        try:
+            connexion.request('POST', '/ping', body=corps, headers=entetes)
+            reponse = connexion.getresponse()
+            return reponse.status, json.loads(reponse.read())
+        finally:
+            connexion.close()
+
+    def test_http_refuse_sans_secret_hote_ou_json(self):
+        """Secret de session, Host local et corps JSON exiges en HTTP."""
+        if hasattr(os, 'getuid'):
+            self.assertEqual(stat.S_IMODE(os.stat(self.chemin_secret).st_mode), 0o600)
+        valides = {'Content-Type': 'application/json',
+                   'Authorization': f"Bearer {lire_secret(self.chemin_secret)}"}
+        self.assertEqual(self._post(valides)[0], 200)
+        self.assertEqual(self._post(dict(valides, Authorization="Bearer faux"))[0], 401)
+        self.assertEqual(self._post({'Content-Type': 'application/json'})[0], 401)
+        self.assertEqual(self._post(dict(valides, Host="attaquant.example:80"))[0], 403)
+        self.assertEqual(self._post(dict(valides, **{'Content-Type': 'text/plain'}))[0], 415)
+
+    def test_http_content_length_invalide(self):
+        """Content-Length illisible ou negatif : 400; trop grand : 413, corps non lu."""
+        valides = {'Content-Type': 'application/json',
+                   'Authorization': f"Bearer {lire_secret(self.chemin_secret)}"}
+        for longueur, code in (('abc', 400), ('-5', 400),
+                               (str(TAILLE_REQUETE_MAX + 1), 413)):
+            statut, reponse = self._post(dict(valides, **{'Content-Length': longueur}))
+            self.assertEqual(statut, code, longueur)
+            self.assertFalse(reponse['ok'])
+        # Le serveur repond toujours
+        self.assertEqual(self._post(valides)[0], 200)
+
+    def test_socket_reserve_au_proprietaire(self):
+        """Le socket Unix est en 0600."""
+        if self.chemin_socket is None or not hasattr(os, 'getuid'):
+            self.skipTest("Sockets Unix indisponibles")
+        self.assertEqual(stat.S_IMODE(os.stat(self.chemin_socket).st_mode), 0o600)
+
+    def test_preview_et_analyze(self):
+        """Apercu par plugin et analyse syntaxique."""
+        with self._client() as client:
+            apercu = client.preview(CODE_AVEC_PRINT, ["print_to_logging_transform"])
+            analyse = client.analyze(CODE_AVEC_PRINT)
+            invalide = client.analyze("def (:\n")
+        self.assertIn("print_to_logging_transform", apercu['apercus'])
+        self.assertTrue(analyse['syntaxe_valide'])
+        self.assertIn("print_to_logging_transform", analyse['applicables'])
+        self.assertFalse(invalide['syntaxe_valide'])
+
+    def test_erreurs_requete(self):
+        """Plugin inconnu ou operation inconnue : ok=False sans couper la connexion."""
+        with self._client() as client:
+            self.assertFalse(client.transform("x = 1", ["inexistant"])['ok'])
+            self.assertFalse(client.requete('inconnue')['ok'])
+            self.assertTrue(client.requete('ping')['ok'])
+
+    def test_client_ligne_de_commande(self):
+        """Le client leger ecrit le code transforme sur stdout."""
+        if self.chemin_socket is None:
+            self.skipTest("Sockets Unix indisponibles")
+        fichier = Path(self.temp_dir) / "a.py"
+        fichier.write_text(CODE_AVEC_PRINT, encoding='utf-8')
+        resultat = subprocess.run(
+            [sys.executable, str(project_root / "client_transformations.py"),
+             "-p", "print_to_logging_transform", "--socket", self.chemin_socket, str(fichier)],
+            capture_output=True, text=True, timeout=60)
+        self.assertEqual(resultat.returncode, 0, resultat.stderr)
+        self.assertIn("logging.info", resultat.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
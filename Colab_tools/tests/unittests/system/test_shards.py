@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du Partage en Shards
+==========================
+
+Tests de core/sharding.py : partition stable par empreinte du chemin
+relatif, shards executes dans des processus separes (lancer_lot.py
+--shard) puis fusionnes (--fusionner) en un seul lot et un seul rapport.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.sharding import analyser_shard, fusionner, nom_manifeste, numero_shard
+
+SHARDS = 3
+
+
+class TestPartition(unittest.TestCase):
+    """Tests de la partition."""
+
+    def test_partition_stable(self):
+        """Meme shard quel que soit le separateur; valeur figee entre versions."""
+        self.assertEqual(numero_shard("pkg/a.py", 7), numero_shard(os.path.join("pkg", "a.py"), 7))
+        # Les machines d'un lot peuvent avoir des versions differentes de l'outil
+        self.assertEqual([numero_shard(f"m{i}.py", 4) for i in range(6)], [1, 3, 2, 0, 1, 2])
+        repartition = [numero_shard(f"m{i}.py", 4) for i in range(400)]
+        self.assertTrue(all(60 < repartition.count(i) < 140 for i in range(4)))
+
+    def test_designation(self):
+        self.assertEqual(analyser_shard("2/4"), (2, 4))
+        for invalide in ("4/4", "-1/4", "1", "a/b", "0/0"):
+            with self.assertRaises(ValueError):
+                analyser_shard(invalide)
+
+
+class TestShardsEnProcessus(unittest.TestCase):
+    """Shards lances comme des processus separes, puis fusion."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.src = Path(self.temp_dir) / "src"
+        for i in range(12):
+            dossier = self.src / f"pkg{i % 3}"
+            dossier.mkdir(parents=True, exist_ok=True)
+            code = f'x = {i}\n' + ('print(x)\n' if i % 2 else '')
+            (dossier / f"m{i}.py").write_text(code, encoding='utf-8')
+        self.manifestes = Path(self.temp_dir) / "manifestes"
+        self.sortie = Path(self.temp_dir) / "sortie"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _lancer(self, *arguments):
+        return subprocess.Popen(
+            [sys.executable, str(project_root / "lancer_lot.py"), *arguments],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+    def _terminer(self, processus):
+        sortie, _ = processus.communicate(timeout=120)
+        lignes = [json.loads(l) for l in sortie.splitlines() if l.strip()]
+        return processus.returncode, lignes
+
+    def test_shards_puis_fusion(self):
+        """Partition disjointe et complete; fusion identique a un lot unique."""
+        processus = [self._lancer("-p", "print_to_logging_transform", str(self.src),
+                                  "-o", str(self.sortie), "--shard", f"{i}/{SHARDS}",
+                                  "--manifestes", str(self.manifestes))
+                     for i in range(SHARDS)]
+        par_shard = [self._terminer(p) for p in processus]
+        self.assertEqual([code for code, _ in par_shard], [0] * SHARDS)
+        vus = [l['relatif'] for _, lignes in par_shard for l in lignes]
+        self.assertEqual(len(vus), 12)
+        self.assertEqual(len(set(vus)), 12)
+        for i, (_, lignes) in enumerate(par_shard):
+            self.assertTrue(all(numero_shard(l['relatif'], SHARDS) == i for l in lignes))
+        self.assertEqual(len(list(self.sortie.rglob("*.py"))), 6)
+
+        rapport = Path(self.temp_dir) / "rapport"
+        code, fusion = self._terminer(self._lancer("--fusionner", str(self.manifestes),
+                                                   "--rapport", str(rapport)))
+        self.assertEqual(code, 0)
+        self.assertEqual([l['relatif'] for l in fusion], sorted(vus))
+        with open(f"{rapport}.json", encoding='utf-8') as f:
+            donnees = json.load(f)
+        self.assertEqual(donnees['fichiers'], 12)
+        self.assertEqual(donnees['statuts'], {'modifie': 6, 'inchange': 6})
+
+        code, unique = self._terminer(self._lancer("-p", "print_to_logging_transform",
+                                                   str(self.src), "--dry-run"))
+        self.assertEqual({l['relatif']: l['statut'] for l in unique},
+                         {l['relatif']: l['statut'] for l in fusion})
+
+    def test_shard_manquant_ou_incomplet(self):
+        """La fusion signale les shards absents et interrompus."""
+        code, _ = self._terminer(self._lancer("-p", "print_to_logging_transform", str(self.src),
+                                              "--dry-run", "--shard", f"0/{SHARDS}",
+                                              "--manifestes", str(self.manifestes)))
+        self.assertEqual(code, 0)
+        # Shard 1 interrompu : en-tete sans ligne de fin
+        with open(self.manifestes / nom_manifeste(0, SHARDS), encoding='utf-8') as f:
+            entete = json.loads(f.readline())
+        with open(self.manifestes / nom_manifeste(1, SHARDS), 'w', encoding='utf-8') as f:
+            f.write(json.dumps(dict(entete, shard=1)) + "\n")
+
+        fusion = fusionner(str(self.manifestes))
+        self.assertEqual((fusion['manquants'], fusion['incomplets']), ([2], [1]))
+        code, _ = self._terminer(self._lancer("--fusionner", str(self.manifestes)))
+        self.assertEqual(code, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la Sortie Archive
+==========================
+
+Tests de SortieArchive (core/batch_pipeline.py) : fichiers transformes
+ecrits directement dans une archive zip ou tar, sans dossier
+intermediaire, et archive presente seulement une fois complete.
+"""
+
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import lancer_lot
+from core.batch_pipeline import BatchPipeline, SortieArchive, format_archive
+from core.colab_output import archiver_dossier
+
+CODE_AVEC_PRINT = 'def f():\n    print("x")\n'
+CODE_SANS_PRINT = 'def g():\n    return 1\n'
+
+
+class TestSortieArchive(unittest.TestCase):
+    """Tests de l'archive de sortie."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.src = Path(self.temp_dir) / "src"
+        for nom in ("a", "b"):
+            (self.src / nom).mkdir(parents=True)
+            (self.src / nom / "module.py").write_text(CODE_AVEC_PRINT, encoding='utf-8')
+        (self.src / "a" / "stable.py").write_text(CODE_SANS_PRINT, encoding='utf-8')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _lancer(self, destination, format_sortie):
+        return subprocess.run(
+            [sys.executable, str(project_root / "lancer_lot.py"), "-p", "print_to_logging_transform",
+             str(self.src), "-o", str(destination), "--format-sortie", format_sortie],
+            capture_output=True, text=True, cwd=project_root)
+
+    def test_format_deduit_de_l_extension(self):
+        self.assertEqual(format_archive("x.ZIP"), 'zip')
+        self.assertEqual(format_archive("x.tgz"), 'tar.gz')
+        self.assertEqual(format_archive("x.tar.gz"), 'tar.gz')
+        self.assertIsNone(format_archive("x.patch"))
+
+    def test_zip_sans_dossier_intermediaire(self):
+        """Seuls les fichiers modifies sont archives; rien d'autre n'est ecrit."""
+        destination = Path(self.temp_dir) / "resultats.zip"
+        resultat = self._lancer(destination, "zip")
+        self.assertEqual(resultat.returncode, 0, resultat.stderr)
+
+        with zipfile.ZipFile(destination) as archive:
+            self.assertEqual(sorted(archive.namelist()), ["a/module.py", "b/module.py"])
+            self.assertIn("logging.info", archive.read("a/module.py").decode('utf-8'))
+        self.assertEqual(sorted(p.name for p in Path(self.temp_dir).iterdir()),
+                         ["resultats.zip", "src"])
+
+    def test_tar_gz(self):
+        destination = Path(self.temp_dir) / "resultats.tar.gz"
+        self.assertEqual(self._lancer(destination, "tar.gz").returncode, 0)
+        with tarfile.open(destination) as archive:
+            self.assertEqual(sorted(archive.getnames()), ["a/module.py", "b/module.py"])
+
+    def test_archive_complete_seulement_a_la_fermeture(self):
+        destination = Path(self.temp_dir) / "sortie.tar"
+        sortie = SortieArchive(str(destination))
+        sortie.ecrire("a/x.py", "x = 1\n")
+        self.assertFalse(destination.exists())
+        sortie.fermer()
+        sortie.fermer()
+        with tarfile.open(destination) as archive:
+            self.assertEqual(archive.extractfile("a/x.py").read(), b"x = 1\n")
+
+    def test_lot_interrompu_sans_archive(self):
+        """Un lot interrompu ne laisse ni archive ni archive partielle."""
+        destination = Path(self.temp_dir) / "interrompu.zip"
+        executer = BatchPipeline.executer
+
+        def interrompre(pipeline, fichiers):
+            for resultat in executer(pipeline, fichiers):
+                yield resultat
+                raise KeyboardInterrupt
+
+        with mock.patch.object(BatchPipeline, 'executer', interrompre), \
+                mock.patch('sys.stdout'), mock.patch('sys.stderr'):
+            with self.assertRaises(KeyboardInterrupt):
+                lancer_lot.main(["-p", "print_to_logging_transform", str(self.src),
+                                 "-o", str(destination), "--format-sortie", "zip"])
+        self.assertFalse(destination.exists())
+        self.assertFalse(Path(str(destination) + ".partiel").exists())
+
+    def test_archiver_dossier(self):
+        """Un dossier de sortie existant devient une seule archive."""
+        chemin = archiver_dossier(str(self.src))
+        self.assertEqual(chemin, str(self.src) + ".zip")
+        with zipfile.ZipFile(chemin) as archive:
+            self.assertEqual(sorted(archive.namelist()),
+                             ["a/module.py", "a/stable.py", "b/module.py"])
+
+
+if __name__ == '__main__':
+    unittest.main()
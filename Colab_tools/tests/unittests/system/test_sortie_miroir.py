@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la Sortie Miroir
+=========================
+
+Tests de SortieMiroir (core/batch_pipeline.py) : arborescence reproduite,
+fichiers inchanges clones sans copie, source jamais modifiee.
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.batch_pipeline import SortieMiroir
+
+CODE_AVEC_PRINT = 'def f():\n    print("x")\n'
+CODE_SANS_PRINT = 'def g():\n    return 1\n'
+
+
+class TestSortieMiroir(unittest.TestCase):
+    """Tests du miroir de l'arborescence."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.src = Path(self.temp_dir) / "src"
+        for nom in ("a", "b"):
+            (self.src / nom).mkdir(parents=True)
+            # Meme nom de base dans deux dossiers : aucune collision
+            (self.src / nom / "module.py").write_text(CODE_AVEC_PRINT, encoding='utf-8')
+        (self.src / "a" / "stable.py").write_text(CODE_SANS_PRINT, encoding='utf-8')
+        (self.src / "a" / "donnees.txt").write_text("texte\n", encoding='utf-8')
+        self.miroir = Path(self.temp_dir) / "miroir"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _lancer(self, *args):
+        return subprocess.run(
+            [sys.executable, str(project_root / "lancer_lot.py"), "-p", "print_to_logging_transform",
+             str(self.src), "-o", str(self.miroir), "--format-sortie", "miroir", *args],
+            capture_output=True, text=True, cwd=project_root)
+
+    def test_arbre_complet(self):
+        """Fichiers modifies ecrits, inchanges et autres extensions clones."""
+        resultat = self._lancer()
+        self.assertEqual(resultat.returncode, 0, resultat.stderr)
+
+        attendus = {"a/module.py", "b/module.py", "a/stable.py", "a/donnees.txt"}
+        presents = {p.relative_to(self.miroir).as_posix()
+                    for p in self.miroir.rglob("*") if p.is_file()}
+        self.assertEqual(presents, attendus)
+        self.assertIn("logging", (self.miroir / "b" / "module.py").read_text(encoding='utf-8'))
+        self.assertEqual((self.miroir / "a" / "stable.py").read_text(encoding='utf-8'),
+                         CODE_SANS_PRINT)
+
+    def test_source_jamais_modifiee(self):
+        """Reecrire un fichier lie remplace la destination sans toucher la source."""
+        sortie = SortieMiroir(str(self.miroir))
+        source = self.src / "a" / "stable.py"
+        sortie.lier("a/stable.py", str(source))
+        self.assertEqual(sum(sortie.compteurs.values()), 1)
+        sortie.ecrire("a/stable.py", "x = 2\n", str(source))
+
+        self.assertEqual(source.read_text(encoding='utf-8'), CODE_SANS_PRINT)
+        self.assertEqual((self.miroir / "a" / "stable.py").read_text(encoding='utf-8'), "x = 2\n")
+
+    def test_fichier_redevenu_inchange(self):
+        """Un second passage recree le miroir a jour sans copier les inchanges."""
+        self.assertEqual(self._lancer().returncode, 0)
+        (self.src / "b" / "module.py").write_text(CODE_SANS_PRINT, encoding='utf-8')
+        self.assertEqual(self._lancer().returncode, 0)
+        self.assertEqual((self.miroir / "b" / "module.py").read_text(encoding='utf-8'),
+                         CODE_SANS_PRINT)
+
+
+if __name__ == '__main__':
+    unittest.main()
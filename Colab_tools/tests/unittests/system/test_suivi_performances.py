@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du Mode Performance du Test Periodique
+============================================
+
+Tests de tests/periodic_transformer_test.py --perf : serie temporelle
+JSONL, detection des regressions et rapports de tendance.
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.append(str(project_root / "tests"))
+
+import periodic_transformer_test as periodique
+
+
+def _mesure(**durees):
+    return {'date': '2026-01-01T00:00:00', 'python': '3', 'fichiers': 1, 'mesures': durees}
+
+
+class TestSuiviPerformances(unittest.TestCase):
+    """Tests de la serie temporelle et des regressions."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.historique = Path(self.temp_dir) / "perf.jsonl"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_regression_detectee(self):
+        """Une duree nettement au-dessus de la mediane glissante est signalee."""
+        historique = [_mesure(a=10.0, b=10.0) for _ in range(5)]
+        regressions = periodique.detecter_regressions(_mesure(a=20.0, b=10.5), historique)
+        self.assertEqual([r['nom'] for r in regressions], ['a'])
+        self.assertAlmostEqual(regressions[0]['ecart'], 1.0)
+
+    def test_historique_insuffisant_ou_bruit(self):
+        """Pas de verdict sans historique suffisant ni pour un ecart negligeable."""
+        self.assertEqual(periodique.detecter_regressions(
+            _mesure(a=20.0), [_mesure(a=10.0)] * 2), [])
+        self.assertEqual(periodique.detecter_regressions(
+            _mesure(a=0.02), [_mesure(a=0.01)] * 5), [])
+
+    def test_mesure_reelle_et_rapports(self):
+        """Le corpus de reference est mesure, enregistre et rapporte."""
+        mesure = periodique.mesurer_performances(repetitions=1)
+        self.assertIn('decouverte', mesure['mesures'])
+        self.assertIn('plugin:print_to_logging_transform', mesure['mesures'])
+
+        periodique.ajouter_mesure(mesure, self.historique)
+        periodique.ajouter_mesure(mesure, self.historique)
+        series = periodique.lire_historique(self.historique)
+        self.assertEqual(len(series), 2)
+
+        texte = periodique.rapport_tendance_texte(series)
+        self.assertIn('rechargement', texte)
+        page = periodique.rapport_tendance_html(series)
+        self.assertIn('<svg', page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests des Tampons d'Idempotence
+===============================
+
+Tests de core/stamps.py : ecriture et relecture des tampons, saut des
+fichiers deja transformes par BatchPipeline tant que leur corps et la
+configuration du plugin n'ont pas change, et par OrchestrateurAST (plus
+d'en-tetes empiles).
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.batch_pipeline import BatchPipeline, SortieDossier
+from core.transformation_loader import TransformationLoader
+from core.stamps import (apposer, empreinte_corps, est_a_jour, lire_tampons,
+                         lire_tampons_code, retirer_tampons, tamponner)
+
+PLUGIN = "print_to_logging_transform"
+
+
+class TestTampons(unittest.TestCase):
+    """Tests des tampons."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _ecrire(self, nom, contenu):
+        chemin = os.path.join(self.temp_dir, nom)
+        with open(chemin, 'wb' if isinstance(contenu, bytes) else 'w') as f:
+            f.write(contenu)
+        return chemin
+
+    def test_apposer_apres_encodage(self):
+        """Les tampons suivent le shebang et l'encodage, et se remplacent."""
+        code = "#!/usr/bin/env python3\n# -*- coding: utf-8 -*-\nx = 1\n"
+        tamponne = apposer(code, {'a': ('1.0', 'c0', 'ab12')})
+        self.assertEqual(tamponne.split('\n')[2], "# colab-tools: a 1.0 config=c0 corps=ab12")
+        relu = lire_tampons_code(tamponne)
+        self.assertEqual(relu, {'a': ('1.0', 'c0', 'ab12')})
+
+        deux = apposer(tamponne, {'a': ('1.1', 'c1', 'cd34'), 'b': ('2', 'c2', 'ef56')})
+        self.assertEqual(lire_tampons_code(deux), {'a': ('1.1', 'c1', 'cd34'),
+                                                   'b': ('2', 'c2', 'ef56')})
+        self.assertEqual(retirer_tampons(deux), code)
+        # Ancien format (source=...) : retire a la reecriture
+        self.assertEqual(retirer_tampons("# colab-tools: a 1.0 source=ab12\nx = 1\n"), "x = 1\n")
+
+    def test_a_jour_selon_corps_et_configuration(self):
+        """Le tampon porte le corps final; toute modification le rend perime."""
+        tamponne = tamponner("x = 1\n", {}, {'a': ('1.0', 'c0')})
+        relu = lire_tampons_code(tamponne)
+        self.assertTrue(est_a_jour(relu, 'a', 'c0', empreinte_corps(tamponne)))
+        self.assertFalse(est_a_jour(relu, 'a', 'c1', empreinte_corps(tamponne)))
+        self.assertFalse(est_a_jour(relu, 'a', 'c0', empreinte_corps(tamponne + "y = 2\n")))
+
+    def test_tampon_hors_tete_ignore(self):
+        """Seul le bloc de commentaires de tete est examine."""
+        code = "x = 1\n# colab-tools: a 1.0 config=c0 corps=ab12\n"
+        self.assertEqual(lire_tampons_code(code), {})
+
+    def test_pipeline_saute_les_fichiers_tamponnes(self):
+        """Second passage sur la sortie : fichier saute tant que son corps est inchange."""
+        source = self._ecrire("a.py", "x = 1\nprint(x)\n")
+        sortie = os.path.join(self.temp_dir, "sortie")
+        pipeline = BatchPipeline([PLUGIN], sortie=SortieDossier(sortie),
+                                 roots=[self.temp_dir], tampons=True)
+        resultat, = pipeline.executer([source])
+        self.assertEqual(resultat['statut'], 'modifie')
+        self.assertIn(PLUGIN, lire_tampons(resultat['sortie']))
+
+        deuxieme = BatchPipeline([PLUGIN], dry_run=True, tampons=True).preparer()
+        premier_resultat, code = deuxieme.traiter_fichier(resultat['sortie'])
+        self.assertEqual((premier_resultat['statut'], code), ('inchange', None))
+        self.assertTrue(premier_resultat['plugins'][0]['tampon'])
+
+        # Code ajoute apres le tampon : le fichier est retransforme
+        with open(resultat['sortie'], 'a', encoding='utf-8') as f:
+            f.write('print("nouveau")\n')
+        modifie, code = deuxieme.traiter_fichier(resultat['sortie'])
+        self.assertEqual(modifie['statut'], 'modifie')
+        self.assertNotIn('print("nouveau")', code)
+        self.assertEqual(code.count("# colab-tools:"), 1)
+
+    def test_autres_instructions_json_non_sautees(self):
+        """Le tampon du plugin JSON-AI depend des instructions chargees."""
+        source = self._ecrire("a.py", "x = 1\n")
+        instructions = []
+        for cible in ("x = 2", "x = 3"):
+            chemin = self._ecrire(f"{cible[-1]}.json", json.dumps({"transformations": [
+                {"action": "replace_text", "from": "x = 1", "to": cible}]}))
+            instructions.append(chemin)
+        with contextlib.redirect_stdout(io.StringIO()):
+            premier = BatchPipeline(["json_ai_transformer"], json_instructions=instructions[0],
+                                    tampons=True, dry_run=True).preparer()
+            _, code = premier.traiter_fichier(source)
+            tamponne = self._ecrire("b.py", code.replace("x = 2", "x = 1"))
+            # Meme instructions : corps change, le plugin est rejoue
+            self.assertEqual(premier.traiter_fichier(tamponne)[0]['statut'], 'modifie')
+            deja = self._ecrire("c.py", code)
+            self.assertEqual(premier.traiter_fichier(deja)[0]['statut'], 'inchange')
+            second = BatchPipeline(["json_ai_transformer"], json_instructions=instructions[1],
+                                   tampons=True, dry_run=True).preparer()
+            resultat, _ = second.traiter_fichier(deja)
+        self.assertFalse(resultat['plugins'][0].get('tampon', False))
+
+    def test_plugin_modifie_meme_version_non_saute(self):
+        """Modifier le fichier du plugin sans changer sa version perime ses tampons."""
+        dossier = Path(self.temp_dir) / "plugins"
+        dossier.mkdir()
+        plugin = dossier / f"{PLUGIN}.py"
+        shutil.copy(project_root / "core" / "transformations" / plugin.name, plugin)
+        source = self._ecrire("a.py", "x = 1\nprint(x)\n")
+
+        def traiter(chemin):
+            with contextlib.redirect_stdout(io.StringIO()):
+                chargeur = TransformationLoader(transformations_dir=str(dossier))
+                pipeline = BatchPipeline([PLUGIN], loader=chargeur, dry_run=True,
+                                         tampons=True).preparer()
+                return pipeline.traiter_fichier(chemin)
+
+        _, code = traiter(source)
+        tamponne = self._ecrire("b.py", code)
+        self.assertTrue(traiter(tamponne)[0]['plugins'][0]['tampon'])
+
+        with open(plugin, 'a', encoding='utf-8') as f:
+            f.write("\n# logique modifiee, meme version\n")
+        resultat, _ = traiter(tamponne)
+        self.assertFalse(resultat['plugins'][0].get('tampon', False))
+
+    def test_orchestrateur_sans_en_tetes_empiles(self):
+        """Reappliquer le meme plugin ne produit pas de second en-tete."""
+        from modificateur_interactif import OrchestrateurAST
+
+        source = self._ecrire("a.py", "x = 1\nprint(x)\n")
+        premier = os.path.join(self.temp_dir, "b.py")
+        second = os.path.join(self.temp_dir, "c.py")
+        with contextlib.redirect_stdout(io.StringIO()):
+            orchestrateur = OrchestrateurAST()
+            self.assertTrue(orchestrateur.appliquer_transformation_modulaire(source, premier, PLUGIN))
+            self.assertFalse(orchestrateur.appliquer_transformation_modulaire(premier, second, PLUGIN))
+        self.assertFalse(os.path.exists(second))
+        with open(premier, encoding='utf-8') as f:
+            self.assertEqual(f.read().count("FICHIER TRANSFORME PAR SYSTEME MODULAIRE"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests pour le Mode Surveillance
+===============================
+
+Tests de core/watch.py : detection des modifications (inotify et
+scrutation), regroupement des sauvegardes et resultats recents.
+"""
+
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.batch_pipeline import BatchPipeline, SortieDossier
+from core.watch import Surveillant, SourceInotify, _Filtre
+
+CODE_AVEC_PRINT = 'def f():\n    print("x")\n'
+
+
+class _BaseSurveillance:
+    """Scenarios communs aux deux sources d'evenements."""
+
+    forcer_polling = False
+
+    def setUp(self):
+        """Cree un projet et lance la surveillance dans un thread."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.src = Path(self.temp_dir) / "src"
+        (self.src / "pkg").mkdir(parents=True)
+        (self.src / "pkg" / "a.py").write_text("x = 1\n", encoding='utf-8')
+        self.sortie = Path(self.temp_dir) / "sortie"
+
+        pipeline = BatchPipeline(["print_to_logging_transform"],
+                                 sortie=SortieDossier(str(self.sortie)),
+                                 roots=[str(self.src)])
+        self.surveillant = Surveillant(pipeline, [str(self.src)],
+                                       forcer_polling=self.forcer_polling,
+                                       intervalle_polling=0.05)
+        self.resultats = queue.Queue()
+        self.thread = threading.Thread(target=self.surveillant.surveiller,
+                                       args=(self.resultats.put,), daemon=True)
+        self.thread.start()
+        self.assertTrue(self.surveillant.pret.wait(30))
+
+    def tearDown(self):
+        """Arrete la surveillance et supprime le projet."""
+        self.surveillant.arret.set()
+        self.thread.join(5)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _attendre(self):
+        return self.resultats.get(timeout=10)
+
+    def test_fichier_modifie_retransforme(self):
+        """Une sauvegarde produit un resultat et ecrit la sortie."""
+        (self.src / "pkg" / "a.py").write_text(CODE_AVEC_PRINT, encoding='utf-8')
+        resultat = self._attendre()
+        self.assertEqual(resultat['statut'], 'modifie')
+        self.assertEqual(resultat['relatif'], 'pkg/a.py')
+        self.assertIn("logging", (self.sortie / "pkg" / "a.py").read_text(encoding='utf-8'))
+
+    def test_nouveau_dossier_surveille(self):
+        """Les fichiers d'un dossier cree apres le demarrage sont suivis."""
+        nouveau = self.src / "nouveau"
+        nouveau.mkdir()
+        time.sleep(0.1)
+        (nouveau / "b.py").write_text(CODE_AVEC_PRINT, encoding='utf-8')
+        self.assertEqual(self._attendre()['relatif'], 'nouveau/b.py')
+
+    def test_rafale_regroupee(self):
+        """Plusieurs sauvegardes rapprochees ne donnent qu'un resultat."""
+        fichier = self.src / "pkg" / "a.py"
+        for i in range(5):
+            fichier.write_text(CODE_AVEC_PRINT + f"y = {i}\n", encoding='utf-8')
+        self._attendre()
+        time.sleep(0.3)
+        self.assertTrue(self.resultats.empty())
+
+
+class TestSurveillanceInotify(_BaseSurveillance, unittest.TestCase):
+    """Surveillance par evenements du noyau."""
+
+    def setUp(self):
+        try:
+            SourceInotify([tempfile.gettempdir()], _Filtre()).fermer()
+        except (OSError, AttributeError):
+            self.skipTest("inotify indisponible")
+        super().setUp()
+
+
+class TestSurveillancePolling(_BaseSurveillance, unittest.TestCase):
+    """Surveillance par scrutation des dates de modification."""
+
+    forcer_polling = True
+
+
+class TestResultatsRecents(unittest.TestCase):
+    """Tests du cache des resultats recents."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.fichier = Path(self.temp_dir) / "a.py"
+        pipeline = BatchPipeline(["print_to_logging_transform"], dry_run=True,
+                                 roots=[self.temp_dir]).preparer()
+        self.surveillant = Surveillant(pipeline, [self.temp_dir])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_contenu_identique_ignore(self):
+        """Une sauvegarde sans changement ne relance pas les plugins."""
+        self.fichier.write_text(CODE_AVEC_PRINT, encoding='utf-8')
+        self.assertIsNotNone(self.surveillant.traiter(str(self.fichier)))
+        self.assertIsNone(self.surveillant.traiter(str(self.fichier)))
+
+    def test_version_deja_vue_en_cache(self):
+        """Un retour a une version deja traitee reutilise le resultat."""
+        self.fichier.write_text(CODE_AVEC_PRINT, encoding='utf-8')
+        premier = self.surveillant.traiter(str(self.fichier))
+        self.fichier.write_text("x = 1\n", encoding='utf-8')
+        self.surveillant.traiter(str(self.fichier))
+        self.fichier.write_text(CODE_AVEC_PRINT, encoding='utf-8')
+        second = self.surveillant.traiter(str(self.fichier))
+        self.assertTrue(second.get('cache'))
+        self.assertEqual(second['statut'], premier['statut'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,12 +8,17 @@ Tests unitaires pour print_to_logging
 Cree automatiquement le 2025-07-03 19:13:20
 """
 
+import ast
 import unittest
 import sys
 from pathlib import Path
 
 # Ajouter le repertoire racine au path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.transformations.print_to_logging_transform import PrintToLoggingTransform
 
 # Imports du module a tester
 try:
@@ -86,6 +91,63 @@ class TestPrintToLoggingIntegration(unittest.TestCase):
         self.assertTrue(True, "Test d'integration a implementer")
 
 
+class TestMoteurJetons(unittest.TestCase):
+    """
+    Tests du moteur par balayage lexical (renommage sur place)
+    """
+
+    def setUp(self):
+        self.jetons = PrintToLoggingTransform()
+        self.ast = PrintToLoggingTransform(moteur='ast')
+
+    def test_commentaires_et_mise_en_forme_conserves(self):
+        """Seul le nom est remplace : commentaires et espacement restent."""
+        code = "x = 1  # compteur\nprint( 'a',\n       x )  # trace\n"
+        self.assertTrue(self.jetons.can_transform(code))
+        self.assertEqual(self.jetons.transform(code),
+                         "x = 1  # compteur\nlogging.info( 'a',\n       x )  # trace\n")
+
+    def test_chaines_commentaires_et_attributs_ignores(self):
+        """print dans une chaine, un commentaire ou un attribut n'est pas renomme."""
+        code = ('s = "print(1)"\n'
+                "d = '''\nprint(2)\n'''\n"
+                "# print(3)\n"
+                "obj.print(4)\n"
+                "myprint(5)\n")
+        self.assertFalse(self.jetons.can_transform(code))
+        self.assertEqual(self.jetons.transform(code), code)
+
+    def test_cas_ambigus_passent_par_ast(self):
+        """print redefini, file= ou f-string : resultat du moteur AST."""
+        cas = [
+            "def print(x):\n    pass\nprint(1)\n",
+            "import sys\nprint('a', file=sys.stderr)\nprint('b')\n",
+            "x = 1\nprint(f\"{print}\")\n",
+        ]
+        for code in cas:
+            with self.subTest(code=code):
+                self.assertEqual(self.jetons.transform(code), self.ast.transform(code))
+
+    def test_argument_file_imbrique(self):
+        """Un file= interne a un autre appel n'empeche pas le renommage."""
+        code = "print(ouvrir(file='a'), profile=1)\n"
+        self.assertEqual(self.jetons.transform(code),
+                         "logging.info(ouvrir(file='a'), profile=1)\n")
+
+    def test_equivalence_avec_ast(self):
+        """Les deux moteurs produisent le meme arbre syntaxique."""
+        code = ("def f(a, b=[]):\n"
+                "    print(a, b, sep='-')  # detail\n"
+                "    return [print(i) for i in a]\n"
+                "class C:\n"
+                "    def m(self):\n"
+                "        print(r'\\d', \\\n"
+                "              self)\n")
+        self.assertEqual(ast.dump(ast.parse(self.jetons.transform(code))),
+                         ast.dump(ast.parse(self.ast.transform(code))))
+        self.assertEqual(self.jetons.preview_changes(code)['estimated_changes'], 3)
+
+
 def suite():
     """
     Cree une suite de tests pour ce module.
@@ -97,6 +159,7 @@ def suite():
     
     # Ajouter les tests d'integration
     test_suite.addTest(unittest.makeSuite(TestPrintToLoggingIntegration))
+    test_suite.addTest(unittest.makeSuite(TestMoteurJetons))
     
     return test_suite
 
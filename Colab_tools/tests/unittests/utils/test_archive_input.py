@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests des Archives en Entree
+============================
+
+Tests de core/archive_input.py : decouverte des membres d'une archive
+zip ou tar (memes exclusions qu'un dossier), lecture en flux sans
+extraction et transformation par BatchPipeline vers un dossier.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.archive_input import decomposer, fermer_archives, ouvrir_texte, taille
+from core.batch_pipeline import BatchPipeline, SortieDossier, SortiePatch, chemin_relatif
+from core.ignore_rules import IgnoreRules
+
+MEMBRES = {
+    "paquet-1.0/paquet/a.py": "x = 1\nprint(x)\n",
+    "paquet-1.0/paquet/b.py": "y = 2\r\n",
+    "paquet-1.0/paquet/__pycache__/c.py": "print(3)\n",
+    "paquet-1.0/PKG-INFO": "Name: paquet\n",
+    "../evasion.py": "print(4)\n",
+}
+
+
+class TestArchivesEnEntree(unittest.TestCase):
+    """Tests de la lecture d'archives."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.zip = os.path.join(self.temp_dir, "paquet.whl")
+        with zipfile.ZipFile(self.zip, 'w') as archive:
+            for nom, contenu in MEMBRES.items():
+                archive.writestr(nom, contenu)
+        self.tar = os.path.join(self.temp_dir, "paquet-1.0.tar.gz")
+        with tarfile.open(self.tar, 'w:gz') as archive:
+            for nom, contenu in MEMBRES.items():
+                donnees = contenu.encode('utf-8')
+                info = tarfile.TarInfo(nom)
+                info.size = len(donnees)
+                archive.addfile(info, io.BytesIO(donnees))
+
+    def tearDown(self):
+        fermer_archives()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _decouvrir(self, archive):
+        regles = IgnoreRules([archive], utiliser_gitignore=False)
+        return sorted(regles.creer_decouverte().iter_files([archive]))
+
+    def test_decouverte_des_membres(self):
+        """Extensions, dossiers exclus et noms hors archive filtres."""
+        for archive in (self.zip, self.tar):
+            chemins = self._decouvrir(archive)
+            self.assertEqual([chemin_relatif(c, [archive]) for c in chemins],
+                             ["paquet-1.0/paquet/a.py", "paquet-1.0/paquet/b.py"])
+            self.assertEqual(decomposer(chemins[0]), (archive, "paquet-1.0/paquet/a.py"))
+
+    def test_lecture_comme_un_fichier(self):
+        """Fins de ligne traduites comme avec open; taille du membre."""
+        for archive in (self.zip, self.tar):
+            chemin = f"{archive}!/paquet-1.0/paquet/b.py"
+            with ouvrir_texte(chemin) as f:
+                self.assertEqual(f.read(), "y = 2\n")
+            self.assertEqual(taille(chemin), 7)
+            with self.assertRaises(FileNotFoundError):
+                ouvrir_texte(f"{archive}!/absent.py")
+
+    def test_fichier_ordinaire_inchange(self):
+        chemin = os.path.join(self.temp_dir, "ordinaire!.py")
+        Path(chemin).write_text("z = 3\n", encoding='utf-8')
+        self.assertIsNone(decomposer(chemin))
+        with ouvrir_texte(chemin) as f:
+            self.assertEqual(f.read(), "z = 3\n")
+
+    def test_transformation_vers_un_dossier(self):
+        """Sortie au chemin du membre dans l'archive; source jamais extraite."""
+        sortie = os.path.join(self.temp_dir, "sortie")
+        pipeline = BatchPipeline(["print_to_logging_transform"], sortie=SortieDossier(sortie),
+                                 roots=[self.tar])
+        resultats = {r['relatif']: r for r in pipeline.executer(self._decouvrir(self.tar))}
+        self.assertEqual(resultats["paquet-1.0/paquet/a.py"]['statut'], 'modifie')
+        self.assertEqual(resultats["paquet-1.0/paquet/b.py"]['statut'], 'inchange')
+        ecrits = sorted(p.relative_to(sortie).as_posix() for p in Path(sortie).rglob("*.py"))
+        self.assertEqual(ecrits, ["paquet-1.0/paquet/a.py"])
+        self.assertEqual(sorted(os.listdir(self.temp_dir)),
+                         ["paquet-1.0.tar.gz", "paquet.whl", "sortie"])
+
+    def test_tar_lu_une_fois_en_parallele(self):
+        """Membres lus par le producteur; le patch relit le membre sans l'archive."""
+        patch = os.path.join(self.temp_dir, "lot.patch")
+        pipeline = BatchPipeline(["print_to_logging_transform"], jobs=2,
+                                 sortie=SortiePatch(patch), roots=[self.tar])
+        extractfile = tarfile.TarFile.extractfile
+        with mock.patch.object(tarfile.TarFile, 'extractfile', autospec=True,
+                               side_effect=extractfile) as lectures:
+            resultats = {r['relatif']: r for r in pipeline.executer(self._decouvrir(self.tar))}
+            pipeline.sortie.fermer()
+        self.assertEqual(resultats["paquet-1.0/paquet/a.py"]['statut'], 'modifie')
+        self.assertEqual(lectures.call_count, 2)
+        contenu = Path(patch).read_text(encoding='utf-8')
+        self.assertIn("--- a/paquet-1.0/paquet/a.py", contenu)
+        self.assertIn("-print(x)", contenu)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du Moteur de Differences
+==============================
+
+Tests de core/diff_engine.py (script d'edition minimal, diff unifie
+applicable) et de la sortie patch du pipeline par lot.
+"""
+
+import difflib
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.batch_pipeline import SortiePatch
+from core.diff_engine import diff_unifie, differences, lignes
+
+
+def _longueur_lcs(a, b):
+    precedente = [0] * (len(b) + 1)
+    for x in a:
+        courante = [0]
+        for j, y in enumerate(b):
+            courante.append(precedente[j] + 1 if x == y else max(precedente[j + 1], courante[j]))
+        precedente = courante
+    return precedente[-1]
+
+
+def _appliquer(a, opcodes, b):
+    resultat = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        resultat.extend(a[i1:i2] if tag == 'equal' else b[j1:j2])
+    return resultat
+
+
+class TestMoteurDifferences(unittest.TestCase):
+    """Tests de l'algorithme et du format."""
+
+    def test_script_minimal_aleatoire(self):
+        """Le script d'edition reconstruit b et son nombre d'editions est minimal."""
+        aleatoire = random.Random(7)
+        for _ in range(300):
+            a = [aleatoire.choice("abcd") for _ in range(aleatoire.randint(0, 25))]
+            b = list(a)
+            for _ in range(aleatoire.randint(0, 6)):
+                if b and aleatoire.random() < 0.5:
+                    del b[aleatoire.randrange(len(b))]
+                else:
+                    b.insert(aleatoire.randint(0, len(b)), aleatoire.choice("abcde"))
+            opcodes = differences(a, b)
+            self.assertEqual(_appliquer(a, opcodes, b), b)
+            editions = sum(i2 - i1 + j2 - j1 for tag, i1, i2, j1, j2 in opcodes if tag != 'equal')
+            self.assertEqual(editions, len(a) + len(b) - 2 * _longueur_lcs(a, b))
+
+    def test_format_identique_a_difflib(self):
+        """Sur une insertion simple, le diff est celui de difflib."""
+        ancien = "".join(f"x{i} = {i}\n" for i in range(20))
+        nouveau = ancien.replace("x7 = 7\n", "x7 = 7\nimport logging\n")
+        attendu = "".join(difflib.unified_diff(lignes(ancien), lignes(nouveau), "a/f.py", "b/f.py"))
+        self.assertEqual(diff_unifie(ancien, nouveau, "a/f.py", "b/f.py"), attendu)
+        self.assertEqual(diff_unifie(ancien, ancien), "")
+
+    def test_fin_de_fichier_sans_saut_de_ligne(self):
+        """La ligne finale sans '\\n' est signalee comme le fait diff."""
+        patch = diff_unifie("a\nb", "a\nc\n")
+        self.assertIn("-b\n\\ No newline at end of file\n+c\n", patch)
+
+    def test_limite_d_editions(self):
+        """Au-dela de d_max, le milieu est remplace en bloc (diff toujours valide)."""
+        a = [f"{i}\n" for i in range(50)]
+        b = [f"{i}x\n" for i in range(50)]
+        opcodes = differences(a, b, d_max=10)
+        self.assertEqual(opcodes, [('replace', 0, 50, 0, 50)])
+
+
+class TestSortiePatch(unittest.TestCase):
+    """Tests de la sortie patch."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "src" / "pkg").mkdir(parents=True)
+        self.source = self.temp_dir / "src" / "pkg" / "m.py"
+        self.source.write_text("import os\n\ndef f():\n    print('x')\n", encoding='utf-8')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_patch_combine_applicable(self):
+        """Le patch combine s'applique avec git apply -p1 depuis la racine."""
+        if not shutil.which("git"):
+            self.skipTest("git absent")
+        nouveau = "import os\nimport logging\n\ndef f():\n    logging.info('x')\n"
+        sortie = SortiePatch(str(self.temp_dir / "lot.patch"))
+        sortie.ecrire("pkg/m.py", nouveau, str(self.source))
+        sortie.fermer()
+
+        subprocess.run(["git", "apply", "-p1", str(self.temp_dir / "lot.patch")],
+                       cwd=self.temp_dir / "src", check=True, capture_output=True)
+        self.assertEqual(self.source.read_text(encoding='utf-8'), nouveau)
+
+    def test_patch_par_fichier(self):
+        """En mode par fichier, un .patch est ecrit au chemin relatif."""
+        sortie = SortiePatch(str(self.temp_dir / "patchs"), combine=False)
+        chemin = sortie.ecrire("pkg/m.py", "x = 1\n", str(self.source))
+        self.assertTrue(chemin.endswith("m.py.patch"))
+        self.assertIn("+++ b/pkg/m.py", Path(chemin).read_text(encoding='utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
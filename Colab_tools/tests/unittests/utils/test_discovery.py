@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests pour le Service de Decouverte de Fichiers
+===============================================
+
+Tests unitaires pour core/discovery.py : parcours parallele,
+dedoublonnage par (device, inode) et protection contre les boucles.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.discovery import FileDiscovery, iter_python_files
+
+
+class TestFileDiscovery(unittest.TestCase):
+    """Tests du service de decouverte."""
+
+    def setUp(self):
+        """Cree une arborescence de test."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = Path(self.temp_dir)
+        for rel in ["a.py", "pkg/b.py", "pkg/sub/c.py", "pkg/notes.txt",
+                    ".cache/d.py", "__pycache__/e.py", "node_modules/f.py"]:
+            chemin = self.root / rel
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            chemin.write_text("x = 1\n", encoding='utf-8')
+
+    def tearDown(self):
+        """Supprime l'arborescence de test."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _relatifs(self, chemins):
+        return sorted(os.path.relpath(c, self.temp_dir).replace(os.sep, '/') for c in chemins)
+
+    def test_decouverte_simple(self):
+        """Seuls les fichiers .py hors dossiers exclus sont produits."""
+        fichiers = FileDiscovery().collect([self.temp_dir])
+        self.assertEqual(self._relatifs(fichiers), ["a.py", "pkg/b.py", "pkg/sub/c.py"])
+
+    def test_racines_qui_se_chevauchent(self):
+        """Des racines imbriquees ne produisent pas de doublons."""
+        racines = [self.temp_dir, str(self.root / "pkg"), str(self.root / "pkg" / "sub")]
+        fichiers = list(FileDiscovery(max_workers=4).iter_files(racines))
+        self.assertEqual(len(fichiers), 3)
+        self.assertEqual(len(set(fichiers)), 3)
+
+    @unittest.skipIf(not hasattr(os, 'symlink') or sys.platform == 'win32',
+                     "Liens symboliques non disponibles")
+    def test_boucle_de_liens_symboliques(self):
+        """Un lien vers un dossier parent ne provoque pas de boucle infinie."""
+        os.symlink(self.temp_dir, self.root / "pkg" / "sub" / "boucle")
+        os.symlink(self.root / "a.py", self.root / "pkg" / "alias.py")
+
+        fichiers = FileDiscovery().collect([self.temp_dir])
+
+        self.assertEqual(len(fichiers), 3)
+
+    def test_flux_generateur(self):
+        """Le resultat est un flux consommable immediatement et interruptible."""
+        flux = iter_python_files([self.temp_dir])
+        self.assertIsInstance(flux, types.GeneratorType)
+
+        premier = next(flux)
+        self.assertTrue(premier.endswith(".py"))
+        flux.close()
+
+    def test_racine_fichier_et_racine_absente(self):
+        """Une racine fichier est acceptee; une racine absente est ignoree."""
+        fichier = str(self.root / "a.py")
+        fichiers = FileDiscovery().collect([fichier, str(self.root / "absent")])
+        self.assertEqual(fichiers, [os.path.abspath(fichier)])
+
+    def test_filtre_personnalise(self):
+        """Le filtre de dossiers peut etre remplace."""
+        decouverte = FileDiscovery(exclure_dossier=lambda nom, chemin: nom == "sub")
+        fichiers = self._relatifs(decouverte.collect([self.temp_dir]))
+        self.assertIn(".cache/d.py", fichiers)
+        self.assertNotIn("pkg/sub/c.py", fichiers)
+
+
+if __name__ == '__main__':
+    unittest.main()
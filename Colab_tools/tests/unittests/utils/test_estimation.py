@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de l'Estimation par Echantillonnage
+=========================================
+
+Tests de core/estimation.py : strates (dossier x quartile de taille),
+allocation de l'echantillon, estimateur du total stratifie et estimation
+d'un lot reel sans ecriture.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.batch_pipeline import BatchPipeline
+from core.estimation import echantillonner, estimer, extrapoler, repartir, stratifier
+
+
+class TestEstimation(unittest.TestCase):
+    """Tests de l'estimation d'un lot."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.fichiers = []
+        for dossier in ("a", "b"):
+            os.makedirs(os.path.join(self.temp_dir, dossier))
+            for i in range(20):
+                chemin = os.path.join(self.temp_dir, dossier, f"m{i}.py")
+                with open(chemin, 'w', encoding='utf-8') as f:
+                    # Un fichier sur deux contient un print
+                    f.write("x = 1\n" * (i + 1) + ("print(x)\n" if i % 2 else ""))
+                self.fichiers.append(chemin)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_strates_par_dossier_et_taille(self):
+        strates = stratifier(self.fichiers, [self.temp_dir])
+        self.assertEqual({dossier for dossier, _ in strates}, {"a", "b"})
+        self.assertEqual({quartile for _, quartile in strates}, {0, 1, 2, 3})
+        self.assertEqual(sum(len(c) for c in strates.values()), len(self.fichiers))
+
+    def test_allocation_proportionnelle_avec_minimum(self):
+        allocation = repartir({'gros': 90, 'petit': 10}, 20)
+        self.assertEqual(sum(allocation.values()), 20)
+        self.assertEqual(allocation['petit'], 2)
+        self.assertEqual(repartir({'x': 3}, 10), {'x': 3})
+
+    def test_tirage_reproductible(self):
+        strates = stratifier(self.fichiers, [self.temp_dir])
+        self.assertEqual(echantillonner(strates, 10, graine=4), echantillonner(strates, 10, graine=4))
+
+    def test_extrapolation_exacte_sans_variance(self):
+        """Strate exhaustive ou constante : intervalle reduit a l'estimation."""
+        mesure = {'duree_ms': 2.0, 'taille_sortie': 10, 'fichiers_modifies': 1, 'modifications': 3}
+        estimations = extrapoler({'s': 50}, {'s': [mesure] * 5})
+        self.assertEqual(estimations['modifications']['estimation'], 150)
+        self.assertEqual(estimations['modifications']['bas'], estimations['modifications']['haut'])
+
+    def test_estimation_encadre_la_valeur_reelle(self):
+        """Seize fichiers tires sur quarante : la moitie des fichiers est modifiee."""
+        pipeline = BatchPipeline(["print_to_logging_transform"], dry_run=True,
+                                 roots=[self.temp_dir]).preparer()
+        estimation = estimer(pipeline, self.fichiers, [self.temp_dir], taille=16, graine=1)
+        self.assertEqual((estimation['fichiers'], estimation['echantillon']), (40, 16))
+        modifies = estimation['estimations']['fichiers_modifies']
+        self.assertLessEqual(modifies['bas'], 20)
+        self.assertGreaterEqual(modifies['haut'], 20)
+        self.assertGreater(estimation['estimations']['modifications']['estimation'], 0)
+
+    def test_lancer_lot_estimer_zero_refuse(self):
+        """--estimer 0 est refuse au lieu de lancer le lot complet avec ecriture."""
+        sortie = os.path.join(self.temp_dir, "sortie")
+        resultat = subprocess.run(
+            [sys.executable, str(project_root / "lancer_lot.py"), "-p",
+             "print_to_logging_transform", self.temp_dir, "-o", sortie, "--estimer", "0"],
+            capture_output=True, text=True, cwd=project_root)
+        self.assertEqual(resultat.returncode, 2, resultat.stderr)
+        self.assertIn("--estimer", resultat.stderr)
+        self.assertEqual(resultat.stdout, "")
+        self.assertFalse(os.path.exists(sortie))
+
+
+if __name__ == '__main__':
+    unittest.main()
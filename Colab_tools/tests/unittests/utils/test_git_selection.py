@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la Selection Incrementale par Git
+==========================================
+
+Tests de core/git_selection.py contre un depot local : seuls les fichiers
+Python modifies, ajoutes ou renommes depuis la reference sont retenus,
+avec les regles d'exclusion de la decouverte.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.git_repositories import find_repository_root
+from core.git_selection import selectionner
+from core.ignore_rules import IgnoreRules
+
+try:
+    import git  # noqa: F401
+    GITPYTHON_DISPONIBLE = True
+except ImportError:
+    GITPYTHON_DISPONIBLE = False
+
+
+def _git(dossier, *args):
+    return subprocess.run(["git", "-C", str(dossier), *args], check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+@unittest.skipUnless(GITPYTHON_DISPONIBLE and shutil.which("git"), "GitPython ou git absent")
+class TestSelectionGit(unittest.TestCase):
+    """Tests contre un depot local avec un commit de reference."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.depot = Path(self.temp_dir) / "depot"
+        self.environnement = dict(os.environ)
+        os.environ.update(GIT_AUTHOR_NAME="t", GIT_AUTHOR_EMAIL="t@t",
+                          GIT_COMMITTER_NAME="t", GIT_COMMITTER_EMAIL="t@t")
+
+        contenus = {
+            "src/modifie.py": "print(1)\n",
+            "src/stable.py": "print(2)\n",
+            "src/ancien_nom.py": "def f():\n    print('renomme')\n    return 1\n",
+            "src/supprime.py": "print(3)\n",
+            "src/notes.txt": "a\n",
+            "hors_racine.py": "print(4)\n",
+        }
+        for nom, contenu in contenus.items():
+            chemin = self.depot / nom
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            chemin.write_text(contenu, encoding='utf-8')
+        subprocess.run(["git", "init", "-q", str(self.depot)], check=True)
+        _git(self.depot, "add", "-A")
+        _git(self.depot, "commit", "-q", "-m", "reference")
+        _git(self.depot, "tag", "reference")
+
+        # Changement : modification, renommage, suppression, ajouts
+        (self.depot / "src" / "modifie.py").write_text("print(10)\n", encoding='utf-8')
+        _git(self.depot, "mv", "src/ancien_nom.py", "src/nouveau_nom.py")
+        _git(self.depot, "rm", "-q", "src/supprime.py")
+        (self.depot / "src" / "build").mkdir()
+        (self.depot / "src" / "build" / "genere.py").write_text("print(5)\n", encoding='utf-8')
+        (self.depot / "src" / "ajoute.py").write_text("print(6)\n", encoding='utf-8')
+        (self.depot / "hors_racine.py").write_text("print(40)\n", encoding='utf-8')
+        _git(self.depot, "add", "-A")
+        _git(self.depot, "commit", "-q", "-m", "changement")
+        # Modification non commitee : comparee aussi (arbre de travail)
+        (self.depot / "src" / "stable.py").write_text("print(20)\n", encoding='utf-8')
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environnement)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _noms(self, chemins):
+        return sorted(os.path.relpath(c, self.depot).replace(os.sep, '/') for c in chemins)
+
+    def test_seuls_les_fichiers_modifies(self):
+        """Renomme sous son nouveau nom; supprime, hors racine et build/ ecartes."""
+        racine = str(self.depot / "src")
+        regles = IgnoreRules([racine])
+        self.assertEqual(self._noms(selectionner([racine], "reference", regles)),
+                         ["src/ajoute.py", "src/modifie.py", "src/nouveau_nom.py",
+                          "src/stable.py"])
+
+    def test_racine_fichier_et_depot_entier(self):
+        self.assertEqual(self._noms(selectionner([str(self.depot / "hors_racine.py")],
+                                                 "reference")), ["hors_racine.py"])
+        self.assertIn("hors_racine.py", self._noms(selectionner([str(self.depot)], "HEAD~1")))
+        self.assertEqual(self._noms(selectionner([str(self.depot)], "HEAD")), ["src/stable.py"])
+
+    def test_reference_inconnue(self):
+        with self.assertRaises(ValueError):
+            list(selectionner([str(self.depot)], "branche-inexistante"))
+
+    def test_racine_hors_depot_ignoree(self):
+        dehors = Path(self.temp_dir) / "dehors"
+        dehors.mkdir()
+        if find_repository_root(str(dehors)) is not None:
+            self.skipTest("dossier temporaire dans un depot git")
+        self.assertEqual(list(selectionner([str(dehors)], "HEAD")), [])
+
+    def test_lancer_lot_depuis_ref(self):
+        """Le lot ne transforme que les fichiers selectionnes."""
+        resultat = subprocess.run(
+            [sys.executable, str(project_root / "lancer_lot.py"), "-p",
+             "print_to_logging_transform", str(self.depot / "src"), "--dry-run",
+             "--depuis-ref", "reference"],
+            capture_output=True, text=True, cwd=project_root)
+        self.assertEqual(resultat.returncode, 0, resultat.stderr)
+        lignes = [json.loads(l) for l in resultat.stdout.splitlines() if l.strip()]
+        self.assertEqual(sorted(l['relatif'] for l in lignes),
+                         ["ajoute.py", "modifie.py", "nouveau_nom.py", "stable.py"])
+        self.assertIn("4 fichier(s) modifie(s) depuis reference", resultat.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
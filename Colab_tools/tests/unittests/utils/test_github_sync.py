@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la Synchronisation Git Ciblee
+======================================
+
+Tests de github-sync.py contre des depots nus locaux : seuls les chemins
+ecrits sont commites, aucun echange reseau sans modification, et
+plusieurs depots sont synchronises en parallele.
+"""
+
+import importlib.util
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+# github-sync.py est a la racine du depot, au-dessus de Colab_tools/
+chemin_script = Path(__file__).parent.parent.parent.parent.parent / "github-sync.py"
+
+try:
+    import git  # noqa: F401
+    GITPYTHON_DISPONIBLE = True
+except ImportError:
+    GITPYTHON_DISPONIBLE = False
+
+
+def _git(dossier, *args):
+    return subprocess.run(["git", "-C", str(dossier), *args], check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+@unittest.skipUnless(GITPYTHON_DISPONIBLE and shutil.which("git"), "GitPython ou git absent")
+class TestSynchronisationCiblee(unittest.TestCase):
+    """Tests contre des depots nus locaux."""
+
+    @classmethod
+    def setUpClass(cls):
+        spec = importlib.util.spec_from_file_location("github_sync", chemin_script)
+        cls.sync = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(cls.sync)
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.environnement = dict(os.environ)
+        os.environ.update(GIT_AUTHOR_NAME="t", GIT_AUTHOR_EMAIL="t@t",
+                          GIT_COMMITTER_NAME="t", GIT_COMMITTER_EMAIL="t@t")
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environnement)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _depot(self, nom):
+        """Depot nu et clone de travail avec un premier commit pousse."""
+        nu = self.temp_dir / f"{nom}.git"
+        clone = self.temp_dir / nom
+        subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(nu)], check=True)
+        subprocess.run(["git", "clone", "-q", str(nu), str(clone)], check=True,
+                       capture_output=True)
+        _git(clone, "checkout", "-q", "-b", "main")
+        (clone / "a.py").write_text("a = 1\n", encoding='utf-8')
+        (clone / "autre.py").write_text("b = 1\n", encoding='utf-8')
+        _git(clone, "add", "-A")
+        _git(clone, "commit", "-q", "-m", "initial")
+        _git(clone, "push", "-q", "origin", "main")
+        return nu, clone
+
+    def test_seuls_les_chemins_ecrits_sont_commites(self):
+        """Les autres modifications du depot restent hors du commit."""
+        nu, clone = self._depot("r1")
+        (clone / "a.py").write_text("a = 2\n", encoding='utf-8')
+        (clone / "nouveau.py").write_text("n = 1\n", encoding='utf-8')
+        (clone / "autre.py").write_text("b = 2\n", encoding='utf-8')
+
+        resultat = self.sync.sync_paths(clone, ["a.py", str(clone / "nouveau.py")], "maj")
+        self.assertEqual(resultat['status'], 'pushed', resultat['message'])
+        self.assertEqual(_git(nu, "show", "--name-only", "--format=", "main").split(),
+                         ["a.py", "nouveau.py"])
+        self.assertIn("autre.py", _git(clone, "status", "--porcelain"))
+
+    def test_aucun_reseau_sans_modification(self):
+        """Sans modification, ni pull ni push (la remote peut etre injoignable)."""
+        _, clone = self._depot("r2")
+        _git(clone, "remote", "set-url", "origin", str(self.temp_dir / "absent.git"))
+        resultat = self.sync.sync_paths(clone, ["a.py"], "maj")
+        self.assertEqual(resultat['status'], 'unchanged')
+
+    def test_plusieurs_depots_en_parallele(self):
+        """Les chemins sont regroupes par depot et synchronises en parallele."""
+        depots = [self._depot(nom) for nom in ("r3", "r4", "r5")]
+        chemins = []
+        for _, clone in depots:
+            (clone / "a.py").write_text("a = 3\n", encoding='utf-8')
+            chemins.append(str(clone / "a.py"))
+        groupes = self.sync.group_paths_by_repository(chemins)
+        self.assertEqual(len(groupes), 3)
+
+        resultats = self.sync.sync_repositories(groupes, "maj", max_workers=2)
+        self.assertEqual([r['status'] for r in resultats], ['pushed'] * 3)
+        for nu, _ in depots:
+            self.assertEqual(_git(nu, "log", "-1", "--format=%s", "main"), "maj")
+
+
+if __name__ == '__main__':
+    unittest.main()
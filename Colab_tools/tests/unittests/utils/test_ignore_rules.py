@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests pour le Moteur de Regles d'Exclusion
+==========================================
+
+Tests unitaires pour core/ignore_rules.py : traduction des motifs
+.gitignore, portees imbriquees, exclusions utilisateur et taille maximale.
+"""
+
+import os
+import re
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.ignore_rules import IgnoreRules, analyser_regle, creer_decouverte
+
+
+class TestAnalyseRegles(unittest.TestCase):
+    """Tests de la traduction des motifs."""
+
+    def _correspond(self, motif, chemin):
+        regex, _, _ = analyser_regle(motif)
+        return re.fullmatch(regex, chemin) is not None
+
+    def test_motifs_simples(self):
+        """Motifs sans '/' : valables a toutes les profondeurs."""
+        self.assertTrue(self._correspond("*.pyc", "a/b/c.pyc"))
+        self.assertTrue(self._correspond("vendor", "src/vendor"))
+        self.assertFalse(self._correspond("*.py", "a/b.pyc"))
+
+    def test_motifs_ancres(self):
+        """Un '/' ancre le motif au dossier du .gitignore."""
+        self.assertTrue(self._correspond("/generated", "generated"))
+        self.assertFalse(self._correspond("/generated", "src/generated"))
+        self.assertTrue(self._correspond("docs/**/*.py", "docs/a/b/c.py"))
+        self.assertTrue(self._correspond("docs/**/*.py", "docs/c.py"))
+
+    def test_lignes_ignorees_et_negation(self):
+        """Commentaires et lignes vides ignores; negation et dossier detectes."""
+        self.assertIsNone(analyser_regle("# commentaire"))
+        self.assertIsNone(analyser_regle("   "))
+        _, negation, dossier = analyser_regle("!keep/")
+        self.assertTrue(negation)
+        self.assertTrue(dossier)
+
+
+class TestIgnoreRules(unittest.TestCase):
+    """Tests de la decouverte filtree."""
+
+    def setUp(self):
+        """Cree une arborescence avec .gitignore imbriques."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = Path(self.temp_dir)
+        fichiers = {
+            ".gitignore": "generated/\n*_pb2.py\n",
+            "app/main.py": "x = 1\n",
+            "app/api_pb2.py": "x = 1\n",
+            "app/.gitignore": "local_*.py\n!local_keep.py\n",
+            "app/local_tmp.py": "x = 1\n",
+            "app/local_keep.py": "x = 1\n",
+            "generated/out.py": "x = 1\n",
+            "venv/pyvenv.cfg": "home = /usr\n",
+            "venv/lib/mod.py": "x = 1\n",
+            "pkg/build/__init__.py": "x = 1\n",
+            "pkg/__pycache__/mod.py": "x = 1\n",
+            "myenv/pyvenv.cfg": "home = /usr\n",
+            "myenv/lib/mod.py": "x = 1\n",
+            "third_party/lib.py": "x = 1\n",
+            "gros.py": "x = 1\n" * 1000,
+        }
+        for rel, contenu in fichiers.items():
+            chemin = self.root / rel
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            chemin.write_text(contenu, encoding='utf-8')
+
+    def tearDown(self):
+        """Supprime l'arborescence."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _decouvrir(self, **options):
+        regles = IgnoreRules([self.temp_dir], **options)
+        fichiers = regles.creer_decouverte().collect([self.temp_dir])
+        return sorted(os.path.relpath(f, self.temp_dir).replace(os.sep, '/') for f in fichiers)
+
+    def test_gitignore_et_environnements(self):
+        """Les .gitignore imbriques et les environnements virtuels sont respectes."""
+        self.assertEqual(self._decouvrir(),
+                         ["app/local_keep.py", "app/main.py", "gros.py",
+                          "pkg/build/__init__.py", "third_party/lib.py"])
+
+    def test_exclusions_utilisateur(self):
+        """Les motifs utilisateur elaguent les sous-arbres."""
+        fichiers = self._decouvrir(exclusions=["third_party", "app/main.py", "pkg"])
+        self.assertEqual(fichiers, ["app/local_keep.py", "gros.py"])
+
+    def test_sous_paquet_nomme_build(self):
+        """Un sous-paquet build est parcouru sauf si un .gitignore l'exclut."""
+        self.assertIn("pkg/build/__init__.py", self._decouvrir())
+        (self.root / "pkg" / ".gitignore").write_text("build/\n", encoding='utf-8')
+        self.assertNotIn("pkg/build/__init__.py", self._decouvrir())
+
+    def test_dossiers_ignores_des_parametres(self):
+        """Le parametre ignored_dirs remplace la liste par defaut."""
+        decouverte = creer_decouverte([self.temp_dir], parametres={'ignored_dirs': ['build']})
+        fichiers = [os.path.relpath(f, self.temp_dir).replace(os.sep, '/')
+                    for f in decouverte.collect([self.temp_dir])]
+        self.assertNotIn("pkg/build/__init__.py", fichiers)
+        self.assertIn("pkg/__pycache__/mod.py", fichiers)
+
+    def test_taille_maximale(self):
+        """Les fichiers au-dela de max_file_size_mb sont ignores."""
+        fichiers = self._decouvrir(max_file_size_mb=0.001)
+        self.assertNotIn("gros.py", fichiers)
+        self.assertIn("app/main.py", fichiers)
+
+    def test_dossier_elague_sans_parcours(self):
+        """Un dossier exclu n'est jamais scanne."""
+        regles = IgnoreRules([self.temp_dir])
+        self.assertTrue(regles.exclure_dossier("generated", str(self.root / "generated")))
+        self.assertFalse(regles.exclure_dossier("app", str(self.root / "app")))
+
+    def test_parametres_du_projet(self):
+        """La limite de taille provient des parametres fournis."""
+        decouverte = creer_decouverte([self.temp_dir], parametres={'max_file_size_mb': 0.001})
+        fichiers = [os.path.basename(f) for f in decouverte.collect([self.temp_dir])]
+        self.assertNotIn("gros.py", fichiers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du Rapport d'Execution
+============================
+
+Tests de core/run_report.py : centiles, cumuls par plugin, fichiers les
+plus lents (tas borne) et echappement du rapport HTML.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.run_report import RapportExecution, centile, rapport_html
+
+
+def _resultat(fichier, duree, statut='modifie', erreur=None):
+    return {'fichier': fichier, 'statut': statut, 'duree_ms': duree, 'erreur': erreur,
+            'plugins': [{'nom': 'a', 'duree_ms': duree * 0.75, 'applique': statut == 'modifie'},
+                        {'nom': 'b', 'duree_ms': duree * 0.25, 'applique': False}]}
+
+
+class TestRapportExecution(unittest.TestCase):
+    """Tests de l'agregation des resultats."""
+
+    def test_centile_rang_le_plus_proche(self):
+        valeurs = list(range(1, 101))
+        self.assertEqual(centile(valeurs, 50), 50)
+        self.assertEqual(centile(valeurs, 95), 95)
+        self.assertEqual(centile(valeurs, 99), 99)
+        self.assertEqual(centile([7.0], 99), 7.0)
+        self.assertEqual(centile([], 50), 0.0)
+
+    def test_agregation(self):
+        rapport = RapportExecution("Test", nombre_lents=3)
+        for i in range(1, 101):
+            rapport.ajouter(_resultat(f"f{i}.py", float(i)))
+        rapport.ajouter(_resultat("casse.py", 0.5, 'erreur', "SyntaxError: x"))
+        donnees = rapport.terminer().donnees()
+
+        self.assertEqual(donnees['fichiers'], 101)
+        self.assertEqual(donnees['statuts'], {'modifie': 100, 'erreur': 1})
+        self.assertEqual(donnees['latence_ms']['p50'], 50.0)
+        self.assertEqual(donnees['latence_ms']['max'], 100.0)
+        self.assertEqual(list(donnees['plugins']), ['a', 'b'])
+        self.assertAlmostEqual(donnees['plugins']['a']['duree_ms'], 0.75 * (5050 + 0.5))
+        self.assertEqual(donnees['plugins']['a']['appliques'], 100)
+        self.assertEqual(donnees['erreurs']['nombre'], 1)
+        self.assertEqual(donnees['erreurs']['details'][0]['fichier'], "casse.py")
+
+        lents = donnees['plus_lents']
+        self.assertEqual([e['fichier'] for e in lents], ["f100.py", "f99.py", "f98.py"])
+        self.assertEqual(lents[0]['etapes'], {'a': 75.0, 'b': 25.0})
+
+    def test_html_echappe(self):
+        rapport = RapportExecution("<lot>")
+        rapport.ajouter(_resultat("<script>.py", 1.0, 'erreur', "<b>"))
+        page = rapport_html(rapport.donnees())
+        self.assertIn("&lt;script&gt;.py", page)
+        self.assertNotIn("<script>", page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests pour la Selection des Tests
+=================================
+
+Tests de tests/unittests/selection_tests.py : graphe des imports,
+references aux plugins par leur nom, fichiers de donnees et scripts hors
+de la racine, et cache des resultats.
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "tests" / "unittests"))
+
+from selection_tests import CacheResultats, GrapheImports, selectionner
+
+FICHIERS = {
+    "core/__init__.py": "",
+    "core/base.py": "X = 1\n",
+    "core/outils.py": "from .base import X\n",
+    "core/transformations/__init__.py": "",
+    "core/transformations/plugin_a.py": "from core.base import X\n",
+    "core/transformations/plugin_b.py": "from core.base import X\n",
+    "core/transformation_loader.py": "from core.base import X\n",
+    "lanceur.py": "import core.outils\n",
+    "tests/unittests/utils/test_outils.py": "from core.outils import X\n",
+    "tests/unittests/utils/test_plugin_a.py": "NOM = 'plugin_a'\n",
+    "tests/unittests/utils/test_lanceur.py": "SCRIPT = 'lanceur.py'\n",
+    "tests/unittests/utils/test_chargeur.py": (
+        "def test():\n    from core.transformation_loader import X\n"),
+    "tests/config/reglages.json": "{}\n",
+    "tests/unittests/utils/test_reglages.py": "NOM = 'reglages.json'\n",
+    # Script au-dessus de la racine, comme github-sync.py
+    "../outil-externe.py": "print(1)\n",
+    "tests/unittests/utils/test_externe.py": (
+        "from pathlib import Path\n"
+        "SCRIPT = Path(__file__).parent.parent.parent.parent.parent / 'outil-externe.py'\n"),
+    "tests/unittests/utils/test_introuvable.py": (
+        "from pathlib import Path\n"
+        "SCRIPT = Path(__file__).parent.parent.parent.parent.parent / 'absent.py'\n"),
+}
+
+RESULTAT_OK = {'tests': 1, 'failures': [], 'errors': [], 'skipped': [],
+               'durees': [], 'sortie': 'ok', 'duree': 0.1}
+
+
+class TestSelectionTests(unittest.TestCase):
+    """Tests du graphe et du cache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.racine = Path(self.temp_dir) / "projet"
+        for relatif, contenu in FICHIERS.items():
+            chemin = self.racine / relatif
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            chemin.write_text(contenu, encoding='utf-8')
+        self.graphe = GrapheImports(self.racine)
+        self.tests = {t.name: t for t in self.graphe.fichiers_de_test()}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _deps(self, nom):
+        return sorted(self.graphe._relatif(d)
+                      for d in self.graphe.dependances_transitives(self.tests[nom]))
+
+    def test_imports_transitifs_et_relatifs(self):
+        """Les imports absolus et relatifs sont suivis transitivement."""
+        self.assertEqual(self._deps("test_outils.py"),
+                         ["core/__init__.py", "core/base.py", "core/outils.py"])
+
+    def test_references_par_nom(self):
+        """Un nom de plugin ou de script cite en chaine est une dependance."""
+        self.assertIn("core/transformations/plugin_a.py", self._deps("test_plugin_a.py"))
+        self.assertNotIn("core/transformations/plugin_b.py", self._deps("test_plugin_a.py"))
+        self.assertIn("lanceur.py", self._deps("test_lanceur.py"))
+
+    def test_seuls_les_tests_du_plugin_sont_affectes(self):
+        """Modifier un plugin ne concerne que ses tests et ceux du chargeur."""
+        plugin = self.racine / "core" / "transformations" / "plugin_a.py"
+        affectes = self.graphe.tests_affectes([plugin], self.tests.values())
+        self.assertEqual(sorted(t.name for t in affectes),
+                         ["test_chargeur.py", "test_plugin_a.py"])
+
+    def test_chargeur_depend_de_tous_les_plugins(self):
+        """Un test qui atteint le chargeur est relance quand un plugin non cite change."""
+        self.assertTrue({"core/transformations/plugin_a.py", "core/transformations/plugin_b.py"}
+                        <= set(self._deps("test_chargeur.py")))
+        module = self.tests["test_chargeur.py"]
+        avant = self.graphe.empreinte_test(module)
+        plugin = self.racine / "core" / "transformations" / "plugin_b.py"
+        plugin.write_text("from core.base import X\nY = 2\n", encoding='utf-8')
+        self.assertNotEqual(GrapheImports(self.racine).empreinte_test(module), avant)
+
+    def test_cache_invalide_par_une_dependance(self):
+        """Un resultat en cache est repris tant que les dependances ne changent pas."""
+        chemin_cache = self.racine / "cache.json"
+        modules = [self.tests[nom] for nom in ("test_lanceur.py", "test_outils.py",
+                                               "test_plugin_a.py")]
+
+        cache = CacheResultats(chemin_cache)
+        a_executer, _, empreintes = selectionner(modules, self.graphe, cache)
+        self.assertEqual(len(a_executer), 3)
+        for module in a_executer:
+            cache.enregistrer(self.graphe._relatif(module), empreintes[module], RESULTAT_OK)
+        cache.sauver()
+
+        plugin = self.racine / "core" / "transformations" / "plugin_a.py"
+        plugin.write_text("from core.base import X\nY = 2\n", encoding='utf-8')
+        graphe = GrapheImports(self.racine)
+        a_executer, en_cache, _ = selectionner(modules, graphe, CacheResultats(chemin_cache))
+        self.assertEqual([m.name for m in a_executer], ["test_plugin_a.py"])
+        self.assertEqual(len(en_cache), 2)
+        self.assertTrue(all(r['cache'] for r in en_cache.values()))
+
+    def test_donnees_et_script_hors_racine(self):
+        """Un fichier de donnees ou un script externe modifie invalide l'empreinte."""
+        for nom, fichier in (("test_reglages.py", self.racine / "tests" / "config" / "reglages.json"),
+                             ("test_externe.py", self.racine.parent / "outil-externe.py")):
+            avant = self.graphe.empreinte_test(self.tests[nom])
+            self.assertIsNotNone(avant)
+            fichier.write_text("modifie\n", encoding='utf-8')
+            self.assertNotEqual(GrapheImports(self.racine).empreinte_test(self.tests[nom]), avant)
+
+    def test_dependance_introuvable_jamais_en_cache(self):
+        """Un test qui sort de la racine vers un fichier inconnu est toujours relance."""
+        module = self.tests["test_introuvable.py"]
+        cache = CacheResultats(self.racine / "cache.json")
+        a_executer, _, empreintes = selectionner([module], self.graphe, cache)
+        self.assertIsNone(empreintes[module])
+        cache.enregistrer(self.graphe._relatif(module), empreintes[module], RESULTAT_OK)
+        self.assertEqual(cache.entrees, {})
+        self.assertEqual(a_executer, [module])
+
+    def test_echec_non_mis_en_cache(self):
+        """Un module en echec sera toujours relance."""
+        cache = CacheResultats(self.racine / "cache.json")
+        cache.enregistrer("m", "e", dict(RESULTAT_OK, failures=[("t", "tb")]))
+        self.assertIsNone(cache.resultat("m", "e"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la Validation des Fichiers Transformes
+===============================================
+
+Tests de core/validation.py : regles syntax_check et import_check,
+resultats memorises par empreinte du code produit, et annulation des
+fichiers invalides par BatchPipeline sans arret du lot.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ajouter le chemin du projet au sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.batch_pipeline import BatchPipeline, SortieDossier
+from core.validation import Validateur, regles_actives, valider_code
+
+REGLES = ['syntax_check', 'import_check']
+
+
+class TestValidation(unittest.TestCase):
+    """Tests des regles de validation."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paquet = Path(self.temp_dir) / "src" / "paquet"
+        self.paquet.mkdir(parents=True)
+        (self.paquet / "voisin.py").write_text("v = 1\n", encoding='utf-8')
+        self.chemin = str(self.paquet / "module.py")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_regles_actives(self):
+        """Format JSON AI : regles desactivees et inconnues ignorees."""
+        regles = [{"rule": "import_check", "enabled": True},
+                  {"rule": "syntax_check", "enabled": False},
+                  {"rule": "type_check", "enabled": True}]
+        self.assertEqual(regles_actives(regles), ['import_check'])
+        self.assertEqual(regles_actives(['import_check', 'syntax_check']), REGLES)
+
+    def test_syntaxe(self):
+        problemes = valider_code("x = = 1\n", self.chemin, REGLES)
+        self.assertEqual([(p['regle'], p['ligne']) for p in problemes], [('syntax_check', 1)])
+        self.assertEqual(valider_code("x = = 1\n", self.chemin, ['import_check']), [])
+
+    def test_imports_resolus(self):
+        """Bibliotheque standard, modules voisins, relatifs et imports optionnels."""
+        code = (
+            "import os, logging.handlers\n"
+            "import voisin\n"
+            "from paquet import voisin\n"
+            "from . import voisin\n"
+            "from .voisin import v\n"
+            "try:\n"
+            "    import module_optionnel_absent\n"
+            "except ImportError:\n"
+            "    module_optionnel_absent = None\n"
+            "from typing import TYPE_CHECKING\n"
+            "if TYPE_CHECKING:\n"
+            "    import module_de_typage_absent\n"
+        )
+        self.assertEqual(valider_code(code, self.chemin, REGLES, [str(self.paquet.parent)]), [])
+
+    def test_imports_introuvables(self):
+        code = "import module_inexistant_xyz\n\ndef f():\n    from .absent import g\n"
+        problemes = valider_code(code, self.chemin, REGLES)
+        self.assertEqual([(p['regle'], p['ligne']) for p in problemes],
+                         [('import_check', 1), ('import_check', 4)])
+
+    def test_problemes_de_la_source_ecartes(self):
+        """Seuls les problemes introduits par la transformation sont rapportes."""
+        source = "import module_inexistant_xyz\nx = 1\n"
+        code = "# entete\nimport module_inexistant_xyz\nimport module_introduit_xyz\nx = 10\n"
+        problemes = valider_code(code, self.chemin, REGLES, source=source)
+        self.assertEqual([(p['ligne'], p['message']) for p in problemes],
+                         [(3, "Module introuvable: module_introduit_xyz")])
+        # Syntaxe deja invalide dans la source : rien de nouveau
+        self.assertEqual(valider_code("x = = 10\n", self.chemin, REGLES, source="x = = 1\n"), [])
+        self.assertEqual(len(valider_code("x = = 1\n", self.chemin, REGLES, source="x = 1\n")), 1)
+
+    def test_resultat_memorise_par_empreinte(self):
+        """Un code deja valide n'est pas reanalyse; seul le code modifie est valide."""
+        validateur = Validateur(REGLES)
+        resultat, code = validateur.valider({'fichier': self.chemin, 'statut': 'modifie'}, "x = 1\n")
+        self.assertTrue(resultat['validation']['valide'])
+        self.assertNotIn('cache', resultat['validation'])
+        resultat, _ = validateur.valider({'fichier': self.chemin, 'statut': 'modifie'}, "x = 1\n")
+        self.assertTrue(resultat['validation']['cache'])
+        resultat, _ = validateur.valider({'fichier': self.chemin, 'statut': 'inchange'}, None)
+        self.assertNotIn('validation', resultat)
+
+
+class TestValidationDuLot(unittest.TestCase):
+    """Tests de l'etape de validation de BatchPipeline."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.src = Path(self.temp_dir) / "src"
+        self.src.mkdir()
+        (self.src / "valide.py").write_text("x = 1\n", encoding='utf-8')
+        (self.src / "syntaxe.py").write_text("x = 1\ny = 2\n", encoding='utf-8')
+        (self.src / "imports.py").write_text("import module_inexistant_xyz\nx = 1\nz = 3\n",
+                                             encoding='utf-8')
+        # Import deja introuvable dans la source : pas un probleme introduit
+        (self.src / "herite.py").write_text("import module_herite_xyz\nx = 1\n",
+                                            encoding='utf-8')
+        self.instructions = Path(self.temp_dir) / "instructions.json"
+        self.instructions.write_text(json.dumps({
+            "transformations": [
+                {"action": "replace_text", "from": "x = 1", "to": "x = 10"},
+                {"action": "replace_text", "from": "y = 2", "to": "y = = 2"},
+                {"action": "replace_text", "from": "z = 3", "to": "import module_introduit_xyz"},
+            ],
+            "validation_rules": [{"rule": "syntax_check", "enabled": True},
+                                 {"rule": "import_check", "enabled": True}],
+        }), encoding='utf-8')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _executer(self, jobs=1, **options):
+        sortie = os.path.join(self.temp_dir, f"sortie{jobs}")
+        pipeline = BatchPipeline(["json_ai_transformer"], json_instructions=str(self.instructions),
+                                 jobs=jobs, sortie=SortieDossier(sortie), roots=[str(self.src)],
+                                 **options)
+        fichiers = sorted(str(p) for p in self.src.glob("*.py"))
+        resultats = {r['relatif']: r for r in pipeline.executer(fichiers)}
+        return resultats, sorted(os.listdir(sortie))
+
+    def test_validation_rules_des_instructions(self):
+        """Sans annulation, les fichiers invalides sont rapportes et ecrits."""
+        resultats, ecrits = self._executer()
+        self.assertTrue(resultats["valide.py"]['validation']['valide'])
+        self.assertTrue(resultats["herite.py"]['validation']['valide'])
+        self.assertEqual(resultats["syntaxe.py"]['validation']['problemes'][0]['regle'],
+                         'syntax_check')
+        self.assertEqual([p['message'] for p in resultats["imports.py"]['validation']['problemes']],
+                         ["Module introuvable: module_introduit_xyz"])
+        self.assertEqual({r['statut'] for r in resultats.values()}, {'modifie'})
+        self.assertEqual(ecrits, ["herite.py", "imports.py", "syntaxe.py", "valide.py"])
+
+    def test_annulation_en_parallele(self):
+        """Fichiers invalides annules sans arreter le lot, avec jobs > 1."""
+        resultats, ecrits = self._executer(jobs=2, annuler_invalides=True)
+        self.assertEqual(resultats["valide.py"]['statut'], 'modifie')
+        self.assertEqual(resultats["herite.py"]['statut'], 'modifie')
+        for relatif in ("syntaxe.py", "imports.py"):
+            self.assertEqual(resultats[relatif]['statut'], 'erreur')
+            self.assertTrue(resultats[relatif]['annule'])
+            self.assertIn("Validation", resultats[relatif]['erreur'])
+        self.assertEqual(ecrits, ["herite.py", "valide.py"])
+
+    def test_regles_explicites(self):
+        """validation remplace les validation_rules des instructions."""
+        resultats, _ = self._executer(validation=['syntax_check'], annuler_invalides=True)
+        self.assertEqual(resultats["imports.py"]['statut'], 'modifie')
+        self.assertEqual(resultats["syntaxe.py"]['statut'], 'erreur')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,15 @@
 # Updated on 2024-09-05 15:30:00.000000
+import argparse
+import json
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from git import Repo, GitCommandError
 
+# Repository lookup shared with Colab_tools (core/git_repositories.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Colab_tools'))
+from core.git_repositories import group_paths_by_repository
+
 def push_to_github(repo_path, commit_message="Update scripts", branch_name=None):
     try:
         # Change to the directory containing the git repository
@@ -56,6 +64,128 @@ def push_to_github(repo_path, commit_message="Update scripts", branch_name=None)
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
 
+def paths_from_run_log(log_file):
+    """Output paths ('sortie') from the JSON lines written by lancer_lot.py."""
+    paths = []
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(result, dict) and result.get('sortie'):
+                paths.append(result['sortie'])
+    return paths
+
+
+def sync_paths(repo_path, paths, commit_message="Update scripts", branch_name=None,
+               remote_name='origin', push=True):
+    """
+    Stage and commit only the given paths, then pull and push.
+
+    Nothing touches the network when none of the paths has changed. The
+    process working directory is never changed, so several repositories
+    can be synced from threads.
+
+    Returns:
+        dict: {'repo', 'status', 'paths', 'commit', 'message'} where status is
+        'unchanged', 'committed', 'pushed' or 'error'
+    """
+    repo_path = os.path.abspath(os.path.expanduser(repo_path))
+    result = {'repo': repo_path, 'status': 'error', 'paths': [], 'commit': None, 'message': ''}
+    try:
+        repo = Repo(repo_path)
+        if branch_name and repo.active_branch.name != branch_name:
+            repo.git.checkout(branch_name)
+
+        pathspecs = []
+        for path in paths:
+            absolute = os.path.abspath(os.path.join(repo_path, os.path.expanduser(path)))
+            if os.path.commonpath([absolute, repo_path]) != repo_path:
+                print(f"Skipping {path}: outside {repo_path}.")
+                continue
+            pathspecs.append(os.path.relpath(absolute, repo_path))
+
+        # Status limited to the written paths: no full-tree scan
+        changed = repo.git.status('--porcelain', '--untracked-files=all', '--', *pathspecs) \
+            if pathspecs else ''
+        if not changed.strip():
+            result.update(status='unchanged', message="No changes to commit.")
+            return result
+
+        repo.git.add('--all', '--', *pathspecs)
+        repo.git.commit('-m', commit_message, '--', *pathspecs)
+        result.update(status='committed', paths=pathspecs, commit=repo.head.commit.hexsha)
+
+        if push:
+            branch = repo.active_branch.name
+            remote = repo.remote(name=remote_name)
+            try:
+                repo.git.pull(remote_name, branch)
+            except GitCommandError as pull_error:
+                if "CONFLICT" in str(pull_error):
+                    result.update(status='error', message="Merge conflicts during pull, "
+                                                          "resolve them manually.")
+                    return result
+                if "couldn't find remote ref" not in str(pull_error):
+                    raise
+            push_info = remote.push(branch)
+            if push_info and push_info[0].flags & push_info[0].ERROR:
+                result.update(status='error', message=f"Push failed: {push_info[0].summary}")
+                return result
+            result.update(status='pushed', commit=repo.head.commit.hexsha)
+        result['message'] = f"{len(pathspecs)} path(s) committed."
+
+    except GitCommandError as e:
+        result['message'] = f"Git command error: {e}"
+    except Exception as e:
+        result['message'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def sync_repositories(paths_by_repo, commit_message="Update scripts", branch_name=None,
+                      max_workers=4, push=True):
+    """Sync several repositories concurrently, at most max_workers at a time."""
+    max_workers = max(1, min(int(max_workers), len(paths_by_repo) or 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(sync_paths, repo_path, paths, commit_message, branch_name,
+                                   push=push)
+                   for repo_path, paths in paths_by_repo.items()]
+        results = [future.result() for future in futures]
+    for result in results:
+        print(f"{result['repo']}: {result['status']} {result['message']}".rstrip())
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Commit and push only the files written by a transformation run.")
+    parser.add_argument('paths', nargs='*', help="Written files (their repositories are found)")
+    parser.add_argument('--from-run-log', help="JSON lines output of lancer_lot.py")
+    parser.add_argument('-m', '--message', default="Auto-sync commit", help="Commit message")
+    parser.add_argument('-b', '--branch', help="Branch to check out before committing")
+    parser.add_argument('-j', '--jobs', type=int, default=4,
+                        help="Repositories synced concurrently (default: 4)")
+    parser.add_argument('--no-push', action='store_true', help="Commit locally only")
+    args = parser.parse_args(argv)
+
+    paths = list(args.paths)
+    if args.from_run_log:
+        paths.extend(paths_from_run_log(args.from_run_log))
+    if not paths:
+        parser.error("no paths to sync")
+
+    skipped = []
+    groups = group_paths_by_repository(paths, skipped=skipped)
+    for path in skipped:
+        print(f"Skipping {path}: not inside a git repository.")
+    results = sync_repositories(groups, args.message, args.branch,
+                                args.jobs, push=not args.no_push)
+    return 1 if any(r['status'] == 'error' for r in results) else 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
     repo_path = 'C:\\Users\\User\\Script_Loop_Development'  # The correct path to your repository
     push_to_github(repo_path, "Auto-sync commit", branch_name="commit-to-change")